@@ -10,6 +10,7 @@ import re
 SHAPE_ORDERING = ['obj',
                   'ply',
                   'serialized',
+                  'mmesh',
                   'sphere',
                   'cylinder',
                   'disk',
@@ -0,0 +1,99 @@
+#pragma once
+
+#include <mitsuba/core/object.h>
+#include <mitsuba/core/filesystem.h>
+
+NAMESPACE_BEGIN(mitsuba)
+
+/**
+ * \brief Process-wide cache of loaded assets (e.g. meshes and bitmaps)
+ *
+ * Plugins that load data from disk can use this cache to share the decoded
+ * contents of files between all scenes loaded by the same process, which
+ * avoids redundant I/O and decoding when a scene (or scenes referencing the
+ * same assets) is loaded repeatedly, e.g. from an interactive Python session.
+ *
+ * Entries are identified by string keys that should encompass everything
+ * that influences the cached data, e.g. the file identity returned by
+ * \ref file_key() and any relevant plugin parameters. Cached objects are
+ * shared and must be treated as read-only by their users.
+ *
+ * The cache is bounded by a total memory budget, and the least recently used
+ * entries are evicted when this budget is exceeded. It is disabled by default
+ * (i.e. its capacity is zero) and can be enabled using \ref set_capacity().
+ */
+class MTS_EXPORT_CORE AssetCache {
+public:
+    /// Usage statistics of the asset cache
+    struct Statistics {
+        /// Number of successful lookups
+        size_t hits = 0;
+        /// Number of failed lookups
+        size_t misses = 0;
+        /// Number of entries that were evicted to respect the capacity
+        size_t evictions = 0;
+        /// Number of entries currently in the cache
+        size_t entries = 0;
+        /// Memory usage of the entries currently in the cache (in bytes)
+        size_t size = 0;
+        /// Capacity of the cache (in bytes)
+        size_t capacity = 0;
+    };
+
+    /// Return the object stored under \c key, or \c nullptr when there is none
+    static ref<Object> get(const std::string &key);
+
+    /**
+     * \brief Insert an object into the cache
+     *
+     * \param size
+     *     Estimated memory usage of the object in bytes. Objects larger than
+     *     the capacity of the cache are not inserted.
+     */
+    static void put(const std::string &key, Object *value, size_t size);
+
+    /**
+     * \brief Look up the object stored under \c key, or invoke \c load() and
+     * insert the object it returns on a cache miss
+     *
+     * \c size() is invoked with the loaded object and must return an estimate
+     * of its memory usage in bytes.
+     */
+    template <typename T, typename Load, typename Size>
+    static ref<T> get_or_load(const std::string &key, Load load, Size size) {
+        if (capacity() > 0) {
+            ref<Object> value = get(key);
+            if (value)
+                return (T *) value.get();
+        }
+        ref<T> result = load();
+        if (capacity() > 0)
+            put(key, result, size(result.get()));
+        return result;
+    }
+
+    /// Remove all entries from the cache
+    static void purge();
+
+    /// Set the capacity of the cache in bytes (zero disables the cache)
+    static void set_capacity(size_t capacity);
+
+    /// Return the capacity of the cache in bytes
+    static size_t capacity();
+
+    /// Return usage statistics of the cache
+    static Statistics statistics();
+
+    /**
+     * \brief Return a string identifying the current state of the given file
+     *
+     * The key combines the absolute path of the file with its size and
+     * modification time, so that modified files invalidate cache entries.
+     */
+    static std::string file_key(const fs::path &path);
+
+    /// Release all entries (must be called before unloading plugin libraries)
+    static void static_shutdown();
+};
+
+NAMESPACE_END(mitsuba)
@@ -4,6 +4,7 @@
 #include <mitsuba/core/vector.h>
 #include <mitsuba/core/properties.h>
 #include <mitsuba/core/rfilter.h>
+#include <future>
 
 NAMESPACE_BEGIN(mitsuba)
 
@@ -316,6 +317,9 @@ public:
     /// Return a \c Struct instance describing the contents of the bitmap
     Struct *struct_() { return m_struct.get(); }
 
+    /// Future reporting the completion of a write issued by \ref write_async()
+    using WriteFuture = std::shared_future<void>;
+
     /**
      * Write an encoded form of the bitmap to a stream using the specified file format
      *
@@ -376,9 +380,40 @@ public:
     void write(const fs::path &path, FileFormat format = FileFormat::Auto,
                int quality = -1) const;
 
-    /// Equivalent to \ref write(), but executes asynchronously on a different thread
-    void write_async(const fs::path &path, FileFormat format = FileFormat::Auto,
-                     int quality = -1) const;
+    /**
+     * \brief Equivalent to \ref write(), but executes asynchronously on a
+     * background writer thread
+     *
+     * The bitmap is not copied and must not be modified until the write has
+     * completed. At most \ref write_queue_capacity() bitmaps are held by
+     * pending writes: when this limit is reached, the function blocks until
+     * a pending write completes. Writes to the same file complete in the
+     * order in which they were issued.
+     *
+     * \return A future that becomes ready once the file has been written.
+     *    Its <tt>get()</tt> function rethrows the exception raised by the
+     *    write, if any (failures are also logged as warnings).
+     */
+    WriteFuture write_async(const fs::path &path, FileFormat format = FileFormat::Auto,
+                            int quality = -1) const;
+
+    /// Wait until all writes issued by \ref write_async() have completed
+    static void flush_async_writes();
+
+    /**
+     * \brief Set the maximum number of bitmaps held by pending writes issued
+     * by \ref write_async() (default: 4)
+     */
+    static void set_write_queue_capacity(size_t capacity);
+
+    /// Return the maximum number of bitmaps held by pending asynchronous writes
+    static size_t write_queue_capacity();
+
+    /// Set the number of threads executing asynchronous writes (default: 2)
+    static void set_write_thread_count(size_t count);
+
+    /// Return the number of threads executing asynchronous writes
+    static size_t write_thread_count();
 
     /**
      * \brief Up- or down-sample this image to a different resolution
@@ -573,6 +608,18 @@ public:
     /// Return a human-readable summary of this bitmap
     virtual std::string to_string() const override;
 
+    /**
+     * \brief Set the number of threads used to encode and decode OpenEXR
+     * files and to compress PNG files
+     *
+     * A value of zero (the default) uses one thread per core. The encoded
+     * files don't depend on the number of threads.
+     */
+    static void set_io_thread_count(uint32_t count);
+
+    /// Return the number of threads used to encode and decode image files
+    static uint32_t io_thread_count();
+
     /// Static initialization of bitmap-related data structures (thread pools, etc.)
     static void static_initialization();
 
@@ -209,6 +209,12 @@ extern MTS_EXPORT_CORE bool exists(const path& p) noexcept;
  */
 extern MTS_EXPORT_CORE size_t file_size(const path& p);
 
+/** \brief Returns the time of the last modification of the file system object
+ * at <tt>p</tt>, in nanoseconds since the Unix epoch. The resolution of the
+ * returned value depends on the platform and file system.
+ */
+extern MTS_EXPORT_CORE uint64_t last_write_time(const path& p);
+
 /** \brief Checks whether two paths refer to the same file system object.
  * Both must refer to an existing file or directory.
  * Symlinks are followed to determine equivalence.
@@ -55,6 +55,16 @@ public:
      */
     static ref<MemoryMappedFile> create_temporary(size_t size);
 
+    /**
+     * \brief Map the specified file into memory with copy-on-write semantics
+     *
+     * The mapped pages are shared with all other processes mapping the same
+     * file until they are modified, at which point the modified pages are
+     * privately copied. Changes are never written back to the file, and the
+     * mapping cannot be resized.
+     */
+    static ref<MemoryMappedFile> map_private(const fs::path &filename);
+
     MTS_DECLARE_CLASS()
 protected:
     /// Internal constructor
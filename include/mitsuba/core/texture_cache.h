@@ -0,0 +1,255 @@
+#pragma once
+
+#include <mitsuba/core/bitmap.h>
+#include <mitsuba/core/mmap.h>
+#include <mitsuba/core/rfilter.h>
+#include <functional>
+#include <memory>
+
+NAMESPACE_BEGIN(mitsuba)
+
+/**
+ * \brief Image stored as a tiled MIP map pyramid in Mitsuba's binary tiled
+ * texture format
+ *
+ * The file contains all levels of the pyramid (in linear single precision
+ * floating point) split into square tiles of a fixed size, which are laid out
+ * contiguously in memory so that individual tiles can be paged in on demand.
+ * The file is memory-mapped and tiles are only accessed through the \ref
+ * TextureCache, which bounds the memory used by the decoded tiles.
+ *
+ * Files are written using the byte order of the current machine and can only
+ * be loaded on machines with the same byte order.
+ */
+class MTS_EXPORT_CORE TiledImage : public Object {
+public:
+    /**
+     * \brief Function converting the texels of a freshly loaded tile in place
+     * (e.g. into a spectral representation), invoked with the tile data, its
+     * number of pixels, and the number of channels
+     */
+    using TileConverter = std::function<void(float *, size_t, uint32_t)>;
+
+    /// Open a tiled image file
+    TiledImage(const fs::path &filename, const TileConverter &converter = {});
+
+    /**
+     * \brief Write \c bitmap as a tiled MIP map pyramid
+     *
+     * The bitmap is converted into a linear single precision representation
+     * with one (luminance) or three (RGB) channels, and the levels of the
+     * pyramid are built by repeatedly halving the resolution using a box
+     * filter.
+     *
+     * \param tile_size
+     *     Width and height of the tiles in pixels
+     *
+     * \param bc
+     *     Boundary condition of the box filter, which should match the wrap
+     *     mode of the textures using the file
+     *
+     * \param source_hash
+     *     Identifies the source of the image (see \ref compute_source_hash())
+     */
+    static void write(const Bitmap *bitmap, const fs::path &filename,
+                      uint32_t tile_size = 64,
+                      FilterBoundaryCondition bc = FilterBoundaryCondition::Repeat,
+                      uint64_t source_hash = 0);
+
+    /**
+     * \brief Convert an image file (e.g. PNG, JPEG, or OpenEXR) into a tiled
+     * image file tagged with the hash of its source
+     *
+     * The target file is replaced atomically, hence concurrent renders never
+     * observe partially written files.
+     *
+     * \param raw
+     *     Disables the linearization of sRGB-encoded images (e.g. for normal maps)
+     */
+    static void convert(const fs::path &source, const fs::path &target,
+                        bool raw = false, uint32_t tile_size = 64,
+                        FilterBoundaryCondition bc = FilterBoundaryCondition::Repeat);
+
+    /**
+     * \brief Compute the hash that identifies the contents of the image file
+     * \c source converted with the given \c raw setting
+     */
+    static uint64_t compute_source_hash(const fs::path &source, bool raw);
+
+    /**
+     * \brief Return the default path of the converted version of an image
+     * file, which is picked up by the \c bitmap texture (the source path
+     * with an additional <tt>.mtt</tt> extension)
+     */
+    static fs::path converted_path(const fs::path &source);
+
+    /// Check whether the given file starts with the header of a tiled image
+    static bool is_tiled_image(const fs::path &filename);
+
+    /// Return the file name of the image
+    const fs::path &filename() const { return m_mmap->filename(); }
+
+    /// Return the pixel format (\ref Bitmap::PixelFormat::Y or \ref Bitmap::PixelFormat::RGB)
+    Bitmap::PixelFormat pixel_format() const { return m_pixel_format; }
+
+    /// Return the number of channels
+    uint32_t channel_count() const { return m_channel_count; }
+
+    /// Return the width and height of the tiles
+    uint32_t tile_size() const { return m_tile_size; }
+
+    /// Return the number of levels of the pyramid
+    uint32_t level_count() const { return (uint32_t) m_levels.size(); }
+
+    /// Return the resolution of a level of the pyramid
+    Vector2u resolution(uint32_t level = 0) const { return m_levels.at(level).size; }
+
+    /// Return the boundary condition that was used to build the pyramid
+    FilterBoundaryCondition boundary_condition() const { return m_boundary_condition; }
+
+    /// Return the hash of the source of the image (zero if unknown)
+    uint64_t source_hash() const { return m_source_hash; }
+
+    /// Return a process-wide unique identifier of the image (used by \ref TextureCache)
+    uint64_t id() const { return m_id; }
+
+    /// Return the size of the decoded tiles in bytes
+    size_t tile_bytes() const {
+        return (size_t) m_tile_size * m_tile_size * m_channel_count * sizeof(float);
+    }
+
+    /**
+     * \brief Read and convert the tile at position (\c x, \c y) of a level
+     * into \c data, which must hold <tt>tile_size()^2 * channel_count()</tt>
+     * values
+     */
+    void read_tile(uint32_t level, uint32_t x, uint32_t y, float *data) const;
+
+    /// Read and convert a complete level of the pyramid
+    ref<Bitmap> read_level(uint32_t level) const;
+
+    std::string to_string() const override;
+
+    MTS_DECLARE_CLASS()
+
+public:
+    /// Header of a tiled image file
+    struct Header {
+        /// File identifier, always <tt>"MTSTILE\0"</tt>
+        char magic[8];
+        uint32_t version;
+        /// Always equal to \ref ByteOrder when read on the same architecture
+        uint32_t byte_order;
+        uint32_t channel_count;
+        uint32_t tile_size;
+        uint32_t level_count;
+        /// Boundary condition used to build the pyramid
+        uint32_t boundary_condition;
+        /// Hash of the source image (see \ref compute_source_hash()), or zero
+        uint64_t source_hash;
+    };
+
+    /// Record describing a level of the pyramid (one per level following the header)
+    struct LevelRecord {
+        uint32_t width;
+        uint32_t height;
+        /// Offset of the first tile, tiles are stored in scanline order
+        uint64_t offset;
+    };
+
+    static constexpr uint32_t Version = 2;
+    static constexpr uint32_t ByteOrder = 0x01020304u;
+    /// Alignment of the tile data of each level
+    static constexpr size_t Alignment = 4096;
+
+protected:
+    virtual ~TiledImage();
+
+    struct Level {
+        Vector2u size;
+        Vector2u tile_count;
+        uint64_t offset;
+    };
+
+    ref<MemoryMappedFile> m_mmap;
+    TileConverter m_converter;
+    Bitmap::PixelFormat m_pixel_format;
+    uint32_t m_channel_count;
+    uint32_t m_tile_size;
+    FilterBoundaryCondition m_boundary_condition;
+    uint64_t m_source_hash;
+    std::vector<Level> m_levels;
+    uint64_t m_id;
+};
+
+/**
+ * \brief Process-wide cache of tiles of \ref TiledImage instances
+ *
+ * Texture plugins can use this cache to render with textures that are much
+ * larger than the available memory: tiles are loaded when they are first
+ * accessed, and the least recently used tiles are evicted when the memory
+ * budget (see \ref set_capacity()) is exceeded. The cache is split into
+ * independently locked shards, and each thread additionally keeps a small
+ * table of the tiles it accessed most recently, which serves most lookups
+ * without any locking.
+ *
+ * Tiles referenced by the per-thread tables stay alive until the tables are
+ * updated, hence the actual memory usage can exceed the capacity by a few
+ * tiles per thread.
+ */
+class MTS_EXPORT_CORE TextureCache {
+public:
+    /// Usage statistics of the texture cache
+    struct Statistics {
+        /// Number of lookups that found the tile in the shared cache
+        size_t hits = 0;
+        /// Number of lookups that loaded the tile from disk
+        size_t misses = 0;
+        /// Number of tiles that were evicted to respect the capacity
+        size_t evictions = 0;
+        /// Number of tiles currently in the cache
+        size_t tiles = 0;
+        /// Memory usage of the tiles currently in the cache (in bytes)
+        size_t size = 0;
+        /// Capacity of the cache (in bytes)
+        size_t capacity = 0;
+    };
+
+    /**
+     * \brief Copy the texel at integer position (\c x, \c y) of a level of
+     * the image to \c value (which must hold \c image->channel_count() values)
+     *
+     * The position must lie within the level.
+     */
+    static void fetch(const TiledImage *image, uint32_t level, uint32_t x,
+                      uint32_t y, float *value);
+
+    /**
+     * \brief Return the data of a tile, loading it if necessary
+     *
+     * The returned tile keeps its data alive even if it is evicted from the
+     * cache in the meantime.
+     */
+    static std::shared_ptr<const float[]> tile(const TiledImage *image, uint32_t level,
+                                               uint32_t x, uint32_t y);
+
+    /// Remove all tiles of the given image from the cache
+    static void release(const TiledImage *image);
+
+    /// Remove all tiles from the cache
+    static void purge();
+
+    /// Set the capacity of the cache in bytes
+    static void set_capacity(size_t capacity);
+
+    /// Return the capacity of the cache in bytes (default: 1 GiB)
+    static size_t capacity();
+
+    /// Return usage statistics of the cache
+    static Statistics statistics();
+
+    /// Release all tiles (must be called before unloading plugin libraries)
+    static void static_shutdown();
+};
+
+NAMESPACE_END(mitsuba)
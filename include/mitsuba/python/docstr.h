@@ -260,6 +260,72 @@ static const char *__doc_mitsuba_ArgParser_parse = R"doc(Parse the given set of
 
 static const char *__doc_mitsuba_ArgParser_parse_2 = R"doc(Parse the given set of command line arguments)doc";
 
+static const char *__doc_mitsuba_AssetCache =
+R"doc(Process-wide cache of loaded assets (e.g. meshes and bitmaps)
+
+Plugins that load data from disk can use this cache to share the
+decoded contents of files between all scenes loaded by the same
+process, which avoids redundant I/O and decoding when a scene (or
+scenes referencing the same assets) is loaded repeatedly, e.g. from an
+interactive Python session.
+
+Entries are identified by string keys that should encompass everything
+that influences the cached data, e.g. the file identity returned by
+file_key() and any relevant plugin parameters. Cached objects are
+shared and must be treated as read-only by their users.
+
+The cache is bounded by a total memory budget, and the least recently
+used entries are evicted when this budget is exceeded. It is disabled
+by default (i.e. its capacity is zero) and can be enabled using
+set_capacity().)doc";
+
+static const char *__doc_mitsuba_AssetCache_Statistics = R"doc(Usage statistics of the asset cache)doc";
+
+static const char *__doc_mitsuba_AssetCache_Statistics_capacity = R"doc(Capacity of the cache (in bytes))doc";
+
+static const char *__doc_mitsuba_AssetCache_Statistics_entries = R"doc(Number of entries currently in the cache)doc";
+
+static const char *__doc_mitsuba_AssetCache_Statistics_evictions = R"doc(Number of entries that were evicted to respect the capacity)doc";
+
+static const char *__doc_mitsuba_AssetCache_Statistics_hits = R"doc(Number of successful lookups)doc";
+
+static const char *__doc_mitsuba_AssetCache_Statistics_misses = R"doc(Number of failed lookups)doc";
+
+static const char *__doc_mitsuba_AssetCache_Statistics_size = R"doc(Memory usage of the entries currently in the cache (in bytes))doc";
+
+static const char *__doc_mitsuba_AssetCache_capacity = R"doc(Return the capacity of the cache in bytes)doc";
+
+static const char *__doc_mitsuba_AssetCache_file_key =
+R"doc(Return a string identifying the current state of the given file
+
+The key combines the absolute path of the file with its size and
+modification time, so that modified files invalidate cache entries.)doc";
+
+static const char *__doc_mitsuba_AssetCache_get =
+R"doc(Return the object stored under ``key``, or ``nullptr`` when there is none)doc";
+
+static const char *__doc_mitsuba_AssetCache_get_or_load =
+R"doc(Look up the object stored under ``key``, or invoke ``load()`` and
+insert the object it returns on a cache miss
+
+``size()`` is invoked with the loaded object and must return an
+estimate of its memory usage in bytes.)doc";
+
+static const char *__doc_mitsuba_AssetCache_purge = R"doc(Remove all entries from the cache)doc";
+
+static const char *__doc_mitsuba_AssetCache_put =
+R"doc(Insert an object into the cache
+
+Parameter ``size``:
+    Estimated memory usage of the object in bytes. Objects larger than
+    the capacity of the cache are not inserted.)doc";
+
+static const char *__doc_mitsuba_AssetCache_set_capacity = R"doc(Set the capacity of the cache in bytes (zero disables the cache))doc";
+
+static const char *__doc_mitsuba_AssetCache_static_shutdown = R"doc(Release all entries (must be called before unloading plugin libraries))doc";
+
+static const char *__doc_mitsuba_AssetCache_statistics = R"doc(Return usage statistics of the cache)doc";
+
 static const char *__doc_mitsuba_AtomicFloat =
 R"doc(Atomic floating point data type
 
@@ -463,6 +529,11 @@ static const char *__doc_mitsuba_BSDF_class = R"doc()doc";
 
 static const char *__doc_mitsuba_BSDF_component_count = R"doc(Number of components this BSDF is comprised of.)doc";
 
+static const char *__doc_mitsuba_BSDF_differential_flags =
+R"doc(Return BSDFFlags::NeedsDifferentials if one of the textures or nested
+BSDFs passed via ``props`` requires texture-space differentials, and
+zero otherwise)doc";
+
 static const char *__doc_mitsuba_BSDF_eval =
 R"doc(Evaluate the BSDF f(wi, wo) or its adjoint version f^{*}(wi, wo) and
 multiply by the cosine foreshortening term.
@@ -776,6 +847,8 @@ static const char *__doc_mitsuba_Bitmap_PixelFormat_Y = R"doc(Single-channel lum
 
 static const char *__doc_mitsuba_Bitmap_PixelFormat_YA = R"doc(Two-channel luminance + alpha bitmap)doc";
 
+static const char *__doc_mitsuba_Bitmap_WriteFuture = R"doc(Future reporting the completion of a write issued by write_async())doc";
+
 static const char *__doc_mitsuba_Bitmap_accumulate =
 R"doc(Accumulate the contents of another bitmap into the region with the
 specified offset
@@ -876,10 +949,14 @@ static const char *__doc_mitsuba_Bitmap_data_2 = R"doc(Return a pointer to the u
 
 static const char *__doc_mitsuba_Bitmap_detect_file_format = R"doc(Attempt to detect the bitmap file format in a given stream)doc";
 
+static const char *__doc_mitsuba_Bitmap_flush_async_writes = R"doc(Wait until all writes issued by write_async() have completed)doc";
+
 static const char *__doc_mitsuba_Bitmap_has_alpha = R"doc(Return whether this image has an alpha channel)doc";
 
 static const char *__doc_mitsuba_Bitmap_height = R"doc(Return the bitmap's height in pixels)doc";
 
+static const char *__doc_mitsuba_Bitmap_io_thread_count = R"doc(Return the number of threads used to encode and decode image files)doc";
+
 static const char *__doc_mitsuba_Bitmap_m_component_format = R"doc()doc";
 
 static const char *__doc_mitsuba_Bitmap_m_data = R"doc()doc";
@@ -995,12 +1072,25 @@ Parameter ``clamp``:
     Filtered image pixels will be clamped to the following range.
     Default: -infinity..infinity (i.e. no clamping is used))doc";
 
+static const char *__doc_mitsuba_Bitmap_set_io_thread_count =
+R"doc(Set the number of threads used to encode and decode OpenEXR files
+and to compress PNG files
+
+A value of zero (the default) uses one thread per core. The encoded
+files don't depend on the number of threads.)doc";
+
 static const char *__doc_mitsuba_Bitmap_set_metadata = R"doc(Set the a Properties object containing the image metadata)doc";
 
 static const char *__doc_mitsuba_Bitmap_set_premultiplied_alpha = R"doc(Specify whether the bitmap uses premultiplied alpha)doc";
 
 static const char *__doc_mitsuba_Bitmap_set_srgb_gamma = R"doc(Specify whether the bitmap uses an sRGB gamma encoding)doc";
 
+static const char *__doc_mitsuba_Bitmap_set_write_queue_capacity =
+R"doc(Set the maximum number of bitmaps held by pending writes issued by
+write_async() (default: 4))doc";
+
+static const char *__doc_mitsuba_Bitmap_set_write_thread_count = R"doc(Set the number of threads executing asynchronous writes (default: 2))doc";
+
 static const char *__doc_mitsuba_Bitmap_size = R"doc(Return the bitmap dimensions in pixels)doc";
 
 static const char *__doc_mitsuba_Bitmap_split =
@@ -1088,8 +1178,19 @@ recommended as the default for lossy compression. The default argument
 compressor.)doc";
 
 static const char *__doc_mitsuba_Bitmap_write_async =
-R"doc(Equivalent to write(), but executes asynchronously on a different
-thread)doc";
+R"doc(Equivalent to write(), but executes asynchronously on a background
+writer thread
+
+The bitmap is not copied and must not be modified until the write has
+completed. At most write_queue_capacity() bitmaps are held by pending
+writes: when this limit is reached, the function blocks until a
+pending write completes. Writes to the same file complete in the order
+in which they were issued.
+
+Returns:
+    A future that becomes ready once the file has been written. Its
+    ``get()`` function rethrows the exception raised by the write, if
+    any (failures are also logged as warnings).)doc";
 
 static const char *__doc_mitsuba_Bitmap_write_jpeg = R"doc(Save a file using the JPEG file format)doc";
 
@@ -1101,8 +1202,24 @@ static const char *__doc_mitsuba_Bitmap_write_png = R"doc(Save a file using the
 
 static const char *__doc_mitsuba_Bitmap_write_ppm = R"doc(Save a file using the PPM file format)doc";
 
+static const char *__doc_mitsuba_Bitmap_write_queue_capacity =
+R"doc(Return the maximum number of bitmaps held by pending asynchronous writes)doc";
+
 static const char *__doc_mitsuba_Bitmap_write_rgbe = R"doc(Save a file using the RGBE file format)doc";
 
+static const char *__doc_mitsuba_Bitmap_write_thread_count = R"doc(Return the number of threads executing asynchronous writes)doc";
+
+static const char *__doc_mitsuba_BlockScheduling =
+R"doc(Strategy used by SamplingIntegrator::render() to distribute image blocks)doc";
+
+static const char *__doc_mitsuba_BlockScheduling_CostAware =
+R"doc(Estimate the cost of every block, split expensive blocks and render
+the most expensive work first)doc";
+
+static const char *__doc_mitsuba_BlockScheduling_Spiral =
+R"doc(Hand out fixed-size blocks following a spiral, one pass after the
+other (default))doc";
+
 static const char *__doc_mitsuba_BoundingBox =
 R"doc(Generic n-dimensional bounding box data structure
 
@@ -1910,6 +2027,12 @@ static const char *__doc_mitsuba_EOFException_m_gcount = R"doc()doc";
 
 static const char *__doc_mitsuba_Emitter = R"doc()doc";
 
+static const char *__doc_mitsuba_EmitterSamplingStrategy = R"doc(Strategy used by Scene::sample_emitter_direction() to pick an emitter)doc";
+
+static const char *__doc_mitsuba_EmitterSamplingStrategy_Power = R"doc(Select emitters proportionally to their estimated power)doc";
+
+static const char *__doc_mitsuba_EmitterSamplingStrategy_Uniform = R"doc(Select every emitter with the same probability (default))doc";
+
 static const char *__doc_mitsuba_Emitter_2 = R"doc()doc";
 
 static const char *__doc_mitsuba_Emitter_3 = R"doc()doc";
@@ -1944,6 +2067,19 @@ static const char *__doc_mitsuba_Emitter_is_environment = R"doc(Is this an envir
 
 static const char *__doc_mitsuba_Emitter_m_flags = R"doc(Combined flags for all properties of this emitter.)doc";
 
+static const char *__doc_mitsuba_Emitter_m_sampling_weight = R"doc(Relative emitter selection weight (assigned by the scene))doc";
+
+static const char *__doc_mitsuba_Emitter_power_estimate =
+R"doc(Return a rough estimate of the total power emitted into the scene
+
+This value is used by the scene's ``power`` emitter selection strategy
+(see Scene::sample_emitter_direction()) and does not need to be
+exact. Emitters that cannot provide an estimate return ``1``.)doc";
+
+static const char *__doc_mitsuba_Emitter_sampling_weight = R"doc(Relative weight used by the scene when selecting this emitter)doc";
+
+static const char *__doc_mitsuba_Emitter_set_sampling_weight = R"doc(Set the relative weight used by the scene when selecting this emitter)doc";
+
 static const char *__doc_mitsuba_Endpoint =
 R"doc(Endpoint: an abstract interface to light sources and sensors
 
@@ -2716,6 +2852,20 @@ static const char *__doc_mitsuba_ImageBlock_offset = R"doc(Return the current bl
 static const char *__doc_mitsuba_ImageBlock_put = R"doc(Accumulate another image block into this one)doc";
 
 static const char *__doc_mitsuba_ImageBlock_put_2 =
+R"doc(Accumulate the part of another image block that overlaps a horizontal
+band of this block
+
+Parameter ``row_begin``:
+    First row of the band, relative to the storage of this block (i.e.
+    row 0 is the first row of the top border)
+
+Parameter ``row_end``:
+    One past the last row of the band
+
+Callers that share a block between threads can use this function to
+only lock the band that is being modified.)doc";
+
+static const char *__doc_mitsuba_ImageBlock_put_3 =
 R"doc(Store a single sample / packets of samples inside the image block.
 
 \note This method is only valid if a reconstruction filter was given
@@ -2740,7 +2890,7 @@ Returns:
     negative. A warning is also printed if ``m_warn_negative`` or
     ``m_warn_invalid`` is enabled.)doc";
 
-static const char *__doc_mitsuba_ImageBlock_put_3 =
+static const char *__doc_mitsuba_ImageBlock_put_4 =
 R"doc(Store a single sample inside the block.
 
 \note This method is only valid if a reconstruction filter was
@@ -2819,6 +2969,13 @@ static const char *__doc_mitsuba_Integrator_class = R"doc()doc";
 
 static const char *__doc_mitsuba_Integrator_render = R"doc(Perform the main rendering job. Returns ``True`` upon success)doc";
 
+static const char *__doc_mitsuba_Integrator_render_sensors =
+R"doc(Render the scene from several sensors. Returns ``True`` upon success
+
+Each sensor renders into its own film. The default implementation
+renders the sensors one after the other using render() and stops at
+the first failure.)doc";
+
 static const char *__doc_mitsuba_Interaction = R"doc(Generic surface interaction data structure)doc";
 
 static const char *__doc_mitsuba_Interaction_Interaction = R"doc()doc";
@@ -3352,6 +3509,14 @@ static const char *__doc_mitsuba_MemoryMappedFile_data_2 = R"doc(Return a pointe
 
 static const char *__doc_mitsuba_MemoryMappedFile_filename = R"doc(Return the associated filename)doc";
 
+static const char *__doc_mitsuba_MemoryMappedFile_map_private =
+R"doc(Map the specified file into memory with copy-on-write semantics
+
+The mapped pages are shared with all other processes mapping the same
+file until they are modified, at which point the modified pages are
+privately copied. Changes are never written back to the file, and the
+mapping cannot be resized.)doc";
+
 static const char *__doc_mitsuba_MemoryMappedFile_resize =
 R"doc(Resize the memory-mapped file
 
@@ -3460,6 +3625,10 @@ static const char *__doc_mitsuba_Mesh_3 = R"doc()doc";
 
 static const char *__doc_mitsuba_Mesh_4 = R"doc()doc";
 
+static const char *__doc_mitsuba_Mesh_MMeshAttribute = R"doc(Mesh attribute record of the binary mesh format)doc";
+
+static const char *__doc_mitsuba_Mesh_MMeshHeader = R"doc(Header of the binary mesh format written by write_mmesh())doc";
+
 static const char *__doc_mitsuba_Mesh_Mesh = R"doc(Create a new mesh with the given vertex and face data structures)doc";
 
 static const char *__doc_mitsuba_Mesh_Mesh_2 = R"doc()doc";
@@ -3482,6 +3651,13 @@ static const char *__doc_mitsuba_Mesh_MeshAttribute_type = R"doc()doc";
 
 static const char *__doc_mitsuba_Mesh_add_attribute = R"doc(Add an attribute buffer with the given ``name`` and ``dim``)doc";
 
+static const char *__doc_mitsuba_Mesh_apply_lod =
+R"doc(Simplify the mesh (see simplify()), reusing a previously simplified
+version from the LOD cache directory when possible
+
+Meshes loaded from files are written to the directory specified via
+the ``lod_cache_dir`` parameter once simplified.)doc";
+
 static const char *__doc_mitsuba_Mesh_attribute_buffer = R"doc(Return the mesh attribute associated with ``name``)doc";
 
 static const char *__doc_mitsuba_Mesh_barycentric_coordinates = R"doc()doc";
@@ -3507,6 +3683,22 @@ since it uses a mutex.)doc";
 
 static const char *__doc_mitsuba_Mesh_class = R"doc()doc";
 
+static const char *__doc_mitsuba_Mesh_compress =
+R"doc(Convert the mesh to a compact, read-only representation
+
+Vertex positions are quantized to 21 bits per axis relative to the
+bounding box, normals are stored using a 2x16 bit octahedral encoding,
+and texture coordinates use 16 bits per component relative to their
+range. Face indices are stored in blocks of 32 triangles as 10 bit
+offsets from the smallest vertex index of the block, falling back to
+plain 32 bit indices for blocks with poor vertex locality.
+
+The full precision buffers are released afterwards, and the accessors
+(face_indices(), vertex_position(), etc.) decode the data on the fly.
+Custom mesh attributes are left untouched. Compression is only
+supported by the scalar and packet variants when Embree is disabled;
+the function logs a warning and returns otherwise.)doc";
+
 static const char *__doc_mitsuba_Mesh_compute_surface_interaction = R"doc()doc";
 
 static const char *__doc_mitsuba_Mesh_ensure_pmf_built = R"doc()doc";
@@ -3525,6 +3717,8 @@ static const char *__doc_mitsuba_Mesh_face_count = R"doc(Return the total number
 
 static const char *__doc_mitsuba_Mesh_face_data_bytes = R"doc()doc";
 
+static const char *__doc_mitsuba_Mesh_face_index_bytes = R"doc(Return the amount of memory used by the face indices)doc";
+
 static const char *__doc_mitsuba_Mesh_face_indices = R"doc(Returns the face indices associated with triangle ``index``)doc";
 
 static const char *__doc_mitsuba_Mesh_faces_buffer = R"doc(Return face indices buffer)doc";
@@ -3537,6 +3731,22 @@ static const char *__doc_mitsuba_Mesh_has_vertex_texcoords = R"doc(Does this mes
 
 static const char *__doc_mitsuba_Mesh_interpolate_attribute = R"doc()doc";
 
+static const char *__doc_mitsuba_Mesh_is_compressed = R"doc(Does this mesh use the compressed storage created by compress()?)doc";
+
+static const char *__doc_mitsuba_Mesh_load_lod =
+R"doc(Initialize the geometry of the mesh from the simplified version stored
+in the LOD cache directory
+
+Returns:
+    ``False`` when the directory does not contain such a file.)doc";
+
+static const char *__doc_mitsuba_Mesh_lod_auto =
+R"doc(Should the scene choose the level of detail of this mesh automatically?)doc";
+
+static const char *__doc_mitsuba_Mesh_lod_path =
+R"doc(Return the path of the simplified version of this mesh in the LOD
+cache directory)doc";
+
 static const char *__doc_mitsuba_Mesh_m_area_pmf = R"doc()doc";
 
 static const char *__doc_mitsuba_Mesh_m_bbox = R"doc()doc";
@@ -3565,6 +3775,8 @@ static const char *__doc_mitsuba_Mesh_m_vertex_positions_buf = R"doc()doc";
 
 static const char *__doc_mitsuba_Mesh_m_vertex_texcoords_buf = R"doc()doc";
 
+static const char *__doc_mitsuba_Mesh_memory_usage = R"doc(Return the total amount of memory used by the vertex and face data)doc";
+
 static const char *__doc_mitsuba_Mesh_parameters_changed = R"doc()doc";
 
 static const char *__doc_mitsuba_Mesh_parameters_grad_enabled = R"doc()doc";
@@ -3598,6 +3810,20 @@ static const char *__doc_mitsuba_Mesh_recompute_vertex_normals = R"doc(Compute s
 
 static const char *__doc_mitsuba_Mesh_sample_position = R"doc()doc";
 
+static const char *__doc_mitsuba_Mesh_simplify =
+R"doc(Simplify the mesh so that it has at most ``face_count`` faces
+
+The function contracts edges in the order given by a quadric error
+metric (Garland and Heckbert, "Surface Simplification Using Quadric
+Error Metrics", SIGGRAPH 1997), while preserving mesh boundaries and
+texture seams as much as possible. Vertex normals, texture coordinates
+and vertex attributes are interpolated, and face attributes are kept
+for the remaining faces. Simplification stops early when no further
+edge can be contracted without damaging the topology of the mesh.
+
+When the mesh is part of a scene, Scene::parameters_changed() must be
+called afterwards.)doc";
+
 static const char *__doc_mitsuba_Mesh_surface_area = R"doc()doc";
 
 static const char *__doc_mitsuba_Mesh_to_string = R"doc(Return a human-readable string representation of the shape contents.)doc";
@@ -3626,6 +3852,14 @@ static const char *__doc_mitsuba_Mesh_vertex_texcoords_buffer = R"doc(Return ver
 
 static const char *__doc_mitsuba_Mesh_vertex_texcoords_buffer_2 = R"doc(Const variant of vertex_texcoords_buffer.)doc";
 
+static const char *__doc_mitsuba_Mesh_write_mmesh =
+R"doc(Export mesh using Mitsuba's memory-mappable binary mesh format
+
+Vertex positions, normals, texture coordinates, face indices and mesh
+attributes are stored exactly as they are laid out in memory (using
+the byte order of the current machine), which allows the ``mmesh``
+shape plugin to map them into memory without any parsing or copying.)doc";
+
 static const char *__doc_mitsuba_Mesh_write_ply = R"doc(Export mesh as a binary PLY file)doc";
 
 static const char *__doc_mitsuba_MicrofacetDistribution =
@@ -4985,6 +5219,8 @@ R"doc(Advance to the next sample.
 A subsequent call to ``next_1d`` or ``next_2d`` will access the first
 1D or 2D components of this sample.)doc";
 
+static const char *__doc_mitsuba_Sampler_base_seed = R"doc(Return the base seed value from which all sequences are derived)doc";
+
 static const char *__doc_mitsuba_Sampler_class = R"doc()doc";
 
 static const char *__doc_mitsuba_Sampler_clone =
@@ -5049,6 +5285,18 @@ static const char *__doc_mitsuba_SamplingIntegrator_3 = R"doc()doc";
 
 static const char *__doc_mitsuba_SamplingIntegrator_4 = R"doc()doc";
 
+static const char *__doc_mitsuba_SamplingIntegrator_PixelStatistics = R"doc(Running luminance statistics of a pixel (Welford's algorithm))doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_PixelStatistics_converged = R"doc()doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_PixelStatistics_m2 = R"doc()doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_PixelStatistics_mean = R"doc()doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_PixelStatistics_put = R"doc()doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_PixelStatistics_sample_count = R"doc()doc";
+
 static const char *__doc_mitsuba_SamplingIntegrator_SamplingIntegrator = R"doc(//! @})doc";
 
 static const char *__doc_mitsuba_SamplingIntegrator_aov_names =
@@ -5060,12 +5308,55 @@ static const char *__doc_mitsuba_SamplingIntegrator_cancel = R"doc()doc";
 
 static const char *__doc_mitsuba_SamplingIntegrator_class = R"doc()doc";
 
+static const char *__doc_mitsuba_SamplingIntegrator_m_adaptive_max_samples =
+R"doc(Minimum and maximum number of samples per pixel when sampling adaptively)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_m_adaptive_min_samples =
+R"doc(Minimum and maximum number of samples per pixel when sampling adaptively)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_m_adaptive_threshold =
+R"doc(Target relative standard error of the pixel luminance
+
+Pixels whose estimate falls below this threshold stop receiving
+samples, and the saved budget is spent on the remaining pixels.
+Adaptive sampling is disabled when this value is not positive.)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_m_block_scheduling = R"doc(Strategy used to distribute image blocks over the worker threads)doc";
+
 static const char *__doc_mitsuba_SamplingIntegrator_m_block_size = R"doc(Size of (square) image blocks to render per core.)doc";
 
+static const char *__doc_mitsuba_SamplingIntegrator_m_block_split_depth =
+R"doc(Maximum number of times that a block can be split into quadrants
+
+Blocks are always seeded in units of <tt>4^m_block_split_depth</tt>
+quadrants in vectorized variants, which keeps the sample generation
+independent of the actual decomposition. Zero unless the cost-aware
+scheduler is used.)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_m_checkpoint_file = R"doc(Checkpoint file (empty if checkpointing is disabled))doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_m_checkpoint_interval = R"doc(Minimum time between two checkpoints in seconds)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_m_checkpoint_resume = R"doc(Continue from an existing checkpoint file)doc";
+
 static const char *__doc_mitsuba_SamplingIntegrator_m_hide_emitters = R"doc(Flag for disabling direct visibility of emitters)doc";
 
+static const char *__doc_mitsuba_SamplingIntegrator_m_pixel_statistics =
+R"doc(Per-pixel statistics of an ongoing adaptive render (scalar variants
+only))doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_m_preview_file = R"doc(Preview image of a progressive render (empty if previews are disabled))doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_m_preview_interval = R"doc(Time between two previews in seconds)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_m_preview_passes = R"doc(Number of passes between two previews)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_m_progressive = R"doc(Render in passes of doubling sample counts (see render_progressive()))doc";
+
 static const char *__doc_mitsuba_SamplingIntegrator_m_render_timer = R"doc(Timer used to enforce the timeout.)doc";
 
+static const char *__doc_mitsuba_SamplingIntegrator_m_sample_count_aov = R"doc(Write the number of samples per pixel into an additional film channel)doc";
+
 static const char *__doc_mitsuba_SamplingIntegrator_m_samples_per_pass =
 R"doc(Number of samples to compute for each pass over the image blocks.
 
@@ -5079,12 +5370,48 @@ R"doc(Maximum amount of time to spend rendering (excluding scene parsing).
 
 Specified in seconds. A negative values indicates no timeout.)doc";
 
+static const char *__doc_mitsuba_SamplingIntegrator_read_checkpoint =
+R"doc(Restore the film from m_checkpoint_file and return the number of
+completed passes)doc";
+
 static const char *__doc_mitsuba_SamplingIntegrator_render = R"doc(//! @{ \name Integrator interface implementation)doc";
 
-static const char *__doc_mitsuba_SamplingIntegrator_render_block = R"doc()doc";
+static const char *__doc_mitsuba_SamplingIntegrator_render_adaptive =
+R"doc(Render on the CPU, allocating samples adaptively based on per-pixel
+variance)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_render_block =
+R"doc(Render the pixels of a single image block
+
+Pixels are visited in Morton order relative to the block of size
+m_block_size that is identified by ``block_id``. The range
+<tt>[morton_begin, morton_end)</tt> selects an aligned quadrant of that
+block, in which case ``block`` must have been positioned at the
+quadrant's origin. Per-pixel seeds only depend on ``block_id`` and the
+Morton index, so splitting a block does not change the rendered image.)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_render_checkpointed = R"doc(Render on the CPU pass by pass, periodically writing checkpoints)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_render_cost_aware = R"doc(Render on the CPU using the BlockScheduling::CostAware scheduler)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_render_progressive =
+R"doc(Render on the CPU in passes of doubling sample counts
+
+The first pass renders ``samples_per_pass`` samples per pixel, and
+every following pass as many samples as all previous passes combined,
+until ``total_spp`` samples have been taken.)doc";
 
 static const char *__doc_mitsuba_SamplingIntegrator_render_sample = R"doc()doc";
 
+static const char *__doc_mitsuba_SamplingIntegrator_render_sensors =
+R"doc(Render the scene from several sensors
+
+On the CPU, the image blocks of all sensors are rendered by a single
+parallel loop, so that threads move on to the next sensor instead of
+waiting for the last blocks of the previous one. Adaptive sampling,
+checkpoints, progressive rendering and the cost-aware scheduler fall
+back to rendering the sensors one after the other.)doc";
+
 static const char *__doc_mitsuba_SamplingIntegrator_sample =
 R"doc(Sample the incident radiance along a ray.
 
@@ -5126,6 +5453,48 @@ Remark:
     mask, aov) = integrator.sample(scene, sampler, ray, medium,
     active) ``)doc";
 
+static const char *__doc_mitsuba_SamplingIntegrator_set_checkpoint =
+R"doc(Periodically save the state of the render to a checkpoint file
+
+Checkpoints store the raw film contents together with the number of
+completed passes (see ``samples_per_pass``). They are written between
+passes once ``interval`` seconds have elapsed since the previous one
+(after every pass if ``interval`` is zero), and when the render is
+cancelled or times out. The blocks of each pass are accumulated in a
+fixed order, so that a render resumed from a checkpoint is
+bit-identical to an uninterrupted one. The checkpoint file is removed
+once rendering completes. Only supported on the CPU.
+
+Parameter ``filename``:
+    Path of the checkpoint file. An empty path disables checkpointing.
+
+Parameter ``interval``:
+    Minimum time between two checkpoints in seconds
+
+Parameter ``resume``:
+    Continue from the checkpoint file if it exists)doc";
+
+static const char *__doc_mitsuba_SamplingIntegrator_set_preview =
+R"doc(Periodically write previews of a progressive render to disk
+
+Enables progressive rendering (see the ``progressive`` parameter). A
+background thread develops the film once ``interval`` seconds have
+elapsed since the previous preview or once ``passes`` further passes
+have completed, whichever happens first, and writes it using
+Bitmap::write_async(). The worker threads are never interrupted, hence
+a preview may combine pixels of two consecutive passes. Only supported
+on the CPU.
+
+Parameter ``filename``:
+    Path of the preview image. An empty path disables previews.
+
+Parameter ``interval``:
+    Time between two previews in seconds (zero: no time limit)
+
+Parameter ``passes``:
+    Number of passes between two previews (zero: no pass limit). When
+    both limits are zero, a preview is written after every pass.)doc";
+
 static const char *__doc_mitsuba_SamplingIntegrator_should_stop =
 R"doc(Indicates whether cancel() or a timeout have occured. Should be
 checked regularly in the integrator's main loop so that timeouts are
@@ -5134,6 +5503,8 @@ enforced accurately.
 Note that accurate timeouts rely on m_render_timer, which needs to be
 reset at the beginning of the rendering phase.)doc";
 
+static const char *__doc_mitsuba_SamplingIntegrator_write_checkpoint = R"doc(Save the film after ``passes`` completed passes to m_checkpoint_file)doc";
+
 static const char *__doc_mitsuba_Scene = R"doc()doc";
 
 static const char *__doc_mitsuba_Scene_2 = R"doc()doc";
@@ -5154,10 +5525,17 @@ static const char *__doc_mitsuba_Scene_accel_release_cpu = R"doc(Release the ray
 
 static const char *__doc_mitsuba_Scene_accel_release_gpu = R"doc()doc";
 
+static const char *__doc_mitsuba_Scene_apply_auto_lod =
+R"doc(Simplify the meshes that request an automatic level of detail based
+on their projected size)doc";
+
 static const char *__doc_mitsuba_Scene_bbox = R"doc(Return a bounding box surrounding the scene)doc";
 
 static const char *__doc_mitsuba_Scene_class = R"doc()doc";
 
+static const char *__doc_mitsuba_Scene_emitter_sampling =
+R"doc(Return the strategy used to select emitters for direct illumination sampling)doc";
+
 static const char *__doc_mitsuba_Scene_emitters = R"doc(Return the list of emitters)doc";
 
 static const char *__doc_mitsuba_Scene_emitters_2 = R"doc(Return the list of emitters (const version))doc";
@@ -5174,6 +5552,10 @@ static const char *__doc_mitsuba_Scene_m_bbox = R"doc()doc";
 
 static const char *__doc_mitsuba_Scene_m_children = R"doc()doc";
 
+static const char *__doc_mitsuba_Scene_m_emitter_distr = R"doc()doc";
+
+static const char *__doc_mitsuba_Scene_m_emitter_sampling = R"doc()doc";
+
 static const char *__doc_mitsuba_Scene_m_emitters = R"doc()doc";
 
 static const char *__doc_mitsuba_Scene_m_environment = R"doc()doc";
@@ -5294,6 +5676,10 @@ static const char *__doc_mitsuba_Scene_to_string = R"doc(Return a human-readable
 
 static const char *__doc_mitsuba_Scene_traverse = R"doc(Perform a custom traversal over the scene graph)doc";
 
+static const char *__doc_mitsuba_Scene_update_emitter_sampling_distribution =
+R"doc((Re-)build the emitter selection distribution from the emitters' power
+estimates)doc";
+
 static const char *__doc_mitsuba_ScopedPhase = R"doc()doc";
 
 static const char *__doc_mitsuba_ScopedPhase_ScopedPhase = R"doc()doc";
@@ -5420,6 +5806,74 @@ This class provides core functionality for sampling positions on
 surfaces, computing ray intersections, and bounding shapes within ray
 intersection acceleration data structures.)doc";
 
+static const char *__doc_mitsuba_ShapeBVH =
+R"doc(Bounding volume hierarchy with SIMD-wide nodes
+
+This class provides an alternative to ShapeKDTree for the native CPU
+ray tracer, which is selected by setting the ``accel`` property of the
+scene to ``"bvh"``. Every node stores the bounding boxes of its (up to)
+MTS_BVH_WIDTH children in a structure-of-arrays layout, so that a
+single traversal step tests a ray against all of them using SIMD
+instructions. Leaves directly reference (shape, primitive) pairs, which
+avoids the search through the primitive map done by the kd-tree.
+
+The hierarchy is built top-down using the binned surface area
+heuristic. Wide nodes are formed by repeatedly splitting the child with
+the largest surface area until the node is full. Large subtrees are
+built in parallel using TBB.
+
+The following scene properties control the construction:
+
+- ``bvh_intersection_cost``: relative cost of a primitive intersection
+(default: 1)
+
+- ``bvh_traversal_cost``: relative cost of a node traversal step
+(default: 1)
+
+- ``bvh_max_leaf_size``: leaves with more primitives are always split
+(default: 8)
+
+- ``bvh_bins``: number of bins per axis used to evaluate the SAH
+(default: 16)
+
+- ``bvh_rebuild_threshold``: see update() (default: 1.5))doc";
+
+static const char *__doc_mitsuba_ShapeBVH_ShapeBVH = R"doc(Create an empty BVH and take build-related parameters from ``props``.)doc";
+
+static const char *__doc_mitsuba_ShapeBVH_add_shape = R"doc(Register a new shape with the BVH (to be called before build()))doc";
+
+static const char *__doc_mitsuba_ShapeBVH_bbox = R"doc(Return the bounding box of the entire hierarchy)doc";
+
+static const char *__doc_mitsuba_ShapeBVH_build = R"doc(Build the BVH)doc";
+
+static const char *__doc_mitsuba_ShapeBVH_class = R"doc()doc";
+
+static const char *__doc_mitsuba_ShapeBVH_memory_usage =
+R"doc(Return the memory used by the nodes and primitive references (in bytes))doc";
+
+static const char *__doc_mitsuba_ShapeBVH_node_count = R"doc(Return the number of nodes)doc";
+
+static const char *__doc_mitsuba_ShapeBVH_primitive_count = R"doc(Return the number of registered primitives)doc";
+
+static const char *__doc_mitsuba_ShapeBVH_shape = R"doc(Return the i-th shape (const version))doc";
+
+static const char *__doc_mitsuba_ShapeBVH_shape_2 = R"doc(Return the i-th shape)doc";
+
+static const char *__doc_mitsuba_ShapeBVH_shape_count = R"doc(Return the number of registered shapes)doc";
+
+static const char *__doc_mitsuba_ShapeBVH_to_string = R"doc(Return a human-readable string representation of the scene contents.)doc";
+
+static const char *__doc_mitsuba_ShapeBVH_update =
+R"doc(Update the BVH following changes to the geometry of ``shapes``
+
+The bounding boxes of the existing hierarchy are refitted to the new
+geometry. When the SAH cost of the refitted hierarchy exceeds the cost
+after the last full build by more than the factor given by the
+``bvh_rebuild_threshold`` property, the BVH is rebuilt from scratch
+instead.)doc";
+
+static const char *__doc_mitsuba_ShapeKDTree_memory_usage = R"doc(Return the memory used by the nodes and primitive indices (in bytes))doc";
+
 static const char *__doc_mitsuba_Shape_2 = R"doc()doc";
 
 static const char *__doc_mitsuba_Shape_3 = R"doc()doc";
@@ -7014,6 +7468,59 @@ The spectrum can be evaluated at arbitrary (continuous) wavelengths,
 though the underlying function it is not required to be smooth or even
 continuous.)doc";
 
+static const char *__doc_mitsuba_TextureCache =
+R"doc(Process-wide cache of tiles of TiledImage instances
+
+Texture plugins can use this cache to render with textures that are
+much larger than the available memory: tiles are loaded when they are
+first accessed, and the least recently used tiles are evicted when the
+memory budget (see set_capacity()) is exceeded. The cache is split into
+independently locked shards, and each thread additionally keeps a small
+table of the tiles it accessed most recently, which serves most lookups
+without any locking.
+
+Tiles referenced by the per-thread tables stay alive until the tables
+are updated, hence the actual memory usage can exceed the capacity by a
+few tiles per thread.)doc";
+
+static const char *__doc_mitsuba_TextureCache_Statistics = R"doc(Usage statistics of the texture cache)doc";
+
+static const char *__doc_mitsuba_TextureCache_Statistics_capacity = R"doc(Capacity of the cache (in bytes))doc";
+
+static const char *__doc_mitsuba_TextureCache_Statistics_evictions = R"doc(Number of tiles that were evicted to respect the capacity)doc";
+
+static const char *__doc_mitsuba_TextureCache_Statistics_hits = R"doc(Number of lookups that found the tile in the shared cache)doc";
+
+static const char *__doc_mitsuba_TextureCache_Statistics_misses = R"doc(Number of lookups that loaded the tile from disk)doc";
+
+static const char *__doc_mitsuba_TextureCache_Statistics_size = R"doc(Memory usage of the tiles currently in the cache (in bytes))doc";
+
+static const char *__doc_mitsuba_TextureCache_Statistics_tiles = R"doc(Number of tiles currently in the cache)doc";
+
+static const char *__doc_mitsuba_TextureCache_capacity = R"doc(Return the capacity of the cache in bytes (default: 1 GiB))doc";
+
+static const char *__doc_mitsuba_TextureCache_fetch =
+R"doc(Copy the texel at integer position (``x``, ``y``) of a level of the
+image to ``value`` (which must hold ``image->channel_count()`` values)
+
+The position must lie within the level.)doc";
+
+static const char *__doc_mitsuba_TextureCache_purge = R"doc(Remove all tiles from the cache)doc";
+
+static const char *__doc_mitsuba_TextureCache_release = R"doc(Remove all tiles of the given image from the cache)doc";
+
+static const char *__doc_mitsuba_TextureCache_set_capacity = R"doc(Set the capacity of the cache in bytes)doc";
+
+static const char *__doc_mitsuba_TextureCache_static_shutdown = R"doc(Release all tiles (must be called before unloading plugin libraries))doc";
+
+static const char *__doc_mitsuba_TextureCache_statistics = R"doc(Return usage statistics of the cache)doc";
+
+static const char *__doc_mitsuba_TextureCache_tile =
+R"doc(Return the data of a tile, loading it if necessary
+
+The returned tile keeps its data alive even if it is evicted from the
+cache in the meantime.)doc";
+
 static const char *__doc_mitsuba_Texture_2 = R"doc()doc";
 
 static const char *__doc_mitsuba_Texture_3 = R"doc()doc";
@@ -7090,6 +7597,10 @@ default implementation throws an exception.
 Even if the operation is provided, it may only return an
 approximation.)doc";
 
+static const char *__doc_mitsuba_Texture_needs_differentials =
+R"doc(Does the texture require texture-space differentials (<tt>si.duv_dx</tt>
+and <tt>si.duv_dy</tt>) to filter its lookups?)doc";
+
 static const char *__doc_mitsuba_Texture_pdf_position = R"doc(Returns the probability per unit area of sample_position())doc";
 
 static const char *__doc_mitsuba_Texture_pdf_spectrum =
@@ -7364,6 +7875,92 @@ static const char *__doc_mitsuba_Thread_unregister_external_thread = R"doc(Unreg
 
 static const char *__doc_mitsuba_Thread_yield = R"doc(Yield to another processor)doc";
 
+static const char *__doc_mitsuba_TiledImage =
+R"doc(Image stored as a tiled MIP map pyramid in Mitsuba's binary tiled
+texture format
+
+The file contains all levels of the pyramid (in linear single precision
+floating point) split into square tiles of a fixed size, which are laid
+out contiguously in memory so that individual tiles can be paged in on
+demand. The file is memory-mapped and tiles are only accessed through
+the TextureCache, which bounds the memory used by the decoded tiles.
+
+Files are written using the byte order of the current machine and can
+only be loaded on machines with the same byte order.)doc";
+
+static const char *__doc_mitsuba_TiledImage_TiledImage = R"doc(Open a tiled image file)doc";
+
+static const char *__doc_mitsuba_TiledImage_boundary_condition = R"doc(Return the boundary condition that was used to build the pyramid)doc";
+
+static const char *__doc_mitsuba_TiledImage_channel_count = R"doc(Return the number of channels)doc";
+
+static const char *__doc_mitsuba_TiledImage_compute_source_hash =
+R"doc(Compute the hash that identifies the contents of the image file
+``source`` converted with the given ``raw`` setting)doc";
+
+static const char *__doc_mitsuba_TiledImage_convert =
+R"doc(Convert an image file (e.g. PNG, JPEG, or OpenEXR) into a tiled
+image file tagged with the hash of its source
+
+The target file is replaced atomically, hence concurrent renders never
+observe partially written files.
+
+Parameter ``raw``:
+    Disables the linearization of sRGB-encoded images (e.g. for normal
+    maps))doc";
+
+static const char *__doc_mitsuba_TiledImage_converted_path =
+R"doc(Return the default path of the converted version of an image file,
+which is picked up by the ``bitmap`` texture (the source path with an
+additional ``.mtt`` extension))doc";
+
+static const char *__doc_mitsuba_TiledImage_filename = R"doc(Return the file name of the image)doc";
+
+static const char *__doc_mitsuba_TiledImage_id =
+R"doc(Return a process-wide unique identifier of the image (used by
+TextureCache))doc";
+
+static const char *__doc_mitsuba_TiledImage_is_tiled_image = R"doc(Check whether the given file starts with the header of a tiled image)doc";
+
+static const char *__doc_mitsuba_TiledImage_level_count = R"doc(Return the number of levels of the pyramid)doc";
+
+static const char *__doc_mitsuba_TiledImage_pixel_format =
+R"doc(Return the pixel format (Bitmap::PixelFormat::Y or
+Bitmap::PixelFormat::RGB))doc";
+
+static const char *__doc_mitsuba_TiledImage_read_level = R"doc(Read and convert a complete level of the pyramid)doc";
+
+static const char *__doc_mitsuba_TiledImage_read_tile =
+R"doc(Read and convert the tile at position (``x``, ``y``) of a level into
+``data``, which must hold <tt>tile_size()^2 * channel_count()</tt>
+values)doc";
+
+static const char *__doc_mitsuba_TiledImage_resolution = R"doc(Return the resolution of a level of the pyramid)doc";
+
+static const char *__doc_mitsuba_TiledImage_source_hash = R"doc(Return the hash of the source of the image (zero if unknown))doc";
+
+static const char *__doc_mitsuba_TiledImage_tile_bytes = R"doc(Return the size of the decoded tiles in bytes)doc";
+
+static const char *__doc_mitsuba_TiledImage_tile_size = R"doc(Return the width and height of the tiles)doc";
+
+static const char *__doc_mitsuba_TiledImage_write =
+R"doc(Write ``bitmap`` as a tiled MIP map pyramid
+
+The bitmap is converted into a linear single precision representation
+with one (luminance) or three (RGB) channels, and the levels of the
+pyramid are built by repeatedly halving the resolution using a box
+filter.
+
+Parameter ``tile_size``:
+    Width and height of the tiles in pixels
+
+Parameter ``bc``:
+    Boundary condition of the box filter, which should match the wrap
+    mode of the textures using the file
+
+Parameter ``source_hash``:
+    Identifies the source of the image (see compute_source_hash()))doc";
+
 static const char *__doc_mitsuba_Timer = R"doc()doc";
 
 static const char *__doc_mitsuba_Timer_Timer = R"doc()doc";
@@ -7919,6 +8516,11 @@ static const char *__doc_mitsuba_filesystem_is_regular_file =
 R"doc(Checks if ``p`` points to a regular file, as opposed to a directory or
 symlink.)doc";
 
+static const char *__doc_mitsuba_filesystem_last_write_time =
+R"doc(Returns the time of the last modification of the file system object
+at ``p``, in nanoseconds since the Unix epoch. The resolution of the
+returned value depends on the platform and file system.)doc";
+
 static const char *__doc_mitsuba_filesystem_path =
 R"doc(Represents a path to a filesystem resource. On construction, the path
 is parsed and stored in a system-agnostic representation. The path can
@@ -449,6 +449,13 @@ protected:
     BSDF(const Properties &props);
     virtual ~BSDF();
 
+    /**
+     * \brief Return \ref BSDFFlags::NeedsDifferentials if one of the textures
+     * or nested BSDFs passed via \c props requires texture-space
+     * differentials, and zero otherwise
+     */
+    static uint32_t differential_flags(const Properties &props);
+
 protected:
     /// Combined flags for all components of this BSDF.
     uint32_t m_flags;
@@ -0,0 +1,468 @@
+#pragma once
+
+#include <mitsuba/core/bbox.h>
+#include <mitsuba/core/object.h>
+#include <mitsuba/core/ray.h>
+#include <mitsuba/render/interaction.h>
+#include <mitsuba/render/mesh.h>
+#include <mitsuba/render/shape.h>
+#include <memory>
+
+/// Branching factor of the nodes of a \ref ShapeBVH
+#define MTS_BVH_WIDTH 4
+
+/// Maximum depth of a \ref ShapeBVH
+#define MTS_BVH_MAXDEPTH 64
+
+/// Size of the traversal stack (enough for the siblings postponed on every level)
+#define MTS_BVH_STACK_SIZE ((MTS_BVH_WIDTH - 1) * MTS_BVH_MAXDEPTH + 1)
+
+NAMESPACE_BEGIN(mitsuba)
+
+/**
+ * \brief Bounding volume hierarchy with SIMD-wide nodes
+ *
+ * This class provides an alternative to \ref ShapeKDTree for the native CPU
+ * ray tracer, which is selected by setting the \c accel property of the
+ * scene to \c "bvh". Every node stores the bounding boxes of its (up to)
+ * \ref MTS_BVH_WIDTH children in a structure-of-arrays layout, so that a
+ * single traversal step tests a ray against all of them using SIMD
+ * instructions. Leaves directly reference (shape, primitive) pairs, which
+ * avoids the search through the primitive map done by the kd-tree.
+ *
+ * The hierarchy is built top-down using the binned surface area heuristic.
+ * Wide nodes are formed by repeatedly splitting the child with the largest
+ * surface area until the node is full. Large subtrees are built in parallel
+ * using TBB.
+ *
+ * The following scene properties control the construction:
+ *
+ * - \c bvh_intersection_cost: relative cost of a primitive intersection
+ *   (default: 1)
+ * - \c bvh_traversal_cost: relative cost of a node traversal step
+ *   (default: 1)
+ * - \c bvh_max_leaf_size: leaves with more primitives are always split
+ *   (default: 8)
+ * - \c bvh_bins: number of bins per axis used to evaluate the SAH
+ *   (default: 16)
+ * - \c bvh_rebuild_threshold: see \ref update() (default: 1.5)
+ */
+template <typename Float, typename Spectrum>
+class MTS_EXPORT_RENDER ShapeBVH : public Object {
+public:
+    MTS_IMPORT_TYPES(Shape, Mesh)
+
+    using Size  = uint32_t;
+    using Index = uint32_t;
+
+    /// Reference to a primitive stored in a leaf
+    struct BVHPrimitive {
+        Index shape;
+        Index prim;
+    };
+
+    /**
+     * \brief Wide BVH node
+     *
+     * A child slot either references another node (<tt>count == 0</tt>),
+     * a range of primitives (<tt>count > 0</tt>), or is empty (in which
+     * case it has an invalid bounding box and is never entered).
+     */
+    struct alignas(16) BVHNode {
+        /// Bounding boxes of the children, indexed by [axis][child]
+        ScalarFloat bbox_min[3][MTS_BVH_WIDTH];
+        ScalarFloat bbox_max[3][MTS_BVH_WIDTH];
+        /// Index of a child node, or offset of the first primitive of a leaf
+        Index child[MTS_BVH_WIDTH];
+        /// Number of primitives of leaf children (zero for inner nodes)
+        Size count[MTS_BVH_WIDTH];
+
+        /// Return the bounding box of the given child
+        ScalarBoundingBox3f child_bbox(size_t i) const {
+            return ScalarBoundingBox3f(
+                ScalarPoint3f(bbox_min[0][i], bbox_min[1][i], bbox_min[2][i]),
+                ScalarPoint3f(bbox_max[0][i], bbox_max[1][i], bbox_max[2][i]));
+        }
+
+        /// Set the bounding box of the given child
+        void set_child_bbox(size_t i, const ScalarBoundingBox3f &bbox) {
+            for (size_t k = 0; k < 3; ++k) {
+                bbox_min[k][i] = bbox.min[k];
+                bbox_max[k][i] = bbox.max[k];
+            }
+        }
+    };
+
+    /// Create an empty BVH and take build-related parameters from \c props.
+    ShapeBVH(const Properties &props);
+
+    /// Register a new shape with the BVH (to be called before \ref build())
+    void add_shape(Shape *shape);
+
+    /// Build the BVH
+    void build();
+
+    /**
+     * \brief Update the BVH following changes to the geometry of \c shapes
+     *
+     * The bounding boxes of the existing hierarchy are refitted to the new
+     * geometry. When the SAH cost of the refitted hierarchy exceeds the cost
+     * after the last full build by more than the factor given by the \c
+     * bvh_rebuild_threshold property, the BVH is rebuilt from scratch instead.
+     */
+    void update(const std::vector<Shape *> &shapes);
+
+    /// Return the number of registered shapes
+    Size shape_count() const { return Size(m_shapes.size()); }
+
+    /// Return the number of registered primitives
+    Size primitive_count() const { return m_primitive_count; }
+
+    /// Return the number of nodes
+    Size node_count() const { return m_node_count; }
+
+    /// Return the memory used by the nodes and primitive references (in bytes)
+    size_t memory_usage() const {
+        return m_node_count * sizeof(BVHNode) + m_primitive_count * sizeof(BVHPrimitive);
+    }
+
+    /// Return the i-th shape (const version)
+    const Shape *shape(size_t i) const { Assert(i < m_shapes.size()); return m_shapes[i]; }
+
+    /// Return the i-th shape
+    Shape *shape(size_t i) { Assert(i < m_shapes.size()); return m_shapes[i]; }
+
+    /// Return the bounding box of the entire hierarchy
+    const ScalarBoundingBox3f &bbox() const { return m_bbox; }
+
+    template <bool ShadowRay>
+    MTS_INLINE PreliminaryIntersection3f ray_intersect_preliminary(const Ray3f &ray,
+                                                                   Mask active) const {
+        ENOKI_MARK_USED(active);
+        if constexpr (!is_array_v<Float>)
+            return ray_intersect_scalar<ShadowRay>(ray);
+        else
+            return ray_intersect_packet<ShadowRay>(ray, active);
+    }
+
+    template <bool ShadowRay>
+    MTS_INLINE PreliminaryIntersection3f ray_intersect_scalar(Ray3f ray) const {
+        using FloatW = Array<ScalarFloat, MTS_BVH_WIDTH>;
+
+        /// Ray traversal stack entry
+        struct BVHStackEntry {
+            // Distance along the ray to the entry point of the node
+            Float mint;
+            // Index of the node
+            Index node;
+        };
+
+        // Allocate the node stack
+        BVHStackEntry stack[MTS_BVH_STACK_SIZE];
+        int32_t stack_index = 0;
+
+        // Resulting intersection struct
+        PreliminaryIntersection3f pi;
+
+        if (unlikely(m_node_count == 0))
+            return pi;
+
+        /* Precompute the slab test. The near and far planes of each
+           child box only depend on the signs of the ray direction */
+        Vector3f d_rcp = slab_rcp(ray.d);
+        FloatW o_x(ray.o.x()), o_y(ray.o.y()), o_z(ray.o.z()),
+               r_x(d_rcp.x()), r_y(d_rcp.y()), r_z(d_rcp.z());
+        bool neg_x = d_rcp.x() < 0.f,
+             neg_y = d_rcp.y() < 0.f,
+             neg_z = d_rcp.z() < 0.f;
+
+        stack[stack_index++] = { ray.mint, 0 };
+
+        while (likely(stack_index > 0)) {
+            const BVHStackEntry &entry = stack[--stack_index];
+            if (entry.mint > ray.maxt)
+                continue;
+
+            const BVHNode &node = m_nodes[entry.node];
+
+            FloatW near_x = load_unaligned<FloatW>(neg_x ? node.bbox_max[0] : node.bbox_min[0]),
+                   near_y = load_unaligned<FloatW>(neg_y ? node.bbox_max[1] : node.bbox_min[1]),
+                   near_z = load_unaligned<FloatW>(neg_z ? node.bbox_max[2] : node.bbox_min[2]),
+                   far_x  = load_unaligned<FloatW>(neg_x ? node.bbox_min[0] : node.bbox_max[0]),
+                   far_y  = load_unaligned<FloatW>(neg_y ? node.bbox_min[1] : node.bbox_max[1]),
+                   far_z  = load_unaligned<FloatW>(neg_z ? node.bbox_min[2] : node.bbox_max[2]);
+
+            FloatW t_near = max(max((near_x - o_x) * r_x, (near_y - o_y) * r_y),
+                                max((near_z - o_z) * r_z, FloatW(ray.mint))),
+                   t_far  = min(min((far_x - o_x) * r_x, (far_y - o_y) * r_y),
+                                (far_z - o_z) * r_z) * SlabScale;
+            t_far = min(t_far, FloatW(ray.maxt));
+
+            ScalarFloat t_near_s[MTS_BVH_WIDTH], t_far_s[MTS_BVH_WIDTH];
+            store_unaligned(t_near_s, t_near);
+            store_unaligned(t_far_s, t_far);
+
+            // Inner nodes that must be visited, sorted by increasing distance
+            BVHStackEntry next[MTS_BVH_WIDTH];
+            size_t next_count = 0;
+
+            for (size_t i = 0; i < MTS_BVH_WIDTH; ++i) {
+                if (!(t_near_s[i] <= t_far_s[i]))
+                    continue;
+
+                if (node.count[i] == 0) {
+                    size_t j = next_count++;
+                    for (; j > 0 && next[j - 1].mint > t_near_s[i]; --j)
+                        next[j] = next[j - 1];
+                    next[j] = { t_near_s[i], node.child[i] };
+                    continue;
+                }
+
+                // Arrived at a leaf
+                Index prim_start = node.child[i],
+                      prim_end   = prim_start + node.count[i];
+                for (Index k = prim_start; k < prim_end; ++k) {
+                    PreliminaryIntersection3f prim_pi =
+                        intersect_prim<ShadowRay>(m_prims[k], ray, true);
+
+                    if (unlikely(prim_pi.is_valid())) {
+                        if constexpr (ShadowRay)
+                            return prim_pi;
+
+                        Assert(prim_pi.t >= ray.mint && prim_pi.t <= ray.maxt);
+                        pi = prim_pi;
+                        ray.maxt = pi.t;
+                    }
+                }
+            }
+
+            // Push the farthest node first so that the nearest is visited next
+            for (size_t j = next_count; j > 0; --j)
+                stack[stack_index++] = next[j - 1];
+        }
+
+        return pi;
+    }
+
+    template <bool ShadowRay>
+    MTS_INLINE PreliminaryIntersection3f ray_intersect_packet(Ray3f ray,
+                                                              Mask active) const {
+        /// Ray traversal stack entry
+        struct BVHStackEntry {
+            // Distance along the rays to the entry point of the node
+            Float mint;
+            // Is the corresponding SIMD lane enabled?
+            Mask active;
+            // Index of the node
+            Index node;
+        };
+
+        // Allocate the node stack
+        BVHStackEntry stack[MTS_BVH_STACK_SIZE];
+        int32_t stack_index = 0;
+
+        // Resulting intersection struct
+        PreliminaryIntersection3f pi;
+
+        if (unlikely(m_node_count == 0))
+            return pi;
+
+        Vector3f d_rcp = slab_rcp(ray.d);
+
+        stack[stack_index++] = { ray.mint, active, 0 };
+
+        while (likely(stack_index > 0)) {
+            BVHStackEntry &entry = stack[--stack_index];
+            active = entry.active && entry.mint <= ray.maxt;
+            if constexpr (ShadowRay)
+                active &= !pi.is_valid();
+
+            if (unlikely(none(active)))
+                continue;
+
+            const BVHNode &node = m_nodes[entry.node];
+
+            // Inner nodes that must be visited, sorted by increasing distance
+            BVHStackEntry next[MTS_BVH_WIDTH];
+            ScalarFloat next_key[MTS_BVH_WIDTH];
+            size_t next_count = 0;
+
+            for (size_t i = 0; i < MTS_BVH_WIDTH; ++i) {
+                if (node.count[i] == 0 && node.child[i] == InvalidIndex)
+                    continue;
+
+                Float t0_x = (node.bbox_min[0][i] - ray.o.x()) * d_rcp.x(),
+                      t0_y = (node.bbox_min[1][i] - ray.o.y()) * d_rcp.y(),
+                      t0_z = (node.bbox_min[2][i] - ray.o.z()) * d_rcp.z(),
+                      t1_x = (node.bbox_max[0][i] - ray.o.x()) * d_rcp.x(),
+                      t1_y = (node.bbox_max[1][i] - ray.o.y()) * d_rcp.y(),
+                      t1_z = (node.bbox_max[2][i] - ray.o.z()) * d_rcp.z();
+
+                Float t_near = max(max(min(t0_x, t1_x), min(t0_y, t1_y)),
+                                   max(min(t0_z, t1_z), ray.mint)),
+                      t_far  = min(min(max(t0_x, t1_x), max(t0_y, t1_y)),
+                                   max(t0_z, t1_z)) * SlabScale;
+                t_far = min(t_far, ray.maxt);
+
+                Mask hit = active && t_near <= t_far;
+                if (none(hit))
+                    continue;
+
+                if (node.count[i] == 0) {
+                    // Order by the nearest entry point among the active lanes
+                    ScalarFloat key = 0.f;
+                    if constexpr (!is_cuda_array_v<Float>)
+                        key = hmin(select(hit, t_near, Float(math::Infinity<Float>)));
+                    size_t j = next_count++;
+                    for (; j > 0 && next_key[j - 1] > key; --j) {
+                        next[j] = next[j - 1];
+                        next_key[j] = next_key[j - 1];
+                    }
+                    next[j] = { t_near, hit, node.child[i] };
+                    next_key[j] = key;
+                    continue;
+                }
+
+                // Arrived at a leaf
+                Index prim_start = node.child[i],
+                      prim_end   = prim_start + node.count[i];
+                for (Index k = prim_start; k < prim_end; ++k) {
+                    PreliminaryIntersection3f prim_pi =
+                        intersect_prim<ShadowRay>(m_prims[k], ray, hit);
+
+                    masked(pi, prim_pi.is_valid()) = prim_pi;
+
+                    if constexpr (ShadowRay) {
+                        hit &= !prim_pi.is_valid();
+                        if (none(hit))
+                            break;
+                    } else {
+                        Assert(all(!prim_pi.is_valid() ||
+                                   (prim_pi.t >= ray.mint &&
+                                    prim_pi.t <= ray.maxt)));
+                        masked(ray.maxt, prim_pi.is_valid()) = prim_pi.t;
+                    }
+                }
+            }
+
+            // Push the farthest node first so that the nearest is visited next
+            for (size_t j = next_count; j > 0; --j)
+                stack[stack_index++] = next[j - 1];
+        }
+
+        return pi;
+    }
+
+    /// Brute force intersection routine for debugging purposes
+    template <bool ShadowRay>
+    MTS_INLINE PreliminaryIntersection3f ray_intersect_naive(Ray3f ray,
+                                                             Mask active) const {
+        PreliminaryIntersection3f pi;
+
+        for (Index shape_index = 0; shape_index < shape_count(); ++shape_index) {
+            Size prim_count = m_shapes[shape_index]->primitive_count();
+            for (Index prim_index = 0; prim_index < prim_count; ++prim_index) {
+                PreliminaryIntersection3f prim_pi = intersect_prim<ShadowRay>(
+                    BVHPrimitive{ shape_index, prim_index }, ray, active);
+
+                if constexpr (is_array_v<Float>) {
+                    masked(pi, prim_pi.is_valid()) = prim_pi;
+                } else if (prim_pi.is_valid()) {
+                    pi = prim_pi;
+                    ray.maxt = prim_pi.t;
+                }
+
+                if (ShadowRay && all(pi.is_valid() || !active))
+                    return pi;
+            }
+        }
+
+        return pi;
+    }
+
+    /// Return a human-readable string representation of the scene contents.
+    virtual std::string to_string() const override;
+
+    MTS_DECLARE_CLASS()
+protected:
+    /// Marks empty child slots
+    static constexpr Index InvalidIndex = (Index) -1;
+
+    /// Conservative scale factor applied to the exit distance of the slab test
+    static constexpr ScalarFloat SlabScale = 1.f + 4.f * math::Epsilon<ScalarFloat>;
+
+    /**
+     * \brief Reciprocal ray direction used by the slab test
+     *
+     * Zero-valued components are replaced by a tiny value of the same sign.
+     * This avoids the <tt>0 * inf = NaN</tt> case for rays starting on the
+     * boundary of a box, while keeping the slab test conservative.
+     */
+    MTS_INLINE static Vector3f slab_rcp(const Vector3f &d) {
+        Vector3f d_safe = select(abs(d) < SlabMinDir, copysign(Vector3f(SlabMinDir), d), d);
+        return rcp(d_safe);
+    }
+
+    /// Smallest direction component magnitude used by the slab test
+    static constexpr ScalarFloat SlabMinDir = ScalarFloat(1e-18);
+
+    /**
+     * \brief Check whether a primitive is intersected by the given ray.
+     *
+     * Shadow rays only set the \c t field of the returned record (to zero
+     * in case of a hit).
+     */
+    template <bool ShadowRay = false>
+    MTS_INLINE PreliminaryIntersection3f
+    intersect_prim(const BVHPrimitive &prim, const Ray3f &ray, Mask active) const {
+        const Shape *shape = m_shapes[prim.shape].get();
+
+        PreliminaryIntersection3f pi;
+
+        if constexpr (ShadowRay) {
+            Mask hit;
+            if (shape->is_mesh()) {
+                const Mesh *mesh = (const Mesh *) shape;
+                hit = mesh->ray_intersect_triangle(prim.prim, ray, active).is_valid();
+            } else {
+                hit = shape->ray_test(ray, active);
+            }
+
+            pi.t = select(hit, Float(0.f), math::Infinity<Float>);
+            return pi;
+        } else {
+            if (shape->is_mesh()) {
+                const Mesh *mesh = (const Mesh *) shape;
+                pi = mesh->ray_intersect_triangle(prim.prim, ray, active);
+            } else {
+                pi = shape->ray_intersect_preliminary(ray, active);
+            }
+
+            return pi;
+        }
+    }
+
+    /// Recompute the bounding boxes of the hierarchy bottom-up
+    void refit();
+
+    /// Compute the SAH cost of the hierarchy
+    ScalarFloat sah_cost() const;
+
+protected:
+    std::vector<ref<Shape>> m_shapes;
+    std::unique_ptr<BVHNode[]> m_nodes;
+    std::unique_ptr<BVHPrimitive[]> m_prims;
+    ScalarBoundingBox3f m_bbox;
+    Size m_node_count = 0;
+    Size m_primitive_count = 0;
+
+    ScalarFloat m_intersection_cost;
+    ScalarFloat m_traversal_cost;
+    Size m_max_leaf_size;
+    Size m_bin_count;
+    ScalarFloat m_rebuild_threshold;
+    ScalarFloat m_build_cost = 0.f;
+};
+
+MTS_EXTERN_CLASS_RENDER(ShapeBVH)
+NAMESPACE_END(mitsuba)
@@ -61,6 +61,7 @@ template <typename Float, typename Spectrum>
 class MTS_EXPORT_RENDER Emitter : public Endpoint<Float, Spectrum> {
 public:
     MTS_IMPORT_BASE(Endpoint)
+    MTS_IMPORT_TYPES()
 
     /// Is this an environment map light emitter?
     bool is_environment() const {
@@ -70,6 +71,21 @@ public:
     /// Flags for all components combined.
     uint32_t flags(mask_t<Float> /*active*/ = true) const { return m_flags; }
 
+    /**
+     * \brief Return a rough estimate of the total power emitted into the scene
+     *
+     * This value is used by the scene's \c power emitter selection strategy
+     * (see \ref Scene::sample_emitter_direction()) and does not need to be
+     * exact. Emitters that cannot provide an estimate return \c 1.
+     */
+    virtual ScalarFloat power_estimate() const;
+
+    /// Relative weight used by the scene when selecting this emitter
+    ScalarFloat sampling_weight() const { return m_sampling_weight; }
+
+    /// Set the relative weight used by the scene when selecting this emitter
+    void set_sampling_weight(ScalarFloat weight) { m_sampling_weight = weight; }
+
 
     ENOKI_CALL_SUPPORT_FRIEND()
     MTS_DECLARE_CLASS()
@@ -81,6 +97,9 @@ protected:
 protected:
     /// Combined flags for all properties of this emitter.
     uint32_t m_flags;
+
+    /// Relative emitter selection weight (assigned by the scene)
+    ScalarFloat m_sampling_weight = 1.f;
 };
 
 MTS_EXTERN_CLASS_RENDER(Emitter)
@@ -98,6 +117,7 @@ ENOKI_CALL_SUPPORT_TEMPLATE_BEGIN(mitsuba::Emitter)
     ENOKI_CALL_SUPPORT_METHOD(pdf_direction)
     ENOKI_CALL_SUPPORT_METHOD(is_environment)
     ENOKI_CALL_SUPPORT_GETTER(flags, m_flags)
+    ENOKI_CALL_SUPPORT_GETTER(sampling_weight, m_sampling_weight)
 ENOKI_CALL_SUPPORT_TEMPLATE_END(mitsuba::Emitter)
 
 //! @}
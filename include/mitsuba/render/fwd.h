@@ -27,6 +27,7 @@ template <typename Float, typename Spectrum> class Sensor;
 template <typename Float, typename Spectrum> class PhaseFunction;
 template <typename Float, typename Spectrum> class ProjectiveCamera;
 template <typename Float, typename Spectrum> class Shape;
+template <typename Float, typename Spectrum> class ShapeBVH;
 template <typename Float, typename Spectrum> class ShapeGroup;
 template <typename Float, typename Spectrum> class ShapeKDTree;
 template <typename Float, typename Spectrum> class Texture;
@@ -74,6 +75,7 @@ template <typename Float_, typename Spectrum_> struct RenderAliases {
     using MicrofacetDistribution = mitsuba::MicrofacetDistribution<FloatU, SpectrumU>;
     using Shape                  = mitsuba::Shape<FloatU, SpectrumU>;
     using ShapeGroup             = mitsuba::ShapeGroup<FloatU, SpectrumU>;
+    using ShapeBVH               = mitsuba::ShapeBVH<FloatU, SpectrumU>;
     using ShapeKDTree            = mitsuba::ShapeKDTree<FloatU, SpectrumU>;
     using Mesh                   = mitsuba::Mesh<FloatU, SpectrumU>;
     using Integrator             = mitsuba::Integrator<FloatU, SpectrumU>;
@@ -132,6 +134,7 @@ template <typename Float_, typename Spectrum_> struct RenderAliases {
     using MicrofacetDistribution = typename RenderAliases::MicrofacetDistribution;                 \
     using Shape                  = typename RenderAliases::Shape;                                  \
     using ShapeKDTree            = typename RenderAliases::ShapeKDTree;                            \
+    using ShapeBVH               = typename RenderAliases::ShapeBVH;                               \
     using Mesh                   = typename RenderAliases::Mesh;                                   \
     using Integrator             = typename RenderAliases::Integrator;                             \
     using SamplingIntegrator     = typename RenderAliases::SamplingIntegrator;                     \
@@ -67,6 +67,22 @@ public:
     /// Accumulate another image block into this one
     void put(const ImageBlock *block);
 
+    /**
+     * \brief Accumulate the part of another image block that overlaps a
+     * horizontal band of this block
+     *
+     * \param row_begin
+     *    First row of the band, relative to the storage of this block (i.e.
+     *    row 0 is the first row of the top border)
+     *
+     * \param row_end
+     *    One past the last row of the band
+     *
+     * Callers that share a block between threads can use this function to
+     * only lock the band that is being modified.
+     */
+    void put(const ImageBlock *block, int row_begin, int row_end);
+
     /**
      * \brief Store a single sample / packets of samples inside the
      * image block.
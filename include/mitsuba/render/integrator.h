@@ -1,5 +1,6 @@
 #pragma once
 
+#include <mitsuba/core/filesystem.h>
 #include <mitsuba/core/fwd.h>
 #include <mitsuba/core/object.h>
 #include <mitsuba/core/properties.h>
@@ -17,6 +18,18 @@
 
 NAMESPACE_BEGIN(mitsuba)
 
+/// Strategy used by \ref SamplingIntegrator::render() to distribute image blocks
+enum class BlockScheduling : uint32_t {
+    /// Hand out fixed-size blocks following a spiral, one pass after the other (default)
+    Spiral,
+
+    /**
+     * Estimate the cost of every block, split expensive blocks and render
+     * the most expensive work first
+     */
+    CostAware
+};
+
 /**
  * \brief Abstract integrator base class, which does not make any assumptions
  * with regards to how radiance is computed.
@@ -41,6 +54,15 @@ public:
     /// Perform the main rendering job. Returns \c true upon success
     virtual bool render(Scene *scene, Sensor *sensor) = 0;
 
+    /**
+     * \brief Render the scene from several sensors. Returns \c true upon success
+     *
+     * Each sensor renders into its own film. The default implementation
+     * renders the sensors one after the other using \ref render() and stops
+     * at the first failure.
+     */
+    virtual bool render_sensors(Scene *scene, const std::vector<Sensor *> &sensors);
+
     /**
      * \brief Cancel a running render job
      *
@@ -130,6 +152,18 @@ public:
     // =========================================================================
 
     bool render(Scene *scene, Sensor *sensor) override;
+
+    /**
+     * \brief Render the scene from several sensors
+     *
+     * On the CPU, the image blocks of all sensors are rendered by a single
+     * parallel loop, so that threads move on to the next sensor instead of
+     * waiting for the last blocks of the previous one. Adaptive sampling,
+     * checkpoints, progressive rendering and the cost-aware scheduler fall
+     * back to rendering the sensors one after the other.
+     */
+    bool render_sensors(Scene *scene, const std::vector<Sensor *> &sensors) override;
+
     void cancel() override;
 
     /**
@@ -148,18 +182,116 @@ public:
     //! @}
     // =========================================================================
 
+    /**
+     * \brief Periodically save the state of the render to a checkpoint file
+     *
+     * Checkpoints store the raw film contents together with the number of
+     * completed passes (see \c samples_per_pass). They are written between
+     * passes once \c interval seconds have elapsed since the previous one
+     * (after every pass if \c interval is zero), and when the render is
+     * cancelled or times out. The blocks of each pass are accumulated in a
+     * fixed order, so that a render resumed from a checkpoint is
+     * bit-identical to an uninterrupted one. The checkpoint file is removed
+     * once rendering completes. Only supported on the CPU.
+     *
+     * \param filename
+     *    Path of the checkpoint file. An empty path disables checkpointing.
+     *
+     * \param interval
+     *    Minimum time between two checkpoints in seconds
+     *
+     * \param resume
+     *    Continue from the checkpoint file if it exists
+     */
+    void set_checkpoint(const fs::path &filename, float interval, bool resume = false);
+
+    /**
+     * \brief Periodically write previews of a progressive render to disk
+     *
+     * Enables progressive rendering (see the \c progressive parameter). A
+     * background thread develops the film once \c interval seconds have
+     * elapsed since the previous preview or once \c passes further passes
+     * have completed, whichever happens first, and writes it using \ref
+     * Bitmap::write_async(). The worker threads are never interrupted, hence
+     * a preview may combine pixels of two consecutive passes. Only supported
+     * on the CPU.
+     *
+     * \param filename
+     *    Path of the preview image. An empty path disables previews.
+     *
+     * \param interval
+     *    Time between two previews in seconds (zero: no time limit)
+     *
+     * \param passes
+     *    Number of passes between two previews (zero: no pass limit). When
+     *    both limits are zero, a preview is written after every pass.
+     */
+    void set_preview(const fs::path &filename, float interval, size_t passes = 0);
+
     MTS_DECLARE_CLASS()
 protected:
     SamplingIntegrator(const Properties &props);
     virtual ~SamplingIntegrator();
 
+    /**
+     * \brief Render the pixels of a single image block
+     *
+     * Pixels are visited in Morton order relative to the block of size
+     * \ref m_block_size that is identified by \c block_id. The range
+     * <tt>[morton_begin, morton_end)</tt> selects an aligned quadrant of that
+     * block, in which case \c block must have been positioned at the
+     * quadrant's origin. Per-pixel seeds only depend on \c block_id and the
+     * Morton index, so splitting a block does not change the rendered image.
+     */
     virtual void render_block(const Scene *scene,
                               const Sensor *sensor,
                               Sampler *sampler,
                               ImageBlock *block,
                               Float *aovs,
                               size_t sample_count,
-                              size_t block_id) const;
+                              size_t block_id,
+                              uint32_t morton_begin = 0,
+                              uint32_t morton_end = (uint32_t) -1) const;
+
+    /// Render on the CPU, allocating samples adaptively based on per-pixel variance
+    void render_adaptive(const Scene *scene,
+                         Sensor *sensor,
+                         const std::vector<std::string> &channels,
+                         size_t samples_per_pass,
+                         size_t total_spp);
+
+    /// Render on the CPU pass by pass, periodically writing checkpoints
+    void render_checkpointed(const Scene *scene,
+                             Sensor *sensor,
+                             const std::vector<std::string> &channels,
+                             size_t samples_per_pass,
+                             size_t n_passes);
+
+    /// Save the film after \c passes completed passes to \ref m_checkpoint_file
+    void write_checkpoint(Sensor *sensor, const std::string &job, size_t passes) const;
+
+    /// Restore the film from \ref m_checkpoint_file and return the number of completed passes
+    size_t read_checkpoint(Sensor *sensor, const std::string &job) const;
+
+    /**
+     * \brief Render on the CPU in passes of doubling sample counts
+     *
+     * The first pass renders \c samples_per_pass samples per pixel, and every
+     * following pass as many samples as all previous passes combined, until
+     * \c total_spp samples have been taken.
+     */
+    void render_progressive(const Scene *scene,
+                            Sensor *sensor,
+                            const std::vector<std::string> &channels,
+                            size_t samples_per_pass,
+                            size_t total_spp);
+
+    /// Render on the CPU using the \ref BlockScheduling::CostAware scheduler
+    void render_cost_aware(const Scene *scene,
+                           Sensor *sensor,
+                           const std::vector<std::string> &channels,
+                           size_t samples_per_pass,
+                           size_t n_passes);
 
     void render_sample(const Scene *scene,
                        const Sensor *sensor,
@@ -177,6 +309,19 @@ protected:
     /// Size of (square) image blocks to render per core.
     uint32_t m_block_size;
 
+    /// Strategy used to distribute image blocks over the worker threads
+    BlockScheduling m_block_scheduling;
+
+    /**
+     * \brief Maximum number of times that a block can be split into quadrants
+     *
+     * Blocks are always seeded in units of <tt>4^m_block_split_depth</tt>
+     * quadrants in vectorized variants, which keeps the sample generation
+     * independent of the actual decomposition. Zero unless the cost-aware
+     * scheduler is used.
+     */
+    uint32_t m_block_split_depth = 0;
+
     /**
      * \brief Number of samples to compute for each pass over the image blocks.
      *
@@ -197,6 +342,58 @@ protected:
 
     /// Flag for disabling direct visibility of emitters
     bool m_hide_emitters;
+
+    /**
+     * \brief Target relative standard error of the pixel luminance
+     *
+     * Pixels whose estimate falls below this threshold stop receiving
+     * samples, and the saved budget is spent on the remaining pixels.
+     * Adaptive sampling is disabled when this value is not positive.
+     */
+    float m_adaptive_threshold;
+
+    /// Minimum and maximum number of samples per pixel when sampling adaptively
+    uint32_t m_adaptive_min_samples, m_adaptive_max_samples;
+
+    /// Write the number of samples per pixel into an additional film channel
+    bool m_sample_count_aov;
+
+    /// Running luminance statistics of a pixel (Welford's algorithm)
+    struct PixelStatistics {
+        uint32_t sample_count = 0;
+        ScalarFloat mean = 0.f, m2 = 0.f;
+        bool converged = false;
+
+        void put(ScalarFloat value) {
+            ScalarFloat delta = value - mean;
+            mean += delta / ++sample_count;
+            m2 += delta * (value - mean);
+        }
+    };
+
+    /// Per-pixel statistics of an ongoing adaptive render (scalar variants only)
+    std::unique_ptr<PixelStatistics[]> m_pixel_statistics;
+
+    /// Checkpoint file (empty if checkpointing is disabled)
+    fs::path m_checkpoint_file;
+
+    /// Minimum time between two checkpoints in seconds
+    float m_checkpoint_interval = 0.f;
+
+    /// Continue from an existing checkpoint file
+    bool m_checkpoint_resume = false;
+
+    /// Render in passes of doubling sample counts (see \ref render_progressive())
+    bool m_progressive;
+
+    /// Preview image of a progressive render (empty if previews are disabled)
+    fs::path m_preview_file;
+
+    /// Time between two previews in seconds
+    float m_preview_interval = 0.f;
+
+    /// Number of passes between two previews
+    size_t m_preview_passes = 0;
 };
 
 /*
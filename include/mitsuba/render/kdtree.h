@@ -2,6 +2,7 @@
 
 #include <unordered_set>
 #include <mitsuba/core/bbox.h>
+#include <mitsuba/core/filesystem.h>
 #include <mitsuba/core/fwd.h>
 #include <mitsuba/core/logger.h>
 #include <mitsuba/core/math.h>
@@ -194,6 +195,12 @@ public:
     /// Return the bounding box of the entire kd-tree
     const BoundingBox bbox() const { return m_bbox; }
 
+    /// Return the SAH cost of the tree following the last call to \ref build() or \ref update()
+    Scalar cost() const { return m_cost; }
+
+    /// Return the SAH cost of the tree following the last call to \ref build()
+    Scalar build_cost() const { return m_build_cost; }
+
     const Derived& derived() const { return (Derived&) *this; }
     Derived& derived() { return (Derived&) *this; }
 
@@ -1707,6 +1714,63 @@ protected:
         }
     }
 
+    /**
+     * \brief Update the tree following a change in the geometry of some primitives
+     *
+     * The structure (i.e. the split planes) of the existing tree is retained.
+     * References to the primitives listed in \c changed are removed from all
+     * leaf nodes and subsequently re-inserted into all leaves that overlap
+     * their new bounding boxes. The bounding box of the tree is expanded if
+     * necessary. This is considerably cheaper than a full rebuild, but the
+     * quality of the tree degrades when primitives move far from their
+     * original location: callers should compare the returned SAH cost against
+     * \ref build_cost() and call \ref build() again when it becomes too large.
+     *
+     * \return The SAH cost of the updated tree
+     */
+    Scalar update(const IndexVector &changed) {
+        if (!ready())
+            Throw("The kd-tree must be built before it can be updated!");
+
+        Size prim_count = derived().primitive_count();
+
+        std::vector<bool> is_changed(prim_count, false);
+        IndexVector reinserted;
+        reinserted.reserve(changed.size());
+
+        BoundingBox bbox(m_bbox);
+        for (Index prim_index : changed) {
+            Assert(prim_index < prim_count);
+            is_changed[prim_index] = true;
+
+            BoundingBox prim_bbox = derived().bbox(prim_index);
+            if (!prim_bbox.valid())
+                continue;
+
+            bbox.expand(prim_bbox);
+            reinserted.push_back(prim_index);
+        }
+
+        if (!m_bbox.contains(bbox)) {
+            /* Slightly enlarge the bounding box as in build(). Leaves along
+               the boundary of the tree grow along with it. */
+            Vector extra = (bbox.extents() + 1.f) * math::Epsilon<Scalar>;
+            m_bbox.min = bbox.min - extra;
+            m_bbox.max = bbox.max + extra;
+        }
+
+        IndexVector indices;
+        indices.reserve(m_index_count + reinserted.size());
+        update_node(0, std::move(reinserted), is_changed, indices);
+
+        m_index_count = Size(indices.size());
+        m_indices.reset(new Index[m_index_count]);
+        std::copy(indices.begin(), indices.end(), m_indices.get());
+
+        m_cost = compute_cost(m_nodes.get(), m_bbox);
+        return m_cost;
+    }
+
     void build() {
         /* Some sanity checks */
         if (ready())
@@ -1812,6 +1876,8 @@ protected:
         m_bbox.min -= extra;
         m_bbox.max += extra;
 
+        m_cost = m_build_cost = compute_cost(m_nodes.get(), m_bbox);
+
         /* ==================================================================== */
         /*         Print various tree statistics if requested by the user       */
         /* ==================================================================== */
@@ -1880,11 +1946,77 @@ protected:
         }
     }
 
+protected:
+    /// Evaluate the SAH cost of the subtree rooted at \c node
+    Scalar compute_cost(const KDNode *node, const BoundingBox &bbox) const {
+        if (node->leaf())
+            return m_cost_model.leaf_cost(node->primitive_count());
+
+        Index axis = node->axis();
+        Scalar split = Scalar(node->split());
+        BoundingBox left_bbox(bbox), right_bbox(bbox);
+        left_bbox.max[axis] = split;
+        right_bbox.min[axis] = split;
+
+        Scalar left_cost  = compute_cost(node->left(), left_bbox),
+               right_cost = compute_cost(node->right(), right_bbox);
+
+        CostModel model(m_cost_model);
+        model.set_bounding_box(bbox);
+        return model.inner_cost(axis, split, left_cost, right_cost);
+    }
+
+    /**
+     * \brief Recursive helper function used by \ref update()
+     *
+     * Filters out stale references to changed primitives, distributes the
+     * primitives in \c prims among the children of the node with index
+     * \c node_index, and appends the resulting leaf lists to \c indices.
+     */
+    void update_node(Size node_index, IndexVector &&prims,
+                     const std::vector<bool> &is_changed, IndexVector &indices) {
+        KDNode &node = m_nodes[node_index];
+
+        if (node.leaf()) {
+            size_t offset = indices.size();
+            for (Size i = 0; i < node.primitive_count(); ++i) {
+                Index prim_index = m_indices[node.primitive_offset() + i];
+                if (!is_changed[prim_index])
+                    indices.push_back(prim_index);
+            }
+            indices.insert(indices.end(), prims.begin(), prims.end());
+
+            if (!node.set_leaf_node(offset, indices.size() - offset))
+                Throw("Internal error: could not update leaf node with %i "
+                      "primitives -- too much geometry?", indices.size() - offset);
+            return;
+        }
+
+        Index axis = node.axis();
+        Scalar split = Scalar(node.split());
+
+        IndexVector left, right;
+        for (Index prim_index : prims) {
+            BoundingBox prim_bbox = derived().bbox(prim_index);
+            if (prim_bbox.min[axis] <= split)
+                left.push_back(prim_index);
+            if (prim_bbox.max[axis] >= split)
+                right.push_back(prim_index);
+        }
+        IndexVector().swap(prims);
+
+        Size left_index = node_index + node.left_offset();
+        update_node(left_index, std::move(left), is_changed, indices);
+        update_node(left_index + 1, std::move(right), is_changed, indices);
+    }
+
 protected:
     std::unique_ptr<KDNode[]> m_nodes;
     std::unique_ptr<Index[]> m_indices;
     Size m_node_count = 0;
     Size m_index_count = 0;
+    Scalar m_cost = 0;
+    Scalar m_build_cost = 0;
 
     CostModel m_cost_model;
     bool m_clip_primitives = true;
@@ -2018,6 +2150,7 @@ public:
 
     using Base = TShapeKDTree<ScalarBoundingBox3f, uint32_t, SurfaceAreaHeuristic3f, ShapeKDTree>;
     using typename Base::KDNode;
+    using typename Base::IndexVector;
     using Base::ready;
     using Base::set_clip_primitives;
     using Base::set_exact_primitive_threshold;
@@ -2031,6 +2164,8 @@ public:
     using Base::m_indices;
     using Base::m_index_count;
     using Base::m_node_count;
+    using Base::m_build_cost;
+    using Base::m_cost;
 
     /// Create an empty kd-tree and take build-related parameters from \c props.
     ShapeKDTree(const Properties &props);
@@ -2038,15 +2173,38 @@ public:
     /// Register a new shape with the kd-tree (to be called before \ref build())
     void add_shape(Shape *shape);
 
-    /// Build the kd-tree
+    /**
+     * \brief Build the kd-tree
+     *
+     * When the \c kd_cache_dir property was specified, the tree is loaded
+     * from a previously written cache file if its key (a hash of the geometry
+     * and of the tree construction parameters) matches. Otherwise, the tree is
+     * built and subsequently written to the cache directory.
+     */
     void build();
 
+    /**
+     * \brief Update the kd-tree following changes to the geometry of \c shapes
+     *
+     * References to the primitives of these shapes are re-inserted into the
+     * existing tree (see \ref TShapeKDTree::update()). When the SAH cost of
+     * the resulting tree exceeds the cost after the last full build by more
+     * than the factor given by the \c kd_rebuild_threshold property, the tree
+     * is rebuilt from scratch instead.
+     */
+    void update(const std::vector<Shape *> &shapes);
+
     /// Return the number of registered shapes
     Size shape_count() const { return Size(m_shapes.size()); }
 
     /// Return the number of registered primitives
     Size primitive_count() const { return m_primitive_map.back(); }
 
+    /// Return the memory used by the nodes and primitive indices (in bytes)
+    size_t memory_usage() const {
+        return m_index_count * sizeof(Index) + m_node_count * sizeof(KDNode);
+    }
+
     /// Return the i-th shape (const version)
     const Shape *shape(size_t i) const { Assert(i < m_shapes.size()); return m_shapes[i]; }
 
@@ -2352,6 +2510,15 @@ protected:
         return shape_index;
     }
 
+    /// Compute a hash of the geometry and construction parameters used to identify cache files
+    uint64_t cache_key() const;
+
+    /// Try to load a previously built tree from a cache file
+    bool load_cache(const fs::path &filename, uint64_t key);
+
+    /// Write the tree to a cache file
+    void save_cache(const fs::path &filename, uint64_t key) const;
+
     /**
      * \brief Check whether a primitive is intersected by the given ray.
      *
@@ -2392,6 +2559,8 @@ protected:
 protected:
     std::vector<ref<Shape>> m_shapes;
     std::vector<Size> m_primitive_map;
+    ScalarFloat m_rebuild_threshold;
+    fs::path m_cache_dir;
 };
 
 MTS_EXTERN_CLASS_RENDER(ShapeKDTree)
@@ -6,8 +6,10 @@
 #include <mitsuba/core/struct.h>
 #include <mitsuba/core/transform.h>
 #include <mitsuba/core/distr_1d.h>
+#include <mitsuba/core/filesystem.h>
 #include <mitsuba/core/properties.h>
 #include <tbb/spin_mutex.h>
+#include <memory>
 #include <unordered_map>
 
 NAMESPACE_BEGIN(mitsuba)
@@ -21,6 +23,7 @@ public:
     // Mesh is always stored in single precision
     using InputFloat = float;
     using InputPoint3f  = Point<InputFloat, 3>;
+    using InputPoint2f  = Point<InputFloat, 2>;
     using InputVector2f = Vector<InputFloat, 2>;
     using InputVector3f = Vector<InputFloat, 3>;
     using InputNormal3f = Normal<InputFloat, 3>;
@@ -73,12 +76,16 @@ public:
     }
 
     /// Add an attribute buffer with the given \c name and \c dim
-    void add_attribute(const std::string& name, size_t dim, const FloatStorage& buf);
+    void add_attribute(const std::string& name, size_t dim, FloatStorage buf);
 
     /// Returns the face indices associated with triangle \c index
     template <typename Index>
     MTS_INLINE auto face_indices(Index index, mask_t<Index> active = true) const {
         using Result = Array<replace_scalar_t<Index, uint32_t>, 3>;
+        if constexpr (!is_dynamic_v<Float>) {
+            if (unlikely(m_compressed))
+                return decode_face_indices(index, active);
+        }
         return gather<Result>(m_faces_buf, index, active);
     }
 
@@ -86,6 +93,10 @@ public:
     template <typename Index>
     MTS_INLINE auto vertex_position(Index index, mask_t<Index> active = true) const {
         using Result = Point<replace_scalar_t<Index, InputFloat>, 3>;
+        if constexpr (!is_dynamic_v<Float>) {
+            if (unlikely(m_compressed))
+                return decode_vertex_position(index, active);
+        }
         return gather<Result>(m_vertex_positions_buf, index, active);
     }
 
@@ -93,6 +104,10 @@ public:
     template <typename Index>
     MTS_INLINE auto vertex_normal(Index index, mask_t<Index> active = true) const {
         using Result = Normal<replace_scalar_t<Index, InputFloat>, 3>;
+        if constexpr (!is_dynamic_v<Float>) {
+            if (unlikely(m_compressed))
+                return decode_vertex_normal(index, active);
+        }
         return gather<Result>(m_vertex_normals_buf, index, active);
     }
 
@@ -100,6 +115,10 @@ public:
     template <typename Index>
     MTS_INLINE auto vertex_texcoord(Index index, mask_t<Index> active = true) const {
         using Result = Point<replace_scalar_t<Index, InputFloat>, 2>;
+        if constexpr (!is_dynamic_v<Float>) {
+            if (unlikely(m_compressed))
+                return decode_vertex_texcoord(index, active);
+        }
         return gather<Result>(m_vertex_texcoords_buf, index, active);
     }
 
@@ -116,10 +135,19 @@ public:
     }
 
     /// Does this mesh have per-vertex normals?
-    bool has_vertex_normals() const { return slices(m_vertex_normals_buf) != 0; }
+    bool has_vertex_normals() const {
+        return m_compressed ? slices(m_compressed->normals) != 0
+                            : slices(m_vertex_normals_buf) != 0;
+    }
 
     /// Does this mesh have per-vertex texture coordinates?
-    bool has_vertex_texcoords() const { return slices(m_vertex_texcoords_buf) != 0; }
+    bool has_vertex_texcoords() const {
+        return m_compressed ? slices(m_compressed->texcoords) != 0
+                            : slices(m_vertex_texcoords_buf) != 0;
+    }
+
+    /// Does this mesh use the compressed storage created by \ref compress()?
+    bool is_compressed() const { return (bool) m_compressed; }
 
     /// @}
     // =========================================================================
@@ -127,12 +155,79 @@ public:
     /// Export mesh as a binary PLY file
     void write_ply(const std::string &filename) const;
 
+    /**
+     * \brief Export mesh using Mitsuba's memory-mappable binary mesh format
+     *
+     * Vertex positions, normals, texture coordinates, face indices and mesh
+     * attributes are stored exactly as they are laid out in memory (using the
+     * byte order of the current machine), which allows the \c mmesh shape
+     * plugin to map them into memory without any parsing or copying.
+     */
+    void write_mmesh(const std::string &filename) const;
+
     /// Compute smooth vertex normals and replace the current normal values
     void recompute_vertex_normals();
 
     /// Recompute the bounding box (e.g. after modifying the vertex positions)
     void recompute_bbox();
 
+    /**
+     * \brief Convert the mesh to a compact, read-only representation
+     *
+     * Vertex positions are quantized to 21 bits per axis relative to the
+     * bounding box, normals are stored using a 2x16 bit octahedral
+     * encoding, and texture coordinates use 16 bits per component relative
+     * to their range. Face indices are stored in blocks of 32 triangles as
+     * 10 bit offsets from the smallest vertex index of the block, falling
+     * back to plain 32 bit indices for blocks with poor vertex locality.
+     *
+     * The full precision buffers are released afterwards, and the accessors
+     * (\ref face_indices(), \ref vertex_position(), etc.) decode the data
+     * on the fly. Custom mesh attributes are left untouched. Compression is
+     * only supported by the scalar and packet variants when Embree is
+     * disabled; the function logs a warning and returns otherwise.
+     */
+    void compress();
+
+    /// Return the total amount of memory used by the vertex and face data
+    size_t memory_usage() const;
+
+    /**
+     * \brief Simplify the mesh so that it has at most \c face_count faces
+     *
+     * The function contracts edges in the order given by a quadric error
+     * metric (Garland and Heckbert, "Surface Simplification Using Quadric
+     * Error Metrics", SIGGRAPH 1997), while preserving mesh boundaries and
+     * texture seams as much as possible. Vertex normals, texture coordinates
+     * and vertex attributes are interpolated, and face attributes are kept
+     * for the remaining faces. Simplification stops early when no further
+     * edge can be contracted without damaging the topology of the mesh.
+     *
+     * When the mesh is part of a scene, \ref Scene::parameters_changed()
+     * must be called afterwards.
+     */
+    void simplify(ScalarSize face_count);
+
+    /**
+     * \brief Simplify the mesh (see \ref simplify()), reusing a previously
+     * simplified version from the LOD cache directory when possible
+     *
+     * Meshes loaded from files are written to the directory specified via the
+     * \c lod_cache_dir parameter once simplified.
+     */
+    void apply_lod(ScalarSize face_count);
+
+    /// Should the scene choose the level of detail of this mesh automatically?
+    bool lod_auto() const { return m_lod_auto; }
+
+    /**
+     * \brief Should the mesh be compressed once loaded (see \ref compress())?
+     *
+     * Meshes with an automatic level of detail are compressed by the scene
+     * once it has been applied, as compressed meshes cannot be simplified.
+     */
+    bool compress_requested() const { return m_compress; }
+
     // =============================================================
     //! @{ \name Shape interface implementation
     // =============================================================
@@ -249,6 +344,10 @@ public:
     size_t vertex_data_bytes() const;
     size_t face_data_bytes() const;
 
+protected:
+    /// Return the amount of memory used by the face indices
+    size_t face_index_bytes() const;
+
 protected:
     Mesh(const Properties &);
     inline Mesh() {}
@@ -277,9 +376,208 @@ protected:
             const_cast<Mesh *>(this)->build_pmf();
     }
 
+    /**
+     * \brief Return the key identifying a mesh loaded from the given file in
+     * the process-wide \ref AssetCache
+     *
+     * The key covers the state of the file, the mesh plugin, the variant, and
+     * the parameters of the base class that affect the loaded geometry. Any
+     * further relevant plugin parameters should be passed via \c options.
+     */
+    std::string cache_key(const fs::path &path, const std::string &options = "") const;
+
+    /**
+     * \brief Initialize the geometry of the mesh from the \ref AssetCache
+     *
+     * When a level of detail was requested, a simplified version stored in
+     * the LOD cache directory takes precedence (see \ref load_lod()).
+     *
+     * \return \c false when the cache does not contain an entry for \c key.
+     */
+    bool load_from_cache(const std::string &key);
+
+    /// Store a copy of the geometry of the mesh in the \ref AssetCache
+    void store_in_cache(const std::string &key) const;
+
+    /// Return the path of the simplified version of this mesh in the LOD cache directory
+    fs::path lod_path(ScalarSize face_count) const;
+
+    /**
+     * \brief Initialize the geometry of the mesh from the simplified version
+     * stored in the LOD cache directory
+     *
+     * \return \c false when the directory does not contain such a file.
+     */
+    bool load_lod(ScalarSize face_count);
+
     MTS_DECLARE_CLASS()
 
 protected:
+    /// Header of the binary mesh format written by \ref write_mmesh()
+    struct MMeshHeader {
+        /// File identifier, always <tt>"MTSMESH\0"</tt>
+        char magic[8];
+        uint32_t version;
+        /// Always equal to \ref MMeshByteOrder when read on the same architecture
+        uint32_t byte_order;
+        uint64_t vertex_count;
+        uint64_t face_count;
+        float bbox_min[3];
+        float bbox_max[3];
+        /// Byte offsets of the data arrays within the file (zero if absent)
+        uint64_t positions_offset;
+        uint64_t normals_offset;
+        uint64_t texcoords_offset;
+        uint64_t faces_offset;
+        /// Number of \ref MMeshAttribute records following the header
+        uint32_t attribute_count;
+        uint32_t reserved;
+    };
+
+    /// Mesh attribute record of the binary mesh format
+    struct MMeshAttribute {
+        char name[56];
+        uint32_t size;
+        uint32_t type;
+        uint64_t offset;
+    };
+
+    static constexpr uint32_t MMeshVersion = 1;
+    static constexpr uint32_t MMeshByteOrder = 0x01020304u;
+    /// Alignment (and padding) of the data arrays, compatible with any packet size
+    static constexpr size_t MMeshAlignment = 64;
+
+    /// Number of triangles per block of compressed face indices (log2)
+    static constexpr uint32_t CompressedFaceBlockShift = 5;
+    static constexpr uint32_t CompressedFaceBlockSize = 1u << CompressedFaceBlockShift;
+    /// Flags a block of compressed face indices that is stored uncompressed
+    static constexpr uint32_t CompressedRawBlock = 0x80000000u;
+
+    /// Storage used by meshes that were converted with \ref compress()
+    struct CompressedStorage {
+        /// Positions packed as three 21 bit integers
+        DynamicBuffer<UInt64> positions;
+        /// Octahedral normals and texture coordinates packed as two 16 bit integers
+        DynamicBuffer<UInt32> normals, texcoords;
+        /// Smallest vertex index and data offset of every block of faces
+        DynamicBuffer<UInt32> face_block_base, face_block_offset;
+        /// Per-face 10 bit index offsets, and blocks that did not fit into them
+        DynamicBuffer<UInt32> faces_packed, faces_raw;
+
+        InputVector3f position_scale;
+        InputPoint3f position_offset;
+        InputVector2f texcoord_scale;
+        InputPoint2f texcoord_offset;
+    };
+
+    template <typename Index>
+    auto decode_face_indices(const Index &index, mask_t<Index> active) const {
+        using UInt32I = replace_scalar_t<Index, uint32_t>;
+        using Result  = Array<UInt32I, 3>;
+        const CompressedStorage &c = *m_compressed;
+
+        if constexpr (!is_array_v<Index>) {
+            uint32_t block  = index >> CompressedFaceBlockShift,
+                     offset = c.face_block_offset.data()[block],
+                     slot   = (offset & ~CompressedRawBlock) + (index & (CompressedFaceBlockSize - 1));
+
+            if (unlikely(offset & CompressedRawBlock))
+                return load_unaligned<Result>(c.faces_raw.data() + 3 * slot);
+
+            uint32_t base   = c.face_block_base.data()[block],
+                     packed = c.faces_packed.data()[slot];
+
+            return Result(base + (packed & 1023u),
+                          base + ((packed >> 10) & 1023u),
+                          base + (packed >> 20));
+        } else {
+            UInt32I block  = index >> CompressedFaceBlockShift,
+                    base   = gather<UInt32I>(c.face_block_base, block, active),
+                    offset = gather<UInt32I>(c.face_block_offset, block, active),
+                    slot   = (offset & ~CompressedRawBlock) + (index & (CompressedFaceBlockSize - 1));
+
+            mask_t<UInt32I> raw = neq(offset & CompressedRawBlock, 0u);
+
+            UInt32I packed = gather<UInt32I>(c.faces_packed, slot, active && !raw);
+            Result fi(base + (packed & 1023u),
+                      base + ((packed >> 10) & 1023u),
+                      base + (packed >> 20));
+
+            raw &= active;
+            if (unlikely(any(raw)))
+                masked(fi, raw) = gather<Result>(c.faces_raw, slot, raw);
+
+            return fi;
+        }
+    }
+
+    template <typename Index>
+    auto decode_vertex_position(const Index &index, mask_t<Index> active) const {
+        using FloatI  = replace_scalar_t<Index, InputFloat>;
+        using Int32I  = replace_scalar_t<Index, int32_t>;
+        using UInt64I = replace_scalar_t<Index, uint64_t>;
+        using Result  = Point<FloatI, 3>;
+        const CompressedStorage &c = *m_compressed;
+
+        UInt64I q;
+        if constexpr (!is_array_v<Index>)
+            q = c.positions.data()[index];
+        else
+            q = gather<UInt64I>(c.positions, index, active);
+
+        const uint64_t mask = (1ull << 21) - 1;
+        return Result(
+            fmadd(FloatI(Int32I(q & mask)),         c.position_scale.x(), c.position_offset.x()),
+            fmadd(FloatI(Int32I((q >> 21) & mask)), c.position_scale.y(), c.position_offset.y()),
+            fmadd(FloatI(Int32I(q >> 42)),          c.position_scale.z(), c.position_offset.z()));
+    }
+
+    template <typename Index>
+    auto decode_vertex_normal(const Index &index, mask_t<Index> active) const {
+        using FloatI  = replace_scalar_t<Index, InputFloat>;
+        using Int32I  = replace_scalar_t<Index, int32_t>;
+        using UInt32I = replace_scalar_t<Index, uint32_t>;
+        using Result  = Normal<FloatI, 3>;
+        const CompressedStorage &c = *m_compressed;
+
+        UInt32I q;
+        if constexpr (!is_array_v<Index>)
+            q = c.normals.data()[index];
+        else
+            q = gather<UInt32I>(c.normals, index, active);
+
+        // Undo the octahedral mapping
+        const InputFloat scale = 2.f / 65535.f;
+        FloatI x = fmadd(FloatI(Int32I(q & 0xFFFFu)), scale, -1.f),
+               y = fmadd(FloatI(Int32I(q >> 16)),     scale, -1.f),
+               z = 1.f - abs(x) - abs(y),
+               t = max(-z, 0.f);
+
+        x += select(x >= 0.f, -t, t);
+        y += select(y >= 0.f, -t, t);
+
+        return Result(normalize(Result(x, y, z)));
+    }
+
+    template <typename Index>
+    auto decode_vertex_texcoord(const Index &index, mask_t<Index> active) const {
+        using FloatI  = replace_scalar_t<Index, InputFloat>;
+        using Int32I  = replace_scalar_t<Index, int32_t>;
+        using UInt32I = replace_scalar_t<Index, uint32_t>;
+        using Result  = Point<FloatI, 2>;
+        const CompressedStorage &c = *m_compressed;
+
+        UInt32I q;
+        if constexpr (!is_array_v<Index>)
+            q = c.texcoords.data()[index];
+        else
+            q = gather<UInt32I>(c.texcoords, index, active);
+
+        return Result(
+            fmadd(FloatI(Int32I(q & 0xFFFFu)), c.texcoord_scale.x(), c.texcoord_offset.x()),
+            fmadd(FloatI(Int32I(q >> 16)),     c.texcoord_scale.y(), c.texcoord_offset.y()));
+    }
+
     enum MeshAttributeType {
         Vertex, Face
     };
@@ -356,6 +654,24 @@ protected:
     /// Flag that can be set by the user to disable loading/computation of vertex normals
     bool m_disable_vertex_normals = false;
 
+    /// Flag that can be set by the user to request compressed storage (see \ref compress())
+    bool m_compress = false;
+
+    /// Compact vertex and face data, only set after \ref compress() was called
+    std::unique_ptr<CompressedStorage> m_compressed;
+
+    /// Target face count requested by the user (see \ref apply_lod(), zero if disabled)
+    ScalarSize m_lod_face_count = 0;
+
+    /// Flag that can be set by the user to let the scene choose the level of detail
+    bool m_lod_auto = false;
+
+    /// Directory storing simplified meshes (see \ref apply_lod())
+    fs::path m_lod_cache_dir;
+
+    /// Asset cache key of the file the mesh was loaded from (see \ref load_from_cache())
+    std::string m_source_key;
+
     /* Surface area distribution -- generated on demand when \ref
        prepare_area_pmf() is first called. */
     DiscreteDistribution<Float> m_area_pmf;
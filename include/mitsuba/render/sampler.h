@@ -88,6 +88,9 @@ public:
     /// Return the number of samples per pixel
     uint32_t sample_count() const { return m_sample_count; }
 
+    /// Return the base seed value from which all sequences are derived
+    uint64_t base_seed() const { return m_base_seed; }
+
     /// Return the size of the wavefront (or 0, if not seeded)
     uint32_t wavefront_size() const { return m_wavefront_size; };
 
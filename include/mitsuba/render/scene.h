@@ -1,6 +1,7 @@
 #pragma once
 
 #include <mitsuba/core/spectrum.h>
+#include <mitsuba/core/distr_1d.h>
 #include <mitsuba/render/emitter.h>
 #include <mitsuba/render/shapegroup.h>
 #include <mitsuba/render/fwd.h>
@@ -8,11 +9,20 @@
 
 NAMESPACE_BEGIN(mitsuba)
 
+/// Strategy used by \ref Scene::sample_emitter_direction() to pick an emitter
+enum class EmitterSamplingStrategy : uint32_t {
+    /// Select every emitter with the same probability (default)
+    Uniform,
+
+    /// Select emitters proportionally to their estimated power
+    Power
+};
+
 template <typename Float, typename Spectrum>
 class MTS_EXPORT_RENDER Scene : public Object {
 public:
     MTS_IMPORT_TYPES(BSDF, Emitter, EmitterPtr, Film, Sampler, Shape, ShapePtr,
-                     ShapeGroup, Sensor, Integrator, Medium, MediumPtr)
+                     ShapeGroup, Sensor, Integrator, Medium, MediumPtr, Mesh)
 
     /// Instantiate a scene from a \ref Properties object
     Scene(const Properties &props);
@@ -89,6 +99,11 @@ public:
      * emission profile and the geometry term between the reference point and
      * the position on the emitter.
      *
+     * The emitter is first chosen according to the scene's
+     * \c emitter_sampling strategy: either uniformly (\c uniform, default)
+     * or proportionally to the emitters' \ref Emitter::power_estimate()
+     * (\c power).
+     *
      * \param ref
      *    A reference point somewhere within the scene
      *
@@ -150,6 +165,9 @@ public:
     /// Return the environment emitter (if any)
     const Emitter *environment() const { return m_environment.get(); }
 
+    /// Return the strategy used to select emitters for direct illumination sampling
+    EmitterSamplingStrategy emitter_sampling() const { return m_emitter_sampling; }
+
     /// Return the list of shapes
     std::vector<ref<Shape>> &shapes() { return m_shapes; }
     /// Return the list of shapes
@@ -185,8 +203,15 @@ protected:
     void accel_init_gpu(const Properties &props);
 
     /// Updates the ray-intersection acceleration data structure
+    void accel_parameters_changed_cpu(const std::vector<Shape *> &shapes);
     void accel_parameters_changed_gpu();
 
+    /// (Re-)build the emitter selection distribution from the emitters' power estimates
+    void update_emitter_sampling_distribution();
+
+    /// Simplify the meshes that request an automatic level of detail based on their projected size
+    void apply_auto_lod(const Properties &props);
+
     /// Release the ray-intersection acceleration data structure
     void accel_release_cpu();
     void accel_release_gpu();
@@ -205,11 +230,18 @@ protected:
     MTS_INLINE Mask ray_test_gpu(const Ray3f &ray, Mask active) const;
 
     using ShapeKDTree = mitsuba::ShapeKDTree<Float, Spectrum>;
+    using ShapeBVH = mitsuba::ShapeBVH<Float, Spectrum>;
 
 protected:
     /// Acceleration data structure (type depends on implementation)
     void *m_accel = nullptr;
 
+    /// Does \c m_accel refer to a \ref ShapeBVH instead of a \ref ShapeKDTree?
+    bool m_accel_bvh = false;
+
+    /// Top-level BVH over the instances of the scene (native CPU ray tracer only)
+    ShapeBVH *m_instance_accel = nullptr;
+
     ScalarBoundingBox3f m_bbox;
 
     host_vector<ref<Emitter>, Float> m_emitters;
@@ -220,6 +252,9 @@ protected:
     ref<Integrator> m_integrator;
     ref<Emitter> m_environment;
 
+    EmitterSamplingStrategy m_emitter_sampling;
+    DiscreteDistribution<Float> m_emitter_distr;
+
     bool m_shapes_grad_enabled;
 };
 
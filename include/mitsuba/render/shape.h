@@ -483,6 +483,17 @@ public:
     /// Return whether shape's parameters require gradients (default implementation return false)
     virtual bool parameters_grad_enabled() const;
 
+    /**
+     * \brief Return whether the geometry changed since the scene last updated
+     * its acceleration data structure
+     *
+     * Set by \ref parameters_changed() and cleared by \ref Scene::parameters_changed().
+     */
+    bool geometry_dirty() const { return m_geometry_dirty; }
+
+    /// Set or clear the flag returned by \ref geometry_dirty()
+    void set_geometry_dirty(bool dirty) { m_geometry_dirty = dirty; }
+
     //! @}
     // =============================================================
 
@@ -509,6 +520,9 @@ protected:
     ScalarTransform4f m_to_world;
     ScalarTransform4f m_to_object;
 
+    /// See \ref geometry_dirty()
+    bool m_geometry_dirty = false;
+
 #if defined(MTS_ENABLE_OPTIX)
     /// OptiX hitgroup data buffer
     void* m_optix_data_ptr = nullptr;
@@ -188,6 +188,12 @@ public:
     /// Does this texture evaluation depend on the UV coordinates
     virtual bool is_spatially_varying() const { return false; }
 
+    /**
+     * \brief Does the texture require texture-space differentials
+     * (<tt>si.duv_dx</tt> and <tt>si.duv_dy</tt>) to filter its lookups?
+     */
+    virtual bool needs_differentials() const { return false; }
+
     /// Convenience method returning the standard D65 illuminant.
     static ref<Texture> D65(ScalarFloat scale = 1.f);
 
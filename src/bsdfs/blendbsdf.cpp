@@ -53,7 +53,7 @@ The following XML snippet describes the material shown above:
 template <typename Float, typename Spectrum>
 class BlendBSDF final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES(Texture)
 
     BlendBSDF(const Properties &props) : Base(props) {
@@ -78,6 +78,7 @@ public:
                 m_components.push_back(m_nested_bsdf[i]->flags(j));
 
         m_flags = m_nested_bsdf[0]->flags() | m_nested_bsdf[1]->flags();
+        m_flags = m_flags | differential_flags(props);
     }
 
     std::pair<BSDFSample3f, Spectrum> sample(const BSDFContext &ctx,
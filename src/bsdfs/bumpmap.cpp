@@ -63,7 +63,7 @@ map. Note the we set the ``raw`` properties of the bump map ``bitmap`` object to
 template <typename Float, typename Spectrum>
 class BumpMap final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES(Texture)
 
     BumpMap(const Properties &props) : Base(props) {
@@ -95,6 +95,7 @@ public:
         for (size_t i = 0; i < m_nested_bsdf->component_count(); ++i)
             m_components.push_back(m_nested_bsdf->flags(i));
         m_flags = m_nested_bsdf->flags();
+        m_flags = m_flags | differential_flags(props);
     }
 
     std::pair<BSDFSample3f, Spectrum> sample(const BSDFContext &ctx,
@@ -194,12 +194,13 @@ the computation of Fresnel reflectances and produces an idealized
 template <typename Float, typename Spectrum>
 class SmoothConductor final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES(Texture)
 
     SmoothConductor(const Properties &props) : Base(props) {
         m_flags = BSDFFlags::DeltaReflection | BSDFFlags::FrontSide;
         m_components.push_back(m_flags);
+        m_flags = m_flags | differential_flags(props);
 
         m_specular_reflectance = props.texture<Texture>("specular_reflectance", 1.f);
 
@@ -168,7 +168,7 @@ parameter:
 template <typename Float, typename Spectrum>
 class SmoothDielectric final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES(Texture)
 
     SmoothDielectric(const Properties &props) : Base(props) {
@@ -196,6 +196,7 @@ public:
                                BSDFFlags::BackSide | BSDFFlags::NonSymmetric);
 
         m_flags = m_components[0] | m_components[1];
+        m_flags = m_flags | differential_flags(props);
     }
 
     std::pair<BSDFSample3f, Spectrum> sample(const BSDFContext &ctx,
@@ -66,13 +66,14 @@ Alternatively, the reflectance can be textured:
 template <typename Float, typename Spectrum>
 class SmoothDiffuse final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES(Texture)
 
     SmoothDiffuse(const Properties &props) : Base(props) {
         m_reflectance = props.texture<Texture>("reflectance", .5f);
         m_flags = BSDFFlags::DiffuseReflection | BSDFFlags::FrontSide;
         m_components.push_back(m_flags);
+        m_flags = m_flags | differential_flags(props);
     }
 
     std::pair<BSDFSample3f, Spectrum> sample(const BSDFContext &ctx,
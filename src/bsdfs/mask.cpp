@@ -62,7 +62,7 @@ The following XML snippet describes a material configuration for a transparent l
 template <typename Float, typename Spectrum>
 class MaskBSDF final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, component_count, m_components, m_flags)
+    MTS_IMPORT_BASE(BSDF, component_count, m_components, m_flags, differential_flags)
     MTS_IMPORT_TYPES(Texture)
 
     MaskBSDF(const Properties &props) : Base(props) {
@@ -88,6 +88,7 @@ public:
         // The "transmission" BSDF component is at the last index.
         m_components.push_back(BSDFFlags::Null | BSDFFlags::FrontSide | BSDFFlags::BackSide);
         m_flags = m_nested_bsdf->flags() | m_components.back();
+        m_flags = m_flags | differential_flags(props);
     }
 
     std::pair<BSDFSample3f, Spectrum> sample(const BSDFContext &ctx,
@@ -64,7 +64,7 @@ transformation from sRGB to linear encoding:
 template <typename Float, typename Spectrum>
 class NormalMap final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES(Texture)
 
     NormalMap(const Properties &props) : Base(props) {
@@ -90,6 +90,7 @@ public:
             m_components.push_back((m_nested_bsdf->flags(i)));
             m_flags |= m_components.back();
         }
+        m_flags = m_flags | differential_flags(props);
     }
 
     std::pair<BSDFSample3f, Spectrum> sample(const BSDFContext &ctx,
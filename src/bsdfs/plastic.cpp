@@ -130,7 +130,7 @@ with a layer of varnish.
 template <typename Float, typename Spectrum>
 class SmoothPlastic final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES(Texture)
 
     SmoothPlastic(const Properties &props) : Base(props) {
@@ -156,6 +156,7 @@ public:
         m_components.push_back(BSDFFlags::DeltaReflection | BSDFFlags::FrontSide);
         m_components.push_back(BSDFFlags::DiffuseReflection | BSDFFlags::FrontSide);
         m_flags = m_components[0] | m_components[1];
+        m_flags = m_flags | differential_flags(props);
 
         parameters_changed();
     }
@@ -52,7 +52,7 @@ transparent material similar to the :ref:`null <bsdf-null>` BSDF plugin.
 template <typename Float, typename Spectrum>
 class LinearRetarder final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES(Texture)
 
     LinearRetarder(const Properties &props) : Base(props) {
@@ -62,6 +62,7 @@ public:
 
         m_flags = BSDFFlags::FrontSide | BSDFFlags::BackSide | BSDFFlags::Null;
         m_components.push_back(m_flags);
+        m_flags = m_flags | differential_flags(props);
     }
 
     std::pair<BSDFSample3f, Spectrum> sample(const BSDFContext &ctx, const SurfaceInteraction3f &si,
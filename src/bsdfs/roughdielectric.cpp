@@ -136,7 +136,7 @@ to significantly slower convergence.
 template <typename Float, typename Spectrum>
 class RoughDielectric final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES(Texture, MicrofacetDistribution)
 
     RoughDielectric(const Properties &props) : Base(props) {
@@ -192,6 +192,7 @@ public:
         m_components.push_back(BSDFFlags::GlossyTransmission | BSDFFlags::FrontSide |
                                BSDFFlags::BackSide | BSDFFlags::NonSymmetric | extra);
         m_flags = m_components[0] | m_components[1];
+        m_flags = m_flags | differential_flags(props);
 
         parameters_changed();
     }
@@ -142,7 +142,7 @@ of this parameter given in the :ref:`plastic <bsdf-plastic>` plugin section.
 template <typename Float, typename Spectrum>
 class RoughPlastic final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES(Texture, MicrofacetDistribution)
 
     RoughPlastic(const Properties &props) : Base(props) {
@@ -178,6 +178,7 @@ public:
         m_components.push_back(BSDFFlags::GlossyReflection | BSDFFlags::FrontSide);
         m_components.push_back(BSDFFlags::DiffuseReflection | BSDFFlags::FrontSide);
         m_flags =  m_components[0] | m_components[1];
+        m_flags = m_flags | differential_flags(props);
 
         parameters_changed();
     }
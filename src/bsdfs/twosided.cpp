@@ -57,7 +57,7 @@ The following snippet describes a two-sided diffuse material:
 template <typename Float, typename Spectrum>
 class TwoSidedBRDF final : public BSDF<Float, Spectrum> {
 public:
-    MTS_IMPORT_BASE(BSDF, m_flags, m_components)
+    MTS_IMPORT_BASE(BSDF, m_flags, m_components, differential_flags)
     MTS_IMPORT_TYPES()
 
     TwoSidedBRDF(const Properties &props) : Base(props) {
@@ -86,6 +86,7 @@ public:
             m_components.push_back(c | BSDFFlags::BackSide);
             m_flags = m_flags | m_components.back();
         }
+        m_flags = m_flags | differential_flags(props);
 
         if (has_flag(m_flags, BSDFFlags::Transmission))
             Throw("Only materials without a transmission component can be nested!");
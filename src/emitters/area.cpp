@@ -188,6 +188,24 @@ public:
 
     ScalarBoundingBox3f bbox() const override { return m_shape->bbox(); }
 
+    ScalarFloat power_estimate() const override {
+        if (!m_shape)
+            return 0.f;
+
+        ScalarFloat radiance;
+        try {
+            radiance = m_radiance->mean();
+        } catch (const std::exception &) {
+            // Not all textures can compute their mean (e.g. mesh attributes)
+            Log(Warn, "Texture %s cannot report its mean value, assuming unit radiance "
+                      "for the power estimate of this emitter.",
+                m_radiance->class_()->name());
+            radiance = 1.f;
+        }
+
+        return radiance * m_shape->surface_area() * math::Pi<ScalarFloat>;
+    }
+
     void traverse(TraversalCallback *callback) override {
         callback->put_object("radiance", m_radiance.get());
     }
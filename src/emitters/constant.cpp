@@ -116,6 +116,10 @@ public:
         return ScalarBoundingBox3f();
     }
 
+    ScalarFloat power_estimate() const override {
+        return m_radiance->mean() * 4.f * sqr(math::Pi<ScalarFloat> * m_bsphere.radius);
+    }
+
     void traverse(TraversalCallback *callback) override {
         callback->put_object("radiance", m_radiance.get());
     }
@@ -146,6 +146,10 @@ public:
         return ScalarBoundingBox3f();
     }
 
+    ScalarFloat power_estimate() const override {
+        return m_irradiance->mean() * math::Pi<ScalarFloat> * sqr(m_bsphere.radius);
+    }
+
     void traverse(TraversalCallback *callback) override {
         callback->put_object("irradiance", m_irradiance.get());
     }
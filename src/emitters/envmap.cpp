@@ -1,3 +1,4 @@
+#include <mitsuba/core/asset_cache.h>
 #include <mitsuba/core/bitmap.h>
 #include <mitsuba/core/bsphere.h>
 #include <mitsuba/core/distr_2d.h>
@@ -74,7 +75,10 @@ public:
         FileResolver *fs = Thread::thread()->file_resolver();
         fs::path file_path = fs->resolve(props.string("filename"));
 
-        ref<Bitmap> bitmap = new Bitmap(file_path);
+        ref<Bitmap> bitmap = AssetCache::get_or_load<Bitmap>(
+            "bitmap:" + AssetCache::file_key(file_path),
+            [&]() { return new Bitmap(file_path); },
+            [](const Bitmap *value) { return value->buffer_size(); });
 
         /* Convert to linear RGBA float bitmap, will undergo further
            conversion into coefficients of a spectral upsampling model below */
@@ -86,6 +90,7 @@ public:
         ScalarFloat *ptr     = (ScalarFloat *) bitmap->data(),
                     *lum_ptr = (ScalarFloat *) luminance.get();
 
+        double lum_accum = 0.0, sin_theta_accum = 0.0;
         for (size_t y = 0; y < bitmap->size().y(); ++y) {
             ScalarFloat sin_theta =
                 std::sin(y / ScalarFloat(bitmap->size().y() - 1) * math::Pi<ScalarFloat>);
@@ -111,11 +116,14 @@ public:
                 }
 
                 *lum_ptr++ = lum * sin_theta;
+                lum_accum += (double) (lum * sin_theta);
+                sin_theta_accum += (double) sin_theta;
                 store_unaligned(ptr, coeff);
                 ptr += 4;
             }
         }
 
+        m_mean_luminance = ScalarFloat(lum_accum / sin_theta_accum);
         m_resolution = bitmap->size();
         m_data = DynamicBuffer<Float>::copy(bitmap->data(), hprod(m_resolution) * 4);
 
@@ -213,6 +221,10 @@ public:
         return ScalarBoundingBox3f();
     }
 
+    ScalarFloat power_estimate() const override {
+        return m_scale * m_mean_luminance * 4.f * sqr(math::Pi<ScalarFloat> * m_bsphere.radius);
+    }
+
     void traverse(TraversalCallback *callback) override {
         callback->put_parameter("scale", m_scale);
         callback->put_parameter("data", m_data);
@@ -228,7 +240,7 @@ public:
             ScalarFloat *ptr     = (ScalarFloat *) m_data.data(),
                         *lum_ptr = (ScalarFloat *) luminance.get();
 
-
+            double lum_accum = 0.0, sin_theta_accum = 0.0;
             for (size_t y = 0; y < m_resolution.y(); ++y) {
                 ScalarFloat sin_theta =
                     std::sin(y / ScalarFloat(m_resolution.y() - 1) * math::Pi<ScalarFloat>);
@@ -247,10 +259,13 @@ public:
                     }
 
                     *lum_ptr++ = lum * sin_theta;
+                    lum_accum += (double) (lum * sin_theta);
+                    sin_theta_accum += (double) sin_theta;
                     ptr += 4;
                 }
             }
 
+            m_mean_luminance = ScalarFloat(lum_accum / sin_theta_accum);
             m_warp = Warp(luminance.get(), m_resolution);
         }
     }
@@ -327,6 +342,7 @@ protected:
     Warp m_warp;
     ref<Texture> m_d65;
     ScalarFloat m_scale;
+    ScalarFloat m_mean_luminance;
 };
 
 MTS_IMPLEMENT_CLASS_VARIANT(EnvironmentMapEmitter, Emitter)
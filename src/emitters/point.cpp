@@ -120,6 +120,10 @@ public:
         return m_world_transform->translation_bounds();
     }
 
+    ScalarFloat power_estimate() const override {
+        return 4.f * math::Pi<ScalarFloat> * m_intensity->mean();
+    }
+
     void traverse(TraversalCallback *callback) override {
         callback->put_object("intensity", m_intensity.get());
     }
@@ -171,6 +171,11 @@ public:
         return m_world_transform->translation_bounds();
     }
 
+    ScalarFloat power_estimate() const override {
+        return 2.f * math::Pi<ScalarFloat> * (1.f - m_cos_cutoff_angle) *
+               m_intensity->mean() * m_texture->mean();
+    }
+
     void traverse(TraversalCallback *callback) override {
         callback->put_object("intensity", m_intensity.get());
         callback->put_object("texture", m_texture.get());
@@ -202,12 +202,34 @@ public:
         m_storage->set_offset(m_crop_offset);
         m_storage->clear();
         m_channels = channels;
+
+        int rows = m_storage->size().y() + 2 * m_storage->border_size();
+        m_band_count = (rows + BandHeight - 1) / BandHeight;
+        m_band_mutexes = std::unique_ptr<std::mutex[]>(new std::mutex[m_band_count]);
     }
 
     void put(const ImageBlock *block) override {
         Assert(m_storage != nullptr);
-        std::lock_guard<std::mutex> lock(m_mutex);
-        m_storage->put(block);
+
+        if constexpr (is_cuda_array_v<Float> || is_diff_array_v<Float>) {
+            std::lock_guard<std::mutex> lock(m_mutex);
+            m_storage->put(block);
+        } else {
+            /* Only lock the horizontal bands of the storage that overlap the
+               block, one at a time. Threads working on different parts of
+               the image thus rarely wait for each other. */
+            int storage_begin = m_storage->offset().y() - m_storage->border_size(),
+                row_begin     = block->offset().y() - block->border_size() - storage_begin,
+                row_end       = row_begin + block->size().y() + 2 * block->border_size();
+
+            int band_begin = std::max(row_begin, 0) / BandHeight,
+                band_end   = std::min((row_end + BandHeight - 1) / BandHeight, m_band_count);
+
+            for (int band = band_begin; band < band_end; ++band) {
+                std::lock_guard<std::mutex> lock(m_band_mutexes[band]);
+                m_storage->put(block, band * BandHeight, (band + 1) * BandHeight);
+            }
+        }
     }
 
     bool develop(const ScalarPoint2i  &source_offset,
@@ -386,6 +408,11 @@ protected:
     ref<ImageBlock> m_storage;
     std::mutex m_mutex;
     std::vector<std::string> m_channels;
+
+    /// Number of storage rows protected by each mutex in \ref put()
+    static constexpr int BandHeight = 8;
+    std::unique_ptr<std::mutex[]> m_band_mutexes;
+    int m_band_count = 0;
 };
 
 MTS_IMPLEMENT_CLASS_VARIANT(HDRFilm, Film)
@@ -142,3 +142,57 @@ def test03_develop(variant_scalar_rgb, file_format, tmpdir):
             assert ek.allclose(img[:, :, :3], contents[:, :, :3], atol=1e-5)
         # Alpha channel was ignored, alpha and weights should default to 1.0.
         assert ek.allclose(img[:, :, 3:5], 1.0, atol=1e-6)
+
+
+@pytest.mark.slow
+def test04_put_benchmark(variant_scalar_rgb):
+    """Measures how the time to accumulate image blocks into the film scales
+    with the number of threads calling Film.put() concurrently."""
+    from mitsuba.core.xml import load_string
+    from mitsuba.render import ImageBlock
+    from concurrent.futures import ThreadPoolExecutor
+    from timeit import default_timer
+    import numpy as np
+
+    film = load_string("""<film version="2.0.0" type="hdrfilm">
+            <integer name="width" value="1024"/>
+            <integer name="height" value="1024"/>
+        </film>""")
+    block_size, channels = 16, ['X', 'Y', 'Z', 'A', 'W']
+    offsets = [(x, y) for y in range(0, 1024, block_size)
+                      for x in range(0, 1024, block_size)]
+
+    def make_block(offset):
+        block = ImageBlock([block_size, block_size], len(channels),
+                           film.reconstruction_filter())
+        block.set_offset(offset)
+        block.clear()
+        block.put([offset[0] + 0.5, offset[1] + 0.5], [1.0] * len(channels))
+        return block
+
+    blocks = [make_block(o) for o in offsets]
+    repetitions = 4
+
+    timings, reference = {}, None
+    for thread_count in [1, 2, 4, 8]:
+        film.prepare(channels)
+
+        def work(i):
+            for block in blocks[i::thread_count]:
+                for _ in range(repetitions):
+                    film.put(block)
+
+        with ThreadPoolExecutor(max_workers=thread_count) as pool:
+            start = default_timer()
+            list(pool.map(work, range(thread_count)))
+            timings[thread_count] = default_timer() - start
+
+        # No contribution may be lost due to concurrent accumulation
+        image = np.array(film.bitmap(raw=True), copy=True)
+        if reference is None:
+            reference = image
+        assert ek.allclose(image, reference, atol=1e-5)
+
+    for thread_count, t in timings.items():
+        print('Film.put(): %i thread(s), %i blocks: %.3f s (%.2fx)' % (
+            thread_count, repetitions * len(blocks), t, timings[1] / t))
@@ -0,0 +1,110 @@
+#include <mitsuba/core/asset_cache.h>
+#include <mitsuba/core/logger.h>
+#include <mitsuba/core/util.h>
+#include <iterator>
+#include <list>
+#include <mutex>
+#include <unordered_map>
+
+NAMESPACE_BEGIN(mitsuba)
+
+struct CacheEntry {
+    std::string key;
+    ref<Object> value;
+    size_t size;
+};
+
+static std::mutex cache_mutex;
+/// Cache entries, sorted from most to least recently used
+static std::list<CacheEntry> cache_list;
+static std::unordered_map<std::string, std::list<CacheEntry>::iterator> cache_map;
+static AssetCache::Statistics cache_stats;
+
+/**
+ * Evict the least recently used entries until \c size bytes are available.
+ * The entries are moved into \c evicted, so that the caller can release them
+ * after unlocking the mutex (their destructors might access the cache).
+ */
+static void cache_evict(size_t size, std::list<CacheEntry> &evicted) {
+    while (!cache_list.empty() && cache_stats.size + size > cache_stats.capacity) {
+        const CacheEntry &entry = cache_list.back();
+        Log(Debug, "Evicting \"%s\" (%s) from the asset cache", entry.key,
+            util::mem_string(entry.size));
+        cache_stats.size -= entry.size;
+        cache_stats.evictions++;
+        cache_map.erase(entry.key);
+        evicted.splice(evicted.begin(), cache_list, std::prev(cache_list.end()));
+    }
+}
+
+ref<Object> AssetCache::get(const std::string &key) {
+    std::lock_guard<std::mutex> guard(cache_mutex);
+    auto it = cache_map.find(key);
+    if (it == cache_map.end()) {
+        cache_stats.misses++;
+        return nullptr;
+    }
+    cache_stats.hits++;
+    cache_list.splice(cache_list.begin(), cache_list, it->second);
+    return it->second->value;
+}
+
+void AssetCache::put(const std::string &key, Object *value, size_t size) {
+    std::list<CacheEntry> evicted;
+    std::lock_guard<std::mutex> guard(cache_mutex);
+    if (size > cache_stats.capacity)
+        return;
+
+    auto it = cache_map.find(key);
+    if (it != cache_map.end()) {
+        cache_stats.size -= it->second->size;
+        evicted.splice(evicted.begin(), cache_list, it->second);
+        cache_map.erase(it);
+    }
+
+    cache_evict(size, evicted);
+    cache_list.push_front(CacheEntry{ key, value, size });
+    cache_map[key] = cache_list.begin();
+    cache_stats.size += size;
+}
+
+void AssetCache::purge() {
+    std::list<CacheEntry> evicted;
+    std::lock_guard<std::mutex> guard(cache_mutex);
+    evicted.swap(cache_list);
+    cache_map.clear();
+    cache_stats.size = 0;
+}
+
+void AssetCache::set_capacity(size_t capacity) {
+    std::list<CacheEntry> evicted;
+    std::lock_guard<std::mutex> guard(cache_mutex);
+    cache_stats.capacity = capacity;
+    cache_evict(0, evicted);
+}
+
+size_t AssetCache::capacity() {
+    std::lock_guard<std::mutex> guard(cache_mutex);
+    return cache_stats.capacity;
+}
+
+AssetCache::Statistics AssetCache::statistics() {
+    std::lock_guard<std::mutex> guard(cache_mutex);
+    Statistics stats = cache_stats;
+    stats.entries = cache_list.size();
+    return stats;
+}
+
+std::string AssetCache::file_key(const fs::path &path) {
+    // Let the caller report missing files
+    if (!fs::exists(path))
+        return path.string();
+    return tfm::format("%s:%i:%i", fs::absolute(path).string(),
+                       fs::file_size(path), fs::last_write_time(path));
+}
+
+void AssetCache::static_shutdown() {
+    purge();
+}
+
+NAMESPACE_END(mitsuba)
@@ -6,11 +6,19 @@
 #include <mitsuba/core/rfilter.h>
 #include <mitsuba/core/transform.h>
 #include <mitsuba/core/fstream.h>
+#include <mitsuba/core/thread.h>
 #include <tbb/tbb.h>
+#include <atomic>
+#include <condition_variable>
+#include <deque>
+#include <mutex>
+#include <set>
 #include <unordered_map>
+#include <unordered_set>
 
 /* libpng */
 #include <png.h>
+#include <zlib.h>
 
 /* libjpeg */
 extern "C" {
@@ -806,26 +814,176 @@ void Bitmap::write(Stream *stream, FileFormat format, int quality) const {
     }
 }
 
-void Bitmap::write_async(const fs::path &path_, FileFormat format_, int quality_) const {
-    class WriteTask : public tbb::task {
-        ref<const Bitmap> bitmap;
-        fs::path path;
-        FileFormat format;
-        int quality;
+// -----------------------------------------------------------------------------
+//   Asynchronous bitmap output
+// -----------------------------------------------------------------------------
+
+/// Write operation issued by \ref Bitmap::write_async()
+struct WriteJob {
+    ref<const Bitmap> bitmap;
+    fs::path path;
+    Bitmap::FileFormat format;
+    int quality;
+    /// Sequence number of the job
+    size_t index;
+    std::promise<void> promise;
+};
+
+/// State of the writer threads executing asynchronous writes
+struct WriteQueue {
+    std::mutex mutex;
+    /// Signaled when a job is queued or a target file is no longer being written
+    std::condition_variable job_available;
+    /// Signaled when a job has completed
+    std::condition_variable job_done;
+    /// Queued jobs in the order in which they were issued
+    std::deque<WriteJob> jobs;
+    /// Target files of the jobs that are currently being executed
+    std::unordered_set<std::string> active_paths;
+    /// Sequence numbers of the queued jobs and of the jobs being executed
+    std::set<size_t> pending;
+    /// Total number of jobs issued so far
+    size_t issued = 0;
+    size_t capacity = 4;
+    size_t thread_count = 2;
+    std::vector<ref<Thread>> threads;
+    bool stop = false;
+};
+
+static WriteQueue write_queue;
+
+/**
+ * \brief Thread executing asynchronous writes
+ *
+ * Jobs are taken in the order in which they were issued, except that jobs
+ * writing to a file that is currently being written by another thread are
+ * deferred. Writes to the same file therefore complete in issue order.
+ */
+class WriterThread : public Thread {
+public:
+    WriterThread(size_t index) : Thread(tfm::format("wrt%i", index)) { }
+
+protected:
+    void run() override {
+        std::unique_lock<std::mutex> lock(write_queue.mutex);
+        while (true) {
+            auto it = write_queue.jobs.end();
+            write_queue.job_available.wait(lock, [&]() {
+                it = std::find_if(write_queue.jobs.begin(), write_queue.jobs.end(),
+                    [](const WriteJob &job) {
+                        return write_queue.active_paths.count(job.path.string()) == 0;
+                    });
+                return it != write_queue.jobs.end() ||
+                       (write_queue.stop && write_queue.jobs.empty());
+            });
+            if (it == write_queue.jobs.end())
+                break;
 
-    public:
-        WriteTask(const Bitmap *bitmap, fs::path path, FileFormat format, int quality)
-            : bitmap(bitmap), path(path), format(format), quality(quality) { }
+            WriteJob job = std::move(*it);
+            write_queue.jobs.erase(it);
+            std::string path = job.path.string();
+            size_t index = job.index;
+            write_queue.active_paths.insert(path);
+            lock.unlock();
+
+            try {
+                job.bitmap->write(job.path, job.format, job.quality);
+                job.promise.set_value();
+            } catch (const std::exception &e) {
+                // Callers that don't wait for the result would otherwise never see the error
+                Log(Warn, "Bitmap::write_async(): could not write \"%s\": %s", path, e.what());
+                job.promise.set_exception(std::current_exception());
+            } catch (...) {
+                job.promise.set_exception(std::current_exception());
+            }
+            job.bitmap = nullptr;
 
-        tbb::task* execute() override {
-            bitmap->write(path, format, quality);
-            return nullptr;
+            lock.lock();
+            write_queue.active_paths.erase(path);
+            write_queue.pending.erase(index);
+            write_queue.job_available.notify_all();
+            write_queue.job_done.notify_all();
         }
-    };
+    }
+};
+
+/// Wait for the completion of all jobs and stop the writer threads (the mutex must be held)
+static void write_queue_stop(std::unique_lock<std::mutex> &lock) {
+    write_queue.stop = true;
+    write_queue.job_available.notify_all();
+    std::vector<ref<Thread>> threads = std::move(write_queue.threads);
+    write_queue.threads.clear();
+
+    lock.unlock();
+    for (Thread *thread : threads)
+        thread->join();
+    lock.lock();
+    write_queue.stop = false;
+    write_queue.job_done.notify_all();
+}
+
+Bitmap::WriteFuture Bitmap::write_async(const fs::path &path, FileFormat format,
+                                        int quality) const {
+    std::unique_lock<std::mutex> lock(write_queue.mutex);
+
+    // Backpressure: wait until the bitmap can be queued
+    write_queue.job_done.wait(lock, [&]() {
+        return !write_queue.stop && write_queue.pending.size() < write_queue.capacity;
+    });
 
-    WriteTask *t = new (tbb::task::allocate_root())
-        WriteTask(this, path_, format_, quality_);
-    tbb::task::enqueue(*t);
+    if (write_queue.threads.empty()) {
+        for (size_t i = 0; i < write_queue.thread_count; ++i) {
+            ref<Thread> thread = new WriterThread(i);
+            thread->start();
+            write_queue.threads.push_back(thread);
+        }
+    }
+
+    size_t index = write_queue.issued++;
+    WriteJob job { this, path, format, quality, index, std::promise<void>() };
+    WriteFuture future = job.promise.get_future().share();
+    write_queue.jobs.push_back(std::move(job));
+    write_queue.pending.insert(index);
+    write_queue.job_available.notify_all();
+    return future;
+}
+
+void Bitmap::flush_async_writes() {
+    std::unique_lock<std::mutex> lock(write_queue.mutex);
+    size_t issued = write_queue.issued;
+    // Jobs issued after this point are not waited for
+    write_queue.job_done.wait(lock, [&]() {
+        return write_queue.pending.empty() || *write_queue.pending.begin() >= issued;
+    });
+}
+
+void Bitmap::set_write_queue_capacity(size_t capacity) {
+    if (capacity == 0)
+        Throw("Bitmap::set_write_queue_capacity(): the capacity must be at least 1!");
+    std::lock_guard<std::mutex> guard(write_queue.mutex);
+    write_queue.capacity = capacity;
+    write_queue.job_done.notify_all();
+}
+
+size_t Bitmap::write_queue_capacity() {
+    std::lock_guard<std::mutex> guard(write_queue.mutex);
+    return write_queue.capacity;
+}
+
+void Bitmap::set_write_thread_count(size_t count) {
+    if (count == 0)
+        Throw("Bitmap::set_write_thread_count(): at least one thread is required!");
+    std::unique_lock<std::mutex> lock(write_queue.mutex);
+    if (count == write_queue.thread_count)
+        return;
+    // The threads are restarted with the new count by the next write
+    write_queue_stop(lock);
+    write_queue.thread_count = count;
+}
+
+size_t Bitmap::write_thread_count() {
+    std::lock_guard<std::mutex> guard(write_queue.mutex);
+    return write_queue.thread_count;
 }
 
 bool Bitmap::operator==(const Bitmap &bitmap) const {
@@ -916,12 +1074,19 @@ private:
     ref<Stream> m_stream;
 };
 
+/// Resize the global thread pool of OpenEXR to the I/O thread count and return the latter
+static int exr_thread_count() {
+    int thread_count = (int) Bitmap::io_thread_count();
+    if (Imf::globalThreadCount() != thread_count)
+        Imf::setGlobalThreadCount(thread_count);
+    return thread_count;
+}
+
 void Bitmap::read_openexr(Stream *stream) {
-    if (Imf::globalThreadCount() == 0)
-        Imf::setGlobalThreadCount(std::min(8, util::core_count()));
+    int thread_count = exr_thread_count();
 
     EXRIStream istr(stream);
-    Imf::InputFile file(istr);
+    Imf::InputFile file(istr, thread_count);
 
     const Imf::Header &header = file.header();
     const Imf::ChannelList &channels = header.channels();
@@ -1279,8 +1444,7 @@ void Bitmap::read_openexr(Stream *stream) {
 }
 
 void Bitmap::write_openexr(Stream *stream, int quality) const {
-    if (Imf::globalThreadCount() == 0)
-        Imf::setGlobalThreadCount(std::min(8, util::core_count()));
+    int thread_count = exr_thread_count();
 
     PixelFormat pixel_format = m_pixel_format;
 
@@ -1378,7 +1542,8 @@ void Bitmap::write_openexr(Stream *stream, int quality) const {
     }
 
     EXROStream ostr(stream);
-    Imf::OutputFile file(ostr, header);
+    // Chunks of scanlines are compressed in parallel
+    Imf::OutputFile file(ostr, header, thread_count);
     file.setFrameBuffer(framebuffer);
     file.writePixels((int) m_size.y());
 }
@@ -1724,10 +1889,85 @@ void Bitmap::read_png(Stream *stream) {
     delete[] rows;
 }
 
+/// Paeth predictor used by the PNG filter type 4
+static inline uint8_t png_paeth(int a, int b, int c) {
+    int p = a + b - c,
+        pa = std::abs(p - a),
+        pb = std::abs(p - b),
+        pc = std::abs(p - c);
+    if (pa <= pb && pa <= pc)
+        return (uint8_t) a;
+    else if (pb <= pc)
+        return (uint8_t) b;
+    else
+        return (uint8_t) c;
+}
+
+/// Prediction of the byte \c i of a row by one of the PNG filter types
+template <int Type>
+static inline uint8_t png_predict(const uint8_t *row, const uint8_t *prev,
+                                  size_t i, size_t bpp) {
+    int a = i >= bpp ? row[i - bpp] : 0,
+        b = prev[i];
+    if constexpr (Type == 0)
+        return 0;
+    else if constexpr (Type == 1)
+        return (uint8_t) a;
+    else if constexpr (Type == 2)
+        return (uint8_t) b;
+    else if constexpr (Type == 3)
+        return (uint8_t) ((a + b) >> 1);
+    else
+        return png_paeth(a, b, i >= bpp ? prev[i - bpp] : 0);
+}
+
+/// Invoke \c func with the PNG filter type as a compile-time constant
+template <typename Func> static void png_dispatch_filter(int type, Func func) {
+    switch (type) {
+        case 0: func(std::integral_constant<int, 0>()); break;
+        case 1: func(std::integral_constant<int, 1>()); break;
+        case 2: func(std::integral_constant<int, 2>()); break;
+        case 3: func(std::integral_constant<int, 3>()); break;
+        default: func(std::integral_constant<int, 4>()); break;
+    }
+}
+
+/**
+ * Filter a row of a PNG image using the filter type that minimizes the sum of
+ * the absolute values of the filtered bytes (the heuristic used by libpng).
+ * Writes the filter type followed by the filtered bytes to \c out. The previous
+ * row \c prev is filled with zeros for the first row of the image.
+ */
+static void png_filter_row(const uint8_t *row, const uint8_t *prev,
+                           size_t row_bytes, size_t bpp, uint8_t *out) {
+    int best_type = 0;
+    size_t best_sum = std::numeric_limits<size_t>::max();
+    for (int type = 0; type < 5; ++type) {
+        png_dispatch_filter(type, [&](auto type_) {
+            constexpr int Type = decltype(type_)::value;
+            size_t sum = 0;
+            for (size_t i = 0; i < row_bytes && sum < best_sum; ++i) {
+                int8_t value = (int8_t) (uint8_t) (row[i] - png_predict<Type>(row, prev, i, bpp));
+                sum += (size_t) std::abs((int) value);
+            }
+            if (sum < best_sum) {
+                best_sum = sum;
+                best_type = Type;
+            }
+        });
+    }
+
+    out[0] = (uint8_t) best_type;
+    png_dispatch_filter(best_type, [&](auto type_) {
+        constexpr int Type = decltype(type_)::value;
+        for (size_t i = 0; i < row_bytes; ++i)
+            out[i + 1] = (uint8_t) (row[i] - png_predict<Type>(row, prev, i, bpp));
+    });
+}
+
 void Bitmap::write_png(Stream *stream, int compression) const {
     png_structp png_ptr;
     png_infop info_ptr;
-    volatile png_bytepp rows = nullptr;
 
     int color_type, bit_depth;
     switch (m_pixel_format) {
@@ -1800,24 +2040,132 @@ void Bitmap::write_png(Stream *stream, int compression) const {
 
     png_write_info(png_ptr, info_ptr);
 
+    size_t row_bytes = png_get_rowbytes(png_ptr, info_ptr),
+           height = m_size.y(),
+           bpp = m_struct->size();
+    Assert(row_bytes == buffer_size() / height);
+
+    bool swap = false;
     #if defined(LITTLE_ENDIAN)
-        if (m_component_format == Struct::Type::UInt16 || m_component_format == Struct::Type::Int16)
-            png_set_swap(png_ptr); // Swap the byte order on little endian machines
+        swap = bit_depth == 16; // PNG files store 16 bit values in big endian byte order
     #endif
 
-    rows = new png_bytep[m_size.y()];
+    /* libpng filters and compresses the image data sequentially. Instead,
+       stripes of rows are filtered and compressed in parallel as separate
+       parts of one zlib stream (each part ends at a byte boundary and is
+       primed with the preceding 32 KiB of data), and the resulting stream
+       is written as IDAT chunks. The stripe size is fixed so that the output
+       does not depend on the number of threads. */
+    const size_t window_size = 32768,
+                 stripe_rows = std::max((size_t) 1, ((size_t) 1 << 20) / (row_bytes + 1)),
+                 stripe_count = (height + stripe_rows - 1) / stripe_rows;
+
+    std::vector<std::vector<uint8_t>> stripes(stripe_count);
+    std::vector<uLong> stripe_adler(stripe_count);
+
+    // Filter rows [start, end) and append the result to 'out'
+    auto filter_rows = [&](size_t start, size_t end, std::vector<uint8_t> &out) {
+        std::unique_ptr<uint8_t[]> buf(new uint8_t[3 * row_bytes]);
+        uint8_t *zero = buf.get(), *swapped[2] = { zero + row_bytes, zero + 2 * row_bytes };
+        memset(zero, 0, row_bytes);
+
+        auto row = [&](size_t y, uint8_t *target) -> const uint8_t * {
+            const uint8_t *ptr = uint8_data() + y * row_bytes;
+            if (!swap)
+                return ptr;
+            for (size_t i = 0; i < row_bytes; i += 2) {
+                target[i] = ptr[i + 1];
+                target[i + 1] = ptr[i];
+            }
+            return target;
+        };
 
-    size_t row_bytes = png_get_rowbytes(png_ptr, info_ptr);
-    Assert(row_bytes == buffer_size() / m_size.y());
-    for (size_t i = 0; i < m_size.y(); i++)
-        rows[i] = &m_data[row_bytes * i];
+        size_t offset = out.size();
+        out.resize(offset + (end - start) * (row_bytes + 1));
+        const uint8_t *prev = start > 0 ? row(start - 1, swapped[1]) : zero;
+        for (size_t y = start, k = 0; y < end; ++y, k ^= 1) {
+            const uint8_t *cur = row(y, swapped[k]);
+            png_filter_row(cur, prev, row_bytes, bpp,
+                           out.data() + offset + (y - start) * (row_bytes + 1));
+            prev = cur;
+        }
+    };
 
-    png_write_image(png_ptr, rows);
-    png_write_end(png_ptr, info_ptr);
+    auto compress_stripe = [&](size_t i) {
+        size_t start = i * stripe_rows,
+               end = std::min(start + stripe_rows, height);
+        bool last = i + 1 == stripe_count;
+
+        // Filtered data preceding the stripe, used as the compression dictionary
+        std::vector<uint8_t> dict;
+        if (start > 0) {
+            size_t dict_rows = std::min(start, (window_size + row_bytes) / (row_bytes + 1));
+            filter_rows(start - dict_rows, start, dict);
+            if (dict.size() > window_size)
+                dict.erase(dict.begin(), dict.end() - window_size);
+        }
+
+        std::vector<uint8_t> filtered;
+        filter_rows(start, end, filtered);
+        stripe_adler[i] = adler32(adler32(0, nullptr, 0), filtered.data(), (uInt) filtered.size());
+
+        z_stream zs;
+        memset(&zs, 0, sizeof(z_stream));
+        if (deflateInit2(&zs, compression, Z_DEFLATED, -15, 8, Z_FILTERED) != Z_OK)
+            Throw("write_png(): could not initialize the compressor!");
+        if (!dict.empty())
+            deflateSetDictionary(&zs, dict.data(), (uInt) dict.size());
+
+        std::vector<uint8_t> &out = stripes[i];
+        out.resize(deflateBound(&zs, (uLong) filtered.size()) + 64);
+        zs.next_in = filtered.data();
+        zs.avail_in = (uInt) filtered.size();
+        zs.next_out = out.data();
+        zs.avail_out = (uInt) out.size();
+
+        // Only the last part terminates the stream, the others are byte-aligned
+        int rv = deflate(&zs, last ? Z_FINISH : Z_SYNC_FLUSH);
+        out.resize(zs.total_out);
+        deflateEnd(&zs);
+        if (rv != (last ? Z_STREAM_END : Z_OK) || zs.avail_in != 0)
+            Throw("write_png(): compression failed!");
+    };
+
+    tbb::task_arena arena((int) io_thread_count());
+    arena.execute([&] {
+        tbb::parallel_for(tbb::blocked_range<size_t>(0, stripe_count, 1),
+            [&](const tbb::blocked_range<size_t> &range) {
+                for (size_t i = range.begin(); i != range.end(); ++i)
+                    compress_stripe(i);
+            }
+        );
+    });
+
+    // zlib header (deflate with a 32 KiB window and the compression level hint)
+    int level = compression < 0 ? Z_DEFAULT_COMPRESSION : compression,
+        level_flag = level == Z_DEFAULT_COMPRESSION || level == 6 ? 2 :
+                     (level < 2 ? 0 : (level < 6 ? 1 : 3));
+    uint8_t header[2] = { 0x78, (uint8_t) (level_flag << 6) };
+    header[1] += (uint8_t) (31 - (header[0] * 256 + header[1]) % 31);
+    stripes.front().insert(stripes.front().begin(), header, header + 2);
+
+    // Checksum of the complete uncompressed data (big endian)
+    uLong adler = stripe_adler[0];
+    for (size_t i = 1; i < stripe_count; ++i) {
+        size_t rows = std::min(stripe_rows, height - i * stripe_rows);
+        adler = adler32_combine(adler, stripe_adler[i], (z_off_t) (rows * (row_bytes + 1)));
+    }
+    for (int i = 3; i >= 0; --i)
+        stripes.back().push_back((uint8_t) (adler >> (8 * i)));
+
+    for (const std::vector<uint8_t> &stripe : stripes)
+        png_write_chunk(png_ptr, (png_const_bytep) "IDAT", stripe.data(), stripe.size());
+
+    // The IDAT chunks were not written by libpng, which would refuse to finish the file
+    png_write_chunk(png_ptr, (png_const_bytep) "IEND", nullptr, 0);
     png_destroy_write_struct(&png_ptr, &info_ptr);
 
     delete[] text;
-    delete[] rows;
 }
 
 // -----------------------------------------------------------------------------
@@ -2479,11 +2827,27 @@ std::ostream &operator<<(std::ostream &os, Bitmap::AlphaTransform value) {
     return os;
 }
 
+/// Number of I/O threads requested via \ref Bitmap::set_io_thread_count() (0: one per core)
+static std::atomic<uint32_t> bitmap_io_thread_count { 0 };
+
+void Bitmap::set_io_thread_count(uint32_t count) {
+    bitmap_io_thread_count = count;
+}
+
+uint32_t Bitmap::io_thread_count() {
+    uint32_t count = bitmap_io_thread_count;
+    return count > 0 ? count : (uint32_t) util::core_count();
+}
+
 void Bitmap::static_initialization() {
     // No-op
 }
 
 void Bitmap::static_shutdown() {
+    /* critical section */ {
+        std::unique_lock<std::mutex> lock(write_queue.mutex);
+        write_queue_stop(lock);
+    }
     Imf::setGlobalThreadCount(0);
 }
 
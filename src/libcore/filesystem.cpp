@@ -133,6 +133,24 @@ size_t file_size(const path& p) {
     return (size_t) sb.st_size;
 }
 
+uint64_t last_write_time(const path& p) {
+#if defined(__WINDOWS__)
+    struct _stati64 sb;
+    if (_wstati64(p.native().c_str(), &sb) != 0)
+        throw std::runtime_error("filesystem::last_write_time(): cannot stat file \"" + p.string() + "\"!");
+    return (uint64_t) sb.st_mtime * 1000000000ull;
+#else
+    struct stat sb;
+    if (stat(p.native().c_str(), &sb) != 0)
+        throw std::runtime_error("filesystem::last_write_time(): cannot stat file \"" + p.string() + "\"!");
+#  if defined(__OSX__)
+    return (uint64_t) sb.st_mtimespec.tv_sec * 1000000000ull + (uint64_t) sb.st_mtimespec.tv_nsec;
+#  else
+    return (uint64_t) sb.st_mtim.tv_sec * 1000000000ull + (uint64_t) sb.st_mtim.tv_nsec;
+#  endif
+#endif
+}
+
 bool equivalent(const path& p1, const path& p2) {
 #if defined(__WINDOWS__)
     struct _stati64 sb1, sb2;
@@ -21,9 +21,11 @@ struct MemoryMappedFile::MemoryMappedFilePrivate {
     void *data;
     bool can_write;
     bool temp;
+    bool copy_on_write;
 
     MemoryMappedFilePrivate(const fs::path &f = "", size_t s = 0)
-        : filename(f), size(s), data(nullptr), can_write(false), temp(false) { }
+        : filename(f), size(s), data(nullptr), can_write(false), temp(false),
+          copy_on_write(false) { }
 
     void create() {
         #if defined(__LINUX__) || defined(__OSX__)
@@ -138,11 +140,13 @@ struct MemoryMappedFile::MemoryMappedFilePrivate {
         size = (size_t) fs::file_size(filename);
 
         #if defined(__LINUX__) || defined(__OSX__)
-            int fd = open(filename.string().c_str(), can_write ? O_RDWR : O_RDONLY);
+            int fd = open(filename.string().c_str(),
+                          (can_write && !copy_on_write) ? O_RDWR : O_RDONLY);
             if (fd == -1)
                 Throw("Could not open \"%s\"!", filename.string());
 
-            data = mmap(nullptr, size, PROT_READ | (can_write ? PROT_WRITE : 0), MAP_SHARED, fd, 0);
+            data = mmap(nullptr, size, PROT_READ | (can_write ? PROT_WRITE : 0),
+                        copy_on_write ? MAP_PRIVATE : MAP_SHARED, fd, 0);
             if (data == MAP_FAILED) {
                 data = nullptr;
                 Throw("Could not map \"%s\" to memory!", filename.string());
@@ -151,7 +155,8 @@ struct MemoryMappedFile::MemoryMappedFilePrivate {
             if (close(fd) != 0)
                 Throw("close(): unable to close file!");
         #elif defined(__WINDOWS__)
-            file = CreateFileW(filename.native().c_str(), GENERIC_READ | (can_write ? GENERIC_WRITE : 0),
+            file = CreateFileW(filename.native().c_str(),
+                GENERIC_READ | ((can_write && !copy_on_write) ? GENERIC_WRITE : 0),
                 FILE_SHARE_WRITE|FILE_SHARE_READ, nullptr, OPEN_EXISTING,
                 FILE_ATTRIBUTE_NORMAL, nullptr);
 
@@ -159,12 +164,16 @@ struct MemoryMappedFile::MemoryMappedFilePrivate {
                 Throw("Could not open \"%s\": %s", filename.string(),
                     util::last_error());
 
-            file_mapping = CreateFileMappingW(file, nullptr, can_write ? PAGE_READWRITE : PAGE_READONLY, 0, 0, nullptr);
+            file_mapping = CreateFileMappingW(file, nullptr,
+                copy_on_write ? PAGE_WRITECOPY : (can_write ? PAGE_READWRITE : PAGE_READONLY),
+                0, 0, nullptr);
             if (file_mapping == nullptr)
                 Throw("CreateFileMapping: Could not map \"%s\" to memory: %s",
                     filename.string(), util::last_error());
 
-            data = (void *) MapViewOfFile(file_mapping, can_write ? FILE_MAP_WRITE : FILE_MAP_READ, 0, 0, 0);
+            data = (void *) MapViewOfFile(file_mapping,
+                copy_on_write ? FILE_MAP_COPY : (can_write ? FILE_MAP_WRITE : FILE_MAP_READ),
+                0, 0, 0);
             if (data == nullptr)
                 Throw("MapViewOfFile: Could not map \"%s\" to memory: %s",
                     filename.string(), util::last_error());
@@ -240,6 +249,8 @@ MemoryMappedFile::~MemoryMappedFile() {
 void MemoryMappedFile::resize(size_t size) {
     if (!d->data)
         Throw("Internal error in MemoryMappedFile::resize()!");
+    if (d->copy_on_write)
+        Throw("MemoryMappedFile::resize(): copy-on-write mappings cannot be resized!");
     bool temp = d->temp;
     d->temp = false;
     d->unmap();
@@ -276,6 +287,17 @@ ref<MemoryMappedFile> MemoryMappedFile::create_temporary(size_t size) {
     return result;
 }
 
+ref<MemoryMappedFile> MemoryMappedFile::map_private(const fs::path &filename) {
+    ref<MemoryMappedFile> result = new MemoryMappedFile();
+    result->d->filename = filename;
+    result->d->can_write = true;
+    result->d->copy_on_write = true;
+    result->d->map();
+    Log(Trace, "Mapped \"%s\" into memory (copy-on-write, %s)..",
+        filename.filename().string(), util::mem_string(result->d->size));
+    return result;
+}
+
 std::string MemoryMappedFile::to_string() const {
     std::ostringstream oss;
     oss << "MemoryMappedFile[" << std::endl
@@ -0,0 +1,31 @@
+#include <mitsuba/core/asset_cache.h>
+#include <mitsuba/python/python.h>
+
+MTS_PY_EXPORT(AssetCache) {
+    auto cache = py::class_<AssetCache>(m, "AssetCache", D(AssetCache))
+        .def_static("get", &AssetCache::get, "key"_a, D(AssetCache, get))
+        .def_static("put", &AssetCache::put, "key"_a, "value"_a, "size"_a,
+                    D(AssetCache, put))
+        .def_static("purge", &AssetCache::purge, D(AssetCache, purge))
+        .def_static("set_capacity", &AssetCache::set_capacity, "capacity"_a,
+                    D(AssetCache, set_capacity))
+        .def_static("capacity", &AssetCache::capacity, D(AssetCache, capacity))
+        .def_static("statistics", &AssetCache::statistics, D(AssetCache, statistics))
+        .def_static("file_key", &AssetCache::file_key, "path"_a, D(AssetCache, file_key));
+
+    py::class_<AssetCache::Statistics>(cache, "Statistics", D(AssetCache, Statistics))
+        .def_readonly("hits", &AssetCache::Statistics::hits, D(AssetCache, Statistics, hits))
+        .def_readonly("misses", &AssetCache::Statistics::misses, D(AssetCache, Statistics, misses))
+        .def_readonly("evictions", &AssetCache::Statistics::evictions,
+                      D(AssetCache, Statistics, evictions))
+        .def_readonly("entries", &AssetCache::Statistics::entries,
+                      D(AssetCache, Statistics, entries))
+        .def_readonly("size", &AssetCache::Statistics::size, D(AssetCache, Statistics, size))
+        .def_readonly("capacity", &AssetCache::Statistics::capacity,
+                      D(AssetCache, Statistics, capacity))
+        .def("__repr__", [](const AssetCache::Statistics &s) {
+            return tfm::format("AssetCache.Statistics[hits=%i, misses=%i, evictions=%i, "
+                               "entries=%i, size=%i, capacity=%i]",
+                               s.hits, s.misses, s.evictions, s.entries, s.size, s.capacity);
+        });
+}
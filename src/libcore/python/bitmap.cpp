@@ -145,6 +145,15 @@ MTS_PY_EXPORT(Bitmap) {
     bitmap.attr("Float64") = type_.attr("Float64");
     bitmap.attr("Invalid") = type_.attr("Invalid");
 
+    py::class_<Bitmap::WriteFuture>(bitmap, "WriteFuture", D(Bitmap, WriteFuture))
+        .def("wait", [](const Bitmap::WriteFuture &future) { future.get(); },
+             "Wait until the file has been written, and raise the exception that "
+             "occurred while writing it (if any)",
+             py::call_guard<py::gil_scoped_release>())
+        .def("done", [](const Bitmap::WriteFuture &future) {
+            return future.wait_for(std::chrono::seconds(0)) == std::future_status::ready;
+        }, "Check whether the write has completed");
+
     bitmap.def(py::init<const fs::path &, Bitmap::FileFormat>(), "path"_a,
             "format"_a = Bitmap::FileFormat::Auto,
             py::call_guard<py::gil_scoped_release>())
@@ -165,9 +174,22 @@ MTS_PY_EXPORT(Bitmap) {
             py::overload_cast<const fs::path &, Bitmap::FileFormat, int>(
                 &Bitmap::write_async, py::const_),
             "path"_a, "format"_a = Bitmap::FileFormat::Auto, "quality"_a = -1,
-            D(Bitmap, write_async))
+            D(Bitmap, write_async), py::call_guard<py::gil_scoped_release>())
+        .def_static("flush_async_writes", &Bitmap::flush_async_writes,
+            D(Bitmap, flush_async_writes), py::call_guard<py::gil_scoped_release>())
+        .def_static("set_write_queue_capacity", &Bitmap::set_write_queue_capacity,
+            "capacity"_a, D(Bitmap, set_write_queue_capacity))
+        .def_static("write_queue_capacity", &Bitmap::write_queue_capacity,
+            D(Bitmap, write_queue_capacity))
+        .def_static("set_write_thread_count", &Bitmap::set_write_thread_count, "count"_a,
+            D(Bitmap, set_write_thread_count), py::call_guard<py::gil_scoped_release>())
+        .def_static("write_thread_count", &Bitmap::write_thread_count,
+            D(Bitmap, write_thread_count))
         .def("split", &Bitmap::split, D(Bitmap, split))
         .def_static("detect_file_format", &Bitmap::detect_file_format, D(Bitmap, detect_file_format))
+        .def_static("set_io_thread_count", &Bitmap::set_io_thread_count, "count"_a,
+            D(Bitmap, set_io_thread_count))
+        .def_static("io_thread_count", &Bitmap::io_thread_count, D(Bitmap, io_thread_count))
         .def_property_readonly("__array_interface__", [](Bitmap &bitmap) -> py::object {
             if (bitmap.struct_()->size() == 0)
                 return py::none();
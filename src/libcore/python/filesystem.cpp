@@ -33,6 +33,7 @@ MTS_PY_EXPORT(filesystem) {
     fs.def("is_directory", &is_directory, D(filesystem, is_directory));
     fs.def("exists", &exists, D(filesystem, exists));
     fs.def("file_size", &file_size, D(filesystem, file_size));
+    fs.def("last_write_time", &last_write_time, D(filesystem, last_write_time));
     fs.def("equivalent", &equivalent, D(filesystem, equivalent));
     fs.def("create_directory", &create_directory, D(filesystem, create_directory));
     fs.def("resize_file", &resize_file, D(filesystem, resize_file));
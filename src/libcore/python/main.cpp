@@ -1,6 +1,8 @@
 #include <tbb/tbb.h>
+#include <mitsuba/core/asset_cache.h>
 #include <mitsuba/core/bitmap.h>
 #include <mitsuba/core/jit.h>
+#include <mitsuba/core/texture_cache.h>
 #include <mitsuba/core/logger.h>
 #include <mitsuba/core/util.h>
 #include <mitsuba/core/fresolver.h>
@@ -14,6 +16,8 @@ MTS_PY_DECLARE(Cast);
 MTS_PY_DECLARE(Struct);
 MTS_PY_DECLARE(Appender);
 MTS_PY_DECLARE(ArgParser);
+MTS_PY_DECLARE(AssetCache);
+MTS_PY_DECLARE(TextureCache);
 MTS_PY_DECLARE(Bitmap);
 MTS_PY_DECLARE(Formatter);
 MTS_PY_DECLARE(FileResolver);
@@ -106,9 +110,11 @@ PYBIND11_MODULE(core_ext, m) {
     MTS_PY_IMPORT(Struct);
     MTS_PY_IMPORT(Appender);
     MTS_PY_IMPORT(ArgParser);
+    MTS_PY_IMPORT(AssetCache);
     MTS_PY_IMPORT(rfilter);
     MTS_PY_IMPORT(Stream);
     MTS_PY_IMPORT(Bitmap);
+    MTS_PY_IMPORT(TextureCache);
     MTS_PY_IMPORT(Formatter);
     MTS_PY_IMPORT(FileResolver);
     MTS_PY_IMPORT(Logger);
@@ -127,6 +133,8 @@ PYBIND11_MODULE(core_ext, m) {
         [scheduler_holder](py::handle weakref) {
             delete scheduler_holder;
 
+            AssetCache::static_shutdown();
+            TextureCache::static_shutdown();
             Bitmap::static_shutdown();
             Logger::static_shutdown();
             Thread::static_shutdown();
@@ -21,6 +21,7 @@ MTS_PY_EXPORT(MemoryMappedFile) {
         .def("filename", &MemoryMappedFile::filename, D(MemoryMappedFile, filename))
         .def("can_write", &MemoryMappedFile::can_write, D(MemoryMappedFile, can_write))
         .def_static("create_temporary", &MemoryMappedFile::create_temporary, D(MemoryMappedFile, create_temporary))
+        .def_static("map_private", &MemoryMappedFile::map_private, "filename"_a, D(MemoryMappedFile, map_private))
         .def_buffer([](MemoryMappedFile &m) -> py::buffer_info {
             return py::buffer_info(
                 m.data(),
@@ -0,0 +1,77 @@
+#include <mitsuba/core/texture_cache.h>
+#include <mitsuba/core/filesystem.h>
+#include <mitsuba/python/python.h>
+
+MTS_PY_EXPORT(TextureCache) {
+    MTS_PY_CLASS(TiledImage, Object)
+        .def(py::init([](const mitsuba::filesystem::path &filename) {
+            return new TiledImage(filename);
+        }), "filename"_a, D(TiledImage, TiledImage))
+        .def_static("write", &TiledImage::write, "bitmap"_a, "filename"_a,
+                    "tile_size"_a = 64, "bc"_a = FilterBoundaryCondition::Repeat,
+                    "source_hash"_a = 0, py::call_guard<py::gil_scoped_release>(),
+                    D(TiledImage, write))
+        .def_static("convert",
+            [](const mitsuba::filesystem::path &source, py::object target, bool raw,
+               uint32_t tile_size, FilterBoundaryCondition bc) {
+                mitsuba::filesystem::path target_path =
+                    target.is_none() ? TiledImage::converted_path(source)
+                                     : target.cast<mitsuba::filesystem::path>();
+                py::gil_scoped_release release;
+                TiledImage::convert(source, target_path, raw, tile_size, bc);
+                return target_path;
+            }, "source"_a, "target"_a = py::none(), "raw"_a = false, "tile_size"_a = 64,
+            "bc"_a = FilterBoundaryCondition::Repeat, D(TiledImage, convert))
+        .def_static("compute_source_hash", &TiledImage::compute_source_hash,
+                    "source"_a, "raw"_a, D(TiledImage, compute_source_hash))
+        .def_static("converted_path", &TiledImage::converted_path, "source"_a,
+                    D(TiledImage, converted_path))
+        .def_static("is_tiled_image", &TiledImage::is_tiled_image, "filename"_a,
+                    D(TiledImage, is_tiled_image))
+        .def("filename", &TiledImage::filename, D(TiledImage, filename))
+        .def("pixel_format", &TiledImage::pixel_format, D(TiledImage, pixel_format))
+        .def("channel_count", &TiledImage::channel_count, D(TiledImage, channel_count))
+        .def("tile_size", &TiledImage::tile_size, D(TiledImage, tile_size))
+        .def("level_count", &TiledImage::level_count, D(TiledImage, level_count))
+        .def("resolution", &TiledImage::resolution, "level"_a = 0,
+             D(TiledImage, resolution))
+        .def("boundary_condition", &TiledImage::boundary_condition,
+             D(TiledImage, boundary_condition))
+        .def("source_hash", &TiledImage::source_hash, D(TiledImage, source_hash))
+        .def("read_level", &TiledImage::read_level, "level"_a,
+             py::call_guard<py::gil_scoped_release>(), D(TiledImage, read_level))
+        .def("fetch", [](const TiledImage &image, uint32_t level, uint32_t x, uint32_t y) {
+            Vector2u size = image.resolution(level);
+            if (x >= size.x() || y >= size.y())
+                throw py::index_error();
+            std::vector<float> value(image.channel_count());
+            TextureCache::fetch(&image, level, x, y, value.data());
+            return value;
+        }, "level"_a, "x"_a, "y"_a, D(TextureCache, fetch));
+
+    auto cache = py::class_<TextureCache>(m, "TextureCache", D(TextureCache))
+        .def_static("purge", &TextureCache::purge, D(TextureCache, purge))
+        .def_static("set_capacity", &TextureCache::set_capacity, "capacity"_a,
+                    D(TextureCache, set_capacity))
+        .def_static("capacity", &TextureCache::capacity, D(TextureCache, capacity))
+        .def_static("statistics", &TextureCache::statistics, D(TextureCache, statistics));
+
+    py::class_<TextureCache::Statistics>(cache, "Statistics", D(TextureCache, Statistics))
+        .def_readonly("hits", &TextureCache::Statistics::hits,
+                      D(TextureCache, Statistics, hits))
+        .def_readonly("misses", &TextureCache::Statistics::misses,
+                      D(TextureCache, Statistics, misses))
+        .def_readonly("evictions", &TextureCache::Statistics::evictions,
+                      D(TextureCache, Statistics, evictions))
+        .def_readonly("tiles", &TextureCache::Statistics::tiles,
+                      D(TextureCache, Statistics, tiles))
+        .def_readonly("size", &TextureCache::Statistics::size,
+                      D(TextureCache, Statistics, size))
+        .def_readonly("capacity", &TextureCache::Statistics::capacity,
+                      D(TextureCache, Statistics, capacity))
+        .def("__repr__", [](const TextureCache::Statistics &s) {
+            return tfm::format("TextureCache.Statistics[hits=%i, misses=%i, evictions=%i, "
+                               "tiles=%i, size=%i, capacity=%i]",
+                               s.hits, s.misses, s.evictions, s.tiles, s.size, s.capacity);
+        });
+}
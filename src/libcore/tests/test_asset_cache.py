@@ -0,0 +1,66 @@
+import pytest
+import time
+
+import mitsuba
+
+
+@pytest.fixture
+def asset_cache():
+    from mitsuba.core import AssetCache
+    AssetCache.purge()
+    AssetCache.set_capacity(1024)
+    yield AssetCache
+    AssetCache.purge()
+    AssetCache.set_capacity(0)
+
+
+def test01_lookup_and_eviction(variant_scalar_rgb, asset_cache):
+    from mitsuba.core import Bitmap, Struct
+
+    initial = asset_cache.statistics()
+    assert initial.capacity == 1024
+    assert initial.entries == 0 and initial.size == 0
+
+    bitmaps = [Bitmap(Bitmap.PixelFormat.Y, Struct.Type.UInt8, [4, 4]) for i in range(4)]
+    assert asset_cache.get('a') is None
+    asset_cache.put('a', bitmaps[0], 400)
+    asset_cache.put('b', bitmaps[1], 400)
+    assert asset_cache.get('a') is bitmaps[0]
+
+    # Exceeds the capacity: evicts the least recently used entry ('b')
+    asset_cache.put('c', bitmaps[2], 400)
+    assert asset_cache.get('b') is None
+    assert asset_cache.get('c') is bitmaps[2]
+
+    # Objects larger than the capacity are not inserted
+    asset_cache.put('d', bitmaps[3], 2048)
+    assert asset_cache.get('d') is None
+
+    stats = asset_cache.statistics()
+    assert stats.hits - initial.hits == 2
+    assert stats.misses - initial.misses == 3
+    assert stats.evictions - initial.evictions == 1
+    assert stats.entries == 2
+    assert stats.size == 800
+
+    asset_cache.set_capacity(500)
+    assert asset_cache.statistics().entries == 1
+    asset_cache.purge()
+    stats = asset_cache.statistics()
+    assert stats.entries == 0 and stats.size == 0
+
+
+def test02_file_key(variant_scalar_rgb, tmpdir):
+    from mitsuba.core import AssetCache
+
+    filename = str(tmpdir.join('file.txt'))
+    with open(filename, 'w') as f:
+        f.write('hello')
+    key = AssetCache.file_key(filename)
+    assert key == AssetCache.file_key(filename)
+
+    # Modifications invalidate the key
+    time.sleep(0.01)
+    with open(filename, 'w') as f:
+        f.write('hello world')
+    assert key != AssetCache.file_key(filename)
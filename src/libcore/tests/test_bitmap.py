@@ -244,3 +244,91 @@ def test_accumulate():
     # but (row, column) in arrays.
     b1.accumulate(b2, [5, 3], [3, 1], [1, 5])
     assert np.all(np.array(b1, copy=False) == ref)
+
+
+@pytest.mark.parametrize('pixel_format', [Bitmap.PixelFormat.Y, Bitmap.PixelFormat.RGBA])
+@pytest.mark.parametrize('component_format', [Struct.Type.UInt8, Struct.Type.UInt16])
+def test_write_png_threads(tmpdir, pixel_format, component_format):
+    # Images are compressed in stripes of rows, the output may not depend on the thread count
+    np.random.seed(0)
+    b = Bitmap(pixel_format, component_format, [317, 1243])
+    dtype = np.uint8 if component_format == Struct.Type.UInt8 else np.uint16
+    data = np.array(b, copy=False)
+    data[:] = (np.random.random(data.shape) * np.iinfo(dtype).max).astype(dtype)
+    data[100:400] = data[99]
+
+    thread_count = Bitmap.io_thread_count()
+    contents = []
+    try:
+        for i, count in enumerate([1, 4]):
+            Bitmap.set_io_thread_count(count)
+            tmp_file = os.path.join(str(tmpdir), "out_%i.png" % i)
+            b.write(tmp_file)
+            assert np.all(np.array(Bitmap(tmp_file)) == data)
+            with open(tmp_file, 'rb') as f:
+                contents.append(f.read())
+    finally:
+        Bitmap.set_io_thread_count(0)
+
+    assert contents[0] == contents[1]
+    assert Bitmap.io_thread_count() == thread_count
+
+
+@pytest.mark.slow
+def test_io_benchmark(tmpdir):
+    """Measures how the throughput of reading and writing large OpenEXR and
+    PNG files scales with the number of I/O threads."""
+    from timeit import default_timer
+
+    np.random.seed(0)
+    exr = Bitmap(np.random.random((2048, 4096, 8)).astype(np.float32))
+    png = Bitmap(Bitmap.PixelFormat.RGBA, Struct.Type.UInt8, [4096, 2048])
+    np.array(png, copy=False)[:] = np.uint8(np.linspace(0, 255, 4096))[np.newaxis, :, np.newaxis]
+
+    timings = {}
+    try:
+        for count in [1, 2, 4, 8]:
+            Bitmap.set_io_thread_count(count)
+            for bitmap, ext in [(exr, 'exr'), (png, 'png')]:
+                tmp_file = os.path.join(str(tmpdir), "out.%s" % ext)
+                start = default_timer()
+                bitmap.write(tmp_file)
+                timings[('write', ext, count)] = default_timer() - start
+                start = default_timer()
+                Bitmap(tmp_file)
+                timings[('read', ext, count)] = default_timer() - start
+    finally:
+        Bitmap.set_io_thread_count(0)
+
+    for (op, ext, count), t in sorted(timings.items()):
+        size = (exr if ext == 'exr' else png).buffer_size()
+        print('%s %s: %i thread(s): %.3f s, %.1f MiB/s (%.2fx)' % (
+            op, ext, count, t, size / t / 2**20, timings[(op, ext, 1)] / t))
+
+
+def test_write_async(tmpdir):
+    np.random.seed(0)
+    ref = np.float32(np.random.random((16, 32, 3)))
+    b = Bitmap(ref)
+
+    capacity = Bitmap.write_queue_capacity()
+    Bitmap.set_write_queue_capacity(2)
+    try:
+        # Writes to the same file complete in the order in which they were issued
+        files = [os.path.join(str(tmpdir), "out_%i.exr" % (i % 3)) for i in range(10)]
+        futures = [Bitmap(ref * i).write_async(f) for i, f in enumerate(files)]
+        futures[-1].wait()
+        Bitmap.flush_async_writes()
+        assert all(f.done() for f in futures)
+        for i in range(7, 10):
+            assert np.allclose(np.array(Bitmap(files[i])), ref * i)
+
+        # Errors are reported when waiting for the result
+        future = b.write_async(os.path.join(str(tmpdir), "missing", "out.exr"))
+        with pytest.raises(RuntimeError):
+            future.wait()
+
+        with pytest.raises(RuntimeError):
+            Bitmap.set_write_queue_capacity(0)
+    finally:
+        Bitmap.set_write_queue_capacity(capacity)
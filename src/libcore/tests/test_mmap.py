@@ -67,3 +67,21 @@ def test04_create_temp():
     assert mmap.can_write()
     del mmap
     assert not os.path.exists(fname)
+
+
+def test05_map_private(tmpdir):
+    tmp_file = os.path.join(str(tmpdir), "mmap_test")
+    with open(tmp_file, "w") as f:
+        f.write('hello!')
+    mmap = MemoryMappedFile.map_private(tmp_file)
+    assert mmap.size() == 6
+    assert mmap.can_write()
+    array_view = np.array(mmap, copy=False)
+    array_view[1] = ord('a')
+    assert np.all(array_view == np.array('hallo!', 'c').view(np.uint8))
+    # Modifications are private to the mapping
+    with open(tmp_file, "r") as f:
+        assert f.readline() == 'hello!'
+    del array_view
+    del mmap
+    os.remove(tmp_file)
@@ -0,0 +1,101 @@
+import mitsuba
+import pytest
+import enoki as ek
+
+
+@pytest.fixture
+def texture_cache():
+    from mitsuba.core import TextureCache
+    capacity = TextureCache.capacity()
+    TextureCache.purge()
+    yield TextureCache
+    TextureCache.purge()
+    TextureCache.set_capacity(capacity)
+
+
+def make_bitmap(width, height):
+    from mitsuba.core import Bitmap
+    import numpy as np
+
+    rng = np.random.RandomState(0)
+    return Bitmap(rng.uniform(size=(height, width, 3)).astype(np.float32))
+
+
+def test01_write_and_read(variant_scalar_rgb, tmpdir):
+    from mitsuba.core import TiledImage, Bitmap
+    import numpy as np
+
+    filename = str(tmpdir.join('image.mtt'))
+    bitmap = make_bitmap(37, 20)
+    TiledImage.write(bitmap, filename, tile_size=8)
+    assert TiledImage.is_tiled_image(filename)
+    assert not TiledImage.is_tiled_image(str(tmpdir))
+
+    image = TiledImage(filename)
+    assert image.pixel_format() == Bitmap.PixelFormat.RGB
+    assert image.channel_count() == 3
+    assert image.tile_size() == 8
+    assert image.level_count() == 6
+    assert image.resolution() == [37, 20]
+    assert image.resolution(1) == [18, 10]
+    assert image.resolution(5) == [1, 1]
+
+    data = np.array(bitmap)
+    assert np.allclose(np.array(image.read_level(0)), data)
+    assert np.allclose(np.array(image.read_level(5)).ravel(), data.mean(axis=(0, 1)),
+                       atol=0.05)
+
+    for x, y in [(0, 0), (36, 19), (9, 17)]:
+        assert np.allclose(image.fetch(0, x, y), data[y, x])
+
+    with pytest.raises(IndexError):
+        image.fetch(0, 37, 0)
+
+
+def test02_eviction(variant_scalar_rgb, tmpdir, texture_cache):
+    from mitsuba.core import TiledImage
+
+    filename = str(tmpdir.join('image.mtt'))
+    TiledImage.write(make_bitmap(256, 256), filename, tile_size=16)
+    image = TiledImage(filename)
+
+    # Budget of 2 tiles (12 KiB) per shard of the cache
+    tile_bytes = 16 * 16 * 3 * 4
+    texture_cache.set_capacity(32 * 2 * tile_bytes)
+    stats = texture_cache.statistics()
+
+    for y in range(0, 256, 16):
+        for x in range(0, 256, 16):
+            image.fetch(0, x, y)
+
+    stats2 = texture_cache.statistics()
+    assert stats2.misses - stats.misses == 256
+    assert stats2.evictions > stats.evictions
+    assert stats2.size <= texture_cache.capacity()
+    assert stats2.tiles * tile_bytes == stats2.size
+
+    texture_cache.purge()
+    assert texture_cache.statistics().tiles == 0
+
+
+def test03_convert(variant_scalar_rgb, tmpdir):
+    from mitsuba.core import TiledImage, Bitmap, FilterBoundaryCondition
+    import numpy as np
+
+    source = str(tmpdir.join('image.exr'))
+    bitmap = make_bitmap(40, 30)
+    bitmap.write(source)
+
+    target = TiledImage.convert(source, tile_size=16, bc=FilterBoundaryCondition.Mirror)
+    assert str(target) == str(TiledImage.converted_path(source)) == source + '.mtt'
+
+    image = TiledImage(target)
+    assert image.tile_size() == 16
+    assert image.boundary_condition() == FilterBoundaryCondition.Mirror
+    assert image.source_hash() == TiledImage.compute_source_hash(source, False)
+    assert image.source_hash() != TiledImage.compute_source_hash(source, True)
+    assert np.allclose(np.array(image.read_level(0)), np.array(bitmap))
+
+    # Modifying the source changes its hash
+    make_bitmap(40, 31).write(source)
+    assert image.source_hash() != TiledImage.compute_source_hash(source, False)
@@ -0,0 +1,511 @@
+#include <mitsuba/core/texture_cache.h>
+#include <mitsuba/core/fstream.h>
+#include <mitsuba/core/hash.h>
+#include <mitsuba/core/logger.h>
+#include <mitsuba/core/plugin.h>
+#include <mitsuba/core/properties.h>
+#include <mitsuba/core/util.h>
+#include <atomic>
+#include <list>
+#include <mutex>
+#include <random>
+#include <unordered_map>
+
+NAMESPACE_BEGIN(mitsuba)
+
+static std::atomic<uint64_t> tiled_image_counter { 0 };
+
+TiledImage::TiledImage(const fs::path &filename, const TileConverter &converter)
+    : m_converter(converter), m_id(++tiled_image_counter) {
+    auto fail = [&](const char *descr) {
+        Throw("Error while loading tiled image \"%s\": %s!", filename.string(), descr);
+    };
+
+    if (!fs::exists(filename))
+        fail("file not found");
+
+    m_mmap = new MemoryMappedFile(filename, false);
+    const uint8_t *data = (const uint8_t *) m_mmap->data();
+
+    Header header;
+    if (m_mmap->size() < sizeof(Header))
+        fail("file is too small");
+    memcpy(&header, data, sizeof(Header));
+    if (memcmp(header.magic, "MTSTILE", 8) != 0)
+        fail("invalid file header");
+    if (header.byte_order != ByteOrder)
+        fail("file was written on a machine with a different byte order");
+    if (header.version != Version)
+        fail("unsupported file format version");
+    if (header.channel_count != 1 && header.channel_count != 3)
+        fail("unsupported channel count");
+    if (header.tile_size == 0 || header.level_count == 0 || header.level_count > 32)
+        fail("invalid tile size or level count");
+    if (sizeof(Header) + header.level_count * sizeof(LevelRecord) > m_mmap->size())
+        fail("truncated level records");
+
+    m_channel_count = header.channel_count;
+    m_pixel_format  = m_channel_count == 1 ? Bitmap::PixelFormat::Y : Bitmap::PixelFormat::RGB;
+    m_tile_size     = header.tile_size;
+    m_boundary_condition = (FilterBoundaryCondition) header.boundary_condition;
+    m_source_hash   = header.source_hash;
+
+    for (uint32_t i = 0; i < header.level_count; ++i) {
+        LevelRecord record;
+        memcpy(&record, data + sizeof(Header) + i * sizeof(LevelRecord), sizeof(LevelRecord));
+
+        Level level;
+        level.size = Vector2u(record.width, record.height);
+        level.tile_count = (level.size + m_tile_size - 1) / m_tile_size;
+        level.offset = record.offset;
+
+        if (any(level.size == 0u) ||
+            level.offset + (uint64_t) hprod(level.tile_count) * tile_bytes() > m_mmap->size())
+            fail("truncated or corrupt file");
+        m_levels.push_back(level);
+    }
+
+    Log(Debug, "Opened tiled image \"%s\" (%ix%i, %i levels, %ix%i tiles)",
+        filename.filename().string(), m_levels[0].size.x(), m_levels[0].size.y(),
+        m_levels.size(), m_tile_size, m_tile_size);
+}
+
+TiledImage::~TiledImage() {
+    TextureCache::release(this);
+}
+
+bool TiledImage::is_tiled_image(const fs::path &filename) {
+    if (!fs::is_regular_file(filename) || fs::file_size(filename) < sizeof(Header))
+        return false;
+    ref<FileStream> stream = new FileStream(filename);
+    char magic[8];
+    stream->read(magic, sizeof(magic));
+    return memcmp(magic, "MTSTILE", 8) == 0;
+}
+
+void TiledImage::read_tile(uint32_t level_, uint32_t x, uint32_t y, float *data) const {
+    const Level &level = m_levels.at(level_);
+    if (x >= level.tile_count.x() || y >= level.tile_count.y())
+        Throw("TiledImage::read_tile(): tile (%i, %i) of level %i is out of bounds!",
+              x, y, level_);
+
+    uint64_t offset = level.offset + (y * (uint64_t) level.tile_count.x() + x) * tile_bytes();
+    memcpy(data, (const uint8_t *) m_mmap->data() + offset, tile_bytes());
+
+    if (m_converter)
+        m_converter(data, (size_t) m_tile_size * m_tile_size, m_channel_count);
+}
+
+ref<Bitmap> TiledImage::read_level(uint32_t level_) const {
+    const Level &level = m_levels.at(level_);
+    ref<Bitmap> bitmap = new Bitmap(m_pixel_format, Struct::Type::Float32, level.size);
+    float *target = (float *) bitmap->data();
+
+    size_t row_size = (size_t) m_tile_size * m_channel_count;
+    for (uint32_t ty = 0; ty < level.tile_count.y(); ++ty) {
+        for (uint32_t tx = 0; tx < level.tile_count.x(); ++tx) {
+            const float *tile = (const float *) ((const uint8_t *) m_mmap->data() + level.offset +
+                (ty * (uint64_t) level.tile_count.x() + tx) * tile_bytes());
+
+            uint32_t x0 = tx * m_tile_size, y0 = ty * m_tile_size,
+                     width  = std::min(m_tile_size, level.size.x() - x0),
+                     height = std::min(m_tile_size, level.size.y() - y0);
+
+            for (uint32_t y = 0; y < height; ++y)
+                memcpy(target + ((y0 + y) * (size_t) level.size.x() + x0) * m_channel_count,
+                       tile + y * row_size, width * m_channel_count * sizeof(float));
+        }
+    }
+
+    if (m_converter)
+        m_converter(target, bitmap->pixel_count(), m_channel_count);
+
+    return bitmap;
+}
+
+void TiledImage::write(const Bitmap *bitmap_, const fs::path &filename,
+                       uint32_t tile_size, FilterBoundaryCondition bc,
+                       uint64_t source_hash) {
+    if (tile_size == 0)
+        Throw("TiledImage::write(): the tile size must be positive!");
+
+    Bitmap::PixelFormat pixel_format;
+    switch (bitmap_->pixel_format()) {
+        case Bitmap::PixelFormat::Y:
+        case Bitmap::PixelFormat::YA:
+            pixel_format = Bitmap::PixelFormat::Y;
+            break;
+
+        case Bitmap::PixelFormat::RGB:
+        case Bitmap::PixelFormat::RGBA:
+        case Bitmap::PixelFormat::XYZ:
+        case Bitmap::PixelFormat::XYZA:
+            pixel_format = Bitmap::PixelFormat::RGB;
+            break;
+
+        default:
+            Throw("TiledImage::write(): the bitmap needs to have a known pixel "
+                  "format (Y[A], RGB[A], XYZ[A] are supported).");
+    }
+
+    // Linear single precision representation of the first level
+    std::vector<ref<Bitmap>> levels;
+    levels.push_back(bitmap_->convert(pixel_format, Struct::Type::Float32, false));
+
+    using ReconstructionFilter = Bitmap::ReconstructionFilter;
+    ref<ReconstructionFilter> rfilter =
+        PluginManager::instance()->create_object<ReconstructionFilter>(Properties("box"));
+
+    while (levels.back()->width() > 1 || levels.back()->height() > 1) {
+        const Bitmap *current = levels.back();
+        levels.push_back(current->resample(max(current->size() / 2u, 1u),
+                                           rfilter, { bc, bc }));
+    }
+
+    uint32_t channel_count = (uint32_t) levels[0]->channel_count();
+    size_t tile_bytes = (size_t) tile_size * tile_size * channel_count * sizeof(float);
+
+    auto align = [](uint64_t offset) {
+        return (offset + Alignment - 1) / Alignment * Alignment;
+    };
+
+    Header header;
+    memset(&header, 0, sizeof(Header));
+    memcpy(header.magic, "MTSTILE", 8);
+    header.version = Version;
+    header.byte_order = ByteOrder;
+    header.channel_count = channel_count;
+    header.tile_size = tile_size;
+    header.level_count = (uint32_t) levels.size();
+    header.boundary_condition = (uint32_t) bc;
+    header.source_hash = source_hash;
+
+    std::vector<LevelRecord> records;
+    uint64_t offset = align(sizeof(Header) + levels.size() * sizeof(LevelRecord));
+    for (const Bitmap *level : levels) {
+        LevelRecord record;
+        record.width  = level->width();
+        record.height = level->height();
+        record.offset = offset;
+        records.push_back(record);
+
+        Vector2u tile_count = (level->size() + tile_size - 1) / tile_size;
+        offset = align(offset + hprod(tile_count) * (uint64_t) tile_bytes);
+    }
+
+    ref<FileStream> stream = new FileStream(filename, FileStream::ETruncReadWrite);
+    stream->write(&header, sizeof(Header));
+    stream->write(records.data(), records.size() * sizeof(LevelRecord));
+
+    std::unique_ptr<float[]> tile(new float[tile_bytes / sizeof(float)]);
+    std::unique_ptr<uint8_t[]> zeros(new uint8_t[Alignment]());
+    size_t row_size = (size_t) tile_size * channel_count;
+
+    for (size_t i = 0; i < levels.size(); ++i) {
+        const Bitmap *level = levels[i];
+        const float *source = (const float *) level->data();
+        size_t padding = records[i].offset - stream->tell();
+        stream->write(zeros.get(), padding);
+
+        Vector2u tile_count = (level->size() + tile_size - 1) / tile_size;
+        for (uint32_t ty = 0; ty < tile_count.y(); ++ty) {
+            for (uint32_t tx = 0; tx < tile_count.x(); ++tx) {
+                uint32_t x0 = tx * tile_size, y0 = ty * tile_size,
+                         width  = std::min(tile_size, level->width() - x0),
+                         height = std::min(tile_size, level->height() - y0);
+
+                // Pixels beyond the boundary of the level are zero
+                memset(tile.get(), 0, tile_bytes);
+                for (uint32_t y = 0; y < height; ++y)
+                    memcpy(tile.get() + y * row_size,
+                           source + ((y0 + y) * (size_t) level->width() + x0) * channel_count,
+                           width * channel_count * sizeof(float));
+                stream->write(tile.get(), tile_bytes);
+            }
+        }
+    }
+
+    Log(Debug, "Wrote tiled image \"%s\" (%ix%i, %i levels, %s)",
+        filename.filename().string(), levels[0]->width(), levels[0]->height(),
+        levels.size(), util::mem_string(stream->size()));
+}
+
+void TiledImage::convert(const fs::path &source, const fs::path &target, bool raw,
+                         uint32_t tile_size, FilterBoundaryCondition bc) {
+    if (!fs::exists(source))
+        Throw("TiledImage::convert(): file \"%s\" not found!", source.string());
+
+    ref<Bitmap> bitmap = new Bitmap(source);
+    if (raw)
+        bitmap->set_srgb_gamma(false);
+
+    // Write to a temporary file first, concurrent jobs might read the target
+    std::random_device rd;
+    fs::path tmp_path = target;
+    tmp_path.replace_extension(tfm::format(".%08x.tmp", rd()));
+    try {
+        write(bitmap, tmp_path, tile_size, bc, compute_source_hash(source, raw));
+    } catch (...) {
+        fs::remove(tmp_path);
+        throw;
+    }
+
+    if (!fs::rename(tmp_path, target)) {
+        fs::remove(tmp_path);
+        Throw("TiledImage::convert(): could not create \"%s\"!", target.string());
+    }
+}
+
+uint64_t TiledImage::compute_source_hash(const fs::path &source, bool raw) {
+    ref<MemoryMappedFile> mmap = new MemoryMappedFile(source, false);
+    const uint8_t *ptr = (const uint8_t *) mmap->data();
+    size_t size = mmap->size();
+
+    // Fast non-cryptographic hash of 64 bit words (multiply-rotate, as in MurmurHash)
+    auto mix = [](uint64_t hash, uint64_t value) {
+        value *= 0x87c37b91114253d5ull;
+        value = (value << 31) | (value >> 33);
+        value *= 0x4cf5ad432745937full;
+        hash ^= value;
+        hash = (hash << 27) | (hash >> 37);
+        return hash * 5 + 0x52dce729;
+    };
+
+    uint64_t hash = 0x9e3779b97f4a7c15ull ^ size;
+    size_t i = 0;
+    for (; i + 8 <= size; i += 8) {
+        uint64_t value;
+        memcpy(&value, ptr + i, 8);
+        hash = mix(hash, value);
+    }
+
+    uint64_t tail = 0;
+    memcpy(&tail, ptr + i, size - i);
+    hash = mix(hash, tail);
+    hash = mix(hash, raw ? 1 : 0);
+
+    // Finalization (avalanche)
+    hash ^= hash >> 33;
+    hash *= 0xff51afd7ed558ccdull;
+    hash ^= hash >> 33;
+    hash *= 0xc4ceb9fe1a85ec53ull;
+    hash ^= hash >> 33;
+
+    // Zero stands for an unknown source
+    return hash == 0 ? 1 : hash;
+}
+
+fs::path TiledImage::converted_path(const fs::path &source) {
+    return fs::path(source.string() + ".mtt");
+}
+
+std::string TiledImage::to_string() const {
+    std::ostringstream oss;
+    oss << "TiledImage[" << std::endl
+        << "  filename = \"" << filename().string() << "\"," << std::endl
+        << "  pixel_format = " << m_pixel_format << "," << std::endl
+        << "  resolution = " << resolution() << "," << std::endl
+        << "  tile_size = " << m_tile_size << "," << std::endl
+        << "  level_count = " << m_levels.size() << std::endl
+        << "]";
+    return oss.str();
+}
+
+// -----------------------------------------------------------------------
+
+/// (image id, packed level and tile position)
+using TileKey = std::pair<uint64_t, uint64_t>;
+
+static TileKey tile_key(const TiledImage *image, uint32_t level, uint32_t x, uint32_t y) {
+    return { image->id(), ((uint64_t) level << 58) | ((uint64_t) y << 29) | (uint64_t) x };
+}
+
+using TileData = std::shared_ptr<const float[]>;
+
+struct TileShard {
+    struct Entry {
+        TileData data;
+        size_t size;
+        std::list<TileKey>::iterator lru;
+    };
+
+    std::mutex mutex;
+    /// Keys of the cached tiles, sorted from most to least recently used
+    std::list<TileKey> lru;
+    std::unordered_map<TileKey, Entry, hasher<TileKey>> map;
+    size_t size = 0;
+};
+
+static constexpr size_t TileShardCount = 32;
+static TileShard tile_shards[TileShardCount];
+static std::atomic<size_t> tile_cache_capacity { (size_t) 1 << 30 };
+static std::atomic<size_t> tile_cache_hits { 0 }, tile_cache_misses { 0 },
+                           tile_cache_evictions { 0 };
+
+/// Incremented whenever tiles are removed, invalidates the per-thread tables
+static std::atomic<uint64_t> tile_cache_epoch { 0 };
+
+static TileShard &tile_shard(const TileKey &key) {
+    return tile_shards[hasher<TileKey>()(key) % TileShardCount];
+}
+
+/// Evict the least recently used tiles of a shard until \c size bytes are available
+static void tile_shard_evict(TileShard &shard, size_t size, std::vector<TileData> &evicted) {
+    size_t capacity = tile_cache_capacity / TileShardCount;
+    while (!shard.lru.empty() && shard.size + size > capacity) {
+        auto it = shard.map.find(shard.lru.back());
+        shard.size -= it->second.size;
+        evicted.push_back(std::move(it->second.data));
+        shard.map.erase(it);
+        shard.lru.pop_back();
+        tile_cache_evictions++;
+    }
+}
+
+/// Small direct-mapped table of the tiles recently accessed by a thread
+struct ThreadTileTable {
+    struct Entry {
+        TileKey key;
+        TileData data;
+    };
+
+    static constexpr size_t Size = 64;
+    Entry entries[Size];
+    uint64_t epoch = 0;
+};
+
+static thread_local ThreadTileTable thread_tile_table;
+
+TileData TextureCache::tile(const TiledImage *image, uint32_t level,
+                            uint32_t x, uint32_t y) {
+    TileKey key = tile_key(image, level, x, y);
+    TileShard &shard = tile_shard(key);
+
+    {
+        std::lock_guard<std::mutex> guard(shard.mutex);
+        auto it = shard.map.find(key);
+        if (it != shard.map.end()) {
+            tile_cache_hits++;
+            shard.lru.splice(shard.lru.begin(), shard.lru, it->second.lru);
+            return it->second.data;
+        }
+    }
+
+    /* Load the tile without holding the lock. Concurrent misses of
+       the same tile load it redundantly, and the first one is kept. */
+    size_t size = image->tile_bytes();
+    std::shared_ptr<float[]> data(new float[size / sizeof(float)]);
+    image->read_tile(level, x, y, data.get());
+    tile_cache_misses++;
+
+    std::vector<TileData> evicted;
+    std::lock_guard<std::mutex> guard(shard.mutex);
+    auto it = shard.map.find(key);
+    if (it != shard.map.end())
+        return it->second.data;
+
+    if (size <= tile_cache_capacity / TileShardCount) {
+        tile_shard_evict(shard, size, evicted);
+        shard.lru.push_front(key);
+        shard.map[key] = TileShard::Entry{ data, size, shard.lru.begin() };
+        shard.size += size;
+    }
+
+    return data;
+}
+
+void TextureCache::fetch(const TiledImage *image, uint32_t level, uint32_t x,
+                         uint32_t y, float *value) {
+    uint32_t tile_size = image->tile_size(),
+             tx = x / tile_size, ty = y / tile_size;
+    TileKey key = tile_key(image, level, tx, ty);
+
+    ThreadTileTable &table = thread_tile_table;
+    uint64_t epoch = tile_cache_epoch.load(std::memory_order_relaxed);
+    if (unlikely(table.epoch != epoch)) {
+        for (auto &entry : table.entries)
+            entry.data.reset();
+        table.epoch = epoch;
+    }
+
+    ThreadTileTable::Entry &entry =
+        table.entries[hasher<TileKey>()(key) % ThreadTileTable::Size];
+    if (!entry.data || entry.key != key) {
+        entry.data = tile(image, level, tx, ty);
+        entry.key = key;
+    }
+
+    uint32_t channel_count = image->channel_count();
+    const float *ptr = entry.data.get() +
+        ((y - ty * tile_size) * (size_t) tile_size + (x - tx * tile_size)) * channel_count;
+    for (uint32_t i = 0; i < channel_count; ++i)
+        value[i] = ptr[i];
+}
+
+void TextureCache::release(const TiledImage *image) {
+    std::vector<TileData> evicted;
+    for (TileShard &shard : tile_shards) {
+        std::lock_guard<std::mutex> guard(shard.mutex);
+        for (auto it = shard.lru.begin(); it != shard.lru.end(); ) {
+            if (it->first != image->id()) {
+                ++it;
+                continue;
+            }
+            auto entry = shard.map.find(*it);
+            shard.size -= entry->second.size;
+            evicted.push_back(std::move(entry->second.data));
+            shard.map.erase(entry);
+            it = shard.lru.erase(it);
+        }
+    }
+    tile_cache_epoch++;
+}
+
+void TextureCache::purge() {
+    std::vector<TileData> evicted;
+    for (TileShard &shard : tile_shards) {
+        std::lock_guard<std::mutex> guard(shard.mutex);
+        for (auto &[key, entry] : shard.map)
+            evicted.push_back(std::move(entry.data));
+        shard.map.clear();
+        shard.lru.clear();
+        shard.size = 0;
+    }
+    tile_cache_epoch++;
+}
+
+void TextureCache::set_capacity(size_t capacity) {
+    tile_cache_capacity = capacity;
+    std::vector<TileData> evicted;
+    for (TileShard &shard : tile_shards) {
+        std::lock_guard<std::mutex> guard(shard.mutex);
+        tile_shard_evict(shard, 0, evicted);
+    }
+    tile_cache_epoch++;
+}
+
+size_t TextureCache::capacity() {
+    return tile_cache_capacity;
+}
+
+TextureCache::Statistics TextureCache::statistics() {
+    Statistics stats;
+    for (TileShard &shard : tile_shards) {
+        std::lock_guard<std::mutex> guard(shard.mutex);
+        stats.tiles += shard.map.size();
+        stats.size += shard.size;
+    }
+    stats.hits = tile_cache_hits;
+    stats.misses = tile_cache_misses;
+    stats.evictions = tile_cache_evictions;
+    stats.capacity = tile_cache_capacity;
+    return stats;
+}
+
+void TextureCache::static_shutdown() {
+    purge();
+    thread_tile_table = ThreadTileTable();
+}
+
+MTS_IMPLEMENT_CLASS(TiledImage, Object)
+NAMESPACE_END(mitsuba)
@@ -1,4 +1,5 @@
 #include <mitsuba/render/bsdf.h>
+#include <mitsuba/render/texture.h>
 #include <mitsuba/core/properties.h>
 
 NAMESPACE_BEGIN(mitsuba)
@@ -8,6 +9,18 @@ MTS_VARIANT BSDF<Float, Spectrum>::BSDF(const Properties &props)
 
 MTS_VARIANT BSDF<Float, Spectrum>::~BSDF() { }
 
+MTS_VARIANT uint32_t BSDF<Float, Spectrum>::differential_flags(const Properties &props) {
+    using Texture = mitsuba::Texture<Float, Spectrum>;
+    for (auto &[name, obj] : props.objects(false)) {
+        const Texture *texture = dynamic_cast<const Texture *>(obj.get());
+        const BSDF *bsdf = dynamic_cast<const BSDF *>(obj.get());
+        if ((texture && texture->needs_differentials()) ||
+            (bsdf && bsdf->needs_differentials()))
+            return +BSDFFlags::NeedsDifferentials;
+    }
+    return +BSDFFlags::None;
+}
+
 MTS_VARIANT Spectrum BSDF<Float, Spectrum>::eval_null_transmission(
     const SurfaceInteraction3f & /* si */, Mask /* active */) const {
     return 0.f;
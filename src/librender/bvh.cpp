@@ -0,0 +1,529 @@
+#include <mitsuba/render/bvh.h>
+#include <mitsuba/core/properties.h>
+#include <mitsuba/core/string.h>
+#include <mitsuba/core/timer.h>
+#include <mitsuba/core/util.h>
+#include <tbb/tbb.h>
+
+NAMESPACE_BEGIN(mitsuba)
+
+/// Ranges with at least this many primitives are binned and built in parallel
+static const uint32_t bvh_parallel_threshold = 4096;
+
+/// Grain size used when computing primitive bounding boxes
+static const uint32_t bvh_grain_size = 1024;
+
+/**
+ * \brief Top-down builder of wide BVHs using the binned surface area heuristic
+ *
+ * Primitives are referenced by their global index and partitioned in place.
+ * Leaves hence reference contiguous ranges of the final index array.
+ */
+template <typename BVH> class BVHBuilder {
+public:
+    using Float         = typename BVH::ScalarFloat;
+    using Point3f       = typename BVH::ScalarPoint3f;
+    using BoundingBox3f = typename BVH::ScalarBoundingBox3f;
+    using BVHNode       = typename BVH::BVHNode;
+    using Size          = uint32_t;
+    using Index         = uint32_t;
+
+    static constexpr Index InvalidIndex = (Index) -1;
+
+    /// Contiguous range of primitive references along with their bounds
+    struct Range {
+        Size begin = 0, end = 0;
+        BoundingBox3f bbox, centroid_bbox;
+
+        Size size() const { return end - begin; }
+    };
+
+    /// Bin of the SAH sweep
+    struct Bin {
+        BoundingBox3f bbox, centroid_bbox;
+        Size count = 0;
+
+        void expand(const Bin &bin) {
+            bbox.expand(bin.bbox);
+            centroid_bbox.expand(bin.centroid_bbox);
+            count += bin.count;
+        }
+    };
+
+    BVHBuilder(const std::vector<BoundingBox3f> &bboxes, Float intersection_cost,
+               Float traversal_cost, Size max_leaf_size, Size bin_count)
+        : m_bboxes(bboxes), m_intersection_cost(intersection_cost),
+          m_traversal_cost(traversal_cost), m_max_leaf_size(max_leaf_size),
+          m_bin_count(bin_count) {
+        Size prim_count = Size(bboxes.size());
+        m_centroids.resize(prim_count);
+        m_indices.resize(prim_count);
+        tbb::parallel_for(
+            tbb::blocked_range<Size>(0u, prim_count, bvh_grain_size),
+            [&](const tbb::blocked_range<Size> &range) {
+                for (Size i = range.begin(); i != range.end(); ++i) {
+                    m_centroids[i] = m_bboxes[i].center();
+                    m_indices[i] = i;
+                }
+            }
+        );
+    }
+
+    /// Build the hierarchy, the root is always the first node
+    void build() {
+        m_nodes.clear();
+        if (m_indices.empty())
+            return;
+
+        Range root = make_range(0, Size(m_indices.size()));
+        auto [child, count] = build_child(root, 0);
+        ENOKI_MARK_USED(child);
+
+        if (count > 0) {
+            // The entire hierarchy is a single leaf: wrap it into a node
+            BVHNode &node = *m_nodes.grow_by(1);
+            init_node(node);
+            node.set_child_bbox(0, root.bbox);
+            node.child[0] = root.begin;
+            node.count[0] = count;
+        }
+    }
+
+    const tbb::concurrent_vector<BVHNode> &nodes() const { return m_nodes; }
+    const std::vector<Index> &indices() const { return m_indices; }
+
+protected:
+    /// Compute the bounds of the given range of primitive references
+    Range make_range(Size begin, Size end) const {
+        Range range;
+        range.begin = begin;
+        range.end = end;
+        for (Size i = begin; i < end; ++i) {
+            Index index = m_indices[i];
+            range.bbox.expand(m_bboxes[index]);
+            range.centroid_bbox.expand(m_centroids[index]);
+        }
+        return range;
+    }
+
+    /// Mark all child slots of a node as empty
+    static void init_node(BVHNode &node) {
+        for (size_t i = 0; i < MTS_BVH_WIDTH; ++i) {
+            for (size_t k = 0; k < 3; ++k) {
+                node.bbox_min[k][i] =  math::Infinity<Float>;
+                node.bbox_max[k][i] = -math::Infinity<Float>;
+            }
+            node.child[i] = InvalidIndex;
+            node.count[i] = 0;
+        }
+    }
+
+    /// Return the bin of a primitive centroid along the given axis
+    MTS_INLINE Size bin_index(const Range &range, const Point3f &c, size_t axis,
+                              Float scale) const {
+        Float value = (c[axis] - range.centroid_bbox.min[axis]) * scale;
+        return std::min(Size(std::max(value, Float(0))), m_bin_count - 1);
+    }
+
+    /**
+     * \brief Split a range into two using the binned SAH
+     *
+     * Returns \c false when a leaf is preferable, in which case the range is
+     * left untouched. Otherwise, the primitive references are partitioned in
+     * place, and \c left and \c right are initialized.
+     */
+    bool split(const Range &range, Size depth, Range &left, Range &right) {
+        Size count = range.size();
+        if (count <= 1 || depth >= MTS_BVH_MAXDEPTH)
+            return false;
+
+        Float scale[3];
+        for (size_t k = 0; k < 3; ++k) {
+            Float extent = range.centroid_bbox.max[k] - range.centroid_bbox.min[k];
+            scale[k] = extent > 0 ? (m_bin_count * math::OneMinusEpsilon<Float>) / extent : 0;
+        }
+
+        // Populate the bins of all three axes
+        auto bin_range = [&](const tbb::blocked_range<Size> &r, std::vector<Bin> bins) {
+            for (Size i = r.begin(); i != r.end(); ++i) {
+                Index index = m_indices[i];
+                const BoundingBox3f &bbox = m_bboxes[index];
+                const Point3f &c = m_centroids[index];
+                for (size_t k = 0; k < 3; ++k) {
+                    Bin &bin = bins[k * m_bin_count + bin_index(range, c, k, scale[k])];
+                    bin.bbox.expand(bbox);
+                    bin.centroid_bbox.expand(c);
+                    bin.count++;
+                }
+            }
+            return bins;
+        };
+
+        std::vector<Bin> bins(3 * m_bin_count);
+        if (count >= bvh_parallel_threshold) {
+            bins = tbb::parallel_reduce(
+                tbb::blocked_range<Size>(range.begin, range.end, bvh_grain_size),
+                bins, bin_range,
+                [&](std::vector<Bin> a, const std::vector<Bin> &b) {
+                    for (size_t i = 0; i < a.size(); ++i)
+                        a[i].expand(b[i]);
+                    return a;
+                }
+            );
+        } else {
+            bins = bin_range(tbb::blocked_range<Size>(range.begin, range.end), std::move(bins));
+        }
+
+        // Sweep over the candidate split planes
+        Float best_cost = math::Infinity<Float>;
+        size_t best_axis = 0;
+        Size best_bin = 0;
+        std::vector<Float> right_area(m_bin_count);
+        std::vector<Size> right_count(m_bin_count);
+
+        for (size_t k = 0; k < 3; ++k) {
+            if (scale[k] == 0)
+                continue;
+            const Bin *axis_bins = bins.data() + k * m_bin_count;
+
+            BoundingBox3f bbox;
+            Size n = 0;
+            for (Size b = m_bin_count - 1; b > 0; --b) {
+                bbox.expand(axis_bins[b].bbox);
+                n += axis_bins[b].count;
+                right_area[b] = n > 0 ? bbox.surface_area() : 0;
+                right_count[b] = n;
+            }
+
+            bbox.reset();
+            n = 0;
+            for (Size b = 1; b < m_bin_count; ++b) {
+                bbox.expand(axis_bins[b - 1].bbox);
+                n += axis_bins[b - 1].count;
+                if (n == 0 || right_count[b] == 0)
+                    continue;
+                Float cost = bbox.surface_area() * n + right_area[b] * right_count[b];
+                if (cost < best_cost) {
+                    best_cost = cost;
+                    best_axis = k;
+                    best_bin = b;
+                }
+            }
+        }
+
+        Float area = range.bbox.surface_area(),
+              leaf_cost = m_intersection_cost * count,
+              split_cost = m_traversal_cost +
+                  m_intersection_cost * best_cost / (area > 0 ? area : Float(1));
+
+        if (best_cost == math::Infinity<Float>) {
+            if (count <= m_max_leaf_size)
+                return false;
+
+            /* All centroids coincide, but the range holds too many
+               primitives for a leaf: fall back to a median split */
+            Size mid = range.begin + count / 2;
+            left = make_range(range.begin, mid);
+            right = make_range(mid, range.end);
+            return true;
+        }
+
+        if (split_cost >= leaf_cost && count <= m_max_leaf_size)
+            return false;
+
+        Index *middle = std::partition(
+            m_indices.data() + range.begin, m_indices.data() + range.end,
+            [&](Index index) {
+                return bin_index(range, m_centroids[index], best_axis,
+                                 scale[best_axis]) < best_bin;
+            }
+        );
+
+        Bin left_bin, right_bin;
+        const Bin *axis_bins = bins.data() + best_axis * m_bin_count;
+        for (Size b = 0; b < m_bin_count; ++b)
+            (b < best_bin ? left_bin : right_bin).expand(axis_bins[b]);
+
+        Size mid = Size(middle - m_indices.data());
+        Assert(mid - range.begin == left_bin.count);
+
+        left.begin = range.begin;
+        left.end = mid;
+        left.bbox = left_bin.bbox;
+        left.centroid_bbox = left_bin.centroid_bbox;
+        right.begin = mid;
+        right.end = range.end;
+        right.bbox = right_bin.bbox;
+        right.centroid_bbox = right_bin.centroid_bbox;
+
+        return true;
+    }
+
+    /**
+     * \brief Build the subtree of a range of primitive references
+     *
+     * Returns the index of the created node and a primitive count of zero,
+     * or the primitive offset and count if the range should be a leaf.
+     */
+    std::pair<Index, Size> build_child(const Range &range, Size depth) {
+        Range left, right;
+        if (!split(range, depth, left, right))
+            return { range.begin, range.size() };
+
+        Index node_index = Index(m_nodes.grow_by(1) - m_nodes.begin());
+
+        /* Collapse several levels of a binary hierarchy into a wide node by
+           repeatedly splitting the child with the largest surface area */
+        Range children[MTS_BVH_WIDTH];
+        bool is_leaf[MTS_BVH_WIDTH] = { };
+        size_t child_count = 2;
+        children[0] = left;
+        children[1] = right;
+
+        while (child_count < MTS_BVH_WIDTH) {
+            size_t best = child_count;
+            Float best_area = -1;
+            for (size_t i = 0; i < child_count; ++i) {
+                Float area = children[i].bbox.surface_area();
+                if (!is_leaf[i] && area > best_area) {
+                    best = i;
+                    best_area = area;
+                }
+            }
+
+            if (best == child_count)
+                break;
+
+            if (split(children[best], depth, left, right)) {
+                children[best] = left;
+                children[child_count++] = right;
+            } else {
+                is_leaf[best] = true;
+            }
+        }
+
+        // Recurse, spawning parallel tasks for large subtrees
+        std::pair<Index, Size> result[MTS_BVH_WIDTH];
+        auto build_range = [&](size_t i) {
+            if (is_leaf[i])
+                result[i] = { children[i].begin, children[i].size() };
+            else
+                result[i] = build_child(children[i], depth + 1);
+        };
+
+        if (range.size() >= bvh_parallel_threshold)
+            tbb::parallel_for(size_t(0), child_count, build_range);
+        else
+            for (size_t i = 0; i < child_count; ++i)
+                build_range(i);
+
+        BVHNode &node = m_nodes[node_index];
+        init_node(node);
+        for (size_t i = 0; i < child_count; ++i) {
+            node.set_child_bbox(i, children[i].bbox);
+            node.child[i] = result[i].first;
+            node.count[i] = result[i].second;
+        }
+
+        return { node_index, 0 };
+    }
+
+protected:
+    const std::vector<BoundingBox3f> &m_bboxes;
+    std::vector<Point3f> m_centroids;
+    std::vector<Index> m_indices;
+    tbb::concurrent_vector<BVHNode> m_nodes;
+
+    Float m_intersection_cost;
+    Float m_traversal_cost;
+    Size m_max_leaf_size;
+    Size m_bin_count;
+};
+
+MTS_VARIANT ShapeBVH<Float, Spectrum>::ShapeBVH(const Properties &props) {
+    /* BVH construction: Relative cost of a shape intersection
+       operation in the surface area heuristic. */
+    m_intersection_cost = props.float_("bvh_intersection_cost", 1.f);
+
+    /* BVH construction: Relative cost of a node traversal
+       operation in the surface area heuristic. */
+    m_traversal_cost = props.float_("bvh_traversal_cost", 1.f);
+
+    /* BVH construction: Leaves containing more primitives are always split */
+    m_max_leaf_size = (Size) props.size_("bvh_max_leaf_size", 8);
+
+    /* BVH construction: Number of bins per axis used to evaluate the SAH */
+    m_bin_count = (Size) props.size_("bvh_bins", 16);
+
+    /* BVH update: Rebuild the hierarchy from scratch when refitting it
+       following a change in geometry increases its SAH cost by more than
+       this factor. */
+    m_rebuild_threshold = props.float_("bvh_rebuild_threshold", 1.5f);
+
+    if (m_intersection_cost <= 0)
+        Throw("The intersection cost must be > 0");
+    if (m_traversal_cost <= 0)
+        Throw("The traversal cost must be > 0");
+    if (m_max_leaf_size == 0)
+        Throw("The maximum leaf size must be > 0");
+    if (m_bin_count < 2)
+        Throw("The number of bins must be >= 2");
+}
+
+MTS_VARIANT void ShapeBVH<Float, Spectrum>::add_shape(Shape *shape) {
+    Assert(m_node_count == 0);
+    m_primitive_count += shape->primitive_count();
+    m_shapes.push_back(shape);
+}
+
+MTS_VARIANT void ShapeBVH<Float, Spectrum>::build() {
+    Timer timer;
+    Log(Info, "Building a SAH BVH (%i primitives) ..", primitive_count());
+
+    // Compute the primitive bounding boxes in parallel
+    std::vector<ScalarBoundingBox3f> bboxes(m_primitive_count);
+    std::vector<BVHPrimitive> prims(m_primitive_count);
+    Size offset = 0;
+    for (Size shape_index = 0; shape_index < shape_count(); ++shape_index) {
+        const Shape *shape = m_shapes[shape_index];
+        Size prim_count = shape->primitive_count();
+        tbb::parallel_for(
+            tbb::blocked_range<Size>(0u, prim_count, bvh_grain_size),
+            [&](const tbb::blocked_range<Size> &range) {
+                for (Size i = range.begin(); i != range.end(); ++i) {
+                    bboxes[offset + i] = shape->bbox(i);
+                    prims[offset + i] = BVHPrimitive{ shape_index, i };
+                }
+            }
+        );
+        offset += prim_count;
+    }
+
+    BVHBuilder<ShapeBVH> builder(bboxes, m_intersection_cost, m_traversal_cost,
+                                 m_max_leaf_size, m_bin_count);
+    builder.build();
+
+    const auto &nodes = builder.nodes();
+    const auto &indices = builder.indices();
+
+    m_node_count = Size(nodes.size());
+    m_nodes.reset(new BVHNode[m_node_count]);
+    std::copy(nodes.begin(), nodes.end(), m_nodes.get());
+
+    m_prims.reset(new BVHPrimitive[m_primitive_count]);
+    for (Size i = 0; i < m_primitive_count; ++i)
+        m_prims[i] = prims[indices[i]];
+
+    m_bbox.reset();
+    if (m_node_count > 0) {
+        for (size_t i = 0; i < MTS_BVH_WIDTH; ++i)
+            m_bbox.expand(m_nodes[0].child_bbox(i));
+    }
+
+    m_build_cost = sah_cost();
+
+    Log(Info, "Finished. (%s of storage, took %s)",
+        util::mem_string(memory_usage()),
+        util::time_string(timer.value())
+    );
+    Log(Debug, "BVH statistics: %i nodes, SAH cost %.2f", m_node_count, m_build_cost);
+}
+
+MTS_VARIANT void ShapeBVH<Float, Spectrum>::update(const std::vector<Shape *> &shapes) {
+    Timer timer;
+
+    for (Shape *shape : shapes) {
+        if (std::find(m_shapes.begin(), m_shapes.end(), shape) == m_shapes.end())
+            Throw("ShapeBVH::update(): shape %s is not part of the BVH!",
+                  shape->to_string());
+    }
+
+    refit();
+    ScalarFloat cost = sah_cost();
+
+    if (cost > m_rebuild_threshold * m_build_cost) {
+        Log(Debug, "BVH refit raised the SAH cost from %.2f to %.2f, rebuilding ..",
+            m_build_cost, cost);
+        build();
+    } else {
+        Log(Debug, "Refitted the BVH (SAH cost %.2f -> %.2f, took %s)",
+            m_build_cost, cost, util::time_string(timer.value()));
+    }
+}
+
+MTS_VARIANT void ShapeBVH<Float, Spectrum>::refit() {
+    // Leaf bounding boxes are independent of each other
+    tbb::parallel_for(
+        tbb::blocked_range<Size>(0u, m_node_count, 64),
+        [&](const tbb::blocked_range<Size> &range) {
+            for (Size i = range.begin(); i != range.end(); ++i) {
+                BVHNode &node = m_nodes[i];
+                for (size_t j = 0; j < MTS_BVH_WIDTH; ++j) {
+                    if (node.count[j] == 0)
+                        continue;
+                    ScalarBoundingBox3f bbox;
+                    for (Size k = node.child[j]; k < node.child[j] + node.count[j]; ++k)
+                        bbox.expand(m_shapes[m_prims[k].shape]->bbox(m_prims[k].prim));
+                    node.set_child_bbox(j, bbox);
+                }
+            }
+        }
+    );
+
+    /* Children are always stored after their parent, hence a reverse sweep
+       over the nodes visits them bottom-up */
+    for (Size i = m_node_count; i-- > 0; ) {
+        BVHNode &node = m_nodes[i];
+        for (size_t j = 0; j < MTS_BVH_WIDTH; ++j) {
+            if (node.count[j] != 0 || node.child[j] == InvalidIndex)
+                continue;
+            const BVHNode &child = m_nodes[node.child[j]];
+            ScalarBoundingBox3f bbox;
+            for (size_t k = 0; k < MTS_BVH_WIDTH; ++k)
+                bbox.expand(child.child_bbox(k));
+            node.set_child_bbox(j, bbox);
+        }
+    }
+
+    m_bbox.reset();
+    if (m_node_count > 0) {
+        for (size_t i = 0; i < MTS_BVH_WIDTH; ++i)
+            m_bbox.expand(m_nodes[0].child_bbox(i));
+    }
+}
+
+MTS_VARIANT typename ShapeBVH<Float, Spectrum>::ScalarFloat
+ShapeBVH<Float, Spectrum>::sah_cost() const {
+    ScalarFloat cost = 0.f, area = m_bbox.surface_area();
+    if (m_node_count == 0 || !(area > 0))
+        return cost;
+
+    for (Size i = 0; i < m_node_count; ++i) {
+        const BVHNode &node = m_nodes[i];
+        for (size_t j = 0; j < MTS_BVH_WIDTH; ++j) {
+            if (node.count[j] == 0 && node.child[j] == InvalidIndex)
+                continue;
+            ScalarFloat child_cost = node.count[j] > 0
+                ? m_intersection_cost * node.count[j] : m_traversal_cost;
+            cost += node.child_bbox(j).surface_area() * child_cost;
+        }
+    }
+
+    return m_traversal_cost + cost / area;
+}
+
+MTS_VARIANT std::string ShapeBVH<Float, Spectrum>::to_string() const {
+    std::ostringstream oss;
+    oss << "ShapeBVH[" << std::endl
+        << "  node_count = " << m_node_count << "," << std::endl
+        << "  shapes = [" << std::endl;
+    for (auto shape : m_shapes)
+        oss << "    " << string::indent(shape, 4)
+            << "," << std::endl;
+    oss << "  ]" << std::endl << "]";
+    return oss.str();
+}
+
+MTS_IMPLEMENT_CLASS_VARIANT(ShapeBVH, Object)
+MTS_INSTANTIATE_CLASS(ShapeBVH)
+NAMESPACE_END(mitsuba)
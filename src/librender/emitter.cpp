@@ -7,6 +7,11 @@ NAMESPACE_BEGIN(mitsuba)
 MTS_VARIANT Emitter<Float, Spectrum>::Emitter(const Properties &props) : Base(props) { }
 MTS_VARIANT Emitter<Float, Spectrum>::~Emitter() { }
 
+MTS_VARIANT typename Emitter<Float, Spectrum>::ScalarFloat
+Emitter<Float, Spectrum>::power_estimate() const {
+    return 1.f;
+}
+
 MTS_IMPLEMENT_CLASS_VARIANT(Emitter, Endpoint, "emitter")
 MTS_INSTANTIATE_CLASS(Emitter)
 NAMESPACE_END(mitsuba)
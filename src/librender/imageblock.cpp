@@ -47,6 +47,11 @@ MTS_VARIANT void ImageBlock<Float, Spectrum>::set_size(const ScalarVector2i &siz
 }
 
 MTS_VARIANT void ImageBlock<Float, Spectrum>::put(const ImageBlock *block) {
+    put(block, 0, size().y() + 2 * border_size());
+}
+
+MTS_VARIANT void ImageBlock<Float, Spectrum>::put(const ImageBlock *block,
+                                                  int row_begin, int row_end) {
     ScopedPhase sp(ProfilerPhase::ImageBlockPut);
 
     if (unlikely(block->channel_count() != channel_count()))
@@ -59,19 +64,30 @@ MTS_VARIANT void ImageBlock<Float, Spectrum>::put(const ImageBlock *block) {
     ScalarPoint2i  source_offset = block->offset() - block->border_size(),
                    target_offset =        offset() -        border_size();
 
+    // Restrict the update to the rows of the requested band
+    ScalarPoint2i relative_offset = source_offset - target_offset;
+    row_begin = std::max(row_begin, relative_offset.y());
+    row_end   = std::min(row_end, relative_offset.y() + source_size.y());
+    if (row_begin >= row_end)
+        return;
+
+    ScalarPoint2i  source_start(0, row_begin - relative_offset.y()),
+                   target_start(relative_offset.x(), row_begin);
+    ScalarVector2i band_size(source_size.x(), row_end - row_begin);
+
     if constexpr (is_cuda_array_v<Float> || is_diff_array_v<Float>) {
         accumulate_2d<Float &, const Float &>(
             block->data(), source_size,
             data(), target_size,
-            ScalarVector2i(0), source_offset - target_offset,
-            source_size, channel_count()
+            source_start, target_start,
+            band_size, channel_count()
         );
     } else {
         accumulate_2d(
             block->data().data(), source_size,
             data().data(), target_size,
-            ScalarVector2i(0), source_offset - target_offset,
-            source_size, channel_count()
+            source_start, target_start,
+            band_size, channel_count()
         );
     }
 }
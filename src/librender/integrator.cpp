@@ -1,10 +1,18 @@
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <functional>
 #include <thread>
 #include <mutex>
 
 #include <enoki/morton.h>
+#include <mitsuba/core/bitmap.h>
+#include <mitsuba/core/fstream.h>
 #include <mitsuba/core/profiler.h>
 #include <mitsuba/core/progress.h>
 #include <mitsuba/core/spectrum.h>
+#include <mitsuba/core/thread.h>
 #include <mitsuba/core/timer.h>
 #include <mitsuba/core/util.h>
 #include <mitsuba/core/warp.h>
@@ -19,6 +27,93 @@
 
 NAMESPACE_BEGIN(mitsuba)
 
+/// Identifies checkpoint files written by \ref SamplingIntegrator::write_checkpoint()
+static const char *CheckpointMagic = "MTS_CHECKPOINT_V1";
+
+/**
+ * \brief Background thread that writes previews of a progressive render
+ *
+ * The thread sleeps until the preview interval has elapsed or enough passes
+ * have completed, takes a snapshot of the film and hands it over to \ref
+ * Bitmap::write_async(), so that neither the snapshot nor the encoding of the
+ * image holds up the rendering threads.
+ */
+class PreviewThread : public Thread {
+public:
+    using Clock = std::chrono::steady_clock;
+
+    PreviewThread(const std::function<ref<Bitmap>()> &snapshot, const fs::path &filename,
+                  float interval, size_t passes)
+        : Thread("preview"), m_snapshot(snapshot), m_filename(filename),
+          m_interval(interval), m_passes(passes) { }
+
+    /// Notify the thread that a pass has completed
+    void pass_done() {
+        std::lock_guard<std::mutex> guard(m_mutex);
+        m_passes_done++;
+        m_cv.notify_one();
+    }
+
+    /// Ask the thread to exit and wait for it to do so
+    void stop() {
+        /* critical section */ {
+            std::lock_guard<std::mutex> guard(m_mutex);
+            m_stop = true;
+        }
+        m_cv.notify_one();
+        join();
+    }
+
+protected:
+    void run() override {
+        std::unique_lock<std::mutex> lock(m_mutex);
+        size_t passes_written = 0, preview_count = 0;
+
+        auto ready = [&]() {
+            return m_stop || (m_passes > 0 && m_passes_done - passes_written >= m_passes);
+        };
+
+        while (true) {
+            if (m_interval > 0.f)
+                m_cv.wait_until(lock, Clock::now() + std::chrono::duration_cast<Clock::duration>(
+                                          std::chrono::duration<float>(m_interval)), ready);
+            else
+                m_cv.wait(lock, ready);
+
+            if (m_stop)
+                break;
+            passes_written = m_passes_done;
+
+            lock.unlock();
+            m_snapshot()->write_async(m_filename);
+            Log(Debug, "Writing preview %i to \"%s\" (%i pass%s completed).", ++preview_count,
+                m_filename.string(), passes_written, passes_written == 1 ? "" : "es");
+            lock.lock();
+        }
+    }
+
+private:
+    std::function<ref<Bitmap>()> m_snapshot;
+    fs::path m_filename;
+    float m_interval;
+    size_t m_passes;
+    size_t m_passes_done = 0;
+    bool m_stop = false;
+    std::mutex m_mutex;
+    std::condition_variable m_cv;
+};
+
+// -----------------------------------------------------------------------------
+
+MTS_VARIANT bool Integrator<Float, Spectrum>::render_sensors(Scene *scene,
+                                                             const std::vector<Sensor *> &sensors) {
+    for (Sensor *sensor : sensors) {
+        if (!render(scene, sensor))
+            return false;
+    }
+    return true;
+}
+
 // -----------------------------------------------------------------------------
 
 MTS_VARIANT SamplingIntegrator<Float, Spectrum>::SamplingIntegrator(const Properties &props)
@@ -32,11 +127,42 @@ MTS_VARIANT SamplingIntegrator<Float, Spectrum>::SamplingIntegrator(const Proper
         m_block_size = block_size;
     }
 
+    std::string scheduling = props.string("block_scheduler", "spiral");
+    if (scheduling == "spiral")
+        m_block_scheduling = BlockScheduling::Spiral;
+    else if (scheduling == "cost")
+        m_block_scheduling = BlockScheduling::CostAware;
+    else
+        Throw("Invalid block scheduler \"%s\", must be one of: \"spiral\", "
+              "\"cost\"", scheduling);
+
     m_samples_per_pass = (uint32_t) props.size_("samples_per_pass", (size_t) -1);
     m_timeout = props.float_("timeout", -1.f);
 
+    /// Render in passes of doubling sample counts
+    m_progressive = props.bool_("progressive", false);
+
     /// Disable direct visibility of emitters if needed
     m_hide_emitters = props.bool_("hide_emitters", false);
+
+    m_adaptive_threshold   = props.float_("adaptive_threshold", 0.f);
+    m_adaptive_min_samples = (uint32_t) props.size_("adaptive_min_samples", 0);
+    m_adaptive_max_samples = (uint32_t) props.size_("adaptive_max_samples", 0);
+    m_sample_count_aov     = props.bool_("sample_count_aov", false);
+
+    if (m_adaptive_threshold > 0.f) {
+        if constexpr (is_array_v<Float>) {
+            Log(Warn, "Adaptive sampling is only supported by scalar variants, disabling it.");
+            m_adaptive_threshold = 0.f;
+        } else if (m_block_scheduling == BlockScheduling::CostAware) {
+            Throw("Adaptive sampling cannot be combined with the cost-aware block scheduler.");
+        } else if (m_progressive) {
+            Throw("Adaptive sampling cannot be combined with progressive rendering.");
+        }
+    }
+
+    if (m_progressive && m_block_scheduling == BlockScheduling::CostAware)
+        Throw("Progressive rendering cannot be combined with the cost-aware block scheduler.");
 }
 
 MTS_VARIANT SamplingIntegrator<Float, Spectrum>::~SamplingIntegrator() { }
@@ -49,6 +175,22 @@ MTS_VARIANT std::vector<std::string> SamplingIntegrator<Float, Spectrum>::aov_na
     return { };
 }
 
+MTS_VARIANT void SamplingIntegrator<Float, Spectrum>::set_checkpoint(const fs::path &filename,
+                                                                     float interval,
+                                                                     bool resume) {
+    m_checkpoint_file     = filename;
+    m_checkpoint_interval = interval;
+    m_checkpoint_resume   = resume;
+}
+
+MTS_VARIANT void SamplingIntegrator<Float, Spectrum>::set_preview(const fs::path &filename,
+                                                                  float interval,
+                                                                  size_t passes) {
+    m_preview_file     = filename;
+    m_preview_interval = std::max(interval, 0.f);
+    m_preview_passes   = (interval <= 0.f && passes == 0) ? 1 : passes;
+}
+
 MTS_VARIANT bool SamplingIntegrator<Float, Spectrum>::render(Scene *scene, Sensor *sensor) {
     ScopedPhase sp(ProfilerPhase::Render);
     m_stop = false;
@@ -56,16 +198,57 @@ MTS_VARIANT bool SamplingIntegrator<Float, Spectrum>::render(Scene *scene, Senso
     ref<Film> film = sensor->film();
     ScalarVector2i film_size = film->crop_size();
 
-    size_t total_spp        = sensor->sampler()->sample_count();
+    bool progressive = m_progressive || !m_preview_file.empty(),
+         checkpoint  = !m_checkpoint_file.empty();
+
+    if constexpr (is_cuda_array_v<Float>) {
+        // The GPU variants render the whole image at once in a single wavefront per pass
+        if (progressive || checkpoint) {
+            Log(Warn, "Progressive rendering, previews and checkpoints are only "
+                      "supported by the CPU variants, ignoring them.");
+            progressive = checkpoint = false;
+        }
+        if (m_block_scheduling == BlockScheduling::CostAware)
+            Log(Warn, "The cost-aware block scheduler is only supported by the "
+                      "CPU variants, ignoring it.");
+    }
+
+    if (progressive && (m_adaptive_threshold > 0.f ||
+                        m_block_scheduling == BlockScheduling::CostAware ||
+                        checkpoint))
+        Throw("Progressive rendering cannot be combined with adaptive sampling, "
+              "checkpoints or the cost-aware block scheduler.");
+
+    size_t total_spp = sensor->sampler()->sample_count();
+
+    // The first pass of a progressive render takes a single sample by default
     size_t samples_per_pass = (m_samples_per_pass == (size_t) -1)
-                               ? total_spp : std::min((size_t) m_samples_per_pass, total_spp);
-    if ((total_spp % samples_per_pass) != 0)
+                               ? (progressive ? 1 : total_spp)
+                               : std::min((size_t) m_samples_per_pass, total_spp);
+    if (!progressive && (total_spp % samples_per_pass) != 0)
         Throw("sample_count (%d) must be a multiple of samples_per_pass (%d).",
               total_spp, samples_per_pass);
 
     size_t n_passes = (total_spp + samples_per_pass - 1) / samples_per_pass;
+    if (progressive) {
+        // Every pass doubles the number of samples taken so far
+        n_passes = 1;
+        for (size_t spp = samples_per_pass; spp < total_spp; spp *= 2)
+            n_passes++;
+    }
+
+    bool adaptive = m_adaptive_threshold > 0.f;
+    if (adaptive && n_passes == 1)
+        Throw("Adaptive sampling requires samples_per_pass (%d) to be smaller "
+              "than sample_count (%d).", samples_per_pass, total_spp);
+
+    if (checkpoint && (adaptive || m_block_scheduling == BlockScheduling::CostAware))
+        Throw("Checkpoints cannot be combined with adaptive sampling or the "
+              "cost-aware block scheduler.");
 
     std::vector<std::string> channels = aov_names();
+    if (adaptive && m_sample_count_aov)
+        channels.push_back("sample_count");
     bool has_aovs = !channels.empty();
 
     // Insert default channels and set up the film
@@ -97,47 +280,70 @@ MTS_VARIANT bool SamplingIntegrator<Float, Spectrum>::render(Scene *scene, Senso
             m_block_size = block_size;
         }
 
-        Spiral spiral(film, m_block_size, n_passes);
+        if (adaptive) {
+            m_block_split_depth = 0;
+            render_adaptive(scene, sensor, channels, samples_per_pass, total_spp);
+        } else if (checkpoint) {
+            m_block_split_depth = 0;
+            render_checkpointed(scene, sensor, channels, samples_per_pass, n_passes);
+        } else if (progressive) {
+            m_block_split_depth = 0;
+            render_progressive(scene, sensor, channels, samples_per_pass, total_spp);
+        } else if (m_block_scheduling == BlockScheduling::CostAware) {
+            // Quadrants are split off down to at most a quarter of the block size
+            m_block_split_depth = 0;
+            while (m_block_split_depth < 2 && (m_block_size >> (m_block_split_depth + 1)) > 0)
+                m_block_split_depth++;
 
-        ThreadEnvironment env;
-        ref<ProgressReporter> progress = new ProgressReporter("Rendering");
-        std::mutex mutex;
+            render_cost_aware(scene, sensor, channels, samples_per_pass, n_passes);
+        } else {
+            m_block_split_depth = 0;
 
-        // Total number of blocks to be handled, including multiple passes.
-        size_t total_blocks = spiral.block_count() * n_passes,
-               blocks_done = 0;
+            Spiral spiral(film, m_block_size, n_passes);
 
-        tbb::parallel_for(
-            tbb::blocked_range<size_t>(0, total_blocks, 1),
-            [&](const tbb::blocked_range<size_t> &range) {
-                ScopedSetThreadEnvironment set_env(env);
-                ref<Sampler> sampler = sensor->sampler()->clone();
-                ref<ImageBlock> block = new ImageBlock(m_block_size, channels.size(),
-                                                       film->reconstruction_filter(),
-                                                       !has_aovs);
-                scoped_flush_denormals flush_denormals(true);
-                std::unique_ptr<Float[]> aovs(new Float[channels.size()]);
+            ThreadEnvironment env;
+            ref<ProgressReporter> progress = new ProgressReporter("Rendering");
+            std::mutex mutex;
 
-                // For each block
-                for (auto i = range.begin(); i != range.end() && !should_stop(); ++i) {
-                    auto [offset, size, block_id] = spiral.next_block();
-                    Assert(hprod(size) != 0);
-                    block->set_size(size);
-                    block->set_offset(offset);
+            // Total number of blocks to be handled, including multiple passes.
+            size_t total_blocks = spiral.block_count() * n_passes;
+            std::atomic<size_t> blocks_done(0);
 
-                    render_block(scene, sensor, sampler, block,
-                                 aovs.get(), samples_per_pass, block_id);
+            tbb::parallel_for(
+                tbb::blocked_range<size_t>(0, total_blocks, 1),
+                [&](const tbb::blocked_range<size_t> &range) {
+                    ScopedSetThreadEnvironment set_env(env);
+                    ref<Sampler> sampler = sensor->sampler()->clone();
+                    ref<ImageBlock> block = new ImageBlock(m_block_size, channels.size(),
+                                                           film->reconstruction_filter(),
+                                                           !has_aovs);
+                    scoped_flush_denormals flush_denormals(true);
+                    std::unique_ptr<Float[]> aovs(new Float[channels.size()]);
 
-                    film->put(block);
+                    // For each block
+                    for (auto i = range.begin(); i != range.end() && !should_stop(); ++i) {
+                        auto [offset, size, block_id] = spiral.next_block();
+                        Assert(hprod(size) != 0);
+                        block->set_size(size);
+                        block->set_offset(offset);
+
+                        render_block(scene, sensor, sampler, block,
+                                     aovs.get(), samples_per_pass, block_id);
 
-                    /* Critical section: update progress bar */ {
-                        std::lock_guard<std::mutex> lock(mutex);
-                        blocks_done++;
-                        progress->update(blocks_done / (ScalarFloat) total_blocks);
+                        film->put(block);
+
+                        /* Update the progress bar unless another thread is
+                           already doing so. The final update always happens. */
+                        size_t done = ++blocks_done;
+                        std::unique_lock<std::mutex> lock(mutex, std::try_to_lock);
+                        if (!lock.owns_lock() && done == total_blocks)
+                            lock.lock();
+                        if (lock.owns_lock())
+                            progress->update(done / (ScalarFloat) total_blocks);
                     }
                 }
-            }
-        );
+            );
+        }
     } else {
         Log(Info, "Start rendering...");
 
@@ -179,46 +385,719 @@ MTS_VARIANT bool SamplingIntegrator<Float, Spectrum>::render(Scene *scene, Senso
     return !m_stop;
 }
 
+MTS_VARIANT bool
+SamplingIntegrator<Float, Spectrum>::render_sensors(Scene *scene,
+                                                    const std::vector<Sensor *> &sensors) {
+    bool shared_loop = sensors.size() > 1 && m_adaptive_threshold <= 0.f && !m_progressive &&
+                       m_preview_file.empty() && m_checkpoint_file.empty() &&
+                       m_block_scheduling == BlockScheduling::Spiral;
+    if (!shared_loop)
+        return Base::render_sensors(scene, sensors);
+
+    if constexpr (!is_cuda_array_v<Float>) {
+        ScopedPhase sp(ProfilerPhase::Render);
+        m_stop = false;
+        m_block_split_depth = 0;
+
+        /// Render job of a single sensor
+        struct Job {
+            Sensor *sensor;
+            ref<Film> film;
+            ref<Spiral> spiral;
+            size_t samples_per_pass, n_passes, block_count, first_block;
+        };
+
+        std::vector<std::string> channels = aov_names();
+        bool has_aovs = !channels.empty();
+        for (size_t i = 0; i < 5; ++i)
+            channels.insert(channels.begin() + i, std::string(1, "XYZAW"[i]));
+
+        std::vector<Job> jobs;
+        size_t total_samples = 0;
+        for (Sensor *sensor : sensors) {
+            ref<Film> film = sensor->film();
+            size_t total_spp        = sensor->sampler()->sample_count();
+            size_t samples_per_pass = (m_samples_per_pass == (size_t) -1)
+                                       ? total_spp : std::min((size_t) m_samples_per_pass, total_spp);
+            if ((total_spp % samples_per_pass) != 0)
+                Throw("sample_count (%d) must be a multiple of samples_per_pass (%d).",
+                      total_spp, samples_per_pass);
+
+            film->prepare(channels);
+            jobs.push_back({ sensor, film, nullptr, samples_per_pass,
+                             total_spp / samples_per_pass, 0, 0 });
+            total_samples += total_spp * (size_t) hprod(film->crop_size());
+        }
+
+        size_t n_threads = __global_thread_count;
+        Log(Info, "Starting render job (%i sensors, %i samples in total, %i thread%s)",
+            jobs.size(), total_samples, n_threads, n_threads == 1 ? "" : "s");
+
+        if (m_timeout > 0.f)
+            Log(Info, "Timeout specified: %.2f seconds.", m_timeout);
+
+        // The blocks of all sensors together need to keep every thread busy
+        if (m_block_size == 0) {
+            uint32_t block_size = MTS_BLOCK_SIZE;
+            while (true) {
+                size_t block_count = 0;
+                for (const Job &job : jobs)
+                    block_count += hprod((job.film->crop_size() + block_size - 1) / block_size);
+                if (block_size == 1 || block_count >= n_threads)
+                    break;
+                block_size /= 2;
+            }
+            m_block_size = block_size;
+        }
+
+        size_t total_blocks = 0;
+        for (Job &job : jobs) {
+            job.spiral = new Spiral(job.film, m_block_size, job.n_passes);
+            job.block_count = job.spiral->block_count() * job.n_passes;
+            job.first_block = total_blocks;
+            total_blocks += job.block_count;
+        }
+
+        m_render_timer.reset();
+        ThreadEnvironment env;
+        ref<ProgressReporter> progress = new ProgressReporter("Rendering");
+        std::mutex mutex;
+        std::atomic<size_t> blocks_done(0);
+
+        /* Blocks are numbered sensor after sensor. Threads that run out of
+           work for one sensor immediately continue with the next one. */
+        tbb::parallel_for(
+            tbb::blocked_range<size_t>(0, total_blocks, 1),
+            [&](const tbb::blocked_range<size_t> &range) {
+                ScopedSetThreadEnvironment set_env(env);
+                std::vector<ref<Sampler>> samplers(jobs.size());
+                std::vector<ref<ImageBlock>> blocks(jobs.size());
+                scoped_flush_denormals flush_denormals(true);
+                std::unique_ptr<Float[]> aovs(new Float[channels.size()]);
+
+                size_t j = 0;
+                for (auto i = range.begin(); i != range.end() && !should_stop(); ++i) {
+                    while (i >= jobs[j].first_block + jobs[j].block_count)
+                        j++;
+                    Job &job = jobs[j];
+
+                    if (!samplers[j]) {
+                        samplers[j] = job.sensor->sampler()->clone();
+                        blocks[j] = new ImageBlock(m_block_size, channels.size(),
+                                                   job.film->reconstruction_filter(),
+                                                   !has_aovs);
+                    }
+
+                    auto [offset, size, block_id] = job.spiral->next_block();
+                    ImageBlock *block = blocks[j];
+                    block->set_size(size);
+                    block->set_offset(offset);
+
+                    render_block(scene, job.sensor, samplers[j], block, aovs.get(),
+                                 job.samples_per_pass, block_id);
+
+                    job.film->put(block);
+
+                    size_t done = ++blocks_done;
+                    std::unique_lock<std::mutex> lock(mutex, std::try_to_lock);
+                    if (!lock.owns_lock() && done == total_blocks)
+                        lock.lock();
+                    if (lock.owns_lock())
+                        progress->update(done / (ScalarFloat) total_blocks);
+                }
+            }
+        );
+
+        if (!m_stop)
+            Log(Info, "Rendering finished. (took %s)",
+                util::time_string(m_render_timer.value(), true));
+
+        return !m_stop;
+    } else {
+        return Base::render_sensors(scene, sensors);
+    }
+}
+
+MTS_VARIANT void
+SamplingIntegrator<Float, Spectrum>::render_adaptive(const Scene *scene,
+                                                     Sensor *sensor,
+                                                     const std::vector<std::string> &channels,
+                                                     size_t samples_per_pass,
+                                                     size_t total_spp) {
+    ref<Film> film = sensor->film();
+    bool has_aovs = channels.size() > 5;
+    size_t pixel_count = (size_t) hprod(film->crop_size());
+
+    uint32_t min_samples = m_adaptive_min_samples > 0 ? m_adaptive_min_samples
+                                                      : (uint32_t) total_spp / 4,
+             max_samples = m_adaptive_max_samples > 0 ? m_adaptive_max_samples
+                                                      : (uint32_t) total_spp * 4;
+    // At least two samples are needed to estimate the variance
+    min_samples = std::max(min_samples, 2u);
+
+    m_pixel_statistics = std::unique_ptr<PixelStatistics[]>(new PixelStatistics[pixel_count]);
+
+    ThreadEnvironment env;
+    ref<ProgressReporter> progress = new ProgressReporter("Rendering");
+
+    /* Keep issuing passes over the unconverged pixels for as long as the
+       sample budget of the non-adaptive render permits it */
+    size_t budget = total_spp * pixel_count, spent = 0,
+           active_pixels = pixel_count, pass = 0;
+
+    while (active_pixels > 0 && spent + active_pixels * samples_per_pass <= budget &&
+           !should_stop()) {
+        Spiral spiral(film, m_block_size, 1);
+        size_t block_count = spiral.block_count();
+
+        // Passes are rendered one after the other, so that each pixel is only touched by one thread
+        tbb::parallel_for(
+            tbb::blocked_range<size_t>(0, block_count, 1),
+            [&](const tbb::blocked_range<size_t> &range) {
+                ScopedSetThreadEnvironment set_env(env);
+                ref<Sampler> sampler = sensor->sampler()->clone();
+                ref<ImageBlock> block = new ImageBlock(m_block_size, channels.size(),
+                                                       film->reconstruction_filter(),
+                                                       !has_aovs);
+                scoped_flush_denormals flush_denormals(true);
+                std::unique_ptr<Float[]> aovs(new Float[channels.size()]);
+
+                for (auto i = range.begin(); i != range.end() && !should_stop(); ++i) {
+                    auto [offset, size, block_id] = spiral.next_block();
+                    block->set_size(size);
+                    block->set_offset(offset);
+
+                    render_block(scene, sensor, sampler, block, aovs.get(),
+                                 samples_per_pass, block_id + pass * block_count);
+
+                    film->put(block);
+                }
+            }
+        );
+
+        spent += active_pixels * samples_per_pass;
+        pass++;
+
+        // Terminate pixels that have converged or exhausted their sample budget
+        active_pixels = 0;
+        for (size_t i = 0; i < pixel_count; ++i) {
+            PixelStatistics &stats = m_pixel_statistics[i];
+            if (stats.converged)
+                continue;
+
+            if (stats.sample_count >= max_samples) {
+                stats.converged = true;
+            } else if (stats.sample_count >= min_samples) {
+                ScalarFloat std_error =
+                    std::sqrt(stats.m2 / ((stats.sample_count - 1) * (ScalarFloat) stats.sample_count));
+                stats.converged =
+                    std_error <= m_adaptive_threshold * std::max(stats.mean, ScalarFloat(1e-3f));
+            }
+
+            if (!stats.converged)
+                active_pixels++;
+        }
+
+        progress->update(spent / (ScalarFloat) budget);
+    }
+
+    Log(Info, "Adaptive sampling: %i passes, %.2f samples per pixel on average, "
+        "%i pixel%s did not converge.", pass, spent / (double) pixel_count,
+        active_pixels, active_pixels == 1 ? "" : "s");
+
+    m_pixel_statistics.reset();
+}
+
+MTS_VARIANT void
+SamplingIntegrator<Float, Spectrum>::render_checkpointed(const Scene *scene,
+                                                         Sensor *sensor,
+                                                         const std::vector<std::string> &channels,
+                                                         size_t samples_per_pass,
+                                                         size_t n_passes) {
+    ref<Film> film = sensor->film();
+    const Sampler *sampler_ = sensor->sampler();
+    bool has_aovs = channels.size() > 5;
+
+    // Everything that needs to match for a checkpoint to be resumed
+    std::string channel_list;
+    for (const std::string &channel : channels)
+        channel_list += (channel_list.empty() ? "" : ",") + channel;
+
+    std::string job = tfm::format(
+        "%s, crop size %s, crop offset %s, channels %s, block size %i, "
+        "%i sample%s (%i per pass), %s sampler with seed %i",
+        class_()->variant(), film->crop_size(), film->crop_offset(), channel_list,
+        m_block_size, sampler_->sample_count(), sampler_->sample_count() == 1 ? "" : "s",
+        samples_per_pass, sampler_->class_()->name(), sampler_->base_seed());
+
+    size_t completed = 0;
+    if (m_checkpoint_resume && fs::exists(m_checkpoint_file)) {
+        completed = read_checkpoint(sensor, job);
+        Log(Info, "Resuming from checkpoint \"%s\" (%i/%i passes completed).",
+            m_checkpoint_file.string(), completed, n_passes);
+    }
+
+    size_t block_count = Spiral(film, m_block_size, 1).block_count(),
+           total_blocks = block_count * n_passes,
+           saved = completed;
+    std::atomic<size_t> blocks_done(block_count * completed);
+
+    /* Blocks of the current pass. They are accumulated into the film in a
+       fixed order once the pass is done, which makes the result independent
+       of the thread scheduling. */
+    std::vector<ref<ImageBlock>> blocks(block_count);
+    std::unique_ptr<bool[]> rendered(new bool[block_count]);
+
+    ThreadEnvironment env;
+    ref<ProgressReporter> progress = new ProgressReporter("Rendering");
+    std::mutex mutex;
+    Timer checkpoint_timer;
+
+    for (size_t pass = completed; pass < n_passes; ++pass) {
+        Spiral spiral(film, m_block_size, 1);
+        std::fill(rendered.get(), rendered.get() + block_count, false);
+
+        tbb::parallel_for(
+            tbb::blocked_range<size_t>(0, block_count, 1),
+            [&](const tbb::blocked_range<size_t> &range) {
+                ScopedSetThreadEnvironment set_env(env);
+                ref<Sampler> sampler = sensor->sampler()->clone();
+                scoped_flush_denormals flush_denormals(true);
+                std::unique_ptr<Float[]> aovs(new Float[channels.size()]);
+
+                for (auto i = range.begin(); i != range.end() && !should_stop(); ++i) {
+                    auto [offset, size, block_id] = spiral.next_block();
+                    ref<ImageBlock> &block = blocks[block_id];
+                    if (!block)
+                        block = new ImageBlock(m_block_size, channels.size(),
+                                               film->reconstruction_filter(), !has_aovs);
+                    block->set_size(size);
+                    block->set_offset(offset);
+
+                    // Same block identifiers as in a regular multi-pass render
+                    render_block(scene, sensor, sampler, block, aovs.get(), samples_per_pass,
+                                 block_id + (n_passes - 1 - pass) * block_count);
+                    rendered[block_id] = true;
+
+                    size_t done = ++blocks_done;
+                    std::unique_lock<std::mutex> lock(mutex, std::try_to_lock);
+                    if (!lock.owns_lock() && done == total_blocks)
+                        lock.lock();
+                    if (lock.owns_lock())
+                        progress->update(done / (ScalarFloat) total_blocks);
+                }
+            }
+        );
+
+        bool stopped = should_stop();
+
+        // Save the completed passes before a partial pass enters the film
+        if (stopped && saved < completed)
+            write_checkpoint(sensor, job, completed);
+
+        for (size_t i = 0; i < block_count; ++i) {
+            if (rendered[i])
+                film->put(blocks[i]);
+        }
+
+        if (stopped)
+            break;
+
+        completed = pass + 1;
+        if (completed < n_passes &&
+            checkpoint_timer.value() >= 1000.f * m_checkpoint_interval) {
+            write_checkpoint(sensor, job, completed);
+            checkpoint_timer.reset();
+            saved = completed;
+        }
+    }
+
+    if (completed == n_passes && fs::exists(m_checkpoint_file))
+        fs::remove(m_checkpoint_file);
+}
+
+MTS_VARIANT void SamplingIntegrator<Float, Spectrum>::write_checkpoint(Sensor *sensor,
+                                                                       const std::string &job,
+                                                                       size_t passes) const {
+    ref<Bitmap> storage = sensor->film()->bitmap(true);
+    if (storage->component_format() != struct_type_v<ScalarFloat>)
+        Throw("Checkpoints require a film that stores raw floating point values!");
+
+    // Write to a temporary file first, a crash must not corrupt an existing checkpoint
+    fs::path temp_file = m_checkpoint_file;
+    temp_file.replace_extension(m_checkpoint_file.extension().string() + ".tmp");
+
+    /* Write the checkpoint */ {
+        ref<FileStream> stream = new FileStream(temp_file, FileStream::ETruncReadWrite);
+        stream->write(std::string(CheckpointMagic));
+        stream->write(job);
+        stream->write((uint64_t) passes);
+        stream->write((uint32_t) storage->width());
+        stream->write((uint32_t) storage->height());
+        stream->write((uint32_t) storage->channel_count());
+        stream->write_array((const ScalarFloat *) storage->data(),
+                            storage->pixel_count() * storage->channel_count());
+    }
+
+    if (!fs::rename(temp_file, m_checkpoint_file))
+        Throw("Could not write checkpoint \"%s\"!", m_checkpoint_file.string());
+
+    Log(Info, "Saved checkpoint \"%s\" after %i pass%s.", m_checkpoint_file.string(),
+        passes, passes == 1 ? "" : "es");
+}
+
+MTS_VARIANT size_t SamplingIntegrator<Float, Spectrum>::read_checkpoint(Sensor *sensor,
+                                                                        const std::string &job) const {
+    ref<FileStream> stream = new FileStream(m_checkpoint_file, FileStream::ERead);
+
+    std::string magic, job_saved;
+    stream->read(magic);
+    if (magic != CheckpointMagic)
+        Throw("\"%s\" is not a valid checkpoint file!", m_checkpoint_file.string());
+
+    stream->read(job_saved);
+    if (job_saved != job)
+        Throw("Checkpoint \"%s\" was created by a different render job:\n"
+              "  checkpoint: %s\n  current:    %s", m_checkpoint_file.string(),
+              job_saved, job);
+
+    uint64_t passes;
+    uint32_t width, height, channel_count;
+    stream->read(passes);
+    stream->read(width);
+    stream->read(height);
+    stream->read(channel_count);
+
+    ref<Film> film = sensor->film();
+    ScalarVector2i size(width, height);
+    if (size != film->crop_size())
+        Throw("Checkpoint \"%s\" has an unexpected resolution!", m_checkpoint_file.string());
+
+    /* Accumulate the saved contents into the freshly prepared (zero) film,
+       which restores the storage exactly */
+    ref<ImageBlock> block = new ImageBlock(size, channel_count, nullptr, false,
+                                           false, false, false);
+    block->set_offset(film->crop_offset());
+    if constexpr (!is_cuda_array_v<Float>) {
+        stream->read_array(block->data().data(), hprod(size) * (size_t) channel_count);
+        film->put(block);
+    } else {
+        Throw("Checkpoints are not supported in GPU variants!");
+    }
+
+    return (size_t) passes;
+}
+
+MTS_VARIANT void
+SamplingIntegrator<Float, Spectrum>::render_progressive(const Scene *scene,
+                                                        Sensor *sensor,
+                                                        const std::vector<std::string> &channels,
+                                                        size_t samples_per_pass,
+                                                        size_t total_spp) {
+    ref<Film> film = sensor->film();
+    bool has_aovs = channels.size() > 5;
+    size_t block_count = Spiral(film, m_block_size, 1).block_count(),
+           pixel_count = (size_t) hprod(film->crop_size());
+
+    ThreadEnvironment env;
+    ref<ProgressReporter> progress = new ProgressReporter("Rendering");
+    std::mutex mutex;
+    size_t total_samples = total_spp * pixel_count;
+    std::atomic<size_t> samples_done(0);
+
+    ref<PreviewThread> preview;
+    if (!m_preview_file.empty()) {
+        preview = new PreviewThread([film]() { return film->bitmap(); }, m_preview_file,
+                                    m_preview_interval, m_preview_passes);
+        preview->start();
+    }
+
+    size_t spp_done = 0, pass = 0;
+    while (spp_done < total_spp && !should_stop()) {
+        size_t pass_spp = std::min(std::max(spp_done, samples_per_pass), total_spp - spp_done);
+        Spiral spiral(film, m_block_size, 1);
+
+        tbb::parallel_for(
+            tbb::blocked_range<size_t>(0, block_count, 1),
+            [&](const tbb::blocked_range<size_t> &range) {
+                ScopedSetThreadEnvironment set_env(env);
+                ref<Sampler> sampler = sensor->sampler()->clone();
+                ref<ImageBlock> block = new ImageBlock(m_block_size, channels.size(),
+                                                       film->reconstruction_filter(),
+                                                       !has_aovs);
+                scoped_flush_denormals flush_denormals(true);
+                std::unique_ptr<Float[]> aovs(new Float[channels.size()]);
+
+                for (auto i = range.begin(); i != range.end() && !should_stop(); ++i) {
+                    auto [offset, size, block_id] = spiral.next_block();
+                    block->set_size(size);
+                    block->set_offset(offset);
+
+                    render_block(scene, sensor, sampler, block, aovs.get(), pass_spp,
+                                 block_id + pass * block_count);
+
+                    film->put(block);
+
+                    size_t done = samples_done += hprod(size) * pass_spp;
+                    std::unique_lock<std::mutex> lock(mutex, std::try_to_lock);
+                    if (!lock.owns_lock() && done == total_samples)
+                        lock.lock();
+                    if (lock.owns_lock())
+                        progress->update(done / (ScalarFloat) total_samples);
+                }
+            }
+        );
+
+        if (should_stop())
+            break;
+
+        spp_done += pass_spp;
+        pass++;
+        Log(Debug, "Progressive rendering: pass %i done, %i/%i samples per pixel.",
+            pass, spp_done, total_spp);
+
+        if (preview && spp_done < total_spp)
+            preview->pass_done();
+    }
+
+    if (preview)
+        preview->stop();
+}
+
+MTS_VARIANT void
+SamplingIntegrator<Float, Spectrum>::render_cost_aware(const Scene *scene,
+                                                       Sensor *sensor,
+                                                       const std::vector<std::string> &channels,
+                                                       size_t samples_per_pass,
+                                                       size_t n_passes) {
+    using Clock = std::chrono::steady_clock;
+
+    /// Part of an image block: an aligned quadrant in Morton order
+    struct WorkItem {
+        ScalarVector2i offset, size;
+        size_t block_id;
+        uint32_t morton_begin, morton_end;
+        double cost;
+    };
+
+    ref<Film> film = sensor->film();
+    bool has_aovs = channels.size() > 5;
+    size_t n_threads = __global_thread_count;
+    uint32_t pixel_count = m_block_size * m_block_size;
+
+    // Enumerate the blocks once, block identifiers match those of the spiral
+    Spiral spiral(film, m_block_size, 1);
+    size_t block_count = spiral.block_count();
+    std::vector<WorkItem> blocks(block_count);
+    for (size_t i = 0; i < block_count; ++i) {
+        auto [offset, size, block_id] = spiral.next_block();
+        blocks[block_id] = { offset, size, block_id, 0, pixel_count, 1.0 };
+    }
+
+    ThreadEnvironment env;
+    ref<ProgressReporter> progress = new ProgressReporter("Rendering");
+    std::mutex mutex;
+    size_t total_pixels = block_count * n_passes * pixel_count;
+    std::atomic<size_t> pixels_done(0);
+
+    /* Process a list of work items in order. Threads fetch the next item from
+       a shared counter, which preserves the ordering of the list (unlike
+       splitting a range). Scratch passes only measure the cost per item. */
+    auto process = [&](std::vector<WorkItem> &items, size_t sample_count, bool scratch) {
+        std::atomic<size_t> next_item(0);
+        tbb::parallel_for(
+            tbb::blocked_range<size_t>(0, n_threads, 1),
+            [&](const tbb::blocked_range<size_t> &) {
+                ScopedSetThreadEnvironment set_env(env);
+                ref<Sampler> sampler = sensor->sampler()->clone();
+                ref<ImageBlock> block = new ImageBlock(m_block_size, channels.size(),
+                                                       film->reconstruction_filter(),
+                                                       !has_aovs);
+                scoped_flush_denormals flush_denormals(true);
+                std::unique_ptr<Float[]> aovs(new Float[channels.size()]);
+
+                while (!should_stop()) {
+                    size_t i = next_item++;
+                    if (i >= items.size())
+                        break;
+
+                    WorkItem &item = items[i];
+                    block->set_size(item.size);
+                    block->set_offset(item.offset);
+
+                    auto start = Clock::now();
+                    render_block(scene, sensor, sampler, block, aovs.get(),
+                                 sample_count, item.block_id,
+                                 item.morton_begin, item.morton_end);
+                    item.cost = std::chrono::duration<double>(Clock::now() - start).count();
+
+                    if (scratch)
+                        continue;
+
+                    film->put(block);
+
+                    // Update the progress bar unless another thread is already doing so
+                    size_t done = pixels_done += item.morton_end - item.morton_begin;
+                    std::unique_lock<std::mutex> lock(mutex, std::try_to_lock);
+                    if (!lock.owns_lock() && done == total_pixels)
+                        lock.lock();
+                    if (lock.owns_lock())
+                        progress->update(done / (ScalarFloat) total_pixels);
+                }
+            }
+        );
+    };
+
+    /* Estimate the cost of every block. Multi-pass renders time their first
+       pass, single-pass renders instead perform a cheap pre-pass with one
+       sample per pixel whose result is discarded. */
+    size_t first_pass = 0;
+    if (n_passes > 1) {
+        for (WorkItem &b : blocks)
+            b.block_id += (n_passes - 1) * block_count;
+        process(blocks, samples_per_pass, false);
+        first_pass = 1;
+    } else if (samples_per_pass >= 4) {
+        process(blocks, 1, true);
+    }
+
+    if (should_stop() || first_pass == n_passes)
+        return;
+
+    /* Split blocks whose estimated cost exceeds a fraction of the expected
+       per-thread workload, so that the last items handed out are short */
+    double pass_cost = 0.0;
+    for (const WorkItem &b : blocks)
+        pass_cost += b.cost;
+    double max_cost = pass_cost * (n_passes - first_pass) / (4.0 * n_threads);
+
+    std::vector<WorkItem> items, stack;
+    size_t split_count = 0;
+    for (size_t pass = first_pass; pass < n_passes; ++pass) {
+        for (const WorkItem &b : blocks) {
+            WorkItem item = b;
+            item.block_id = b.block_id % block_count + (n_passes - 1 - pass) * block_count;
+            stack.push_back(item);
+
+            while (!stack.empty()) {
+                item = stack.back();
+                stack.pop_back();
+
+                uint32_t count = item.morton_end - item.morton_begin;
+                if (item.cost > max_cost && count * (1u << (2 * m_block_split_depth)) > pixel_count) {
+                    int32_t side = (int32_t) m_block_size;
+                    while ((uint32_t) (side * side) > count / 4)
+                        side /= 2;
+
+                    for (uint32_t q = 0; q < 4; ++q) {
+                        uint32_t begin = item.morton_begin + q * (count / 4);
+                        ScalarVector2i sub_origin(enoki::morton_decode<ScalarPoint2u>(begin)),
+                                       sub_size = min(ScalarVector2i(side), b.size - sub_origin);
+                        // Skip quadrants that lie outside of the film
+                        if (any(sub_size <= 0)) {
+                            pixels_done += count / 4;
+                            continue;
+                        }
+                        stack.push_back({ b.offset + sub_origin, sub_size, item.block_id,
+                                          begin, begin + count / 4, item.cost / 4 });
+                    }
+                    split_count++;
+                } else {
+                    items.push_back(item);
+                }
+            }
+        }
+    }
+
+    // Longest-processing-time-first ordering
+    std::stable_sort(items.begin(), items.end(),
+                     [](const WorkItem &a, const WorkItem &b) { return a.cost > b.cost; });
+
+    Log(Debug, "Cost-aware scheduler: %i work items (%i splits) for %i pass%s.",
+        items.size(), split_count, n_passes - first_pass,
+        n_passes - first_pass == 1 ? "" : "es");
+
+    process(items, samples_per_pass, false);
+}
+
 MTS_VARIANT void SamplingIntegrator<Float, Spectrum>::render_block(const Scene *scene,
                                                                    const Sensor *sensor,
                                                                    Sampler *sampler,
                                                                    ImageBlock *block,
                                                                    Float *aovs,
                                                                    size_t sample_count_,
-                                                                   size_t block_id) const {
+                                                                   size_t block_id,
+                                                                   uint32_t morton_begin,
+                                                                   uint32_t morton_end) const {
     block->clear();
     uint32_t pixel_count  = (uint32_t)(m_block_size * m_block_size),
              sample_count = (uint32_t)(sample_count_ == (size_t) -1
                                            ? sampler->sample_count()
                                            : sample_count_);
+    morton_end = std::min(morton_end, pixel_count);
+    Assert(morton_begin < morton_end);
 
     ScalarFloat diff_scale_factor = rsqrt((ScalarFloat) sampler->sample_count());
 
     if constexpr (!is_array_v<Float>) {
-        for (uint32_t i = 0; i < pixel_count && !should_stop(); ++i) {
+        const Film *film = sensor->film();
+        size_t sample_count_channel = 5 + aov_names().size();
+
+        for (uint32_t i = morton_begin; i < morton_end && !should_stop(); ++i) {
             sampler->seed(block_id * pixel_count + i);
 
-            ScalarPoint2u pos = enoki::morton_decode<ScalarPoint2u>(i);
+            // Quadrants are aligned, hence the offset can simply be subtracted
+            ScalarPoint2u pos = enoki::morton_decode<ScalarPoint2u>(i - morton_begin);
             if (any(pos >= block->size()))
                 continue;
 
             pos += block->offset();
+
+            PixelStatistics *stats = nullptr;
+            if (m_pixel_statistics) {
+                ScalarVector2i p = ScalarVector2i(pos) - film->crop_offset();
+                stats = &m_pixel_statistics[p.y() * film->crop_size().x() + p.x()];
+                if (stats->converged)
+                    continue;
+            }
+
             for (uint32_t j = 0; j < sample_count && !should_stop(); ++j) {
+                /* The film averages this channel over the samples of a pixel:
+                   the values 1, 3, 5, .. average to the sample count. */
+                if (stats && m_sample_count_aov)
+                    aovs[sample_count_channel] = ScalarFloat(2 * stats->sample_count + 1);
+
                 render_sample(scene, sensor, sampler, block, aovs,
                               pos, diff_scale_factor);
+
+                // Track the luminance (Y) of the sample
+                if (stats && std::isfinite(aovs[1]))
+                    stats->put(aovs[1]);
             }
         }
     } else if constexpr (is_array_v<Float> && !is_cuda_array_v<Float>) {
-        // Ensure that the sample generation is fully deterministic
-        sampler->seed(block_id);
+        /* Ensure that the sample generation is fully deterministic: seed each
+           of the 4^m_block_split_depth units of the block separately, so that
+           the result does not depend on how the block was split up. */
+        uint32_t unit_count = 1u << (2 * m_block_split_depth),
+                 unit_size  = pixel_count / unit_count;
+        Assert(morton_begin % unit_size == 0 && morton_end % unit_size == 0);
 
-        for (auto [index, active] : range<UInt32>(pixel_count * sample_count)) {
-            if (should_stop())
-                break;
-            Point2u pos = enoki::morton_decode<Point2u>(index / UInt32(sample_count));
-            active &= !any(pos >= block->size());
-            pos += block->offset();
-            render_sample(scene, sensor, sampler, block, aovs, pos, diff_scale_factor, active);
+        for (uint32_t unit = morton_begin / unit_size;
+             unit < morton_end / unit_size && !should_stop(); ++unit) {
+            sampler->seed(block_id * unit_count + unit);
+            uint32_t unit_offset = unit * unit_size - morton_begin;
+
+            for (auto [index, active] : range<UInt32>(unit_size * sample_count)) {
+                if (should_stop())
+                    break;
+                Point2u pos = enoki::morton_decode<Point2u>(
+                    unit_offset + index / UInt32(sample_count));
+                active &= !any(pos >= block->size());
+                pos += block->offset();
+                render_sample(scene, sensor, sampler, block, aovs, pos,
+                              diff_scale_factor, active);
+            }
         }
     } else {
         ENOKI_MARK_USED(scene);
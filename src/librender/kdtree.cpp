@@ -1,9 +1,49 @@
 #include <mitsuba/render/kdtree.h>
 #include <mitsuba/render/mesh.h>
+#include <mitsuba/core/fstream.h>
+#include <mitsuba/core/mmap.h>
 #include <mitsuba/core/properties.h>
+#include <chrono>
+#include <iomanip>
 
 NAMESPACE_BEGIN(mitsuba)
 
+/// Version of the kd-tree cache file format, increase when changing it
+static const uint32_t kdtree_cache_version = 1;
+
+/// Header of a kd-tree cache file, followed by the node and index arrays
+template <typename Scalar> struct KDTreeCacheHeader {
+    char magic[4];
+    uint32_t version;
+    uint32_t scalar_size;
+    uint32_t node_count;
+    uint64_t key;
+    uint32_t index_count;
+    uint32_t primitive_count;
+    Scalar bbox_min[3];
+    Scalar bbox_max[3];
+    Scalar cost;
+};
+
+/// Hash a memory region 8 bytes at a time (FNV-1a variant)
+static uint64_t hash_bytes(const void *ptr, size_t size, uint64_t hash) {
+    const uint8_t *data = (const uint8_t *) ptr;
+    size_t i = 0;
+    for (; i + 8 <= size; i += 8) {
+        uint64_t word;
+        memcpy(&word, data + i, 8);
+        hash = (hash ^ word) * 0x100000001b3ull;
+        hash ^= hash >> 29;
+    }
+    for (; i < size; ++i)
+        hash = (hash ^ data[i]) * 0x100000001b3ull;
+    return hash;
+}
+
+template <typename T> static uint64_t hash_value(const T &value, uint64_t hash) {
+    return hash_bytes(&value, sizeof(T), hash);
+}
+
 MTS_VARIANT ShapeKDTree<Float, Spectrum>::ShapeKDTree(const Properties &props)
     : Base(SurfaceAreaHeuristic3f(
           /* kd-tree construction: Relative cost of a shape intersection
@@ -44,10 +84,31 @@ MTS_VARIANT ShapeKDTree<Float, Spectrum>::ShapeKDTree(const Properties &props)
     if (props.has_property("kd_exact_primitive_threshold"))
         set_exact_primitive_threshold(props.int_("kd_exact_primitive_threshold"));
 
+    /* kd-tree update: Rebuild the tree from scratch when updating it following
+       a change in geometry increases its SAH cost by more than this factor. */
+    m_rebuild_threshold = props.float_("kd_rebuild_threshold", 1.5f);
+
+    /* kd-tree construction: Directory used to cache built trees across runs.
+       Caching is disabled when this property is not specified. */
+    if (props.has_property("kd_cache_dir"))
+        m_cache_dir = fs::absolute(props.string("kd_cache_dir"));
+
     m_primitive_map.push_back(0);
 }
 
 MTS_VARIANT void ShapeKDTree<Float, Spectrum>::build() {
+    uint64_t key = 0;
+    fs::path cache_file;
+    if (!m_cache_dir.empty()) {
+        key = cache_key();
+        std::ostringstream oss;
+        oss << "kdtree_" << std::hex << std::setfill('0') << std::setw(16) << key << ".bin";
+        cache_file = m_cache_dir / oss.str();
+
+        if (fs::exists(cache_file) && load_cache(cache_file, key))
+            return;
+    }
+
     Timer timer;
     Log(Info, "Building a SAH kd-tree (%i primitives) ..",
         primitive_count());
@@ -55,10 +116,180 @@ MTS_VARIANT void ShapeKDTree<Float, Spectrum>::build() {
     Base::build();
 
     Log(Info, "Finished. (%s of storage, took %s)",
-        util::mem_string(m_index_count * sizeof(Index) +
-                        m_node_count * sizeof(KDNode)),
+        util::mem_string(memory_usage()),
         util::time_string(timer.value())
     );
+
+    if (!cache_file.empty())
+        save_cache(cache_file, key);
+}
+
+MTS_VARIANT uint64_t ShapeKDTree<Float, Spectrum>::cache_key() const {
+    uint64_t hash = 0xcbf29ce484222325ull;
+
+    // Tree construction parameters
+    auto model = Base::cost_model();
+    hash = hash_value(model.query_cost(), hash);
+    hash = hash_value(model.traversal_cost(), hash);
+    hash = hash_value(model.empty_space_bonus(), hash);
+    hash = hash_value(Base::max_depth(), hash);
+    hash = hash_value(Base::min_max_bins(), hash);
+    hash = hash_value(Base::clip_primitives(), hash);
+    hash = hash_value(Base::retract_bad_splits(), hash);
+    hash = hash_value(Base::max_bad_refines(), hash);
+    hash = hash_value(Base::stop_primitives(), hash);
+    hash = hash_value(Base::exact_primitive_threshold(), hash);
+
+    // Geometry
+    hash = hash_bytes(m_primitive_map.data(), m_primitive_map.size() * sizeof(Size), hash);
+    for (const Shape *shape : m_shapes) {
+        if (shape->is_mesh() && !((const Mesh *) shape)->is_compressed()) {
+            const Mesh *mesh = (const Mesh *) shape;
+            hash = hash_bytes(mesh->vertex_positions_buffer().data(),
+                              mesh->vertex_count() * 3 * sizeof(typename Mesh::InputFloat), hash);
+            hash = hash_bytes(mesh->faces_buffer().data(),
+                              mesh->face_count() * 3 * sizeof(uint32_t), hash);
+        } else {
+            /* Other shapes (and compressed meshes) only contribute their
+               bounding boxes to the tree construction */
+            for (Size i = 0; i < shape->primitive_count(); ++i)
+                hash = hash_value(shape->bbox(i), hash);
+        }
+    }
+
+    return hash;
+}
+
+MTS_VARIANT bool ShapeKDTree<Float, Spectrum>::load_cache(const fs::path &filename, uint64_t key) {
+    using Header = KDTreeCacheHeader<ScalarFloat>;
+
+    try {
+        Timer timer;
+        ref<MemoryMappedFile> mmap = new MemoryMappedFile(filename);
+        const uint8_t *ptr = (const uint8_t *) mmap->data();
+
+        Header header;
+        if (mmap->size() < sizeof(Header))
+            Throw("file is truncated");
+        memcpy(&header, ptr, sizeof(Header));
+        ptr += sizeof(Header);
+
+        if (memcmp(header.magic, "MTKD", 4) != 0 ||
+            header.version != kdtree_cache_version ||
+            header.scalar_size != sizeof(ScalarFloat))
+            Throw("incompatible file format");
+
+        if (header.key != key || header.primitive_count != primitive_count())
+            Throw("cache key mismatch");
+
+        size_t node_size  = header.node_count * sizeof(KDNode),
+               index_size = header.index_count * sizeof(Index);
+        if (mmap->size() != sizeof(Header) + node_size + index_size)
+            Throw("file is truncated");
+
+        m_node_count = header.node_count;
+        m_index_count = header.index_count;
+        m_nodes.reset(new KDNode[m_node_count]);
+        m_indices.reset(new Index[m_index_count]);
+        memcpy(m_nodes.get(), ptr, node_size);
+        memcpy(m_indices.get(), ptr + node_size, index_size);
+
+        m_bbox.min = ScalarPoint3f(header.bbox_min[0], header.bbox_min[1], header.bbox_min[2]);
+        m_bbox.max = ScalarPoint3f(header.bbox_max[0], header.bbox_max[1], header.bbox_max[2]);
+        m_cost = m_build_cost = header.cost;
+
+        Log(Info, "Loaded a SAH kd-tree (%i primitives) from \"%s\" (took %s)",
+            primitive_count(), filename.filename(), util::time_string(timer.value()));
+        return true;
+    } catch (const std::exception &e) {
+        Log(Warn, "Could not load the kd-tree cache file \"%s\" (%s), rebuilding ..",
+            filename, e.what());
+        m_nodes.reset();
+        m_indices.reset();
+        m_node_count = m_index_count = 0;
+        return false;
+    }
+}
+
+MTS_VARIANT void ShapeKDTree<Float, Spectrum>::save_cache(const fs::path &filename, uint64_t key) const {
+    using Header = KDTreeCacheHeader<ScalarFloat>;
+
+    Header header;
+    memset(&header, 0, sizeof(Header));
+    memcpy(header.magic, "MTKD", 4);
+    header.version = kdtree_cache_version;
+    header.scalar_size = sizeof(ScalarFloat);
+    header.node_count = m_node_count;
+    header.key = key;
+    header.index_count = m_index_count;
+    header.primitive_count = primitive_count();
+    for (int i = 0; i < 3; ++i) {
+        header.bbox_min[i] = m_bbox.min[i];
+        header.bbox_max[i] = m_bbox.max[i];
+    }
+    header.cost = m_build_cost;
+
+    /* Write to a temporary file first, so that concurrent
+       processes never observe a partially written cache */
+    fs::path temp_file = filename;
+    temp_file.replace_extension(
+        ".tmp" + std::to_string(std::chrono::steady_clock::now().time_since_epoch().count()));
+
+    try {
+        if (!fs::exists(m_cache_dir))
+            fs::create_directory(m_cache_dir);
+
+        ref<FileStream> stream = new FileStream(temp_file, FileStream::ETruncReadWrite);
+        stream->write(&header, sizeof(Header));
+        stream->write(m_nodes.get(), m_node_count * sizeof(KDNode));
+        stream->write(m_indices.get(), m_index_count * sizeof(Index));
+        stream->close();
+
+        if (!fs::rename(temp_file, filename))
+            Throw("could not rename \"%s\"", temp_file);
+
+        Log(Debug, "Wrote the kd-tree cache file \"%s\"", filename);
+    } catch (const std::exception &e) {
+        Log(Warn, "Could not write the kd-tree cache file \"%s\": %s", filename, e.what());
+        fs::remove(temp_file);
+    }
+}
+
+MTS_VARIANT void ShapeKDTree<Float, Spectrum>::update(const std::vector<Shape *> &shapes) {
+    Assert(ready());
+    Timer timer;
+
+    IndexVector changed;
+    for (Shape *shape : shapes) {
+        auto it = std::find(m_shapes.begin(), m_shapes.end(), shape);
+        if (it == m_shapes.end())
+            Throw("ShapeKDTree::update(): shape %s is not part of the kd-tree!",
+                  shape->to_string());
+
+        Size shape_index = Size(it - m_shapes.begin());
+        for (Size i = m_primitive_map[shape_index]; i < m_primitive_map[shape_index + 1]; ++i)
+            changed.push_back(i);
+    }
+
+    ScalarFloat cost = Base::update(changed);
+
+    if (cost > m_rebuild_threshold * m_build_cost) {
+        Log(Debug, "kd-tree update raised the SAH cost from %.2f to %.2f, rebuilding ..",
+            m_build_cost, cost);
+
+        m_nodes.reset();
+        m_indices.reset();
+        m_node_count = m_index_count = 0;
+
+        m_bbox.reset();
+        for (Shape *shape : m_shapes)
+            m_bbox.expand(shape->bbox());
+
+        build();
+    } else {
+        Log(Debug, "Updated the kd-tree (%i primitives, SAH cost %.2f -> %.2f, took %s)",
+            changed.size(), m_build_cost, cost, util::time_string(timer.value()));
+    }
 }
 
 MTS_VARIANT void ShapeKDTree<Float, Spectrum>::add_shape(Shape *shape) {
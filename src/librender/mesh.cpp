@@ -1,4 +1,7 @@
+#include <mitsuba/core/asset_cache.h>
 #include <mitsuba/core/fstream.h>
+#include <mitsuba/core/hash.h>
+#include <mitsuba/core/mmap.h>
 #include <mitsuba/core/timer.h>
 #include <mitsuba/core/transform.h>
 #include <mitsuba/core/util.h>
@@ -8,7 +11,13 @@
 #include <mitsuba/render/mesh.h>
 #include <mitsuba/render/records.h>
 #include <mitsuba/render/scene.h>
+#include <algorithm>
+#include <atomic>
 #include <mutex>
+#include <queue>
+#include <random>
+#include <tuple>
+#include <tbb/parallel_for.h>
 
 #if defined(MTS_ENABLE_EMBREE)
     #include <embree3/rtcore.h>
@@ -23,12 +32,473 @@
 
 NAMESPACE_BEGIN(mitsuba)
 
+/// Number of faces/vertices processed per task by parallel loops over the mesh
+static constexpr size_t grain_size = 16384;
+
+/// Copy of the geometry of a mesh stored in the asset cache
+struct CachedMeshGeometry : public Object {
+    struct Attribute {
+        std::string name;
+        size_t size;
+        std::vector<float> data;
+    };
+
+    std::string name;
+    uint32_t vertex_count, face_count;
+    double bbox_min[3], bbox_max[3];
+    std::vector<float> positions, normals, texcoords;
+    std::vector<uint32_t> faces;
+    std::vector<Attribute> attributes;
+
+    size_t size() const {
+        size_t result = sizeof(CachedMeshGeometry) +
+                        (positions.size() + normals.size() + texcoords.size()) * sizeof(float) +
+                        faces.size() * sizeof(uint32_t);
+        for (const Attribute &attribute : attributes)
+            result += attribute.data.size() * sizeof(float);
+        return result;
+    }
+};
+
+/**
+ * \brief Mesh simplification based on iterative edge collapses that are
+ * ordered by a quadric error metric
+ *
+ * Follows "Surface Simplification Using Quadric Error Metrics" by Michael
+ * Garland and Paul S. Heckbert (SIGGRAPH 1997). Each vertex accumulates the
+ * area-weighted squared distance to the planes of its adjacent faces, and
+ * the edge whose collapse introduces the smallest error is contracted first.
+ * Boundary edges (including texture seams, which split the vertices of a
+ * mesh) are preserved by additional planes that are perpendicular to the
+ * adjacent face. Collapses that would create non-manifold configurations or
+ * flip faces are rejected.
+ *
+ * Vertex attributes (normals, texture coordinates, etc.) are linearly
+ * interpolated along the contracted edges. The result is deterministic.
+ */
+class MeshSimplifier {
+public:
+    using Vector3d = Vector<double, 3>;
+
+    MeshSimplifier(const float *positions, const uint32_t *faces,
+                   uint32_t vertex_count, uint32_t face_count)
+        : m_positions(vertex_count), m_faces(faces, faces + face_count * 3),
+          m_face_removed(face_count, false), m_vertex_faces(vertex_count),
+          m_quadrics(vertex_count), m_version(vertex_count, 0),
+          m_boundary(vertex_count, false), m_face_count(face_count) {
+        for (uint32_t i = 0; i < vertex_count; ++i)
+            m_positions[i] = Vector3d(positions[3 * i], positions[3 * i + 1],
+                                      positions[3 * i + 2]);
+
+        for (uint32_t f = 0; f < face_count; ++f) {
+            const uint32_t *fi = &m_faces[3 * f];
+            if (fi[0] == fi[1] || fi[1] == fi[2] || fi[2] == fi[0]) {
+                // Discard degenerate faces right away
+                m_face_removed[f] = true;
+                m_face_count--;
+                continue;
+            }
+            for (size_t k = 0; k < 3; ++k)
+                m_vertex_faces[fi[k]].push_back(f);
+
+            Vector3d n = face_normal(fi[0], fi[1], fi[2]);
+            double area = norm(n);
+            if (area == 0.0)
+                continue;
+            n /= area;
+            add_plane(fi, n, -dot(n, m_positions[fi[0]]), 0.5 * area);
+        }
+
+        // Find boundary edges, i.e. edges that are only used by a single face
+        std::vector<std::tuple<uint32_t, uint32_t, uint32_t>> edges;
+        edges.reserve(m_face_count * 3);
+        for (uint32_t f = 0; f < face_count; ++f) {
+            if (m_face_removed[f])
+                continue;
+            for (size_t k = 0; k < 3; ++k) {
+                uint32_t i0 = m_faces[3 * f + k], i1 = m_faces[3 * f + (k + 1) % 3];
+                edges.emplace_back(std::min(i0, i1), std::max(i0, i1), f);
+            }
+        }
+        std::sort(edges.begin(), edges.end());
+
+        for (size_t i = 0; i < edges.size(); ) {
+            size_t j = i + 1;
+            while (j < edges.size() && std::get<0>(edges[j]) == std::get<0>(edges[i]) &&
+                   std::get<1>(edges[j]) == std::get<1>(edges[i]))
+                ++j;
+
+            uint32_t i0 = std::get<0>(edges[i]), i1 = std::get<1>(edges[i]);
+            if (j - i == 1) {
+                m_boundary[i0] = m_boundary[i1] = true;
+
+                // Constrain the boundary using a plane perpendicular to the face
+                const uint32_t *fi = &m_faces[3 * std::get<2>(edges[i])];
+                Vector3d n = face_normal(fi[0], fi[1], fi[2]),
+                         e = m_positions[i1] - m_positions[i0];
+                double area = norm(n);
+                if (area > 0.0) {
+                    Vector3d c = cross(e, n / area);
+                    double length = norm(c);
+                    if (length > 0.0) {
+                        c /= length;
+                        uint32_t endpoints[2] = { i0, i1 };
+                        add_plane(endpoints, c, -dot(c, m_positions[i0]),
+                                  BoundaryWeight * squared_norm(e), 2);
+                    }
+                }
+            }
+            m_edges.emplace_back(i0, i1);
+            i = j;
+        }
+    }
+
+    /// Interpolate the given per-vertex data with \c dim components during collapses
+    void add_vertex_data(const float *data, size_t dim) {
+        m_vertex_data.emplace_back(data, data + m_positions.size() * dim);
+        m_vertex_data_dim.push_back(dim);
+    }
+
+    /// Collapse edges until at most \c target_face_count faces remain (if possible)
+    void run(uint32_t target_face_count) {
+        for (auto [i0, i1] : m_edges)
+            push_edge(i0, i1);
+        m_edges.clear();
+        m_edges.shrink_to_fit();
+
+        std::vector<uint32_t> neighbors_0, neighbors_1;
+        while (m_face_count > target_face_count && !m_queue.empty()) {
+            Candidate c = m_queue.top();
+            m_queue.pop();
+
+            if (m_version[c.v0] != c.version0 || m_version[c.v1] != c.version1)
+                continue; // Outdated entry
+
+            neighbors(c.v0, neighbors_0);
+            neighbors(c.v1, neighbors_1);
+
+            /* Link condition: the endpoints may only share the neighbors
+               that are opposite of the contracted edge */
+            size_t shared_faces = 0, shared_neighbors = 0;
+            for (uint32_t f : m_vertex_faces[c.v0])
+                shared_faces += !m_face_removed[f] && has_vertex(f, c.v1);
+            for (uint32_t v : neighbors_0)
+                shared_neighbors += std::binary_search(neighbors_1.begin(), neighbors_1.end(), v);
+            if (shared_neighbors != shared_faces || shared_faces == 0)
+                continue;
+
+            // Don't pinch the mesh by contracting an interior edge between two boundaries
+            if (shared_faces == 2 && m_boundary[c.v0] && m_boundary[c.v1])
+                continue;
+
+            Vector3d position;
+            double t;
+            std::tie(position, t, std::ignore) = placement(c.v0, c.v1);
+            if (flips(c.v0, c.v1, position) || flips(c.v1, c.v0, position))
+                continue;
+
+            collapse(c.v0, c.v1, position, t);
+        }
+    }
+
+    /// Return the number of remaining faces
+    uint32_t face_count() const { return m_face_count; }
+
+    /**
+     * \brief Return the remaining faces using compact vertex indices
+     *
+     * \param vertex_map
+     *     Receives the original index of every remaining vertex
+     * \param face_map
+     *     Receives the original index of every remaining face
+     */
+    std::vector<uint32_t> faces(std::vector<uint32_t> &vertex_map,
+                                std::vector<uint32_t> &face_map) const {
+        const uint32_t invalid = std::numeric_limits<uint32_t>::max();
+        std::vector<uint32_t> remap(m_positions.size(), invalid), result;
+        vertex_map.clear();
+        face_map.clear();
+
+        // Preserve the relative order of the vertices and faces
+        for (uint32_t f = 0; f < (uint32_t) m_face_removed.size(); ++f) {
+            if (m_face_removed[f])
+                continue;
+            for (size_t k = 0; k < 3; ++k)
+                remap[m_faces[3 * f + k]] = 0;
+        }
+        for (uint32_t i = 0; i < (uint32_t) remap.size(); ++i) {
+            if (remap[i] == invalid)
+                continue;
+            remap[i] = (uint32_t) vertex_map.size();
+            vertex_map.push_back(i);
+        }
+
+        result.reserve(m_face_count * 3);
+        for (uint32_t f = 0; f < (uint32_t) m_face_removed.size(); ++f) {
+            if (m_face_removed[f])
+                continue;
+            for (size_t k = 0; k < 3; ++k)
+                result.push_back(remap[m_faces[3 * f + k]]);
+            face_map.push_back(f);
+        }
+        return result;
+    }
+
+    /// Return the (interpolated) positions of the given vertices
+    std::vector<float> positions(const std::vector<uint32_t> &vertex_map) const {
+        std::vector<float> result(vertex_map.size() * 3);
+        for (size_t i = 0; i < vertex_map.size(); ++i)
+            for (size_t k = 0; k < 3; ++k)
+                result[3 * i + k] = (float) m_positions[vertex_map[i]][k];
+        return result;
+    }
+
+    /// Return the interpolated vertex data registered with \ref add_vertex_data()
+    std::vector<float> vertex_data(size_t index, const std::vector<uint32_t> &vertex_map) const {
+        size_t dim = m_vertex_data_dim[index];
+        const std::vector<float> &data = m_vertex_data[index];
+        std::vector<float> result(vertex_map.size() * dim);
+        for (size_t i = 0; i < vertex_map.size(); ++i)
+            for (size_t k = 0; k < dim; ++k)
+                result[dim * i + k] = data[dim * vertex_map[i] + k];
+        return result;
+    }
+
+private:
+    /// Symmetric 4x4 matrix (xx, xy, xz, xw, yy, yz, yw, zz, zw, ww)
+    struct Quadric {
+        double q[10] = { };
+
+        Quadric &operator+=(const Quadric &other) {
+            for (size_t i = 0; i < 10; ++i)
+                q[i] += other.q[i];
+            return *this;
+        }
+
+        double eval(const Vector3d &p) const {
+            double x = p.x(), y = p.y(), z = p.z();
+            return q[0] * x * x + 2 * q[1] * x * y + 2 * q[2] * x * z + 2 * q[3] * x
+                 + q[4] * y * y + 2 * q[5] * y * z + 2 * q[6] * y
+                 + q[7] * z * z + 2 * q[8] * z + q[9];
+        }
+    };
+
+    struct Candidate {
+        double cost;
+        uint32_t v0, v1, version0, version1;
+
+        bool operator>(const Candidate &c) const {
+            return std::tie(cost, v0, v1) > std::tie(c.cost, c.v0, c.v1);
+        }
+    };
+
+    Vector3d face_normal(uint32_t i0, uint32_t i1, uint32_t i2) const {
+        return cross(m_positions[i1] - m_positions[i0], m_positions[i2] - m_positions[i0]);
+    }
+
+    void add_plane(const uint32_t *vertices, const Vector3d &n, double d,
+                   double weight, size_t count = 3) {
+        Quadric p;
+        double a = n.x(), b = n.y(), c = n.z();
+        double values[10] = { a * a, a * b, a * c, a * d, b * b,
+                              b * c, b * d, c * c, c * d, d * d };
+        for (size_t i = 0; i < 10; ++i)
+            p.q[i] = weight * values[i];
+        for (size_t k = 0; k < count; ++k)
+            m_quadrics[vertices[k]] += p;
+    }
+
+    bool has_vertex(uint32_t f, uint32_t v) const {
+        const uint32_t *fi = &m_faces[3 * f];
+        return fi[0] == v || fi[1] == v || fi[2] == v;
+    }
+
+    /// Collect the sorted neighbors of vertex \c v
+    void neighbors(uint32_t v, std::vector<uint32_t> &result) const {
+        result.clear();
+        for (uint32_t f : m_vertex_faces[v]) {
+            if (m_face_removed[f])
+                continue;
+            for (size_t k = 0; k < 3; ++k)
+                if (m_faces[3 * f + k] != v)
+                    result.push_back(m_faces[3 * f + k]);
+        }
+        std::sort(result.begin(), result.end());
+        result.erase(std::unique(result.begin(), result.end()), result.end());
+    }
+
+    /**
+     * Find the position minimizing the error of contracting the edge (v0, v1),
+     * and its projection \c t onto the edge used to interpolate vertex data
+     */
+    std::tuple<Vector3d, double, double> placement(uint32_t v0, uint32_t v1) const {
+        Quadric q = m_quadrics[v0];
+        q += m_quadrics[v1];
+        const Vector3d &p0 = m_positions[v0], &p1 = m_positions[v1];
+
+        // Solve the 3x3 system of the quadric using Cramer's rule
+        const double *m = q.q;
+        double c0 = m[4] * m[7] - m[5] * m[5],
+               c1 = m[2] * m[5] - m[1] * m[7],
+               c2 = m[1] * m[5] - m[2] * m[4],
+               det = m[0] * c0 + m[1] * c1 + m[2] * c2,
+               scale = m[0] + m[4] + m[7];
+
+        Vector3d best;
+        double best_error = std::numeric_limits<double>::infinity();
+        if (std::abs(det) > 1e-12 * scale * scale * scale) {
+            double inv_det = 1.0 / det;
+            double r0 = m[0] * m[7] - m[2] * m[2],
+                   r1 = m[1] * m[2] - m[0] * m[5],
+                   r2 = m[0] * m[4] - m[1] * m[1];
+            // Multiply by the inverse (the adjugate divided by the determinant)
+            Vector3d b(-m[3], -m[6], -m[8]);
+            Vector3d x(c0 * b.x() + c1 * b.y() + c2 * b.z(),
+                       c1 * b.x() + r0 * b.y() + r1 * b.z(),
+                       c2 * b.x() + r1 * b.y() + r2 * b.z());
+            best = x * inv_det;
+            best_error = q.eval(best);
+
+            /* Reject solutions that lie far from the edge, which is a sign
+               of an ill-conditioned system */
+            if (!(norm(best - 0.5 * (p0 + p1)) <= 2.0 * norm(p1 - p0)))
+                best_error = std::numeric_limits<double>::infinity();
+        }
+
+        Vector3d fallback[3] = { p0, p1, 0.5 * (p0 + p1) };
+        for (const Vector3d &p : fallback) {
+            double error = q.eval(p);
+            if (error < best_error) {
+                best = p;
+                best_error = error;
+            }
+        }
+
+        Vector3d e = p1 - p0;
+        double length_sqr = squared_norm(e);
+        double t = length_sqr > 0.0 ? dot(best - p0, e) / length_sqr : 0.0;
+        t = std::min(std::max(t, 0.0), 1.0);
+
+        return { best, t, std::max(best_error, 0.0) };
+    }
+
+    /// Does moving \c v to \c position flip (or degenerate) a face not shared with \c other?
+    bool flips(uint32_t v, uint32_t other, const Vector3d &position) const {
+        for (uint32_t f : m_vertex_faces[v]) {
+            if (m_face_removed[f] || has_vertex(f, other))
+                continue;
+            const uint32_t *fi = &m_faces[3 * f];
+            Vector3d p[3], p_new[3];
+            for (size_t k = 0; k < 3; ++k) {
+                p[k] = m_positions[fi[k]];
+                p_new[k] = fi[k] == v ? position : p[k];
+            }
+            Vector3d n_old = cross(p[1] - p[0], p[2] - p[0]),
+                     n_new = cross(p_new[1] - p_new[0], p_new[2] - p_new[0]);
+            double length_old = norm(n_old), length_new = norm(n_new);
+            if (length_new == 0.0 ||
+                dot(n_old, n_new) < 0.2 * length_old * length_new)
+                return true;
+        }
+        return false;
+    }
+
+    void push_edge(uint32_t v0, uint32_t v1) {
+        if (v0 > v1)
+            std::swap(v0, v1);
+        double error = std::get<2>(placement(v0, v1));
+        m_queue.push(Candidate{ error, v0, v1, m_version[v0], m_version[v1] });
+    }
+
+    /// Contract the edge (v0, v1) into vertex v0
+    void collapse(uint32_t v0, uint32_t v1, const Vector3d &position, double t) {
+        m_positions[v0] = position;
+        m_quadrics[v0] += m_quadrics[v1];
+        m_boundary[v0] = m_boundary[v0] || m_boundary[v1];
+
+        for (size_t i = 0; i < m_vertex_data.size(); ++i) {
+            size_t dim = m_vertex_data_dim[i];
+            float *d0 = m_vertex_data[i].data() + dim * v0,
+                  *d1 = m_vertex_data[i].data() + dim * v1;
+            for (size_t k = 0; k < dim; ++k)
+                d0[k] = (float) ((1.0 - t) * d0[k] + t * d1[k]);
+        }
+
+        for (uint32_t f : m_vertex_faces[v1]) {
+            if (m_face_removed[f])
+                continue;
+            if (has_vertex(f, v0)) {
+                m_face_removed[f] = true;
+                m_face_count--;
+                continue;
+            }
+            for (size_t k = 0; k < 3; ++k) {
+                if (m_faces[3 * f + k] == v1)
+                    m_faces[3 * f + k] = v0;
+            }
+            m_vertex_faces[v0].push_back(f);
+        }
+
+        std::vector<uint32_t> &faces = m_vertex_faces[v0];
+        faces.erase(std::remove_if(faces.begin(), faces.end(),
+                                   [&](uint32_t f) { return (bool) m_face_removed[f]; }),
+                    faces.end());
+        std::vector<uint32_t>().swap(m_vertex_faces[v1]);
+
+        m_version[v0]++;
+        m_version[v1]++;
+
+        std::vector<uint32_t> adjacent;
+        neighbors(v0, adjacent);
+        for (uint32_t v : adjacent)
+            push_edge(v0, v);
+    }
+
+private:
+    /// Weight of the planes constraining boundary edges
+    static constexpr double BoundaryWeight = 10.0;
+
+    std::vector<Vector3d> m_positions;
+    std::vector<uint32_t> m_faces;
+    std::vector<bool> m_face_removed;
+    std::vector<std::vector<uint32_t>> m_vertex_faces;
+    std::vector<Quadric> m_quadrics;
+    std::vector<uint32_t> m_version;
+    std::vector<bool> m_boundary;
+    std::vector<std::pair<uint32_t, uint32_t>> m_edges;
+    std::vector<std::vector<float>> m_vertex_data;
+    std::vector<size_t> m_vertex_data_dim;
+    std::priority_queue<Candidate, std::vector<Candidate>, std::greater<Candidate>> m_queue;
+    uint32_t m_face_count;
+};
+
 MTS_VARIANT Mesh<Float, Spectrum>::Mesh(const Properties &props) : Base(props) {
     /* When set to ``true``, Mitsuba will use per-face instead of per-vertex
        normals when rendering the object, which will give it a faceted
        appearance. Default: ``false`` */
     if (props.bool_("face_normals", false))
         m_disable_vertex_normals = true;
+
+    /* When set to ``true``, the mesh data is converted to a compact quantized
+       representation once loading has finished (see \ref compress()).
+       Default: ``false`` */
+    m_compress = props.bool_("compress", false);
+
+    /* Level of detail: simplify the mesh to the given number of faces after
+       loading it (see \ref simplify()). Default: ``0``, i.e. disabled */
+    int lod_face_count = props.int_("lod_face_count", 0);
+    if (lod_face_count < 0)
+        Throw("The \"lod_face_count\" parameter must be nonnegative!");
+    m_lod_face_count = (ScalarSize) lod_face_count;
+
+    /* When set to ``true``, the scene chooses the level of detail based on
+       the projected size of the mesh. Default: ``false`` */
+    m_lod_auto = props.bool_("lod_auto", false);
+
+    /* Directory in which simplified meshes are stored, so that subsequent
+       runs can skip both loading the full mesh and simplifying it.
+       Default: none */
+    m_lod_cache_dir = props.string("lod_cache_dir", "");
 }
 
 MTS_VARIANT
@@ -81,6 +551,9 @@ Mesh<Float, Spectrum>::bbox(ScalarIndex index) const {
 }
 
 MTS_VARIANT void Mesh<Float, Spectrum>::write_ply(const std::string &filename) const {
+    if (m_compressed)
+        Throw("write_ply(): mesh \"%s\" uses compressed storage and cannot be exported!", m_name);
+
     ref<FileStream> stream = new FileStream(filename, FileStream::ETruncReadWrite);
 
     std::vector<std::pair<std::string, const MeshAttribute&>> vertex_attributes;
@@ -197,7 +670,98 @@ MTS_VARIANT void Mesh<Float, Spectrum>::write_ply(const std::string &filename) c
     );
 }
 
+MTS_VARIANT void Mesh<Float, Spectrum>::write_mmesh(const std::string &filename) const {
+    if (m_compressed)
+        Throw("write_mmesh(): mesh \"%s\" uses compressed storage and cannot be exported!", m_name);
+
+    Log(Info, "Writing mesh to \"%s\" ..", filename);
+    Timer timer;
+
+    auto align = [](uint64_t offset) {
+        return (offset + MMeshAlignment - 1) / MMeshAlignment * MMeshAlignment;
+    };
+
+    MMeshHeader header;
+    memset(&header, 0, sizeof(MMeshHeader));
+    memcpy(header.magic, "MTSMESH", 8);
+    header.version         = MMeshVersion;
+    header.byte_order      = MMeshByteOrder;
+    header.vertex_count    = m_vertex_count;
+    header.face_count      = m_face_count;
+    header.attribute_count = (uint32_t) m_mesh_attributes.size();
+    for (size_t i = 0; i < 3; ++i) {
+        header.bbox_min[i] = (float) m_bbox.min[i];
+        header.bbox_max[i] = (float) m_bbox.max[i];
+    }
+
+    // Lay out the data arrays following the header and the attribute records
+    uint64_t offset = align(sizeof(MMeshHeader) +
+                            m_mesh_attributes.size() * sizeof(MMeshAttribute));
+    std::vector<std::pair<const void *, uint64_t>> sections;
+    auto add_section = [&](const void *ptr, uint64_t size) {
+        uint64_t result = offset;
+        sections.emplace_back(ptr, size);
+        offset = align(offset + size);
+        return result;
+    };
+
+    header.positions_offset =
+        add_section(m_vertex_positions_buf.data(), m_vertex_count * 3 * sizeof(InputFloat));
+    if (has_vertex_normals())
+        header.normals_offset =
+            add_section(m_vertex_normals_buf.data(), m_vertex_count * 3 * sizeof(InputFloat));
+    if (has_vertex_texcoords())
+        header.texcoords_offset =
+            add_section(m_vertex_texcoords_buf.data(), m_vertex_count * 2 * sizeof(InputFloat));
+    header.faces_offset =
+        add_section(m_faces_buf.data(), m_face_count * 3 * sizeof(ScalarIndex));
+
+    std::vector<MMeshAttribute> attributes;
+    for (const auto&[name, attribute]: m_mesh_attributes) {
+        MMeshAttribute record;
+        memset(&record, 0, sizeof(MMeshAttribute));
+        if (name.size() >= sizeof(record.name))
+            Throw("write_mmesh(): attribute name \"%s\" is too long!", name);
+        memcpy(record.name, name.c_str(), name.size());
+        record.size = (uint32_t) attribute.size;
+        record.type = (uint32_t) attribute.type;
+        size_t count = attribute.type == MeshAttributeType::Vertex ? m_vertex_count
+                                                                   : m_face_count;
+        record.offset = add_section(attribute.buf.data(),
+                                    count * attribute.size * sizeof(InputFloat));
+        attributes.push_back(record);
+    }
+
+    ref<FileStream> stream = new FileStream(filename, FileStream::ETruncReadWrite);
+    stream->write(&header, sizeof(MMeshHeader));
+    if (!attributes.empty())
+        stream->write(attributes.data(), attributes.size() * sizeof(MMeshAttribute));
+
+    // Write the data arrays, padding each one to the alignment boundary
+    const uint8_t zeros[MMeshAlignment] = { };
+    auto pad = [&]() {
+        size_t padding = align(stream->tell()) - stream->tell();
+        if (padding > 0)
+            stream->write(zeros, padding);
+    };
+    for (auto [ptr, size] : sections) {
+        pad();
+        if (size > 0)
+            stream->write(ptr, size);
+    }
+    pad();
+
+    Log(Info, "\"%s\": wrote %i faces, %i vertices (%s in %s)",
+        filename, m_face_count, m_vertex_count,
+        util::mem_string(stream->size()),
+        util::time_string(timer.value())
+    );
+}
+
 MTS_VARIANT void Mesh<Float, Spectrum>::recompute_vertex_normals() {
+    if (m_compressed)
+        Throw("recompute_vertex_normals(): mesh \"%s\" uses compressed storage "
+              "and cannot be modified!", m_name);
     if (!has_vertex_normals())
         Throw("Storing new normals in a Mesh that didn't have normals at "
               "construction time is not implemented yet.");
@@ -206,52 +770,88 @@ MTS_VARIANT void Mesh<Float, Spectrum>::recompute_vertex_normals() {
        by Grit Thuermer and Charles A. Wuethrich, JGT 1998, Vol 3 */
 
     if constexpr (!is_dynamic_v<Float>) {
-        size_t invalid_counter = 0;
-        std::vector<InputNormal3f> normals(m_vertex_count, zero<InputNormal3f>());
-
-        for (ScalarSize i = 0; i < m_face_count; ++i) {
-            auto fi = face_indices(i);
-            Assert(fi[0] < m_vertex_count &&
-                   fi[1] < m_vertex_count &&
-                   fi[2] < m_vertex_count);
-
-            InputPoint3f v[3] = { vertex_position(fi[0]),
-                                  vertex_position(fi[1]),
-                                  vertex_position(fi[2]) };
-
-            InputVector3f side_0 = v[1] - v[0],
-                          side_1 = v[2] - v[0];
-            InputNormal3f n = cross(side_0, side_1);
-            InputFloat length_sqr = squared_norm(n);
-            if (likely(length_sqr > 0)) {
-                n *= rsqrt(length_sqr);
-
-                // Use Enoki to compute the face angles at the same time
-                auto side1 = transpose(Array<Packet<InputFloat, 3>, 3>{ side_0, v[2] - v[1], v[0] - v[2] });
-                auto side2 = transpose(Array<Packet<InputFloat, 3>, 3>{ side_1, v[0] - v[1], v[1] - v[2] });
-                InputVector3f face_angles = unit_angle(normalize(side1), normalize(side2));
-
-                for (size_t j = 0; j < 3; ++j)
-                    normals[fi[j]] += n * face_angles[j];
+        /* The faces are processed in parallel and atomically accumulate their
+           contributions into the vertex normals. The sums are computed in
+           fixed point arithmetic: integer addition is associative, hence the
+           result does not depend on the order of the contributions and is
+           deterministic. Each contribution is bounded by pi in magnitude. */
+        const double fixed_point_scale = double(1ll << 40);
+
+        std::unique_ptr<std::atomic<int64_t>[]> normals(
+            new std::atomic<int64_t>[m_vertex_count * 3]);
+        tbb::parallel_for(
+            tbb::blocked_range<size_t>(0, m_vertex_count * 3, grain_size),
+            [&](const tbb::blocked_range<size_t> &range) {
+                for (size_t i = range.begin(); i != range.end(); ++i)
+                    normals[i].store(0, std::memory_order_relaxed);
             }
-        }
+        );
 
-        for (ScalarSize i = 0; i < m_vertex_count; i++) {
-            InputNormal3f n = normals[i];
-            InputFloat length = norm(n);
-            if (likely(length != 0.f)) {
-                n /= length;
-            } else {
-                n = InputNormal3f(1, 0, 0); // Choose some bogus value
-                invalid_counter++;
+        tbb::parallel_for(
+            tbb::blocked_range<ScalarSize>(0, m_face_count, grain_size),
+            [&](const tbb::blocked_range<ScalarSize> &range) {
+                for (ScalarSize i = range.begin(); i != range.end(); ++i) {
+                    auto fi = face_indices(i);
+                    Assert(fi[0] < m_vertex_count &&
+                           fi[1] < m_vertex_count &&
+                           fi[2] < m_vertex_count);
+
+                    InputPoint3f v[3] = { vertex_position(fi[0]),
+                                          vertex_position(fi[1]),
+                                          vertex_position(fi[2]) };
+
+                    InputVector3f side_0 = v[1] - v[0],
+                                  side_1 = v[2] - v[0];
+                    InputNormal3f n = cross(side_0, side_1);
+                    InputFloat length_sqr = squared_norm(n);
+                    if (unlikely(!(length_sqr > 0)))
+                        continue;
+                    n *= rsqrt(length_sqr);
+
+                    // Use Enoki to compute the face angles at the same time
+                    auto side1 = transpose(Array<Packet<InputFloat, 3>, 3>{ side_0, v[2] - v[1], v[0] - v[2] });
+                    auto side2 = transpose(Array<Packet<InputFloat, 3>, 3>{ side_1, v[0] - v[1], v[1] - v[2] });
+                    InputVector3f face_angles = unit_angle(normalize(side1), normalize(side2));
+
+                    for (size_t j = 0; j < 3; ++j) {
+                        for (size_t k = 0; k < 3; ++k) {
+                            int64_t value = (int64_t) std::llround(
+                                (double) (n[k] * face_angles[j]) * fixed_point_scale);
+                            normals[fi[j] * 3 + k].fetch_add(value, std::memory_order_relaxed);
+                        }
+                    }
+                }
             }
+        );
 
-            store(m_vertex_normals_buf.data() + 3 * i, n);
-        }
+        std::atomic<size_t> invalid_counter(0);
+        tbb::parallel_for(
+            tbb::blocked_range<ScalarSize>(0, m_vertex_count, grain_size),
+            [&](const tbb::blocked_range<ScalarSize> &range) {
+                size_t invalid = 0;
+                for (ScalarSize i = range.begin(); i != range.end(); ++i) {
+                    InputNormal3f n;
+                    for (size_t k = 0; k < 3; ++k)
+                        n[k] = (InputFloat) (normals[i * 3 + k].load(std::memory_order_relaxed) /
+                                             fixed_point_scale);
+
+                    InputFloat length = norm(n);
+                    if (likely(length != 0.f)) {
+                        n /= length;
+                    } else {
+                        n = InputNormal3f(1, 0, 0); // Choose some bogus value
+                        invalid++;
+                    }
+
+                    store_unaligned(m_vertex_normals_buf.data() + 3 * i, n);
+                }
+                invalid_counter += invalid;
+            }
+        );
 
         if (invalid_counter > 0)
             Log(Warn, "\"%s\": computed vertex normals (%i invalid vertices!)",
-                m_name, invalid_counter);
+                m_name, (size_t) invalid_counter);
     } else {
         auto fi = face_indices(arange<UInt32>(m_face_count));
 
@@ -282,6 +882,167 @@ MTS_VARIANT void Mesh<Float, Spectrum>::recompute_bbox() {
         m_bbox.expand(vertex_position(i));
 }
 
+MTS_VARIANT void Mesh<Float, Spectrum>::compress() {
+#if defined(MTS_ENABLE_EMBREE)
+    Log(Warn, "\"%s\": compressed mesh storage is not supported by the Embree "
+              "backend, ignoring.", m_name);
+#else
+    if constexpr (is_dynamic_v<Float>) {
+        Log(Warn, "\"%s\": compressed mesh storage is only supported by the "
+                  "scalar and packet variants, ignoring.", m_name);
+    } else {
+        if (m_compressed)
+            return;
+
+        Timer timer;
+        size_t size_before = memory_usage();
+        std::unique_ptr<CompressedStorage> c(new CompressedStorage());
+
+        // Vertex positions: 21 bit fixed point coordinates within the bounding box
+        const uint32_t position_max = (1u << 21) - 1;
+        InputVector3f extents = m_bbox.valid() ? InputVector3f(m_bbox.extents())
+                                               : InputVector3f(0.f);
+        c->position_offset = m_bbox.valid() ? InputPoint3f(m_bbox.min) : InputPoint3f(0.f);
+        c->position_scale  = extents / (InputFloat) position_max;
+
+        InputVector3f inv_scale = select(extents > 0.f, (InputFloat) position_max / extents, 0.f);
+        c->positions = zero<DynamicBuffer<UInt64>>(m_vertex_count);
+        uint64_t *positions_out = c->positions.data();
+        for (ScalarSize i = 0; i < m_vertex_count; ++i) {
+            InputVector3f p = (vertex_position(i) - c->position_offset) * inv_scale;
+            uint64_t q[3];
+            for (size_t k = 0; k < 3; ++k)
+                q[k] = (uint64_t) std::min(
+                    (uint32_t) std::max(std::rint(p[k]), 0.f), position_max);
+            positions_out[i] = q[0] | (q[1] << 21) | (q[2] << 42);
+        }
+
+        // Vertex normals: octahedral mapping with 16 bits per component
+        if (has_vertex_normals()) {
+            c->normals = zero<DynamicBuffer<UInt32>>(m_vertex_count);
+            uint32_t *normals_out = c->normals.data();
+            for (ScalarSize i = 0; i < m_vertex_count; ++i) {
+                InputNormal3f n = vertex_normal(i);
+                n /= abs(n.x()) + abs(n.y()) + abs(n.z());
+                InputFloat x = n.x(), y = n.y();
+                if (n.z() < 0.f) {
+                    x = (1.f - abs(n.y())) * (n.x() >= 0.f ? 1.f : -1.f);
+                    y = (1.f - abs(n.x())) * (n.y() >= 0.f ? 1.f : -1.f);
+                }
+                auto quantize = [](InputFloat v) {
+                    return (uint32_t) std::rint(clamp(v * .5f + .5f, 0.f, 1.f) * 65535.f);
+                };
+                normals_out[i] = quantize(x) | (quantize(y) << 16);
+            }
+        }
+
+        // Texture coordinates: 16 bits per component within their range
+        if (has_vertex_texcoords()) {
+            InputPoint2f uv_min(math::Infinity<InputFloat>),
+                         uv_max(-math::Infinity<InputFloat>);
+            for (ScalarSize i = 0; i < m_vertex_count; ++i) {
+                InputPoint2f uv = vertex_texcoord(i);
+                uv_min = min(uv_min, uv);
+                uv_max = max(uv_max, uv);
+            }
+            if (m_vertex_count == 0)
+                uv_min = uv_max = InputPoint2f(0.f);
+
+            InputVector2f uv_extents = uv_max - uv_min,
+                          uv_inv_scale = select(uv_extents > 0.f, 65535.f / uv_extents, 0.f);
+            c->texcoord_offset = uv_min;
+            c->texcoord_scale  = uv_extents / 65535.f;
+
+            c->texcoords = zero<DynamicBuffer<UInt32>>(m_vertex_count);
+            uint32_t *texcoords_out = c->texcoords.data();
+            for (ScalarSize i = 0; i < m_vertex_count; ++i) {
+                InputVector2f uv = (vertex_texcoord(i) - uv_min) * uv_inv_scale;
+                uint32_t u = (uint32_t) std::min(std::rint(uv.x()), 65535.f),
+                         v = (uint32_t) std::min(std::rint(uv.y()), 65535.f);
+                texcoords_out[i] = u | (v << 16);
+            }
+        }
+
+        /* Face indices: blocks of faces share a base index, and the vertex
+           indices of each face are stored as three 10 bit offsets from it */
+        ScalarSize block_count =
+            (m_face_count + CompressedFaceBlockSize - 1) / CompressedFaceBlockSize;
+        c->face_block_base   = zero<DynamicBuffer<UInt32>>(block_count);
+        c->face_block_offset = zero<DynamicBuffer<UInt32>>(block_count);
+        uint32_t *block_base   = c->face_block_base.data(),
+                 *block_offset = c->face_block_offset.data();
+
+        const ScalarIndex *faces = m_faces_buf.data();
+        std::vector<uint32_t> packed, raw;
+        packed.reserve(m_face_count);
+        size_t raw_blocks = 0;
+
+        for (ScalarSize b = 0; b < block_count; ++b) {
+            ScalarSize start = b * CompressedFaceBlockSize,
+                       end   = std::min(start + CompressedFaceBlockSize, m_face_count);
+
+            uint32_t idx_min = faces[3 * start], idx_max = idx_min;
+            for (ScalarSize i = 3 * start; i < 3 * end; ++i) {
+                idx_min = std::min(idx_min, faces[i]);
+                idx_max = std::max(idx_max, faces[i]);
+            }
+
+            if (idx_max - idx_min < 1024u) {
+                block_base[b]   = idx_min;
+                block_offset[b] = (uint32_t) packed.size();
+                for (ScalarSize i = start; i < end; ++i)
+                    packed.push_back( (faces[3 * i]     - idx_min) |
+                                     ((faces[3 * i + 1] - idx_min) << 10) |
+                                     ((faces[3 * i + 2] - idx_min) << 20));
+            } else {
+                block_base[b]   = 0;
+                block_offset[b] = (uint32_t) (raw.size() / 3) | CompressedRawBlock;
+                raw.insert(raw.end(), faces + 3 * start, faces + 3 * end);
+                raw_blocks++;
+            }
+        }
+
+        c->faces_packed = DynamicBuffer<UInt32>::copy(packed.data(), packed.size());
+        c->faces_raw    = DynamicBuffer<UInt32>::copy(raw.data(), raw.size());
+
+        // Release the full precision data and switch over to the decoder
+        m_compressed           = std::move(c);
+        m_vertex_positions_buf = FloatStorage();
+        m_vertex_normals_buf   = FloatStorage();
+        m_vertex_texcoords_buf = FloatStorage();
+        m_faces_buf            = DynamicBuffer<UInt32>();
+
+        recompute_bbox();
+        m_area_pmf = DiscreteDistribution<Float>();
+        m_parameterization = nullptr;
+
+        Log(Debug, "\"%s\": compressed mesh data from %s to %s (%i of %i face "
+                   "blocks uncompressed, took %s)",
+            m_name, util::mem_string(size_before), util::mem_string(memory_usage()),
+            raw_blocks, block_count, util::time_string(timer.value()));
+    }
+#endif
+}
+
+MTS_VARIANT size_t Mesh<Float, Spectrum>::memory_usage() const {
+    size_t bytes = m_vertex_count * vertex_data_bytes() + face_index_bytes();
+
+    for (const auto&[name, attribute]: m_mesh_attributes)
+        if (attribute.type == MeshAttributeType::Face)
+            bytes += m_face_count * attribute.size * sizeof(InputFloat);
+
+    return bytes;
+}
+
+MTS_VARIANT size_t Mesh<Float, Spectrum>::face_index_bytes() const {
+    if (!m_compressed)
+        return m_face_count * 3 * sizeof(ScalarIndex);
+
+    const CompressedStorage &c = *m_compressed;
+    return (slices(c.face_block_base) + slices(c.face_block_offset) +
+            slices(c.faces_packed) + slices(c.faces_raw)) * sizeof(ScalarIndex);
+}
+
 MTS_VARIANT void Mesh<Float, Spectrum>::build_pmf() {
     std::lock_guard<tbb::spin_mutex> lock(m_mutex);
 
@@ -293,14 +1054,19 @@ MTS_VARIANT void Mesh<Float, Spectrum>::build_pmf() {
 
     // TODO could use manage() as area_pmf doesn't need to be differentiable
     if constexpr (!is_dynamic_v<Float>) {
-        std::vector<ScalarFloat> table(m_face_count);
-        for (ScalarIndex i = 0; i < m_face_count; i++)
-            table[i] = face_area(i);
-
-        m_area_pmf = DiscreteDistribution<Float>(
-            table.data(),
-            m_face_count
+        using PMFStorage = typename DiscreteDistribution<Float>::FloatStorage;
+        PMFStorage table = empty<PMFStorage>(m_face_count);
+        ScalarFloat *table_ptr = table.data();
+
+        tbb::parallel_for(
+            tbb::blocked_range<ScalarIndex>(0, m_face_count, grain_size),
+            [&](const tbb::blocked_range<ScalarIndex> &range) {
+                for (ScalarIndex i = range.begin(); i != range.end(); ++i)
+                    table_ptr[i] = face_area(i);
+            }
         );
+
+        m_area_pmf = DiscreteDistribution<Float>(std::move(table));
     } else {
         Float table = face_area(arange<UInt32>(m_face_count)).managed();
 
@@ -323,7 +1089,15 @@ MTS_VARIANT void Mesh<Float, Spectrum>::build_parameterization() {
     ref<Mesh> mesh =
         new Mesh(m_name + "_param", m_vertex_count, m_face_count,
                  props, false, false);
-    mesh->m_faces_buf = m_faces_buf;
+    if (m_compressed) {
+        if constexpr (!is_dynamic_v<Float>) {
+            ScalarIndex *faces_out = mesh->m_faces_buf.data();
+            for (ScalarIndex i = 0; i < m_face_count; ++i)
+                store_unaligned(faces_out + 3 * i, face_indices(i));
+        }
+    } else {
+        mesh->m_faces_buf = m_faces_buf;
+    }
 
     ScalarFloat *pos_out = (ScalarFloat *) mesh->m_vertex_positions_buf.data();
     for (size_t i = 0; i < m_vertex_count; ++i) {
@@ -544,9 +1318,333 @@ Mesh<Float, Spectrum>::compute_surface_interaction(const Ray3f &ray,
     return si;
 }
 
+MTS_VARIANT std::string Mesh<Float, Spectrum>::cache_key(const fs::path &path,
+                                                         const std::string &options) const {
+    std::ostringstream oss;
+    oss << "mesh:" << class_()->name() << ":" << class_()->variant() << ":"
+        << AssetCache::file_key(path) << ":" << m_disable_vertex_normals << ":";
+    oss.precision(17);
+    for (size_t i = 0; i < 4; ++i)
+        for (size_t j = 0; j < 4; ++j)
+            oss << m_to_world.matrix(i, j) << ",";
+    oss << ":" << options;
+    return oss.str();
+}
+
+MTS_VARIANT bool Mesh<Float, Spectrum>::load_from_cache(const std::string &key) {
+    m_source_key = key;
+    if (m_lod_face_count > 0 && load_lod(m_lod_face_count))
+        return true;
+
+    if (AssetCache::capacity() == 0)
+        return false;
+
+    ref<Object> value = AssetCache::get(key);
+    if (!value)
+        return false;
+
+    const CachedMeshGeometry *geometry = (const CachedMeshGeometry *) value.get();
+    m_name = geometry->name;
+    m_vertex_count = geometry->vertex_count;
+    m_face_count = geometry->face_count;
+    m_bbox = ScalarBoundingBox3f(
+        ScalarPoint3f(geometry->bbox_min[0], geometry->bbox_min[1], geometry->bbox_min[2]),
+        ScalarPoint3f(geometry->bbox_max[0], geometry->bbox_max[1], geometry->bbox_max[2]));
+
+    m_vertex_positions_buf = FloatStorage::copy(geometry->positions.data(),
+                                                geometry->positions.size());
+    m_faces_buf = DynamicBuffer<UInt32>::copy(geometry->faces.data(), geometry->faces.size());
+    if (!geometry->normals.empty())
+        m_vertex_normals_buf = FloatStorage::copy(geometry->normals.data(),
+                                                  geometry->normals.size());
+    if (!geometry->texcoords.empty())
+        m_vertex_texcoords_buf = FloatStorage::copy(geometry->texcoords.data(),
+                                                    geometry->texcoords.size());
+
+    m_faces_buf.managed();
+    m_vertex_positions_buf.managed();
+    m_vertex_normals_buf.managed();
+    m_vertex_texcoords_buf.managed();
+
+    /* The attributes are inserted directly: spectral variants already
+       converted colors when the mesh was first loaded */
+    for (const auto &attribute : geometry->attributes) {
+        bool is_vertex_attr = attribute.name.find("vertex_") == 0;
+        m_mesh_attributes.insert(
+            { attribute.name,
+              { attribute.size,
+                is_vertex_attr ? MeshAttributeType::Vertex : MeshAttributeType::Face,
+                FloatStorage::copy(attribute.data.data(), attribute.data.size()) } });
+    }
+
+    if constexpr (is_cuda_array_v<Float>)
+        cuda_sync();
+
+    Log(Debug, "\"%s\": loaded %i faces, %i vertices from the asset cache",
+        m_name, m_face_count, m_vertex_count);
+    return true;
+}
+
+MTS_VARIANT void Mesh<Float, Spectrum>::store_in_cache(const std::string &key) const {
+    if (AssetCache::capacity() == 0)
+        return;
+    if (m_compressed)
+        Throw("store_in_cache(): mesh \"%s\" uses compressed storage!", m_name);
+
+    if constexpr (is_cuda_array_v<Float>)
+        cuda_sync();
+
+    auto copy = [](const auto &buf) {
+        using Value = std::decay_t<decltype(*buf.data())>;
+        return std::vector<Value>(buf.data(), buf.data() + slices(buf));
+    };
+
+    ref<CachedMeshGeometry> geometry = new CachedMeshGeometry();
+    geometry->name = m_name;
+    geometry->vertex_count = m_vertex_count;
+    geometry->face_count = m_face_count;
+    for (size_t i = 0; i < 3; ++i) {
+        geometry->bbox_min[i] = (double) m_bbox.min[i];
+        geometry->bbox_max[i] = (double) m_bbox.max[i];
+    }
+
+    geometry->positions = copy(m_vertex_positions_buf);
+    geometry->faces     = copy(m_faces_buf);
+    geometry->normals   = copy(m_vertex_normals_buf);
+    geometry->texcoords = copy(m_vertex_texcoords_buf);
+
+    for (const auto &[name, attribute] : m_mesh_attributes)
+        geometry->attributes.push_back({ name, attribute.size, copy(attribute.buf) });
+
+    AssetCache::put(key, geometry, geometry->size());
+}
+
+MTS_VARIANT void Mesh<Float, Spectrum>::simplify(ScalarSize face_count) {
+    if (m_compressed)
+        Throw("simplify(): mesh \"%s\" uses compressed storage and cannot be "
+              "modified!", m_name);
+    if (face_count >= m_face_count)
+        return;
+
+    if constexpr (is_cuda_array_v<Float>)
+        cuda_sync();
+
+    Timer timer;
+    ScalarSize original_face_count = m_face_count;
+    MeshSimplifier simplifier(m_vertex_positions_buf.data(), m_faces_buf.data(),
+                              m_vertex_count, m_face_count);
+
+    bool has_normals = has_vertex_normals(), has_texcoords = has_vertex_texcoords();
+    if (has_normals)
+        simplifier.add_vertex_data(m_vertex_normals_buf.data(), 3);
+    if (has_texcoords)
+        simplifier.add_vertex_data(m_vertex_texcoords_buf.data(), 2);
+
+    std::vector<MeshAttribute *> vertex_attributes, face_attributes;
+    for (auto &[name, attribute] : m_mesh_attributes) {
+        ENOKI_MARK_USED(name);
+        if (attribute.type == MeshAttributeType::Vertex) {
+            simplifier.add_vertex_data(attribute.buf.data(), attribute.size);
+            vertex_attributes.push_back(&attribute);
+        } else {
+            face_attributes.push_back(&attribute);
+        }
+    }
+
+    simplifier.run(face_count);
+
+    std::vector<uint32_t> vertex_map, face_map;
+    std::vector<uint32_t> faces = simplifier.faces(vertex_map, face_map);
+    std::vector<float> positions = simplifier.positions(vertex_map);
+
+    m_vertex_count = (ScalarSize) vertex_map.size();
+    m_face_count = (ScalarSize) face_map.size();
+    m_vertex_positions_buf = FloatStorage::copy(positions.data(), positions.size());
+    m_faces_buf = DynamicBuffer<UInt32>::copy(faces.data(), faces.size());
+
+    size_t index = 0;
+    if (has_normals) {
+        std::vector<float> normals = simplifier.vertex_data(index++, vertex_map);
+        for (size_t i = 0; i < normals.size(); i += 3) {
+            InputNormal3f n = load_unaligned<InputNormal3f>(normals.data() + i);
+            InputFloat length = norm(n);
+            store_unaligned(normals.data() + i,
+                            length > 0.f ? InputNormal3f(n / length) : InputNormal3f(1, 0, 0));
+        }
+        m_vertex_normals_buf = FloatStorage::copy(normals.data(), normals.size());
+    }
+    if (has_texcoords) {
+        std::vector<float> texcoords = simplifier.vertex_data(index++, vertex_map);
+        m_vertex_texcoords_buf = FloatStorage::copy(texcoords.data(), texcoords.size());
+    }
+    for (MeshAttribute *attribute : vertex_attributes) {
+        std::vector<float> values = simplifier.vertex_data(index++, vertex_map);
+        attribute->buf = FloatStorage::copy(values.data(), values.size());
+    }
+    for (MeshAttribute *attribute : face_attributes) {
+        const InputFloat *src = attribute->buf.data();
+        std::vector<float> values(face_map.size() * attribute->size);
+        for (size_t i = 0; i < face_map.size(); ++i)
+            for (size_t k = 0; k < attribute->size; ++k)
+                values[i * attribute->size + k] = src[face_map[i] * attribute->size + k];
+        attribute->buf = FloatStorage::copy(values.data(), values.size());
+    }
+
+    m_faces_buf.managed();
+    m_vertex_positions_buf.managed();
+    m_vertex_normals_buf.managed();
+    m_vertex_texcoords_buf.managed();
+    for (auto &[name, attribute] : m_mesh_attributes) {
+        ENOKI_MARK_USED(name);
+        attribute.buf.managed();
+    }
+
+    if constexpr (is_cuda_array_v<Float>)
+        cuda_sync();
+
+    recompute_bbox();
+
+    // The sampling tables refer to the previous faces
+    m_area_pmf = DiscreteDistribution<Float>();
+    m_parameterization = nullptr;
+
+    Log(Debug, "\"%s\": simplified mesh from %i to %i faces (took %s)", m_name,
+        original_face_count, m_face_count, util::time_string(timer.value()));
+}
+
+MTS_VARIANT void Mesh<Float, Spectrum>::apply_lod(ScalarSize face_count) {
+    if (face_count == 0 || face_count >= m_face_count)
+        return;
+    if (load_lod(face_count))
+        return;
+
+    simplify(face_count);
+
+    fs::path path = lod_path(face_count);
+    if (path.empty())
+        return;
+
+    /* Write to a temporary file first, so that concurrent processes never
+       observe a partially written file */
+    fs::path tmp_path = path;
+    tmp_path.replace_extension(tfm::format(".%08x.tmp", std::random_device()()));
+    try {
+        if (!fs::exists(m_lod_cache_dir))
+            fs::create_directory(m_lod_cache_dir);
+        write_mmesh(tmp_path.string());
+        if (!fs::rename(tmp_path, path))
+            Throw("could not rename \"%s\"", tmp_path.string());
+    } catch (const std::exception &e) {
+        fs::remove(tmp_path);
+        Log(Warn, "\"%s\": could not store simplified mesh in \"%s\": %s", m_name,
+            m_lod_cache_dir.string(), e.what());
+    }
+}
+
+MTS_VARIANT fs::path Mesh<Float, Spectrum>::lod_path(ScalarSize face_count) const {
+    if (m_lod_cache_dir.empty() || m_source_key.empty())
+        return fs::path();
+    return m_lod_cache_dir /
+           fs::path(tfm::format("%016x-%i.mmesh", (uint64_t) hash(m_source_key), face_count));
+}
+
+MTS_VARIANT bool Mesh<Float, Spectrum>::load_lod(ScalarSize face_count) {
+    fs::path path = lod_path(face_count);
+    if (path.empty() || !fs::exists(path))
+        return false;
+
+    auto fail = [&](const char *descr) {
+        Throw("Error while loading simplified mesh \"%s\": %s!", path.string(), descr);
+    };
+
+    try {
+        ref<MemoryMappedFile> mmap = MemoryMappedFile::map_private(path);
+        const uint8_t *data = (const uint8_t *) mmap->data();
+
+        if (mmap->size() < sizeof(MMeshHeader))
+            fail("file is too small");
+        MMeshHeader header;
+        memcpy(&header, data, sizeof(MMeshHeader));
+        if (memcmp(header.magic, "MTSMESH", 8) != 0 || header.version != MMeshVersion ||
+            header.byte_order != MMeshByteOrder)
+            fail("invalid file header");
+        if (header.positions_offset == 0 || header.faces_offset == 0 ||
+            header.vertex_count > std::numeric_limits<ScalarSize>::max() ||
+            header.face_count > std::numeric_limits<ScalarSize>::max())
+            fail("invalid mesh size");
+        if (sizeof(MMeshHeader) + header.attribute_count * sizeof(MMeshAttribute) > mmap->size())
+            fail("truncated attribute records");
+
+        auto section = [&](uint64_t offset, size_t count, size_t size) {
+            if (offset % MMeshAlignment != 0 || offset + count * size > mmap->size())
+                fail("truncated or corrupt file");
+            return data + offset;
+        };
+        auto load = [&](uint64_t offset, size_t count) {
+            return FloatStorage::copy(section(offset, count, sizeof(InputFloat)), count);
+        };
+
+        ScalarSize vertex_count = (ScalarSize) header.vertex_count,
+                   face_count_  = (ScalarSize) header.face_count;
+
+        FloatStorage positions = load(header.positions_offset, vertex_count * 3), normals, texcoords;
+        DynamicBuffer<UInt32> faces = DynamicBuffer<UInt32>::copy(
+            section(header.faces_offset, face_count_ * 3, sizeof(ScalarIndex)), face_count_ * 3);
+        if (header.normals_offset != 0 && !m_disable_vertex_normals)
+            normals = load(header.normals_offset, vertex_count * 3);
+        if (header.texcoords_offset != 0)
+            texcoords = load(header.texcoords_offset, vertex_count * 2);
+
+        std::unordered_map<std::string, MeshAttribute> attributes;
+        for (uint32_t i = 0; i < header.attribute_count; ++i) {
+            MMeshAttribute record;
+            memcpy(&record, data + sizeof(MMeshHeader) + i * sizeof(MMeshAttribute),
+                   sizeof(MMeshAttribute));
+            if (record.name[sizeof(record.name) - 1] != '\0')
+                fail("invalid attribute name");
+            MeshAttributeType type =
+                record.type == 0 ? MeshAttributeType::Vertex : MeshAttributeType::Face;
+            size_t count = (type == MeshAttributeType::Vertex ? vertex_count : face_count_) *
+                           record.size;
+            // Inserted directly, colors were already converted when the file was written
+            attributes.insert({ record.name, { record.size, type, load(record.offset, count) } });
+        }
+
+        m_vertex_count = vertex_count;
+        m_face_count = face_count_;
+        m_vertex_positions_buf = std::move(positions);
+        m_vertex_normals_buf = std::move(normals);
+        m_vertex_texcoords_buf = std::move(texcoords);
+        m_faces_buf = std::move(faces);
+        m_mesh_attributes = std::move(attributes);
+        m_bbox = ScalarBoundingBox3f(
+            ScalarPoint3f(header.bbox_min[0], header.bbox_min[1], header.bbox_min[2]),
+            ScalarPoint3f(header.bbox_max[0], header.bbox_max[1], header.bbox_max[2]));
+    } catch (const std::exception &e) {
+        Log(Warn, "%s Ignoring the file.", e.what());
+        return false;
+    }
+
+    m_faces_buf.managed();
+    m_vertex_positions_buf.managed();
+    m_vertex_normals_buf.managed();
+    m_vertex_texcoords_buf.managed();
+    for (auto &[name, attribute] : m_mesh_attributes) {
+        ENOKI_MARK_USED(name);
+        attribute.buf.managed();
+    }
+
+    if constexpr (is_cuda_array_v<Float>)
+        cuda_sync();
+
+    Log(Debug, "\"%s\": loaded simplified mesh with %i faces, %i vertices from \"%s\"",
+        m_name, m_face_count, m_vertex_count, path.string());
+    return true;
+}
+
 MTS_VARIANT void Mesh<Float, Spectrum>::add_attribute(const std::string& name,
                                                       size_t dim,
-                                                      const FloatStorage& buffer) {
+                                                      FloatStorage buffer) {
     auto attribute = m_mesh_attributes.find(name);
     if (attribute != m_mesh_attributes.end())
         Throw("add_attribute(): attribute %s already exists.", name.c_str());
@@ -570,7 +1668,7 @@ MTS_VARIANT void Mesh<Float, Spectrum>::add_attribute(const std::string& name,
         }
     }
 
-    m_mesh_attributes.insert({ name, { dim, type, buffer } });
+    m_mesh_attributes.insert({ name, { dim, type, std::move(buffer) } });
 }
 
 MTS_VARIANT typename Mesh<Float, Spectrum>::UnpolarizedSpectrum
@@ -741,6 +1839,9 @@ MTS_VARIANT std::string Mesh<Float, Spectrum>::to_string() const {
 
     oss << "  disable_vertex_normals = " << m_disable_vertex_normals;
 
+    if (m_compressed)
+        oss << "," << std::endl << "  compressed = 1";
+
     if (!m_mesh_attributes.empty()) {
         oss << "," << std::endl << "  mesh attributes = [" << std::endl;
         size_t i = 0;
@@ -758,12 +1859,21 @@ MTS_VARIANT std::string Mesh<Float, Spectrum>::to_string() const {
 }
 
 MTS_VARIANT size_t Mesh<Float, Spectrum>::vertex_data_bytes() const {
-    size_t vertex_data_bytes = 3 * sizeof(InputFloat);
+    size_t vertex_data_bytes;
 
-    if (has_vertex_normals())
-        vertex_data_bytes += 3 * sizeof(InputFloat);
-    if (has_vertex_texcoords())
-        vertex_data_bytes += 2 * sizeof(InputFloat);
+    if (m_compressed) {
+        vertex_data_bytes = sizeof(uint64_t);
+        if (has_vertex_normals())
+            vertex_data_bytes += sizeof(uint32_t);
+        if (has_vertex_texcoords())
+            vertex_data_bytes += sizeof(uint32_t);
+    } else {
+        vertex_data_bytes = 3 * sizeof(InputFloat);
+        if (has_vertex_normals())
+            vertex_data_bytes += 3 * sizeof(InputFloat);
+        if (has_vertex_texcoords())
+            vertex_data_bytes += 2 * sizeof(InputFloat);
+    }
 
     for (const auto&[name, attribute]: m_mesh_attributes)
         if (attribute.type == MeshAttributeType::Vertex)
@@ -775,6 +1885,11 @@ MTS_VARIANT size_t Mesh<Float, Spectrum>::vertex_data_bytes() const {
 MTS_VARIANT size_t Mesh<Float, Spectrum>::face_data_bytes() const {
     size_t face_data_bytes = 3 * sizeof(ScalarIndex);
 
+    // Compressed indices: average storage per face, rounded up
+    if (m_compressed)
+        face_data_bytes = m_face_count == 0 ? 0 :
+            (face_index_bytes() + m_face_count - 1) / m_face_count;
+
     for (const auto&[name, attribute]: m_mesh_attributes)
         if (attribute.type == MeshAttributeType::Face)
             face_data_bytes += attribute.size * sizeof(InputFloat);
@@ -837,16 +1952,23 @@ MTS_VARIANT void Mesh<Float, Spectrum>::traverse(TraversalCallback *callback) {
 
     callback->put_parameter("vertex_count",         m_vertex_count);
     callback->put_parameter("face_count",           m_face_count);
-    callback->put_parameter("faces_buf",            m_faces_buf);
-    callback->put_parameter("vertex_positions_buf", m_vertex_positions_buf);
-    callback->put_parameter("vertex_normals_buf",   m_vertex_normals_buf);
-    callback->put_parameter("vertex_texcoords_buf", m_vertex_texcoords_buf);
+
+    // Compressed meshes are read-only and don't expose their geometry buffers
+    if (!m_compressed) {
+        callback->put_parameter("faces_buf",            m_faces_buf);
+        callback->put_parameter("vertex_positions_buf", m_vertex_positions_buf);
+        callback->put_parameter("vertex_normals_buf",   m_vertex_normals_buf);
+        callback->put_parameter("vertex_texcoords_buf", m_vertex_texcoords_buf);
+    }
 
     for(auto &[name, attribute]: m_mesh_attributes)
         callback->put_parameter(tfm::format("%s_buf", name.c_str()), attribute.buf);
 }
 
 MTS_VARIANT void Mesh<Float, Spectrum>::parameters_changed(const std::vector<std::string> &keys) {
+    if (m_compressed)
+        return;
+
     if (keys.empty() || string::contains(keys, "vertex_positions_buf")) {
         if constexpr (is_cuda_array_v<Float>) {
             m_vertex_positions_buf.managed();
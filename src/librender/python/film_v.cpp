@@ -11,7 +11,8 @@ MTS_PY_EXPORT(Film) {
     MTS_PY_IMPORT_TYPES(Film)
     MTS_PY_CLASS(Film, Object)
         .def_method(Film, prepare, "channels"_a)
-        .def_method(Film, put, "block"_a)
+        .def("put", &Film::put, "block"_a, D(Film, put),
+            py::call_guard<py::gil_scoped_release>())
         .def_method(Film, set_destination_file, "filename"_a)
         .def("develop", py::overload_cast<>(&Film::develop))
         .def("develop", py::overload_cast<const ScalarPoint2i &, const ScalarVector2i &,
@@ -12,11 +12,13 @@ MTS_PY_EXPORT(ImageBlock) {
             "border"_a = true, "normalize"_a = false)
         .def("put", py::overload_cast<const ImageBlock *>(&ImageBlock::put),
             D(ImageBlock, put), "block"_a)
+        .def("put", py::overload_cast<const ImageBlock *, int, int>(&ImageBlock::put),
+            D(ImageBlock, put, 2), "block"_a, "row_begin"_a, "row_end"_a)
         .def("put", vectorize(py::overload_cast<const Point2f &,
             const wavelength_t<Spectrum> &, const Spectrum &, const Float &,
             mask_t<Float>>(&ImageBlock::put)),
             "pos"_a, "wavelengths"_a, "value"_a, "alpha"_a = 1.f, "active"_a = true,
-            D(ImageBlock, put, 2))
+            D(ImageBlock, put, 3))
         .def("put",
             [](ImageBlock &ib, const Point2f &pos,
                 const std::vector<Float> &data, Mask mask) {
@@ -20,6 +20,38 @@ static std::function<void()> sigint_handler;
 static void (*sigint_handler_prev)(int) = nullptr;
 #endif
 
+/// Run a render job, which is cancelled when the interrupt signal is received
+template <typename IntegratorPtr, typename Func>
+bool render_interruptible(IntegratorPtr integrator, Func func) {
+    py::gil_scoped_release release;
+
+#if MTS_HANDLE_SIGINT
+    // Install new signal handler
+    sigint_handler = [integrator]() {
+        integrator->cancel();
+    };
+
+    sigint_handler_prev = signal(SIGINT, [](int) {
+        Log(Warn, "Received interrupt signal, winding down..");
+        if (sigint_handler) {
+            sigint_handler();
+            sigint_handler = std::function<void()>();
+            signal(SIGINT, sigint_handler_prev);
+            raise(SIGINT);
+        }
+    });
+#endif
+
+    bool res = func();
+
+#if MTS_HANDLE_SIGINT
+    // Restore previous signal handler
+    signal(SIGINT, sigint_handler_prev);
+#endif
+
+    return res;
+}
+
 /// Trampoline for derived types implemented in Python
 MTS_VARIANT class PySamplingIntegrator : public SamplingIntegrator<Float, Spectrum> {
 public:
@@ -123,36 +155,19 @@ MTS_PY_EXPORT(Integrator) {
 
     MTS_PY_CLASS(Integrator, Object)
         .def("render",
-            [&](Integrator *integrator, Scene *scene, Sensor *sensor) {
-                py::gil_scoped_release release;
-
-#if MTS_HANDLE_SIGINT
-                // Install new signal handler
-                sigint_handler = [integrator]() {
-                    integrator->cancel();
-                };
-
-                sigint_handler_prev = signal(SIGINT, [](int) {
-                    Log(Warn, "Received interrupt signal, winding down..");
-                    if (sigint_handler) {
-                        sigint_handler();
-                        sigint_handler = std::function<void()>();
-                        signal(SIGINT, sigint_handler_prev);
-                        raise(SIGINT);
-                    }
+            [](Integrator *integrator, Scene *scene, Sensor *sensor) {
+                return render_interruptible(integrator, [&]() {
+                    return integrator->render(scene, sensor);
                 });
-#endif
-
-                bool res = integrator->render(scene, sensor);
-
-#if MTS_HANDLE_SIGINT
-                // Restore previous signal handler
-                signal(SIGINT, sigint_handler_prev);
-#endif
-
-                return res;
             },
             D(Integrator, render), "scene"_a, "sensor"_a)
+        .def("render_sensors",
+            [](Integrator *integrator, Scene *scene, const std::vector<Sensor *> &sensors) {
+                return render_interruptible(integrator, [&]() {
+                    return integrator->render_sensors(scene, sensors);
+                });
+            },
+            D(Integrator, render_sensors), "scene"_a, "sensors"_a)
         .def_method(Integrator, cancel);
 
     auto integrator =
@@ -160,7 +175,11 @@ MTS_PY_EXPORT(Integrator) {
                     ref<SamplingIntegrator>>(m, "SamplingIntegrator", D(SamplingIntegrator))
             .def(py::init<const Properties&>())
             .def_method(SamplingIntegrator, aov_names)
-            .def_method(SamplingIntegrator, should_stop);
+            .def_method(SamplingIntegrator, should_stop)
+            .def_method(SamplingIntegrator, set_checkpoint, "filename"_a, "interval"_a,
+                        "resume"_a = false)
+            .def_method(SamplingIntegrator, set_preview, "filename"_a, "interval"_a,
+                        "passes"_a = 0);
 
     bind_integrator_sample<Float, Spectrum>(integrator);
 
@@ -76,6 +76,7 @@ MTS_PY_DECLARE(Scene);
 MTS_PY_DECLARE(Sensor);
 MTS_PY_DECLARE(Shape);
 MTS_PY_DECLARE(ShapeKDTree);
+MTS_PY_DECLARE(ShapeBVH);
 MTS_PY_DECLARE(srgb);
 MTS_PY_DECLARE(Texture);
 MTS_PY_DECLARE(Volume);
@@ -117,6 +118,7 @@ PYBIND11_MODULE(MODULE_NAME, m) {
     MTS_PY_IMPORT(Sampler);
     MTS_PY_IMPORT(Sensor);
     MTS_PY_IMPORT(ShapeKDTree);
+    MTS_PY_IMPORT(ShapeBVH);
     MTS_PY_IMPORT(srgb);
     MTS_PY_IMPORT(Texture);
     MTS_PY_IMPORT(Volume);
@@ -3,6 +3,7 @@
 #include <mitsuba/render/mesh.h>
 #include <mitsuba/render/scene.h>
 #include <mitsuba/render/kdtree.h>
+#include <mitsuba/render/bvh.h>
 #include <mitsuba/render/sensor.h>
 #include <mitsuba/python/python.h>
 
@@ -27,7 +28,29 @@ MTS_PY_EXPORT(ShapeKDTree) {
         .def("__len__", &ShapeKDTree::primitive_count)
         .def("bbox", [] (ShapeKDTree &s) { return s.bbox(); })
         .def_method(ShapeKDTree, build)
-        .def_method(ShapeKDTree, build);
+        .def_method(ShapeKDTree, memory_usage);
+#else
+    ENOKI_MARK_USED(m);
+#endif
+}
+
+MTS_PY_EXPORT(ShapeBVH) {
+    MTS_PY_IMPORT_TYPES(ShapeBVH, Shape, Mesh)
+#if !defined(MTS_ENABLE_EMBREE)
+    MTS_PY_CLASS(ShapeBVH, Object)
+        .def(py::init<const Properties &>(), D(ShapeBVH, ShapeBVH))
+        .def_method(ShapeBVH, add_shape)
+        .def_method(ShapeBVH, primitive_count)
+        .def_method(ShapeBVH, shape_count)
+        .def_method(ShapeBVH, node_count)
+        .def("shape", (Shape *(ShapeBVH::*)(size_t)) &ShapeBVH::shape, D(ShapeBVH, shape))
+        .def("__len__", &ShapeBVH::primitive_count)
+        .def("bbox", [] (ShapeBVH &s) { return s.bbox(); }, D(ShapeBVH, bbox))
+        .def_method(ShapeBVH, build)
+        .def("update", [](ShapeBVH &s, const std::vector<Shape *> &shapes) {
+                 s.update(shapes);
+             }, "shapes"_a, D(ShapeBVH, update))
+        .def_method(ShapeBVH, memory_usage);
 #else
     ENOKI_MARK_USED(m);
 #endif
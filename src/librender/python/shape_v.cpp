@@ -65,8 +65,15 @@ MTS_PY_EXPORT(Shape) {
         .def_method(Mesh, has_vertex_texcoords)
         .def_method(Mesh, recompute_vertex_normals)
         .def_method(Mesh, recompute_bbox)
+        .def_method(Mesh, compress)
+        .def_method(Mesh, is_compressed)
+        .def_method(Mesh, memory_usage)
+        .def_method(Mesh, simplify, "face_count"_a)
+        .def_method(Mesh, apply_lod, "face_count"_a)
+        .def_method(Mesh, lod_auto)
         .def("write_ply", &Mesh::write_ply, "filename"_a,
              "Export mesh as a binary PLY file")
+        .def("write_mmesh", &Mesh::write_mmesh, "filename"_a, D(Mesh, write_mmesh))
         .def("vertex_positions_buffer",
              py::overload_cast<>(&Mesh::vertex_positions_buffer),
              D(Mesh, vertex_positions_buffer),
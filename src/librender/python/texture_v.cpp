@@ -9,6 +9,8 @@ MTS_PY_EXPORT(Texture) {
         .def("mean", &Texture::mean, D(Texture, mean))
         .def("is_spatially_varying", &Texture::is_spatially_varying,
              D(Texture, is_spatially_varying))
+        .def("needs_differentials", &Texture::needs_differentials,
+             D(Texture, needs_differentials))
         .def("eval",
             vectorize(&Texture::eval),
             "si"_a, "active"_a = true, D(Texture, eval))
@@ -1,11 +1,15 @@
 #include <mitsuba/core/properties.h>
 #include <mitsuba/core/plugin.h>
+#include <mitsuba/core/thread.h>
 #include <mitsuba/render/bsdf.h>
 #include <mitsuba/render/medium.h>
 #include <mitsuba/render/scene.h>
 #include <mitsuba/render/kdtree.h>
+#include <mitsuba/render/bvh.h>
 #include <mitsuba/render/integrator.h>
+#include <mitsuba/render/mesh.h>
 #include <enoki/stl.h>
+#include <tbb/parallel_for.h>
 
 #if defined(MTS_ENABLE_EMBREE)
 #  include "scene_embree.inl"
@@ -20,6 +24,15 @@
 NAMESPACE_BEGIN(mitsuba)
 
 MTS_VARIANT Scene<Float, Spectrum>::Scene(const Properties &props) {
+    std::string emitter_sampling = props.string("emitter_sampling", "uniform");
+    if (emitter_sampling == "uniform")
+        m_emitter_sampling = EmitterSamplingStrategy::Uniform;
+    else if (emitter_sampling == "power")
+        m_emitter_sampling = EmitterSamplingStrategy::Power;
+    else
+        Throw("Invalid emitter sampling strategy \"%s\", must be one of: "
+              "\"uniform\", or \"power\"!", emitter_sampling);
+
     for (auto &kv : props.objects()) {
         m_children.push_back(kv.second.get());
 
@@ -91,6 +104,15 @@ MTS_VARIANT Scene<Float, Spectrum>::Scene(const Properties &props) {
             create_object<Integrator>(Properties("path"));
     }
 
+    apply_auto_lod(props);
+
+    // Compression of these meshes was postponed until their level of detail was chosen
+    for (Shape *shape : m_shapes) {
+        if (shape->is_mesh() && ((Mesh *) shape)->lod_auto() &&
+            ((Mesh *) shape)->compress_requested())
+            ((Mesh *) shape)->compress();
+    }
+
     if constexpr (is_cuda_array_v<Float>)
         accel_init_gpu(props);
     else
@@ -100,9 +122,107 @@ MTS_VARIANT Scene<Float, Spectrum>::Scene(const Properties &props) {
     for (Emitter *emitter: m_emitters)
         emitter->set_scene(this);
 
+    update_emitter_sampling_distribution();
+
     m_shapes_grad_enabled = false;
 }
 
+MTS_VARIANT void Scene<Float, Spectrum>::apply_auto_lod(const Properties &props) {
+    /// Index of the sensor whose viewpoint determines the level of detail
+    int sensor_index = props.int_("lod_sensor", 0);
+    /// Number of triangles per pixel covered by a mesh with an automatic level of detail
+    ScalarFloat triangles_per_pixel = props.float_("lod_triangles_per_pixel", 1.f);
+    /// Meshes are never simplified below this number of faces
+    const uint32_t min_face_count = 64;
+
+    std::vector<Mesh *> meshes;
+    for (Shape *shape : m_shapes) {
+        if (shape->is_mesh() && ((Mesh *) shape)->lod_auto())
+            meshes.push_back((Mesh *) shape);
+    }
+    if (meshes.empty())
+        return;
+
+    if (sensor_index < 0 || sensor_index >= (int) m_sensors.size())
+        Throw("Invalid LOD sensor index %i, the scene contains %i sensors!",
+              sensor_index, m_sensors.size());
+    if (!(triangles_per_pixel > 0.f))
+        Throw("The \"lod_triangles_per_pixel\" parameter must be positive!");
+
+    if constexpr (is_cuda_array_v<Float>) {
+        Log(Warn, "Automatic level of detail is not supported by the GPU "
+                  "variants, ignoring.");
+    } else {
+        const Sensor *sensor = m_sensors[sensor_index];
+
+        /* The footprint of a pixel is estimated using the differentials of
+           the ray through the center of the film */
+        auto [ray, ray_weight] = sensor->sample_ray_differential(
+            sensor->shutter_open(), 0.5f, Point2f(0.5f), Point2f(0.5f));
+        ENOKI_MARK_USED(ray_weight);
+        if (!ray.has_differentials) {
+            Log(Warn, "The LOD sensor does not provide ray differentials, "
+                      "disabling automatic level of detail.");
+            return;
+        }
+
+        auto to_scalar = [](const auto &v) {
+            if constexpr (is_array_v<Float>)
+                return ScalarVector3f(v.x().coeff(0), v.y().coeff(0), v.z().coeff(0));
+            else
+                return ScalarVector3f(v);
+        };
+
+        ScalarPoint3f origin = to_scalar(ray.o);
+        ScalarVector3f d = to_scalar(ray.d);
+
+        // Pixel size at distance t: footprint_offset + t * footprint_slope
+        ScalarFloat footprint_offset =
+            max(norm(to_scalar(ray.o_x) - origin), norm(to_scalar(ray.o_y) - origin));
+        ScalarFloat footprint_slope =
+            max(norm(to_scalar(ray.d_x) - d), norm(to_scalar(ray.d_y) - d));
+        ScalarFloat film_area = (ScalarFloat) hprod(sensor->film()->crop_size());
+
+        ThreadEnvironment env;
+        tbb::parallel_for(
+            tbb::blocked_range<size_t>(0, meshes.size(), 1),
+            [&](const tbb::blocked_range<size_t> &range) {
+                ScopedSetThreadEnvironment set_env(env);
+                for (size_t i = range.begin(); i != range.end(); ++i) {
+                    Mesh *mesh = meshes[i];
+                    auto sphere = mesh->bbox().bounding_sphere();
+                    ScalarFloat distance = max(norm(sphere.center - origin) - sphere.radius, 0.f),
+                                footprint = footprint_offset + distance * footprint_slope;
+
+                    // Number of pixels covered by the bounding sphere of the mesh
+                    ScalarFloat pixels = film_area;
+                    if (footprint > 0.f)
+                        pixels = min(math::Pi<ScalarFloat> * sqr(sphere.radius / footprint),
+                                     film_area);
+
+                    /* Round up to a power of two: this is conservative, and
+                       limits the number of distinct levels stored on disk */
+                    ScalarFloat target = max(ceil(pixels * triangles_per_pixel),
+                                             (ScalarFloat) min_face_count);
+                    if (target >= (ScalarFloat) mesh->face_count())
+                        continue;
+                    uint32_t face_count = math::round_to_power_of_two((uint32_t) target);
+                    if (face_count >= mesh->face_count())
+                        continue;
+
+                    Log(Debug, "\"%s\": covers ~%.0f pixels, selecting a level "
+                        "of detail with %i faces", mesh->id(), pixels, face_count);
+                    mesh->apply_lod(face_count);
+                }
+            }
+        );
+
+        m_bbox.reset();
+        for (Shape *shape : m_shapes)
+            m_bbox.expand(shape->bbox());
+    }
+}
+
 MTS_VARIANT Scene<Float, Spectrum>::~Scene() {
     if constexpr (is_cuda_array_v<Float>)
         accel_release_gpu();
@@ -176,6 +296,20 @@ Scene<Float, Spectrum>::sample_emitter_direction(const Interaction3f &ref, const
         if (m_emitters.size() == 1) {
             // Fast path if there is only one emitter
             std::tie(ds, spec) = m_emitters[0]->sample_direction(ref, sample, active);
+        } else if (m_emitter_sampling == EmitterSamplingStrategy::Power) {
+            // Pick an emitter proportionally to its estimated power
+            auto [index, sample_x, emitter_pdf] =
+                m_emitter_distr.sample_reuse_pmf(sample.x(), active);
+            sample.x() = sample_x;
+
+            EmitterPtr emitter = gather<EmitterPtr>(m_emitters.data(), index, active);
+
+            // Sample a direction towards the emitter
+            std::tie(ds, spec) = emitter->sample_direction(ref, sample, active);
+
+            // Account for the discrete probability of sampling this emitter
+            ds.pdf *= emitter_pdf;
+            spec *= rcp(emitter_pdf);
         } else {
             ScalarFloat emitter_pdf = 1.f / m_emitters.size();
 
@@ -224,12 +358,44 @@ Scene<Float, Spectrum>::pdf_emitter_direction(const Interaction3f &ref,
     if (m_emitters.size() == 1) {
         // Fast path if there is only one emitter
         return m_emitters[0]->pdf_direction(ref, ds, active);
+    } else if (m_emitter_sampling == EmitterSamplingStrategy::Power) {
+        EmitterPtr emitter = reinterpret_array<EmitterPtr>(ds.object);
+        return emitter->pdf_direction(ref, ds, active) *
+               emitter->sampling_weight() * m_emitter_distr.normalization();
     } else {
         return reinterpret_array<EmitterPtr>(ds.object)->pdf_direction(ref, ds, active) *
             (1.f / m_emitters.size());
     }
 }
 
+MTS_VARIANT void Scene<Float, Spectrum>::update_emitter_sampling_distribution() {
+    if (m_emitter_sampling != EmitterSamplingStrategy::Power || m_emitters.size() < 2)
+        return;
+
+    std::vector<ScalarFloat> weights(m_emitters.size());
+    bool has_mass = false;
+    for (size_t i = 0; i < m_emitters.size(); ++i) {
+        ScalarFloat power = m_emitters[i]->power_estimate();
+        if (!std::isfinite(power) || power < 0.f)
+            Throw("Emitter %s reported an invalid power estimate (%f)!",
+                  m_emitters[i]->class_()->name(), power);
+        weights[i] = power;
+        has_mass |= power > 0.f;
+    }
+
+    // Fall back to uniform weights if no emitter provides any power estimate
+    if (!has_mass) {
+        Log(Warn, "No emitter reported a nonzero power estimate, falling back "
+                  "to uniform emitter sampling weights.");
+        std::fill(weights.begin(), weights.end(), 1.f);
+    }
+
+    for (size_t i = 0; i < m_emitters.size(); ++i)
+        m_emitters[i]->set_sampling_weight(weights[i]);
+
+    m_emitter_distr = DiscreteDistribution<Float>(weights.data(), weights.size());
+}
+
 MTS_VARIANT void Scene<Float, Spectrum>::traverse(TraversalCallback *callback) {
     for (auto& child : m_children) {
         std::string id = child->id();
@@ -240,25 +406,33 @@ MTS_VARIANT void Scene<Float, Spectrum>::traverse(TraversalCallback *callback) {
 }
 
 MTS_VARIANT void Scene<Float, Spectrum>::parameters_changed(const std::vector<std::string> &keys) {
-    if (m_environment)
-        m_environment->set_scene(this); // TODO use parameters_changed({"scene"})
-
-    bool update_accel = false;
+    /* Only update the acceleration data structure for shapes whose geometry
+       was modified, e.g. changing a shape's BSDF leaves it untouched */
+    std::vector<Shape *> changed_shapes;
     for (auto &s : m_shapes) {
-        if (string::contains(keys, s->id()) || string::contains(keys, s->class_()->name())) {
-            update_accel = true;
-            break;
+        if ((string::contains(keys, s->id()) || string::contains(keys, s->class_()->name())) &&
+            s->geometry_dirty()) {
+            changed_shapes.push_back(s);
+            s->set_geometry_dirty(false);
         }
     }
 
-    if (update_accel) {
+    if (!changed_shapes.empty()) {
+        m_bbox.reset();
+        for (auto &s : m_shapes)
+            m_bbox.expand(s->bbox());
+
         if constexpr (is_cuda_array_v<Float>)
             accel_parameters_changed_gpu();
-        else {
-            // TODO update Embree BVH or Mitsuba kdtree if necessary
-        }
+        else
+            accel_parameters_changed_cpu(changed_shapes);
     }
 
+    if (m_environment)
+        m_environment->set_scene(this); // TODO use parameters_changed({"scene"})
+
+    update_emitter_sampling_distribution();
+
     // Checks whether any of the shape's parameters require gradient
     m_shapes_grad_enabled = false;
     if constexpr (is_diff_array_v<Float>) {
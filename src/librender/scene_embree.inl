@@ -38,6 +38,24 @@ MTS_VARIANT void Scene<Float, Spectrum>::accel_init_cpu(const Properties &/*prop
     Log(Info, "Embree ready. (took %s)", util::time_string(timer.value()));
 }
 
+MTS_VARIANT void Scene<Float, Spectrum>::accel_parameters_changed_cpu(const std::vector<Shape *> &shapes) {
+    RTCScene embree_scene = (RTCScene) m_accel;
+
+    /* Geometry IDs match the order in which shapes were attached. Re-create
+       the geometry of changed shapes, since their buffers may have been
+       reallocated. */
+    for (Shape *shape : shapes) {
+        auto it = std::find(m_shapes.begin(), m_shapes.end(), shape);
+        unsigned int geom_id = (unsigned int) (it - m_shapes.begin());
+        rtcDetachGeometry(embree_scene, geom_id);
+        RTCGeometry geom = shape->embree_geometry(__embree_device);
+        rtcAttachGeometryByID(embree_scene, geom, geom_id);
+        rtcReleaseGeometry(geom);
+    }
+
+    rtcCommitScene(embree_scene);
+}
+
 MTS_VARIANT void Scene<Float, Spectrum>::accel_release_cpu() {
     rtcReleaseScene((RTCScene) m_accel);
 }
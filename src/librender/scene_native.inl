@@ -1,30 +1,108 @@
 NAMESPACE_BEGIN(mitsuba)
 
 MTS_VARIANT void Scene<Float, Spectrum>::accel_init_cpu(const Properties &props) {
-    ShapeKDTree *kdtree = new ShapeKDTree(props);
-    kdtree->inc_ref();
+    /* Instances are kept out of the main acceleration data structure and
+       managed by a separate top-level BVH over their world-space bounds */
+    std::vector<Shape *> shapes, instances;
     for (Shape *shape : m_shapes)
-        kdtree->add_shape(shape);
-    kdtree->build();
-    m_accel = kdtree;
+        (shape->is_instance() ? instances : shapes).push_back(shape);
+
+    std::string accel = props.string("accel", "kdtree");
+    if (accel == "kdtree") {
+        ShapeKDTree *kdtree = new ShapeKDTree(props);
+        kdtree->inc_ref();
+        for (Shape *shape : shapes)
+            kdtree->add_shape(shape);
+        kdtree->build();
+        m_accel = kdtree;
+        m_accel_bvh = false;
+    } else if (accel == "bvh") {
+        ShapeBVH *bvh = new ShapeBVH(props);
+        bvh->inc_ref();
+        for (Shape *shape : shapes)
+            bvh->add_shape(shape);
+        bvh->build();
+        m_accel = bvh;
+        m_accel_bvh = true;
+    } else {
+        Throw("Invalid acceleration data structure \"%s\", must be one of: "
+              "\"kdtree\", or \"bvh\"!", accel);
+    }
+
+    if (!instances.empty()) {
+        /* Intersecting an instance traverses the acceleration data structure
+           of its shape group, hence the higher cost and smaller leaves */
+        Properties instance_props;
+        instance_props.set_float("bvh_intersection_cost", 4.f);
+        instance_props.set_int("bvh_max_leaf_size", 2);
+        m_instance_accel = new ShapeBVH(instance_props);
+        m_instance_accel->inc_ref();
+        for (Shape *instance : instances)
+            m_instance_accel->add_shape(instance);
+        m_instance_accel->build();
+    }
+}
+
+MTS_VARIANT void Scene<Float, Spectrum>::accel_parameters_changed_cpu(const std::vector<Shape *> &shapes) {
+    std::vector<Shape *> changed_shapes;
+    bool instances_changed = false;
+    for (Shape *shape : shapes) {
+        if (shape->is_instance())
+            instances_changed = true;
+        else
+            changed_shapes.push_back(shape);
+    }
+
+    if (!changed_shapes.empty()) {
+        if (m_accel_bvh)
+            ((ShapeBVH *) m_accel)->update(changed_shapes);
+        else
+            ((ShapeKDTree *) m_accel)->update(changed_shapes);
+    }
+
+    /* Moving instances invalidates the layout of the top level, which is
+       cheap to rebuild from scratch. Shape groups remain untouched. */
+    if (instances_changed)
+        m_instance_accel->build();
 }
 
 MTS_VARIANT void Scene<Float, Spectrum>::accel_release_cpu() {
-    ((ShapeKDTree *) m_accel)->dec_ref();
+    if (m_accel_bvh)
+        ((ShapeBVH *) m_accel)->dec_ref();
+    else
+        ((ShapeKDTree *) m_accel)->dec_ref();
     m_accel = nullptr;
+
+    if (m_instance_accel) {
+        m_instance_accel->dec_ref();
+        m_instance_accel = nullptr;
+    }
 }
 
 MTS_VARIANT typename Scene<Float, Spectrum>::PreliminaryIntersection3f
 Scene<Float, Spectrum>::ray_intersect_preliminary_cpu(const Ray3f &ray, Mask active) const {
-    const ShapeKDTree *kdtree = (const ShapeKDTree *) m_accel;
-    return kdtree->template ray_intersect_preliminary<false>(ray, active);
+    PreliminaryIntersection3f pi;
+    if (m_accel_bvh)
+        pi = ((const ShapeBVH *) m_accel)->template ray_intersect_preliminary<false>(ray, active);
+    else
+        pi = ((const ShapeKDTree *) m_accel)->template ray_intersect_preliminary<false>(ray, active);
+
+    if (m_instance_accel) {
+        // Only look for instances in front of the closest regular shape
+        Ray3f ray_inst(ray);
+        masked(ray_inst.maxt, pi.is_valid()) = pi.t;
+
+        PreliminaryIntersection3f pi_inst =
+            m_instance_accel->template ray_intersect_preliminary<false>(ray_inst, active);
+        masked(pi, pi_inst.is_valid()) = pi_inst;
+    }
+
+    return pi;
 }
 
 MTS_VARIANT typename Scene<Float, Spectrum>::SurfaceInteraction3f
 Scene<Float, Spectrum>::ray_intersect_cpu(const Ray3f &ray, HitComputeFlags flags, Mask active) const {
-    const ShapeKDTree *kdtree = (const ShapeKDTree *) m_accel;
-
-    PreliminaryIntersection3f pi = kdtree->template ray_intersect_preliminary<false>(ray, active);
+    PreliminaryIntersection3f pi = ray_intersect_preliminary_cpu(ray, active);
     active &= pi.is_valid();
 
     SurfaceInteraction3f si;
@@ -42,9 +120,21 @@ Scene<Float, Spectrum>::ray_intersect_cpu(const Ray3f &ray, HitComputeFlags flag
 
 MTS_VARIANT typename Scene<Float, Spectrum>::SurfaceInteraction3f
 Scene<Float, Spectrum>::ray_intersect_naive_cpu(const Ray3f &ray, Mask active) const {
-    const ShapeKDTree *kdtree = (const ShapeKDTree *) m_accel;
+    PreliminaryIntersection3f pi;
+    if (m_accel_bvh)
+        pi = ((const ShapeBVH *) m_accel)->template ray_intersect_naive<false>(ray, active);
+    else
+        pi = ((const ShapeKDTree *) m_accel)->template ray_intersect_naive<false>(ray, active);
+
+    if (m_instance_accel) {
+        Ray3f ray_inst(ray);
+        masked(ray_inst.maxt, pi.is_valid()) = pi.t;
+
+        PreliminaryIntersection3f pi_inst =
+            m_instance_accel->template ray_intersect_naive<false>(ray_inst, active);
+        masked(pi, pi_inst.is_valid()) = pi_inst;
+    }
 
-    auto pi = kdtree->template ray_intersect_naive<false>(ray, active);
     active &= pi.is_valid();
 
     SurfaceInteraction3f si;
@@ -62,8 +152,20 @@ Scene<Float, Spectrum>::ray_intersect_naive_cpu(const Ray3f &ray, Mask active) c
 
 MTS_VARIANT typename Scene<Float, Spectrum>::Mask
 Scene<Float, Spectrum>::ray_test_cpu(const Ray3f &ray, Mask active) const {
-    const ShapeKDTree *kdtree = (ShapeKDTree *) m_accel;
-    return kdtree->template ray_intersect_preliminary<true>(ray, active).is_valid();
+    Mask hit;
+    if (m_accel_bvh)
+        hit = ((const ShapeBVH *) m_accel)->template ray_intersect_preliminary<true>(ray, active).is_valid();
+    else
+        hit = ((const ShapeKDTree *) m_accel)->template ray_intersect_preliminary<true>(ray, active).is_valid();
+
+    // Only trace the remaining rays against the instances
+    if (m_instance_accel) {
+        active &= !hit;
+        if (any(active))
+            hit |= m_instance_accel->template ray_intersect_preliminary<true>(ray, active).is_valid();
+    }
+
+    return hit;
 }
 
 NAMESPACE_END(mitsuba)
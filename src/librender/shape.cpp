@@ -414,6 +414,9 @@ MTS_VARIANT void Shape<Float, Spectrum>::traverse(TraversalCallback *callback) {
 
 MTS_VARIANT
 void Shape<Float, Spectrum>::parameters_changed(const std::vector<std::string> &/*keys*/) {
+    // Subclasses only call this function when their geometry was modified
+    m_geometry_dirty = true;
+
     if (m_emitter)
         m_emitter->parameters_changed({"parent"});
     if (m_sensor)
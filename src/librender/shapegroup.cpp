@@ -25,6 +25,9 @@ MTS_VARIANT ShapeGroup<Float, Spectrum>::ShapeGroup(const Properties &props) {
                 Throw("Instancing of emitters is not supported");
             if (shape->is_sensor())
                 Throw("Instancing of sensors is not supported");
+            if (shape->is_mesh() && ((Mesh *) shape)->lod_auto())
+                Throw("Automatic level of detail is not supported for instanced "
+                      "meshes (\"%s\"), use \"lod_face_count\" instead", shape->id());
             else {
 #if defined(MTS_ENABLE_EMBREE) || defined(MTS_ENABLE_OPTIX)
                 m_shapes.push_back(shape);
@@ -0,0 +1,249 @@
+import mitsuba
+import pytest
+import enoki as ek
+
+from .mesh_generation import create_stairs
+
+from mitsuba.python.test.util import fresolver_append_path
+
+
+def make_synthetic_scene(n_steps, accel="bvh"):
+    from mitsuba.core import Properties
+    from mitsuba.render import Scene
+
+    props = Properties("scene")
+    props["accel"] = accel
+    props["_unnamed_0"] = create_stairs(n_steps)
+    return Scene(props)
+
+
+def load_bunny(accel="bvh"):
+    from mitsuba.core.xml import load_string
+
+    return load_string("""
+        <scene version="0.5.0">
+            <string name="accel" value="{}"/>
+            <shape type="ply" id="bunny">
+                <string name="filename" value="resources/data/common/meshes/bunny_lowres.ply"/>
+            </shape>
+        </scene>
+    """.format(accel))
+
+
+def compare_results(res_a, res_b, atol=0.0):
+    assert ek.all(res_a.is_valid() == res_b.is_valid())
+    if ek.any(res_a.is_valid()):
+        assert ek.allclose(res_a.t, res_b.t, atol=atol), "\n%s\n\n%s" % (res_a.t, res_b.t)
+
+
+def check_bbox_rays(scene, n=50, z_offset=0.0):
+    from mitsuba.core import Ray3f
+
+    b = scene.bbox()
+    inv_n = 1.0 / (n - 1)
+
+    for x in range(n):
+        for y in range(n):
+            o = [b.min[0] * (1 - x * inv_n) + b.max[0] * x * inv_n,
+                 b.min[1] * (1 - y * inv_n) + b.max[1] * y * inv_n,
+                 b.min[2] - z_offset]
+            r = Ray3f(o, [0, 0, 1], 0.5, [])
+            r.mint = 0
+            r.maxt = 100
+
+            res_naive  = scene.ray_intersect_naive(r)
+            res        = scene.ray_intersect(r)
+            res_shadow = scene.ray_test(r)
+            assert ek.all(res_shadow == res_naive.is_valid())
+            compare_results(res_naive, res)
+
+# ------------------------------------------------------------------------------
+
+def test01_depth_scalar_stairs(variant_scalar_rgb):
+    from mitsuba.core import Ray3f
+    from mitsuba.render import SurfaceInteraction3f
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    n_steps = 20
+    scene = make_synthetic_scene(n_steps)
+
+    n = 128
+    inv_n = 1.0 / (n-1)
+    wavelengths = []
+
+    for x in range(n - 1):
+        for y in range(n - 1):
+            o = [x * inv_n,  y * inv_n,  2]
+            d = [0,  0,  -1]
+            r = Ray3f(o, d, 0.5, wavelengths)
+            r.mint = 0
+            r.maxt = 100
+
+            res_naive   = scene.ray_intersect_naive(r)
+            res         = scene.ray_intersect(r)
+            res_shadow  = scene.ray_test(r)
+
+            step_idx = ek.floor((y * inv_n) * n_steps)
+
+            assert ek.all(res_shadow)
+            assert ek.all(res_shadow == res_naive.is_valid())
+            expected = SurfaceInteraction3f()
+            expected.t = 2.0 - (step_idx / n_steps)
+            compare_results(res_naive, expected, atol=1e-9)
+            compare_results(res_naive, res)
+
+
+@fresolver_append_path
+def test02_depth_scalar_bunny(variant_scalar_rgb):
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    check_bbox_rays(load_bunny(), n=100)
+
+
+def test03_depth_packet_stairs(variant_packet_rgb):
+    from mitsuba.core import Ray3f as Ray3fX
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    scene = make_synthetic_scene(11)
+
+    mitsuba.set_variant("scalar_rgb")
+    from mitsuba.core import Ray3f, Vector3f
+
+    n = 4
+    inv_n = 1.0 / (n - 1)
+    rays = Ray3fX.zero(n * n)
+    d = [0, 0, -1]
+    wavelengths = []
+
+    for x in range(n):
+        for y in range(n):
+            o = Vector3f(x * inv_n, y * inv_n, 2)
+            o = o * 0.999 + 0.0005
+            rays[x * n + y] = Ray3f(o, d, 0, 100, 0.5, wavelengths)
+
+    res_naive  = scene.ray_intersect_naive(rays)
+    res        = scene.ray_intersect(rays)
+    res_shadow = scene.ray_test(rays)
+
+    assert ek.all(res_shadow == res.is_valid())
+    assert ek.all(res.is_valid())
+    compare_results(res_naive, res, atol=1e-6)
+
+
+@fresolver_append_path
+def test04_update_scalar_bunny(variant_scalar_rgb):
+    from mitsuba.python.util import traverse
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    scene = load_bunny()
+
+    # Deform the mesh and let the scene refit (or rebuild) its BVH
+    params = traverse(scene)
+    key = 'bunny.vertex_positions_buf'
+    positions = params[key]
+    for i in range(0, ek.slices(positions), 3):
+        positions[i + 2] += 0.5 * positions[i]
+    params[key] = positions * 1.5
+    params.update()
+
+    check_bbox_rays(scene, z_offset=1)
+
+
+def test05_build_api(variant_scalar_rgb):
+    from mitsuba.core import Properties
+    from mitsuba.render import ShapeBVH
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    props = Properties()
+    props["bvh_max_leaf_size"] = 2
+    bvh = ShapeBVH(props)
+    stairs = create_stairs(100)
+    bvh.add_shape(stairs)
+    bvh.build()
+
+    assert len(bvh) == stairs.face_count()
+    assert bvh.shape_count() == 1
+    assert bvh.node_count() > 1
+    assert bvh.memory_usage() > 0
+    assert bvh.bbox() == stairs.bbox()
+
+    with pytest.raises(Exception) as e:
+        make_synthetic_scene(4, accel="octree")
+    e.match("Invalid acceleration data structure")
+
+
+@pytest.mark.slow
+@fresolver_append_path
+def test06_benchmark(variant_packet_rgb):
+    """Compares the build time, memory usage and ray throughput of the BVH
+    with those of the kd-tree."""
+    from mitsuba.core import Properties, Ray3f, Vector3f
+    from mitsuba.core.xml import load_string
+    from mitsuba.render import ShapeKDTree, ShapeBVH
+    from timeit import default_timer
+    import numpy as np
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    def make_shape(name):
+        if name == 'stairs':
+            return create_stairs(2000)
+        return load_string("""
+            <shape version="2.0.0" type="ply">
+                <string name="filename" value="resources/data/common/meshes/bunny_lowres.ply"/>
+            </shape>""")
+
+    def make_rays(bbox, count):
+        # Random rays between points on the bounding sphere of the shape
+        rng = np.random.RandomState(0)
+        center = np.array(bbox.center())
+        radius = np.linalg.norm(np.array(bbox.extents())) * 0.5
+
+        def sphere_points():
+            p = rng.normal(size=(count, 3))
+            return center + radius * p / np.linalg.norm(p, axis=1)[:, None]
+
+        o, t = sphere_points(), sphere_points()
+        d = t - o
+        d /= np.linalg.norm(d, axis=1)[:, None]
+        return Ray3f(Vector3f(o[:, 0], o[:, 1], o[:, 2]),
+                     Vector3f(d[:, 0], d[:, 1], d[:, 2]), 0.0, [])
+
+    ray_count = 1 << 18
+    for name in ['bunny', 'stairs']:
+        shape = make_shape(name)
+        rays = make_rays(shape.bbox(), ray_count)
+        results = {}
+
+        for accel, cls in [('kdtree', ShapeKDTree), ('bvh', ShapeBVH)]:
+            tree = cls(Properties())
+            tree.add_shape(shape)
+            start = default_timer()
+            tree.build()
+            build_time = default_timer() - start
+
+            props = Properties("scene")
+            props["accel"] = accel
+            props["_unnamed_0"] = shape
+            scene = mitsuba.render.Scene(props)
+
+            start = default_timer()
+            si = scene.ray_intersect_preliminary(rays)
+            trace_time = default_timer() - start
+
+            results[accel] = si
+            print('%s, %s: build %.3f s, %i KiB, %.2f Mrays/s' % (
+                name, accel, build_time, tree.memory_usage() // 1024,
+                ray_count / trace_time * 1e-6))
+
+        compare_results(results['kdtree'], results['bvh'], atol=1e-4)
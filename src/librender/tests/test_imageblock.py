@@ -247,4 +247,32 @@ def test06_put_values_basic(variant_scalar_spectral):
             # we'll just add one sample right in the center of each pixel.
             im.put([j + 0.5, i + 0.5], wavelengths, spectrum, alpha=1.0)
 
-    check_value(im, ref, atol=1e-6)
\ No newline at end of file
+    check_value(im, ref, atol=1e-6)
+
+def test07_put_image_block_bands(variant_scalar_rgb):
+    from mitsuba.core.xml import load_string
+    from mitsuba.render import ImageBlock
+
+    rfilter = load_string("""<rfilter version="2.0.0" type="gaussian"/>""")
+    block = ImageBlock([7, 9], 2, filter=rfilter)
+    block.set_offset([5, 4])
+    block.clear()
+    for i in range(block.height()):
+        for j in range(block.width()):
+            block.put([block.offset()[0] + j + 0.3, block.offset()[1] + i + 0.7],
+                      [i + 1.0, j + 1.0])
+
+    target = ImageBlock([16, 18], 2, filter=rfilter)
+    target.set_offset([1, 2])
+    target.clear()
+    target.put(block)
+    ref = np.array(target.data(), copy=True)
+
+    # Accumulating the block band by band must produce the same result
+    banded = ImageBlock([16, 18], 2, filter=rfilter)
+    banded.set_offset([1, 2])
+    banded.clear()
+    rows = banded.height() + 2 * banded.border_size()
+    for row in range(-3, rows, 3):
+        banded.put(block, row, row + 3)
+    check_value(banded, ref.reshape(rows, -1, 2))
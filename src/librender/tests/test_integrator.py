@@ -7,6 +7,7 @@ import numpy as np
 from enoki.dynamic import Float32 as Float
 
 from mitsuba.python.test.scenes import SCENES
+from mitsuba.python.test.util import fresolver_append_path
 
 integrators = [
     'int_name', [
@@ -148,6 +149,211 @@ def test06_render_timeout(variants_cpu_rgb, int_name):
     assert ek.allclose(timeout, effective, atol=0.5)
 
 
+@pytest.mark.parametrize('samples_per_pass', [-1, 4])
+def test07_render_block_scheduler(variants_cpu_rgb, samples_per_pass):
+    from mitsuba.core import Bitmap, Struct
+
+    def render(scheduler):
+        xml = """<string name="block_scheduler" value="{}"/>""".format(scheduler)
+        if samples_per_pass > 0:
+            xml += """<integer name="samples_per_pass" value="{}"/>""".format(samples_per_pass)
+        integrator = make_integrator('path', xml)
+        scene = SCENES['teapot']['factory'](spp=16)
+        sensor = scene.sensors()[0]
+        assert integrator.render(scene, sensor)
+        converted = sensor.film().bitmap(raw=True).convert(
+            Bitmap.PixelFormat.RGBA, Struct.Type.Float32, False)
+        return np.array(converted, copy=True)
+
+    # The image must not depend on how the cost-aware scheduler splits blocks
+    cost = render('cost')
+    assert np.allclose(cost, render('cost'), atol=1e-5)
+
+    # Scalar variants seed every pixel individually, hence both schedulers agree
+    if mitsuba.variant().startswith('scalar'):
+        assert np.allclose(cost, render('spiral'), atol=1e-5)
+
+    with pytest.raises(RuntimeError):
+        make_integrator('path', """<string name="block_scheduler" value="fifo"/>""")
+
+
+
+def test08_render_adaptive(variant_scalar_rgb):
+    from mitsuba.core import Bitmap, Struct
+
+    spp = 64
+    integrator = make_integrator('path', """
+        <integer name="samples_per_pass" value="4"/>
+        <float name="adaptive_threshold" value="0.05"/>
+        <boolean name="sample_count_aov" value="true"/>
+    """)
+    scene = SCENES['teapot']['factory'](spp=spp)
+    sensor = scene.sensors()[0]
+    assert integrator.render(scene, sensor)
+
+    bitmap = sensor.film().bitmap()
+    channels = [field.name for field in bitmap.struct_()]
+    assert channels == ['R', 'G', 'B', 'A', 'sample_count']
+
+    values = np.array(bitmap.convert(Bitmap.PixelFormat.MultiChannel,
+                                     Struct.Type.Float32, False), copy=False)
+    means = np.mean(values[:, :, :4], axis=(0, 1))
+    assert ek.allclose(means, SCENES['teapot']['full'], rtol=5e-2)
+
+    # The background converges quickly and frees budget for the teapot
+    sample_count = values[:, :, 4]
+    assert np.all(sample_count > 0)
+    assert np.min(sample_count) < np.max(sample_count)
+    assert np.mean(sample_count) <= spp + 1
+
+    # Adaptive sampling needs multiple passes
+    integrator = make_integrator('path', """<float name="adaptive_threshold" value="0.05"/>""")
+    with pytest.raises(RuntimeError):
+        integrator.render(scene, sensor)
+
+
+def test09_render_checkpoint(variants_cpu_rgb, tmpdir):
+    def render(xml, checkpoint, resume):
+        integrator = make_integrator('path', """
+            <integer name="samples_per_pass" value="2"/>""" + xml)
+        integrator.set_checkpoint(checkpoint, 0, resume)
+        scene = SCENES['teapot']['factory'](spp=64)
+        sensor = scene.sensors()[0]
+        assert integrator.render(scene, sensor)
+        return np.array(sensor.film().bitmap(raw=True), copy=True)
+
+    reference_file = str(tmpdir.join('reference.ckpt'))
+    reference = render("", reference_file, False)
+    # The checkpoint is removed once the render completes
+    assert not os.path.exists(reference_file)
+
+    # Interrupt a render, then resume it
+    checkpoint_file = str(tmpdir.join('interrupted.ckpt'))
+    render("""<float name="timeout" value="0.2"/>""", checkpoint_file, False)
+    resumed = render("", checkpoint_file, True)
+    assert not os.path.exists(checkpoint_file)
+    assert np.array_equal(resumed, reference)
+
+    # A checkpoint of a different render job is rejected
+    render("""<float name="timeout" value="0.2"/>""", checkpoint_file, False)
+    if os.path.exists(checkpoint_file):
+        integrator = make_integrator('path', """<integer name="samples_per_pass" value="4"/>""")
+        integrator.set_checkpoint(checkpoint_file, 0, True)
+        scene = SCENES['teapot']['factory'](spp=64)
+        with pytest.raises(RuntimeError):
+            integrator.render(scene, scene.sensors()[0])
+
+
+
+def test10_render_progressive(variants_cpu_rgb, tmpdir):
+    import time
+    from mitsuba.core import Bitmap, Struct
+
+    # The total sample count need not be a power of two
+    integrator = make_integrator('path', """<boolean name="progressive" value="true"/>""")
+    scene = SCENES['teapot']['factory'](spp=24)
+    sensor = scene.sensors()[0]
+    assert integrator.render(scene, sensor)
+    converted = sensor.film().bitmap(raw=True).convert(Bitmap.PixelFormat.RGBA, Struct.Type.Float32, False)
+    means = np.mean(np.array(converted, copy=False), axis=(0, 1))
+    assert ek.allclose(means, SCENES['teapot']['full'], rtol=5e-2)
+
+    # Previews are written in the background after every pass
+    preview_file = str(tmpdir.join('preview.exr'))
+    integrator = make_integrator('path')
+    integrator.set_preview(preview_file, 0, 1)
+    scene = SCENES['teapot']['factory'](spp=16)
+    assert integrator.render(scene, scene.sensors()[0])
+
+    for i in range(100):
+        if os.path.exists(preview_file):
+            break
+        time.sleep(0.1)
+    assert os.path.exists(preview_file)
+
+    with pytest.raises(RuntimeError):
+        make_integrator('path', """
+            <boolean name="progressive" value="true"/>
+            <string name="block_scheduler" value="cost"/>""")
+
+
+
+def test10_render_progressive_gpu(variant_gpu_rgb, tmpdir):
+    # GPU variants warn about and ignore progressive rendering and checkpoints,
+    # but still take all samples
+    from mitsuba.core import Bitmap, Struct, Thread, LogLevel
+
+    logger = Thread.thread().logger()
+    level = logger.error_level()
+    try:
+        logger.set_error_level(LogLevel.Warn)
+        for xml, checkpoint in [("""<boolean name="progressive" value="true"/>""", False),
+                                ("""<integer name="samples_per_pass" value="4"/>""", True)]:
+            integrator = make_integrator('path', xml)
+            if checkpoint:
+                integrator.set_checkpoint(str(tmpdir.join('render.ckpt')), 0, False)
+            scene = SCENES['teapot']['factory'](spp=16)
+            with pytest.raises(RuntimeError, match='only supported by the CPU variants'):
+                integrator.render(scene, scene.sensors()[0])
+    finally:
+        logger.set_error_level(level)
+
+    integrator = make_integrator('path', """<boolean name="progressive" value="true"/>""")
+    scene = SCENES['teapot']['factory'](spp=64)
+    sensor = scene.sensors()[0]
+    assert integrator.render(scene, sensor)
+    converted = sensor.film().bitmap(raw=True).convert(Bitmap.PixelFormat.RGBA, Struct.Type.Float32, False)
+    means = np.mean(np.array(converted, copy=False), axis=(0, 1))
+    assert ek.allclose(means, SCENES['teapot']['full'], rtol=5e-2)
+    assert not os.path.exists(str(tmpdir.join('render.ckpt')))
+
+
+@fresolver_append_path
+def test11_render_sensors(variants_cpu_rgb):
+    from mitsuba.core import Bitmap, Struct
+    from mitsuba.core.xml import load_string
+
+    sensor_xml = """
+        <sensor type="perspective">
+            <transform name="to_world">
+                <lookat target="0, 0, 0.2" origin="{}" up="0, 0, 1"/>
+            </transform>
+            <film type="hdrfilm">
+                <integer name="width" value="{}"/>
+                <integer name="height" value="{}"/>
+            </film>
+            <sampler type="independent">
+                <integer name="sample_count" value="8"/>
+            </sampler>
+        </sensor>"""
+
+    scene = load_string("""
+        <scene version="2.0.0">
+            {}{}{}
+            <shape type="ply">
+                <string name="filename" value="resources/data/common/meshes/teapot.ply"/>
+            </shape>
+            <emitter type="constant"/>
+        </scene>""".format(sensor_xml.format("1, -12, 2", 64, 48),
+                           sensor_xml.format("-12, 1, 2", 37, 53),
+                           sensor_xml.format("0, 0, 12", 16, 16)))
+
+    def image(sensor):
+        converted = sensor.film().bitmap(raw=True).convert(
+            Bitmap.PixelFormat.RGBA, Struct.Type.Float32, False)
+        return np.array(converted, copy=True)
+
+    # Every sensor renders into its own film, as if it was rendered separately
+    integrator = make_integrator('path')
+    sensors = scene.sensors()
+    assert integrator.render_sensors(scene, sensors)
+    images = [image(sensor) for sensor in sensors]
+
+    for sensor, img in zip(sensors, images):
+        assert integrator.render(scene, sensor)
+        assert img.shape == image(sensor).shape
+        assert np.allclose(img, image(sensor), atol=1e-5)
+
 def make_reference_renders():
     mitsuba.set_variant('scalar_rgb')
     from mitsuba.core import Bitmap, Struct
@@ -131,3 +131,96 @@ def test03_depth_packet_stairs(variant_packet_rgb):
     # TODO: spot-check (here, we only check consistency)
     assert ek.all(res_shadow == res.is_valid())
     compare_results(res_naive, res, atol=1e-6)
+
+
+@fresolver_append_path
+def test04_update_scalar_bunny(variant_scalar_rgb):
+    from mitsuba.core import Ray3f
+    from mitsuba.core.xml import load_string
+    from mitsuba.python.util import traverse
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    scene = load_string("""
+        <scene version="0.5.0">
+            <shape type="ply" id="bunny">
+                <string name="filename" value="resources/data/common/meshes/bunny_lowres.ply"/>
+            </shape>
+        </scene>
+    """)
+
+    # Deform the mesh and let the scene update its kd-tree
+    params = traverse(scene)
+    key = 'bunny.vertex_positions_buf'
+    positions = params[key]
+    for i in range(0, ek.slices(positions), 3):
+        positions[i + 2] += 0.5 * positions[i]
+    params[key] = positions * 1.5
+    params.update()
+
+    b = scene.bbox()
+    n = 50
+    inv_n = 1.0 / (n - 1)
+    wavelengths = []
+
+    for x in range(n):
+        for y in range(n):
+            o = [b.min[0] * (1 - x * inv_n) + b.max[0] * x * inv_n,
+                 b.min[1] * (1 - y * inv_n) + b.max[1] * y * inv_n,
+                 b.min[2] - 1]
+            d = [0, 0, 1]
+            r = Ray3f(o, d, 0.5, wavelengths)
+            r.mint = 0
+            r.maxt = 100
+
+            res_naive  = scene.ray_intersect_naive(r)
+            res        = scene.ray_intersect(r)
+            res_shadow = scene.ray_test(r)
+            assert ek.all(res_shadow == res_naive.is_valid())
+            compare_results(res_naive, res)
+
+
+@fresolver_append_path
+def test05_cache_scalar_bunny(variant_scalar_rgb, tmpdir):
+    from mitsuba.core import Ray3f
+    from mitsuba.core.xml import load_string
+    import os
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    def load_scene():
+        return load_string("""
+            <scene version="0.5.0">
+                <string name="kd_cache_dir" value="{}"/>
+                <shape type="ply">
+                    <string name="filename" value="resources/data/common/meshes/bunny_lowres.ply"/>
+                </shape>
+            </scene>
+        """.format(str(tmpdir).replace('\\', '/')))
+
+    scene_built = load_scene()
+    cache_files = [f for f in os.listdir(str(tmpdir)) if f.startswith('kdtree_')]
+    assert len(cache_files) == 1
+
+    # The second scene is loaded from the cache file
+    scene_cached = load_scene()
+    assert os.listdir(str(tmpdir)) == cache_files
+    assert scene_built.bbox() == scene_cached.bbox()
+
+    b = scene_built.bbox()
+    n = 50
+    inv_n = 1.0 / (n - 1)
+
+    for x in range(n):
+        for y in range(n):
+            o = [b.min[0] * (1 - x * inv_n) + b.max[0] * x * inv_n,
+                 b.min[1] * (1 - y * inv_n) + b.max[1] * y * inv_n,
+                 b.min[2]]
+            r = Ray3f(o, [0, 0, 1], 0.5, [])
+            r.mint = 0
+            r.maxt = 100
+
+            compare_results(scene_built.ray_intersect(r), scene_cached.ray_intersect(r))
+            compare_results(scene_cached.ray_intersect_naive(r), scene_cached.ray_intersect(r))
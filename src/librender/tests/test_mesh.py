@@ -648,3 +648,567 @@ def test16_differentiable_surface_interaction_params_backward(variant_gpu_autodi
     assert ek.allclose(ek.gradient(params[vertex_texcoords_key]),
                        [0, 2, 0, 0, 0, 0, 0, -2], atol=1e-5)
 
+
+
+def load_mesh_scene(filename, compress, accel="kdtree"):
+    from mitsuba.core.xml import load_string
+
+    return load_string("""
+        <scene version="2.0.0">
+            <string name="accel" value="{2}"/>
+            <shape type="{0}" id="mesh">
+                <string name="filename" value="{1}"/>
+                <boolean name="compress" value="{3}"/>
+            </shape>
+        </scene>
+    """.format(filename.split('.')[-1], filename, accel, str(compress).lower()))
+
+
+@fresolver_append_path
+def test17_compressed_mesh(variant_scalar_rgb):
+    from mitsuba.core import Ray3f
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    filename = 'resources/data/common/meshes/bunny_lowres.ply'
+    scene_ref = load_mesh_scene(filename, compress=False)
+    scene = load_mesh_scene(filename, compress=True)
+    mesh_ref, mesh = scene_ref.shapes()[0], scene.shapes()[0]
+
+    assert not mesh_ref.is_compressed()
+    assert mesh.is_compressed()
+    assert mesh.has_vertex_normals() == mesh_ref.has_vertex_normals()
+    assert mesh.memory_usage() < 0.6 * mesh_ref.memory_usage()
+    assert 'compressed = 1' in str(mesh)
+
+    # Quantized positions lie within a tiny fraction of the bounding box
+    b = mesh_ref.bbox()
+    tol = ek.hmax(b.extents()) * 1e-5
+    assert ek.allclose(mesh.bbox().min, b.min, atol=tol)
+    assert ek.allclose(mesh.bbox().max, b.max, atol=tol)
+    for i in range(0, mesh.face_count(), 7):
+        assert ek.allclose(mesh.bbox(i).min, mesh_ref.bbox(i).min, atol=tol)
+        assert ek.allclose(mesh.bbox(i).max, mesh_ref.bbox(i).max, atol=tol)
+
+    n = 40
+    inv_n = 1.0 / (n - 1)
+    mismatches = 0
+    for x in range(n):
+        for y in range(n):
+            o = [b.min[0] * (1 - x * inv_n) + b.max[0] * x * inv_n,
+                 b.min[1] * (1 - y * inv_n) + b.max[1] * y * inv_n,
+                 b.min[2] - 1]
+            r = Ray3f(o, [0, 0, 1], 0.5, [])
+            si_ref = scene_ref.ray_intersect(r)
+            si = scene.ray_intersect(r)
+
+            # Rays grazing a silhouette may legitimately change their outcome
+            if si_ref.is_valid() != si.is_valid():
+                mismatches += 1
+                continue
+            if si.is_valid():
+                assert ek.allclose(si.t, si_ref.t, atol=10 * tol)
+                assert ek.allclose(si.p, si_ref.p, atol=10 * tol)
+                assert ek.dot(si.sh_frame.n, si_ref.sh_frame.n) > 0.999
+
+    assert mismatches < n * n * 0.01
+
+
+@fresolver_append_path
+def test18_compressed_mesh_texcoords(variant_packet_rgb):
+    from mitsuba.core import Ray3f, Vector3f
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    filename = 'resources/data/common/meshes/rectangle.obj'
+    for accel in ['kdtree', 'bvh']:
+        scene = load_mesh_scene(filename, compress=True, accel=accel)
+        mesh = scene.shapes()[0]
+        assert mesh.is_compressed()
+        assert mesh.has_vertex_texcoords()
+
+        ray = Ray3f(Vector3f([-0.3, 0.3], [-0.3, 0.3], -10.0),
+                    Vector3f(0.0, 0.0, 1.0), 0, [])
+        si = scene.ray_intersect(ray)
+        assert ek.all(si.is_valid())
+        assert ek.allclose(si.t, 10, atol=1e-4)
+        assert ek.allclose(si.p.x, [-0.3, 0.3], atol=1e-4)
+        assert ek.allclose(si.uv.x, [0.35, 0.65], atol=1e-4)
+        assert ek.allclose(si.uv.y, [0.35, 0.65], atol=1e-4)
+
+
+@pytest.mark.slow
+@fresolver_append_path
+def test19_compressed_mesh_benchmark(variant_packet_rgb):
+    """Reports the memory usage and ray throughput of compressed meshes."""
+    from mitsuba.core import Ray3f, Vector3f
+    from timeit import default_timer
+    import numpy as np
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    filename = 'resources/data/common/meshes/bunny_lowres.ply'
+    ray_count = 1 << 18
+    rng = np.random.RandomState(0)
+
+    for accel in ['kdtree', 'bvh']:
+        results = {}
+        for compress in [False, True]:
+            scene = load_mesh_scene(filename, compress=compress, accel=accel)
+            mesh = scene.shapes()[0]
+
+            if compress is False:
+                b = mesh.bbox()
+                o = rng.uniform(b.min, b.max, size=(ray_count, 3))
+                o[:, 2] = b.min[2] - 1
+                rays = Ray3f(Vector3f(o[:, 0], o[:, 1], o[:, 2]),
+                             Vector3f(0, 0, 1), 0.0, [])
+
+            start = default_timer()
+            si = scene.ray_intersect(rays)
+            trace_time = default_timer() - start
+            results[compress] = si
+
+            print('%s, compress=%s: %i KiB, %.2f Mrays/s' % (
+                accel, compress, mesh.memory_usage() // 1024,
+                ray_count / trace_time * 1e-6))
+
+        valid = results[False].is_valid() & results[True].is_valid()
+        mismatches = np.array(results[False].is_valid()) != np.array(results[True].is_valid())
+        assert np.count_nonzero(mismatches) < ray_count * 0.01
+        assert ek.allclose(ek.select(valid, results[False].t, 0),
+                           ek.select(valid, results[True].t, 0), atol=1e-3)
+
+
+@fresolver_append_path
+def test20_write_mmesh(variants_cpu_rgb, tmpdir):
+    from mitsuba.core.xml import load_string
+
+    for filename in ['resources/data/common/meshes/bunny_lowres.ply',
+                     'resources/data/common/meshes/rectangle.obj',
+                     'data/triangle_face_colors.ply']:
+        mesh_ref = load_string("""
+            <shape type="{0}" version="2.0.0">
+                <string name="filename" value="{1}"/>
+            </shape>
+        """.format(filename.split('.')[-1], filename))
+
+        mmesh_file = str(tmpdir.join('mesh.mmesh'))
+        mesh_ref.write_mmesh(mmesh_file)
+
+        mesh = load_string("""
+            <shape type="mmesh" version="2.0.0">
+                <string name="filename" value="{}"/>
+            </shape>
+        """.format(mmesh_file))
+
+        assert mesh.vertex_count() == mesh_ref.vertex_count()
+        assert mesh.face_count() == mesh_ref.face_count()
+        assert mesh.has_vertex_normals() == mesh_ref.has_vertex_normals()
+        assert mesh.has_vertex_texcoords() == mesh_ref.has_vertex_texcoords()
+        assert mesh.bbox() == mesh_ref.bbox()
+        assert ek.all(mesh.faces_buffer() == mesh_ref.faces_buffer())
+        assert ek.all(mesh.vertex_positions_buffer() == mesh_ref.vertex_positions_buffer())
+        assert ek.all(mesh.vertex_normals_buffer() == mesh_ref.vertex_normals_buffer())
+        assert ek.all(mesh.vertex_texcoords_buffer() == mesh_ref.vertex_texcoords_buffer())
+        assert str(mesh).split('\n')[2:] == str(mesh_ref).split('\n')[2:]
+
+        if 'face_colors' in filename:
+            assert ek.all(mesh.attribute_buffer('face_color') ==
+                          mesh_ref.attribute_buffer('face_color'))
+
+
+@fresolver_append_path
+def test21_mmesh_copy_on_write(variant_scalar_rgb, tmpdir):
+    from mitsuba.core.xml import load_string
+
+    mesh_ref = load_string("""
+        <shape type="ply" version="2.0.0">
+            <string name="filename" value="resources/data/common/meshes/bunny_lowres.ply"/>
+        </shape>
+    """)
+    mmesh_file = str(tmpdir.join('bunny.mmesh'))
+    mesh_ref.write_mmesh(mmesh_file)
+    with open(mmesh_file, 'rb') as f:
+        contents = f.read()
+
+    # Transformed and edited meshes don't modify the file
+    mesh = load_string("""
+        <shape type="mmesh" version="2.0.0">
+            <string name="filename" value="{}"/>
+            <transform name="to_world">
+                <translate x="1"/>
+            </transform>
+        </shape>
+    """.format(mmesh_file))
+    b = mesh_ref.bbox()
+    assert ek.allclose(mesh.bbox().min, [b.min[0] + 1, b.min[1], b.min[2]])
+
+    params = traverse(mesh)
+    params['vertex_positions_buf'][0] += 10
+    params.update()
+
+    with open(mmesh_file, 'rb') as f:
+        assert f.read() == contents
+
+    with pytest.raises(Exception) as e:
+        mesh_ref.write_mmesh(str(tmpdir.join('invalid.mmesh')))
+        with open(str(tmpdir.join('invalid.mmesh')), 'r+b') as f:
+            f.write(b'XXXX')
+        load_string("""
+            <shape type="mmesh" version="2.0.0">
+                <string name="filename" value="{}"/>
+            </shape>
+        """.format(str(tmpdir.join('invalid.mmesh'))))
+    e.match('invalid file header')
+
+
+def test22_ply_parallel_loading(variant_scalar_rgb, tmpdir):
+    from mitsuba.core.xml import load_string
+    import numpy as np
+
+    # Large enough to be split into several batches / text chunks
+    n = 300
+    x, y = np.meshgrid(np.linspace(0, 1, n), np.linspace(0, 1, n))
+    positions = np.stack([x.ravel(), y.ravel(), (x * y).ravel()], axis=1).astype(np.float32)
+    idx = np.arange(n * n, dtype=np.uint32).reshape(n, n)[:-1, :-1].ravel()
+    faces = np.concatenate([np.stack([idx, idx + 1, idx + n + 1], axis=1),
+                            np.stack([idx, idx + n + 1, idx + n], axis=1)])
+
+    def write_ply(filename, fmt, truncate=False):
+        header = ('ply\nformat %s 1.0\nelement vertex %i\n'
+                  'property float x\nproperty float y\nproperty float z\n'
+                  'element face %i\nproperty list uchar int vertex_indices\n'
+                  'end_header\n') % (fmt, len(positions), len(faces))
+        with open(filename, 'wb') as f:
+            f.write(header.encode())
+            face_records = faces[:-1] if truncate else faces
+            if fmt == 'ascii':
+                np.savetxt(f, positions, fmt='%.9g')
+                np.savetxt(f, face_records, fmt='3 %i %i %i')
+            else:
+                f.write(positions.tobytes())
+                records = np.zeros(len(face_records), dtype=[('n', 'u1'), ('i', '<i4', 3)])
+                records['n'], records['i'] = 3, face_records
+                f.write(records.tobytes())
+
+    def load(filename):
+        return load_string("""
+            <shape type="ply" version="2.0.0">
+                <string name="filename" value="{}"/>
+            </shape>
+        """.format(filename))
+
+    meshes = []
+    for fmt in ['ascii', 'binary_little_endian']:
+        filename = str(tmpdir.join(fmt + '.ply'))
+        write_ply(filename, fmt)
+        mesh = load(filename)
+        assert mesh.vertex_count() == len(positions)
+        assert mesh.face_count() == len(faces)
+        assert np.all(np.array(mesh.faces_buffer()) == faces.ravel())
+        assert np.allclose(np.array(mesh.vertex_positions_buffer()), positions.ravel())
+        meshes.append(mesh)
+
+    assert meshes[0].bbox() == meshes[1].bbox()
+    assert ek.allclose(meshes[0].vertex_normals_buffer(), meshes[1].vertex_normals_buffer())
+
+    for fmt, message in [('ascii', 'Unexpected end of PLY file'),
+                         ('binary_little_endian', 'unexpected end of file')]:
+        filename = str(tmpdir.join('truncated_' + fmt + '.ply'))
+        write_ply(filename, fmt, truncate=True)
+        with pytest.raises(Exception) as e:
+            load(filename)
+        e.match(message)
+
+
+def test23_obj_parallel_loading(variant_scalar_rgb, tmpdir):
+    from mitsuba.core.xml import load_string
+    import numpy as np
+
+    # Large enough to be split into several chunks
+    n = 300
+    x, y = np.meshgrid(np.linspace(0, 1, n), np.linspace(0, 1, n))
+    positions = np.stack([x.ravel(), y.ravel(), (x * y).ravel()], axis=1)
+    idx = np.arange(n * n).reshape(n, n)[:-1, :-1].ravel() + 1
+    quads = np.stack([idx, idx + 1, idx + n + 1, idx + n], axis=1)
+
+    filename = str(tmpdir.join('grid.obj'))
+    with open(filename, 'w') as f:
+        f.write('# Grid\no grid\n')
+        np.savetxt(f, positions, fmt='v %.9g %.9g %.9g')
+        np.savetxt(f, positions[:, :2], fmt='vt %.9g %.9g')
+        np.savetxt(f, np.tile([0, 0, 1], (len(positions), 1)), fmt='vn  %i\t%i %i')
+        np.savetxt(f, np.repeat(quads, 3, axis=1), fmt='f %i/%i/%i %i/%i/%i %i/%i/%i %i/%i/%i')
+
+    mesh = load_string("""
+        <shape type="obj" version="2.0.0">
+            <string name="filename" value="{}"/>
+        </shape>
+    """.format(filename))
+
+    # Vertices are numbered in the order of their first reference
+    ids, faces = {}, []
+    for q in quads:
+        for tri in [(q[0], q[1], q[2]), (q[0], q[2], q[3])]:
+            for v in tri:
+                faces.append(ids.setdefault(v, len(ids)))
+    order = np.array(sorted(ids, key=ids.get)) - 1
+
+    assert mesh.vertex_count() == len(ids)
+    assert mesh.face_count() == 2 * len(quads)
+    assert np.all(np.array(mesh.faces_buffer()) == faces)
+    assert np.allclose(np.array(mesh.vertex_positions_buffer()), positions[order].ravel())
+    texcoords = positions[order, :2].copy()
+    texcoords[:, 1] = 1 - texcoords[:, 1]
+    assert np.allclose(np.array(mesh.vertex_texcoords_buffer()), texcoords.ravel())
+    assert np.allclose(np.array(mesh.vertex_normals_buffer()),
+                       np.tile([0, 0, 1], len(ids)))
+
+    with open(filename, 'a') as f:
+        f.write('f 1 2 %i\n' % (n * n + 1))
+    with pytest.raises(Exception) as e:
+        load_string("""
+            <shape type="obj" version="2.0.0">
+                <string name="filename" value="{}"/>
+            </shape>
+        """.format(filename))
+    e.match('reference to invalid vertex')
+
+
+def test24_serialized_multiple_shapes(variant_scalar_rgb, tmpdir):
+    from mitsuba.core.xml import load_string
+    import numpy as np
+    import struct
+    import zlib
+
+    # Write a serialized file containing many single-triangle meshes
+    shape_count = 64
+    filename = str(tmpdir.join('shapes.serialized'))
+    offsets = []
+    with open(filename, 'wb') as f:
+        for i in range(shape_count):
+            offsets.append(f.tell())
+            positions = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32) + i
+            data = struct.pack('<I', 0x1000) + b'mesh_%i\0' % i
+            data += struct.pack('<QQ', 3, 1) + positions.astype('<f4').tobytes()
+            data += np.array([0, 1, 2], dtype='<u4').tobytes()
+            f.write(struct.pack('<HH', 0x041C, 0x0004) + zlib.compress(data))
+        f.write(struct.pack('<%iQI' % shape_count, *offsets, shape_count))
+
+    shapes = ''.join("""
+        <shape type="serialized">
+            <string name="filename" value="{}"/>
+            <integer name="shape_index" value="{}"/>
+        </shape>""".format(filename, i) for i in range(shape_count))
+    scene = load_string('<scene version="2.0.0">{}</scene>'.format(shapes))
+
+    meshes = sorted(scene.shapes(), key=lambda s: s.bbox().min[0])
+    assert len(meshes) == shape_count
+    for i, mesh in enumerate(meshes):
+        assert 'name = "mesh_%i"' % i in str(mesh)
+        assert mesh.face_count() == 1
+        assert ek.allclose(mesh.bbox().min, [i, i, i])
+        assert ek.allclose(mesh.bbox().max, [i + 1, i + 1, i])
+
+    with pytest.raises(Exception) as e:
+        load_string("""
+            <shape type="serialized" version="2.0.0">
+                <string name="filename" value="{}"/>
+                <integer name="shape_index" value="{}"/>
+            </shape>
+        """.format(filename, shape_count))
+    e.match('shape index is out of range')
+
+
+def test25_parallel_normals_and_pmf(variant_scalar_rgb):
+    from mitsuba.render import Mesh
+    import numpy as np
+
+    # Randomly perturbed grid that spans many parallel work items
+    n = 400
+    rng = np.random.RandomState(0)
+    x, y = np.meshgrid(np.linspace(0, 1, n), np.linspace(0, 1, n))
+    positions = np.stack([x.ravel(), y.ravel(), 0.01 * rng.normal(size=n * n)], axis=1)
+    idx = np.arange(n * n, dtype=np.uint32).reshape(n, n)[:-1, :-1].ravel()
+    faces = np.concatenate([np.stack([idx, idx + 1, idx + n + 1], axis=1),
+                            np.stack([idx, idx + n + 1, idx + n], axis=1)])
+
+    m = Mesh("MyMesh", n * n, len(faces), has_vertex_normals=True)
+    m.vertex_positions_buffer()[:] = positions.ravel().astype(np.float32)
+    m.faces_buffer()[:] = faces.ravel()
+
+    # The accumulation of the vertex normals is deterministic
+    m.recompute_vertex_normals()
+    normals = np.array(m.vertex_normals_buffer())
+    for i in range(3):
+        m.recompute_vertex_normals()
+        assert np.all(np.array(m.vertex_normals_buffer()) == normals)
+
+    normals = normals.reshape(-1, 3)
+    assert np.allclose(np.linalg.norm(normals, axis=1), 1, atol=1e-5)
+    assert np.all(normals[:, 2] > 0.9)
+
+    m.parameters_changed()
+    p = positions[faces].astype(np.float64)
+    area = 0.5 * np.linalg.norm(np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0]), axis=1)
+    assert ek.allclose(m.surface_area(), area.sum(), rtol=1e-4)
+
+
+def test26_mesh_asset_cache(variant_scalar_rgb, tmpdir):
+    from mitsuba.core import AssetCache
+    from mitsuba.core.xml import load_string
+    import time
+
+    filename = str(tmpdir.join('quad.obj'))
+    def write_obj(z):
+        with open(filename, 'w') as f:
+            f.write('v 0 0 %f\nv 1 0 0\nv 1 1 0\nv 0 1 0\n'
+                    'vt 0 0\nvt 1 0\nvt 1 1\nvt 0 1\nf 1/1 2/2 3/3 4/4\n' % z)
+
+    def load(scale=1):
+        return load_string("""
+            <shape type="obj" version="2.0.0">
+                <string name="filename" value="{}"/>
+                <transform name="to_world">
+                    <scale value="{}"/>
+                </transform>
+            </shape>
+        """.format(filename, scale))
+
+    write_obj(0)
+    AssetCache.purge()
+    AssetCache.set_capacity(1 << 20)
+    try:
+        stats = AssetCache.statistics()
+        m1 = load()
+        m2 = load()
+        assert AssetCache.statistics().hits == stats.hits + 1
+        assert AssetCache.statistics().entries == 1
+        assert m1.face_count() == m2.face_count() == 2
+        assert ek.all(m1.faces_buffer() == m2.faces_buffer())
+        assert ek.all(m1.vertex_positions_buffer() == m2.vertex_positions_buffer())
+        assert ek.all(m1.vertex_texcoords_buffer() == m2.vertex_texcoords_buffer())
+        assert ek.all(m1.vertex_normals_buffer() == m2.vertex_normals_buffer())
+        assert m1.bbox() == m2.bbox()
+
+        # Meshes don't share their buffers
+        m2.vertex_positions_buffer()[0] = 5
+        assert load().vertex_positions_buffer()[0] == 0
+
+        # Different parameters or a modified file are cache misses
+        assert load(scale=2).bbox().max[0] == 2
+        time.sleep(0.01)
+        write_obj(0.5)
+        assert load().bbox().max[2] == 0.5
+        assert AssetCache.statistics().entries == 3
+    finally:
+        AssetCache.purge()
+        AssetCache.set_capacity(0)
+
+
+def test27_mesh_lod(variant_scalar_rgb, tmpdir):
+    from mitsuba.core.xml import load_string
+    import numpy as np
+    import os
+
+    n = 100
+    x, y = np.meshgrid(np.linspace(0, 1, n), np.linspace(0, 1, n))
+    z = 0.1 * np.sin(4 * x) * np.cos(3 * y)
+    positions = np.stack([x.ravel(), y.ravel(), z.ravel()], axis=1).astype(np.float32)
+    idx = np.arange(n * n, dtype=np.uint32).reshape(n, n)[:-1, :-1].ravel()
+    faces = np.concatenate([np.stack([idx, idx + 1, idx + n + 1], axis=1),
+                            np.stack([idx, idx + n + 1, idx + n], axis=1)])
+
+    filename = str(tmpdir.join('grid.ply'))
+    with open(filename, 'wb') as f:
+        f.write(('ply\nformat binary_little_endian 1.0\nelement vertex %i\n'
+                 'property float x\nproperty float y\nproperty float z\n'
+                 'element face %i\nproperty list uchar int vertex_indices\n'
+                 'end_header\n' % (len(positions), len(faces))).encode())
+        f.write(positions.tobytes())
+        records = np.zeros(len(faces), dtype=[('n', 'u1'), ('i', '<i4', 3)])
+        records['n'], records['i'] = 3, faces
+        f.write(records.tobytes())
+
+    def load(params=''):
+        return load_string("""
+            <shape type="ply" version="2.0.0">
+                <string name="filename" value="{}"/>
+                {}
+            </shape>
+        """.format(filename, params))
+
+    mesh = load()
+    area = mesh.surface_area()
+    mesh.simplify(1000)
+    assert 990 <= mesh.face_count() <= 1000
+    assert mesh.vertex_count() < len(positions) // 5
+    assert abs(mesh.surface_area() - area) < 1e-2 * area
+
+    # The boundary of the grid is preserved
+    bbox = mesh.bbox()
+    assert ek.allclose([bbox.min[0], bbox.min[1], bbox.max[0], bbox.max[1]],
+                       [0, 0, 1, 1], atol=1e-4)
+
+    # Simplified meshes are stored on disk and reused
+    cache_dir = str(tmpdir.join('lod'))
+    params = """<integer name="lod_face_count" value="1000"/>
+                <string name="lod_cache_dir" value="{}"/>""".format(cache_dir)
+    m1 = load(params)
+    assert m1.face_count() == mesh.face_count()
+    assert len(os.listdir(cache_dir)) == 1
+    m2 = load(params)
+    assert ek.all(m1.faces_buffer() == m2.faces_buffer())
+    assert ek.all(m1.vertex_positions_buffer() == m2.vertex_positions_buffer())
+    assert ek.all(m1.vertex_normals_buffer() == m2.vertex_normals_buffer())
+    assert m1.bbox() == m2.bbox()
+
+    # Automatic level of detail, based on the distance to the sensor
+    def load_scene(distance, params=''):
+        return load_string("""
+            <scene version="2.0.0">
+                <sensor type="perspective">
+                    <float name="fov" value="45"/>
+                    <transform name="to_world">
+                        <lookat origin="0.5, 0.5, {}" target="0.5, 0.5, 0" up="0, 1, 0"/>
+                    </transform>
+                    <film type="hdrfilm">
+                        <integer name="width" value="256"/>
+                        <integer name="height" value="256"/>
+                    </film>
+                </sensor>
+                <shape type="ply">
+                    <string name="filename" value="{}"/>
+                    <boolean name="lod_auto" value="true"/>
+                    {}
+                </shape>
+            </scene>
+        """.format(distance, filename, params))
+
+    assert load_scene(1.5).shapes()[0].face_count() == len(faces)
+    assert load_scene(100).shapes()[0].face_count() <= 256
+
+    # Compression is postponed until the level of detail has been applied
+    mesh = load_scene(100, '<boolean name="compress" value="true"/>').shapes()[0]
+    assert mesh.face_count() <= 256
+    assert mesh.is_compressed()
+
+    # Instanced meshes cannot choose their level of detail automatically
+    with pytest.raises(RuntimeError, match='.*not supported for instanced meshes.*'):
+        load_string("""
+            <scene version="2.0.0">
+                <shape type="shapegroup" id="group">
+                    <shape type="ply">
+                        <string name="filename" value="{}"/>
+                        <boolean name="lod_auto" value="true"/>
+                    </shape>
+                </shape>
+                <shape type="instance">
+                    <ref id="group"/>
+                </shape>
+            </scene>
+        """.format(filename))
@@ -1,3 +1,4 @@
+import math
 import pytest
 
 import enoki as ek
@@ -102,3 +103,132 @@ def test03_shapes_parameters_grad_enabled(variant_gpu_autodiff_rgb):
     params.set_dirty(shape_param_key)
     params.update()
     assert scene.shapes_grad_enabled() == True
+
+
+@fresolver_append_path
+def test04_emitter_sampling_power(variant_scalar_rgb):
+    from mitsuba.core import Vector3f
+    from mitsuba.core.xml import load_string
+    from mitsuba.render import Interaction3f
+
+    def make_scene(strategy):
+        return load_string("""
+            <scene version="2.0.0">
+                <string name="emitter_sampling" value="{}"/>
+                <shape type="rectangle">
+                    <transform name="to_world">
+                        <translate z="-1"/>
+                    </transform>
+                    <emitter type="area">
+                        <rgb name="radiance" value="1.0"/>
+                    </emitter>
+                </shape>
+                <shape type="rectangle">
+                    <transform name="to_world">
+                        <rotate x="1" angle="180"/>
+                        <translate z="1"/>
+                    </transform>
+                    <emitter type="area">
+                        <rgb name="radiance" value="9.0"/>
+                    </emitter>
+                </shape>
+            </scene>
+        """.format(strategy))
+
+    with pytest.raises(RuntimeError, match='.*Invalid emitter sampling strategy.*'):
+        make_scene("foo")
+
+    scene = make_scene("power")
+    emitters = scene.emitters()
+    assert ek.allclose(emitters[0].power_estimate(), 4 * math.pi)
+    assert ek.allclose(emitters[1].power_estimate(), 36 * math.pi)
+
+    it = ek.zero(Interaction3f)
+    it.p = Vector3f(0.0, 0.0, 0.0)
+
+    n_bright = 0
+    n_samples = 1000
+    for i in range(n_samples):
+        sample = [(i + 0.5) / n_samples, 0.5]
+        ds, spec = scene.sample_emitter_direction(it, sample, False)
+        assert ds.pdf > 0
+        assert ek.allclose(scene.pdf_emitter_direction(it, ds), ds.pdf)
+        n_bright += ds.p.z > 0
+
+    # The brighter emitter should be selected with probability 9/10
+    assert abs(n_bright / n_samples - 0.9) < 1e-2
+
+    # Uniform selection must stay the default
+    scene = make_scene("uniform")
+    ds, _ = scene.sample_emitter_direction(it, [0.25, 0.5], False)
+    assert ek.allclose(scene.pdf_emitter_direction(it, ds), ds.pdf)
+
+    # Radiance textures without a mean value fall back to unit radiance
+    scene = load_string("""
+        <scene version="2.0.0">
+            <string name="emitter_sampling" value="power"/>
+            <shape type="rectangle">
+                <emitter type="area">
+                    <texture type="mesh_attribute" name="radiance">
+                        <string name="name" value="vertex_color"/>
+                    </texture>
+                </emitter>
+            </shape>
+            <shape type="rectangle">
+                <transform name="to_world">
+                    <translate z="1"/>
+                </transform>
+                <emitter type="area"/>
+            </shape>
+        </scene>
+    """)
+    emitters = scene.emitters()
+    assert ek.allclose(emitters[0].power_estimate(), 4 * math.pi)
+
+
+@fresolver_append_path
+def test05_render_sweep(variant_scalar_rgb, tmpdir):
+    from mitsuba.core import Bitmap
+    from mitsuba.core.xml import load_string
+    from mitsuba.python.util import render_sweep, traverse
+    import numpy as np
+    import os
+
+    scene = load_string("""
+        <scene version="2.0.0">
+            <integrator type="direct"/>
+            <sensor type="perspective">
+                <transform name="to_world">
+                    <lookat target="0, 0, 0" origin="0, 0, 5" up="0, 1, 0"/>
+                </transform>
+                <film type="hdrfilm">
+                    <integer name="width" value="16"/>
+                    <integer name="height" value="16"/>
+                    <string name="pixel_format" value="rgb"/>
+                </film>
+                <sampler type="independent">
+                    <integer name="sample_count" value="4"/>
+                </sampler>
+            </sensor>
+            <shape type="obj" id="box">
+                <string name="filename" value="resources/data/tests/obj/cbox_smallbox.obj"/>
+                <bsdf type="diffuse" id="box_bsdf"/>
+            </shape>
+            <emitter type="constant"/>
+        </scene>
+    """)
+
+    params = traverse(scene)
+    key = 'box.bsdf.reflectance.value'
+    assert key in params
+    reflectance = params[key][0]
+
+    filename = os.path.join(str(tmpdir), 'frame_{:02d}.exr')
+    frames = [{key: [0.1, 0.1, 0.1]}, {key: [0.8, 0.8, 0.8]}, {}]
+    assert render_sweep(scene, frames, filename)
+
+    means = [np.mean(np.array(Bitmap(filename.format(i)))) for i in range(len(frames))]
+    assert means[0] < means[1]
+    # The last frame does not override the reflectance, which is thus restored
+    assert means[0] < means[2] < means[1]
+    assert ek.allclose(params[key][0], reflectance)
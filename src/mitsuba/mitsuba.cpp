@@ -15,6 +15,11 @@
 #include <mitsuba/render/scene.h>
 #include <tbb/task_scheduler_init.h>
 
+#include <fstream>
+#include <map>
+#include <set>
+#include <unordered_map>
+
 #if defined(MTS_ENABLE_OPTIX)
 #include <mitsuba/render/optix_api.h>
 #endif
@@ -59,7 +64,9 @@ Options:
 
     -s <index>, --sensor <index>
         Index of the sensor to render with (following the declaration
-        order in the scene file). Default value: 0.
+        order in the scene file). Default value: 0. A comma-separated
+        list of indices (e.g. "0,2,5") or "all" renders several sensors
+        in one job, writing the image of sensor i to "<output>_<i>.exr".
 
     -u, --update
         When specified, Mitsuba will update the scene's
@@ -70,42 +77,385 @@ Options:
 
     -o <filename>, --output <filename>
         Write the output image to the file "filename".
+
+    -c <seconds>, --checkpoint <seconds>
+        Save the state of the render to "<output>.ckpt" between passes
+        (see the integrator's "samples_per_pass" parameter) whenever the
+        given number of seconds have elapsed since the last checkpoint.
+
+    -r, --resume
+        Continue from an existing checkpoint file. The result is identical
+        to that of an uninterrupted render with checkpoints enabled.
+
+    --sweep <filename>
+        Render a parameter sweep or animation from a single loaded scene.
+        Every line of the file describes a frame as a list of
+        "name=value" pairs, where names refer to scene parameters (as
+        listed by the Python function mitsuba.python.util.traverse()) and
+        vector values are comma-separated (e.g. "sphere.to_world=..."
+        takes 16 values). Frame i is written to "<output>_<i>.exr", where
+        <i> is padded with zeros to four digits (e.g. "<output>_0007.exr").
+        When rendering several sensors, the image of sensor s is written
+        to "<output>_<s>_<i>.exr".
+
+    -p <seconds>, --preview <seconds>
+        Render progressively in passes of doubling sample counts and
+        periodically write a preview of the image to "<output>.preview.exr".
+
+    --preview-passes <count>
+        Also write a preview after the given number of passes.
 )";
 }
 
 std::function<void(void)> develop_callback;
 std::mutex develop_callback_mutex;
 
+/// Frame of a parameter sweep: list of (parameter name, value) pairs
+using SweepFrame = std::vector<std::pair<std::string, std::string>>;
+
+/**
+ * Read the frames of a parameter sweep. Every line of the file describes a
+ * frame using whitespace-separated "name=value" pairs, where vector-valued
+ * parameters take a comma-separated list of values. Empty lines and lines
+ * starting with '#' are skipped.
+ */
+static std::vector<SweepFrame> read_sweep_file(const fs::path &filename) {
+    std::ifstream is(filename.native());
+    if (!is.good())
+        Throw("Could not open parameter sweep file \"%s\"!", filename.string());
+
+    std::vector<SweepFrame> frames;
+    std::string line;
+    while (std::getline(is, line)) {
+        line = string::trim(line);
+        if (line.empty() || line[0] == '#')
+            continue;
+
+        SweepFrame frame;
+        for (const std::string &item : string::tokenize(line, " \t")) {
+            auto sep = item.find('=');
+            if (sep == std::string::npos)
+                Throw("Parameter sweep file \"%s\": expected name=value pairs, got \"%s\"!",
+                      filename.string(), item);
+            frame.emplace_back(item.substr(0, sep), item.substr(sep + 1));
+        }
+        frames.push_back(frame);
+    }
+
+    if (frames.empty())
+        Throw("Parameter sweep file \"%s\" does not contain any frames!", filename.string());
+    return frames;
+}
+
+/**
+ * \brief Applies the frames of a parameter sweep to a loaded scene
+ *
+ * Parameters are found using \ref Object::traverse() and named as by the
+ * Python function \c mitsuba.python.util.traverse(). Every frame starts from
+ * the original scene: parameters overridden by an earlier frame are restored
+ * unless the current frame overrides them again. Only the modified objects
+ * and their parents are notified via \ref Object::parameters_changed(), hence
+ * the scene keeps its acceleration data structure unless shapes are deformed.
+ */
 template <typename Float, typename Spectrum>
-bool render(Object *scene_, size_t sensor_i, filesystem::path filename) {
+class SceneParameters {
+public:
+    MTS_IMPORT_CORE_TYPES()
+
+    SceneParameters(Object *scene) { add_object(scene, nullptr, "", 0); }
+
+    void apply(const SweepFrame &frame) {
+        // Objects to be notified, the deepest ones are handled first
+        std::map<std::pair<size_t, Object *>, std::vector<std::string>> changed;
+
+        auto overridden = [&](const std::string &name) {
+            return std::any_of(frame.begin(), frame.end(),
+                               [&](const auto &item) { return item.first == name; });
+        };
+
+        for (auto it = m_original.begin(); it != m_original.end(); ) {
+            if (overridden(it->first)) {
+                ++it;
+                continue;
+            }
+            it->second();
+            set_dirty(it->first, changed);
+            it = m_original.erase(it);
+        }
+
+        for (const auto &[name, value] : frame) {
+            auto it = m_parameters.find(name);
+            if (it == m_parameters.end())
+                Throw("Unknown scene parameter \"%s\"!", name);
+            set(name, it->second, value);
+            set_dirty(name, changed);
+        }
+
+        for (auto it = changed.rbegin(); it != changed.rend(); ++it)
+            it->first.second->parameters_changed(it->second);
+    }
+
+private:
+    struct Parameter {
+        void *ptr;
+        const std::type_info *type;
+        Object *object;
+    };
+
+    struct Node {
+        Object *parent;
+        size_t depth;
+    };
+
+    class Traversal : public TraversalCallback {
+    public:
+        Traversal(SceneParameters *params, Object *node, const std::string &prefix, size_t depth)
+            : m_params(params), m_node(node), m_prefix(prefix), m_depth(depth) { }
+
+        void put_object(const std::string &name, Object *obj) override {
+            if (m_params->m_hierarchy.count(obj) == 0)
+                m_params->add_object(obj, m_node, full_name(name), m_depth + 1);
+        }
+
+    protected:
+        void put_parameter_impl(const std::string &name, const std::type_info &type,
+                                void *ptr) override {
+            m_params->m_parameters[full_name(name)] = { ptr, &type, m_node };
+        }
+
+        std::string full_name(const std::string &name) const {
+            return m_prefix.empty() ? name : m_prefix + "." + name;
+        }
+
+    private:
+        SceneParameters *m_params;
+        Object *m_node;
+        std::string m_prefix;
+        size_t m_depth;
+    };
+
+    void add_object(Object *node, Object *parent, std::string name, size_t depth) {
+        if (parent) {
+            // Disambiguate objects that are referenced under the same name
+            std::string base_name = name;
+            for (size_t i = 1; m_prefixes.count(name) != 0; ++i)
+                name = tfm::format("%s_%i", base_name, i);
+            m_prefixes.insert(name);
+        }
+
+        m_hierarchy[node] = { parent, depth };
+        Traversal cb(this, node, name, depth);
+        node->traverse(&cb);
+    }
+
+    /// Record the parameter and its parents as modified
+    void set_dirty(std::string key,
+                   std::map<std::pair<size_t, Object *>, std::vector<std::string>> &changed) {
+        Object *node = m_parameters[key].object;
+        while (node) {
+            const Node &n = m_hierarchy[node];
+            std::string name = key;
+            if (n.parent) {
+                auto sep = key.rfind('.');
+                name = key.substr(sep + 1);
+                key = key.substr(0, sep);
+            }
+
+            std::vector<std::string> &names = changed[{ n.depth, node }];
+            if (!string::contains(names, name))
+                names.push_back(name);
+            node = n.parent;
+        }
+    }
+
+    template <typename T>
+    static T parse(const std::string &name, const std::string &value) {
+        std::vector<double> values;
+        for (const std::string &token : string::tokenize(value, ",")) {
+            char *end_ptr = nullptr;
+            double v = std::strtod(token.c_str(), &end_ptr);
+            if (*end_ptr != '\0')
+                Throw("Parameter \"%s\": could not parse \"%s\"!", name, value);
+            values.push_back(v);
+        }
+
+        size_t size = 1;
+        if constexpr (enoki::is_matrix_v<T>)
+            size = T::Size * T::Size;
+        else if constexpr (enoki::is_static_array_v<T>)
+            size = T::Size;
+        if (values.size() != size)
+            Throw("Parameter \"%s\" expects %i value%s, got %i!", name, size,
+                  size == 1 ? "" : "s", values.size());
+
+        T result;
+        if constexpr (enoki::is_matrix_v<T>) {
+            for (size_t i = 0; i < T::Size; ++i)
+                for (size_t j = 0; j < T::Size; ++j)
+                    result(i, j) = (scalar_t<T>) values[i * T::Size + j];
+        } else if constexpr (enoki::is_static_array_v<T>) {
+            for (size_t i = 0; i < T::Size; ++i)
+                result[i] = (scalar_t<T>) values[i];
+        } else {
+            result = (T) values[0];
+        }
+        return result;
+    }
+
+    /// Assign a parameter, remembering its original value
+    template <typename T, typename Scalar>
+    void set_as(const std::string &name, const Parameter &param, const std::string &value) {
+        T *ptr = (T *) param.ptr;
+        if (m_original.count(name) == 0)
+            m_original[name] = [ptr, original = T(*ptr)]() { *ptr = original; };
+        *ptr = T(parse<Scalar>(name, value));
+    }
+
+    void set(const std::string &name, const Parameter &param, const std::string &value) {
+        const std::type_info &type = *param.type;
+
+#define SET_PARAM(T, Scalar)                                                                   \
+        if (type == typeid(T))                                                                 \
+            return set_as<T, Scalar>(name, param, value);
+
+        SET_PARAM(ScalarFloat, ScalarFloat);
+        SET_PARAM(ScalarInt32, ScalarInt32);
+        SET_PARAM(ScalarUInt32, ScalarUInt32);
+        SET_PARAM(ScalarColor3f, ScalarColor3f);
+        SET_PARAM(ScalarPoint2f, ScalarPoint2f);
+        SET_PARAM(ScalarPoint3f, ScalarPoint3f);
+        SET_PARAM(ScalarVector2f, ScalarVector2f);
+        SET_PARAM(ScalarVector3f, ScalarVector3f);
+        SET_PARAM(ScalarTransform4f, ScalarMatrix4f);
+
+        if constexpr (!std::is_same_v<Float, ScalarFloat>) {
+            SET_PARAM(Float, ScalarFloat);
+            SET_PARAM(Int32, ScalarInt32);
+            SET_PARAM(UInt32, ScalarUInt32);
+            SET_PARAM(Color3f, ScalarColor3f);
+            SET_PARAM(Point2f, ScalarPoint2f);
+            SET_PARAM(Point3f, ScalarPoint3f);
+            SET_PARAM(Vector2f, ScalarVector2f);
+            SET_PARAM(Vector3f, ScalarVector3f);
+        }
+
+#undef SET_PARAM
+
+        Throw("Parameter \"%s\" has a type that cannot be set from the command line!", name);
+    }
+
+    std::map<std::string, Parameter> m_parameters;
+    std::unordered_map<Object *, Node> m_hierarchy;
+    std::set<std::string> m_prefixes;
+    std::map<std::string, std::function<void()>> m_original;
+};
+
+template <typename Float, typename Spectrum>
+bool render(Object *scene_, const std::vector<size_t> &sensor_indices, filesystem::path filename,
+            const std::vector<SweepFrame> &frames, float checkpoint_interval, bool resume,
+            float preview_interval, size_t preview_passes) {
     auto *scene = dynamic_cast<Scene<Float, Spectrum> *>(scene_);
     if (!scene)
         Throw("Root element of the input file must be a <scene> tag!");
-    if (sensor_i >= scene->sensors().size())
-        Throw("Specified sensor index is out of bounds!");
-    auto sensor = scene->sensors()[sensor_i];
-    auto film = sensor->film();
 
+    // An empty list of indices selects all sensors
+    std::vector<Sensor<Float, Spectrum> *> sensors;
+    for (size_t i = 0; i < scene->sensors().size(); ++i)
+        sensors.push_back(scene->sensors()[i].get());
+    if (!sensor_indices.empty()) {
+        sensors.clear();
+        for (size_t sensor_i : sensor_indices) {
+            if (sensor_i >= scene->sensors().size())
+                Throw("Specified sensor index is out of bounds!");
+            sensors.push_back(scene->sensors()[sensor_i].get());
+        }
+    }
+    if (sensors.empty())
+        Throw("The scene does not contain any sensors!");
+
+    std::vector<ref<Film<Float, Spectrum>>> films;
+    for (auto *sensor : sensors)
+        films.push_back(sensor->film());
+
+    /* Write one image per sensor when rendering several of them, and one
+       image per frame of a parameter sweep */
+    auto set_destination_files = [&](size_t frame) {
+        for (size_t i = 0; i < sensors.size(); ++i) {
+            fs::path dest_file = filename;
+            dest_file.replace_extension("");
+            if (sensors.size() > 1)
+                dest_file = tfm::format("%s_%i", dest_file.string(),
+                                        sensor_indices.empty() ? i : sensor_indices[i]);
+            if (!frames.empty())
+                dest_file = tfm::format("%s_%04i", dest_file.string(), frame);
+            dest_file.replace_extension("exr");
+            films[i]->set_destination_file(dest_file);
+        }
+    };
     filename.replace_extension("exr");
-    film->set_destination_file(filename);
 
     auto integrator = scene->integrator();
     if (!integrator)
         Throw("No integrator specified for scene: %s", scene);
 
-    /* critical section */ {
-        std::lock_guard<std::mutex> guard(develop_callback_mutex);
-        develop_callback = [&]() { film->develop(); };
+    auto sampling_integrator =
+        dynamic_cast<SamplingIntegrator<Float, Spectrum> *>(integrator);
+
+    bool checkpoint = checkpoint_interval >= 0.f || resume,
+         preview    = preview_interval >= 0.f || preview_passes > 0;
+    if ((checkpoint || preview) && (sensors.size() > 1 || !frames.empty()))
+        Throw("Checkpoints and previews require rendering a single sensor and frame!");
+
+    if (checkpoint) {
+        if (!sampling_integrator)
+            Throw("Checkpoints are only supported by sampling integrators!");
+        fs::path checkpoint_file = filename;
+        checkpoint_file.replace_extension("ckpt");
+        sampling_integrator->set_checkpoint(checkpoint_file, std::max(checkpoint_interval, 0.f),
+                                            resume);
     }
-    bool success = integrator->render(scene, sensor.get());
-    /* critical section */ {
-        std::lock_guard<std::mutex> guard(develop_callback_mutex);
-        develop_callback = nullptr;
+
+    if (preview) {
+        if (!sampling_integrator)
+            Throw("Progressive previews are only supported by sampling integrators!");
+        fs::path preview_file = filename;
+        preview_file.replace_extension("preview.exr");
+        sampling_integrator->set_preview(preview_file, std::max(preview_interval, 0.f),
+                                         preview_passes);
+    }
+
+    // The scene is loaded once, frames only update the modified parameters
+    std::unique_ptr<SceneParameters<Float, Spectrum>> params;
+    if (!frames.empty())
+        params = std::make_unique<SceneParameters<Float, Spectrum>>(scene);
+
+    bool success = true;
+    for (size_t frame = 0; frame < std::max(frames.size(), (size_t) 1) && success; ++frame) {
+        if (params) {
+            Log(Info, "Rendering frame %i/%i ..", frame + 1, frames.size());
+            params->apply(frames[frame]);
+        }
+        set_destination_files(frame);
+
+        /* critical section */ {
+            std::lock_guard<std::mutex> guard(develop_callback_mutex);
+            develop_callback = [&]() {
+                for (auto &film : films)
+                    film->develop();
+            };
+        }
+        success = integrator->render_sensors(scene, sensors);
+        /* critical section */ {
+            std::lock_guard<std::mutex> guard(develop_callback_mutex);
+            develop_callback = nullptr;
+        }
+        if (success) {
+            for (auto &film : films)
+                film->develop();
+        } else {
+            Log(Warn, "\U0000274C Rendering failed, result not saved.");
+        }
     }
-    if (success)
-        film->develop();
-    else
-        Log(Warn, "\U0000274C Rendering failed, result not saved.");
     return success;
 }
 
@@ -142,6 +492,12 @@ int main(int argc, char *argv[]) {
     auto arg_help      = parser.add(StringVec{ "-h", "--help" });
     auto arg_mode      = parser.add(StringVec{ "-m", "--mode" }, true);
     auto arg_paths     = parser.add(StringVec{ "-a" }, true);
+    auto arg_checkpoint = parser.add(StringVec{ "-c", "--checkpoint" }, true);
+    auto arg_resume    = parser.add(StringVec{ "-r", "--resume" }, false);
+    // Must precede "--preview", which is a prefix of this argument
+    auto arg_preview_passes = parser.add(StringVec{ "--preview-passes" }, true);
+    auto arg_preview   = parser.add(StringVec{ "-p", "--preview" }, true);
+    auto arg_sweep     = parser.add(StringVec{ "--sweep" }, true);
     auto arg_extra     = parser.add("", true);
     bool print_profile = false;
     xml::ParameterList params;
@@ -187,7 +543,29 @@ int main(int argc, char *argv[]) {
         }
 #endif
 
-        size_t sensor_i  = (*arg_sensor_i ? arg_sensor_i->as_int() : 0);
+        // Indices of the sensors to render, an empty list stands for all of them
+        std::vector<size_t> sensor_indices = { 0 };
+        if (*arg_sensor_i) {
+            std::string value = arg_sensor_i->as_string();
+            sensor_indices.clear();
+            if (value != "all") {
+                for (const std::string &token : string::tokenize(value, ",")) {
+                    char *end_ptr = nullptr;
+                    unsigned long index = std::strtoul(token.c_str(), &end_ptr, 10);
+                    if (token.empty() || *end_ptr != '\0')
+                        Throw("-s/--sensor: expected an index, a comma-separated list "
+                              "of indices or \"all\"!");
+                    sensor_indices.push_back((size_t) index);
+                }
+            }
+        }
+        float checkpoint_interval = (*arg_checkpoint ? (float) arg_checkpoint->as_float() : -1.f);
+        bool resume = *arg_resume;
+        std::vector<SweepFrame> frames;
+        if (*arg_sweep)
+            frames = read_sweep_file(arg_sweep->as_string());
+        float preview_interval = (*arg_preview ? (float) arg_preview->as_float() : -1.f);
+        size_t preview_passes = (*arg_preview_passes ? arg_preview_passes->as_int() : 0);
 
         // Initialize Intel Thread Building Blocks with the requested number of threads
         if (*arg_threads)
@@ -242,7 +620,9 @@ int main(int argc, char *argv[]) {
                 xml::load_file(arg_extra->as_string(), mode, params, *arg_update);
 
             bool success = MTS_INVOKE_VARIANT(mode, render, parsed.get(),
-                                              sensor_i, filename);
+                                              sensor_indices, filename, frames,
+                                              checkpoint_interval, resume,
+                                              preview_interval, preview_passes);
             print_profile = print_profile || success;
             arg_extra = arg_extra->next();
         }
@@ -0,0 +1,202 @@
+#include <mitsuba/core/argparser.h>
+#include <mitsuba/core/bitmap.h>
+#include <mitsuba/core/filesystem.h>
+#include <mitsuba/core/fresolver.h>
+#include <mitsuba/core/jit.h>
+#include <mitsuba/core/logger.h>
+#include <mitsuba/core/texture_cache.h>
+#include <mitsuba/core/thread.h>
+#include <mitsuba/core/timer.h>
+#include <mitsuba/core/util.h>
+#include <mitsuba/render/scene.h>
+#include <tbb/task_scheduler_init.h>
+
+using namespace mitsuba;
+
+static void help(int thread_count) {
+    std::cout << util::info_build(thread_count) << std::endl;
+    std::cout << util::info_copyright() << std::endl;
+    std::cout << R"(
+Usage: mtstexconv [options] <One or more image files>
+
+Converts images (JPEG, PNG, OpenEXR, RGBE, TGA, or BMP) into linear, tiled
+MIP map pyramids that are ready for rendering. The conversion of "image.png"
+is written to "image.png.mtt", which the bitmap texture plugin automatically
+uses in place of the original file as long as it is up to date.
+
+Options:
+
+    -h, --help
+        Display this help text.
+
+    -v, --verbose
+        Be more verbose. (can be specified multiple times)
+
+    -t <count>, --threads <count>
+        Convert with the specified number of threads.
+
+    -o <filename>, --output <filename>
+        Write the converted image to the file "filename" (only
+        allowed when converting a single image).
+
+    -r, --raw
+        Don't linearize sRGB-encoded images. Textures must then be
+        loaded with the "raw" parameter set to true.
+
+    -w <mode>, --wrap-mode <mode>
+        Wrap mode of the textures using the images ("repeat",
+        "mirror", or "clamp"), which determines how the MIP map
+        pyramid is built. Default: repeat.
+
+    -s <size>, --tile-size <size>
+        Width and height of the tiles in pixels. Default: 64.
+
+    -f, --force
+        Convert images even if an up-to-date conversion exists.
+)";
+}
+
+int main(int argc, char *argv[]) {
+    Jit::static_initialization();
+    Class::static_initialization();
+    Thread::static_initialization();
+    Logger::static_initialization();
+    Bitmap::static_initialization();
+
+    // Ensure that the mitsuba-render shared library is loaded
+    librender_nop();
+
+    ArgParser parser;
+    using StringVec   = std::vector<std::string>;
+    auto arg_threads  = parser.add(StringVec{ "-t", "--threads" }, true);
+    auto arg_verbose  = parser.add(StringVec{ "-v", "--verbose" }, false);
+    auto arg_output   = parser.add(StringVec{ "-o", "--output" }, true);
+    auto arg_raw      = parser.add(StringVec{ "-r", "--raw" }, false);
+    auto arg_wrap     = parser.add(StringVec{ "-w", "--wrap-mode" }, true);
+    auto arg_tile     = parser.add(StringVec{ "-s", "--tile-size" }, true);
+    auto arg_force    = parser.add(StringVec{ "-f", "--force" }, false);
+    auto arg_help     = parser.add(StringVec{ "-h", "--help" });
+    auto arg_extra    = parser.add("", true);
+    std::string error_msg;
+
+    try {
+        // Parse all command line options
+        parser.parse(argc, argv);
+
+        if (*arg_verbose) {
+            auto logger = Thread::thread()->logger();
+            if (arg_verbose->next())
+                logger->set_log_level(Trace);
+            else
+                logger->set_log_level(Debug);
+        }
+
+        // Initialize Intel Thread Building Blocks with the requested number of threads
+        if (*arg_threads)
+            __global_thread_count = arg_threads->as_int();
+        if (__global_thread_count < 1)
+            Throw("Thread count must be >= 1!");
+        tbb::task_scheduler_init init((int) __global_thread_count);
+
+        // Append the mitsuba directory to the FileResolver search path list
+        ref<FileResolver> fr = Thread::thread()->file_resolver();
+        fs::path base_path = util::library_path().parent_path();
+        if (!fr->contains(base_path))
+            fr->append(base_path);
+
+        FilterBoundaryCondition bc = FilterBoundaryCondition::Repeat;
+        if (*arg_wrap) {
+            std::string wrap_mode = arg_wrap->as_string();
+            if (wrap_mode == "mirror")
+                bc = FilterBoundaryCondition::Mirror;
+            else if (wrap_mode == "clamp")
+                bc = FilterBoundaryCondition::Clamp;
+            else if (wrap_mode != "repeat")
+                Throw("Invalid wrap mode \"%s\", must be one of: \"repeat\", "
+                      "\"mirror\", or \"clamp\"!", wrap_mode);
+        }
+
+        int tile_size = *arg_tile ? arg_tile->as_int() : 64;
+        if (tile_size < 1)
+            Throw("Tile size must be >= 1!");
+
+        bool raw = *arg_raw, force = *arg_force;
+
+        if (*arg_output && arg_extra->next())
+            Throw("-o/--output: can only be used when converting a single image!");
+
+        if (!*arg_extra || *arg_help)
+            help((int) __global_thread_count);
+
+        while (arg_extra && *arg_extra) {
+            fs::path source = arg_extra->as_string();
+            fs::path target = *arg_output ? fs::path(arg_output->as_string())
+                                          : TiledImage::converted_path(source);
+
+            if (!force && TiledImage::is_tiled_image(target)) {
+                // Outdated, truncated or corrupt files are simply converted again
+                ref<TiledImage> image;
+                try {
+                    image = new TiledImage(target);
+                } catch (const std::exception &e) {
+                    Log(Warn, "Replacing unreadable file \"%s\": %s", target.string(), e.what());
+                }
+                if (image &&
+                    image->source_hash() == TiledImage::compute_source_hash(source, raw) &&
+                    image->boundary_condition() == bc &&
+                    image->tile_size() == (uint32_t) tile_size) {
+                    Log(Info, "\"%s\" is up to date.", target.string());
+                    arg_extra = arg_extra->next();
+                    continue;
+                }
+            }
+
+            Timer timer;
+            TiledImage::convert(source, target, raw, (uint32_t) tile_size, bc);
+            Log(Info, "Converted \"%s\" to \"%s\" (%s, took %s)", source.string(),
+                target.string(), util::mem_string(fs::file_size(target)),
+                util::time_string(timer.value()));
+
+            arg_extra = arg_extra->next();
+        }
+    } catch (const std::exception &e) {
+        error_msg = std::string("Caught a critical exception: ") + e.what();
+    } catch (...) {
+        error_msg = std::string("Caught a critical exception of unknown type!");
+    }
+
+    if (!error_msg.empty()) {
+        /* Strip zero-width spaces from the message (Mitsuba uses these
+           to properly format chains of multiple exceptions) */
+        const std::string zerowidth_space = "\xe2\x80\x8b";
+        while (true) {
+            auto it = error_msg.find(zerowidth_space);
+            if (it == std::string::npos)
+                break;
+            error_msg = error_msg.substr(0, it) + error_msg.substr(it + 3);
+        }
+
+#if defined(__WINDOWS__)
+        HANDLE console = GetStdHandle(STD_OUTPUT_HANDLE);
+        CONSOLE_SCREEN_BUFFER_INFO console_info;
+        GetConsoleScreenBufferInfo(console, &console_info);
+        SetConsoleTextAttribute(console, FOREGROUND_RED | FOREGROUND_INTENSITY);
+#else
+        std::cerr << "\x1b[31m";
+#endif
+        std::cerr << std::endl << error_msg << std::endl;
+#if defined(__WINDOWS__)
+        SetConsoleTextAttribute(console, console_info.wAttributes);
+#else
+        std::cerr << "\x1b[0m";
+#endif
+    }
+
+    TextureCache::static_shutdown();
+    Bitmap::static_shutdown();
+    Logger::static_shutdown();
+    Thread::static_shutdown();
+    Class::static_shutdown();
+    Jit::static_shutdown();
+    return error_msg.empty() ? 0 : -1;
+}
@@ -95,6 +95,13 @@ def write_bitmap(filename, data, resolution, write_async=True):
     """
     Write the linearized RGB image in `data` to a PNG/EXR/.. file with
     resolution `resolution`.
+
+    When `write_async` is set, the file is written by a background thread and
+    the function returns a `Bitmap.WriteFuture`, whose `wait()` method waits
+    for the write to complete and raises any error that occurred. At most
+    `Bitmap.write_queue_capacity()` images are queued: the function blocks
+    when the disk cannot keep up, so that memory usage remains bounded. Use
+    `Bitmap.flush_async_writes()` to wait for all pending writes.
     """
     import numpy as np
     from mitsuba.core import Bitmap, Struct
@@ -113,7 +120,7 @@ def write_bitmap(filename, data, resolution, write_async=True):
     quality = 0 if filename.endswith('png') else -1
 
     if write_async:
-        bitmap.write_async(filename, quality=quality)
+        return bitmap.write_async(filename, quality=quality)
     else:
         bitmap.write(filename, quality=quality)
 
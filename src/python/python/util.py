@@ -188,3 +188,52 @@ def traverse(node: 'mitsuba.core.Object') -> ParameterMap:
     node.traverse(cb)
 
     return ParameterMap(cb.properties, cb.hierarchy)
+
+
+def render_sweep(scene, frames, filename, sensor=0, integrator=None) -> bool:
+    """
+    Render a parameter sweep or animation from a single loaded scene.
+
+    Each entry of ``frames`` is a dictionary that maps parameter names (as
+    returned by :py:func:`mitsuba.python.util.traverse()`) to their values in
+    that frame. Every frame starts from the original scene: parameters
+    overridden by a previous frame are restored unless the current frame
+    overrides them again. Only the modified objects are updated, hence the
+    scene keeps its acceleration data structure unless shapes are deformed.
+
+    ``filename`` is a format string that receives the frame index (e.g.
+    ``'frame_{:04d}.exr'``), ``sensor`` is a sensor or the index of one of the
+    scene's sensors. The scene's integrator is used unless another one is
+    provided. The original parameter values are restored once all frames
+    are done. Returns ``False`` if rendering failed or was interrupted.
+    """
+    params = traverse(scene)
+    if integrator is None:
+        integrator = scene.integrator()
+    if isinstance(sensor, int):
+        sensor = scene.sensors()[sensor]
+    film = sensor.film()
+
+    original = {}
+    success = True
+    for i, frame in enumerate(frames):
+        for key in [k for k in original if k not in frame]:
+            params[key] = original.pop(key)
+        for key, value in frame.items():
+            if key not in original:
+                # Parameters are references, keep a copy of the original value
+                original[key] = type(params[key])(params[key])
+            params[key] = value
+        params.update()
+
+        success = integrator.render(scene, sensor)
+        if not success:
+            break
+        film.set_destination_file(filename.format(i))
+        film.develop()
+
+    for key, value in original.items():
+        params[key] = value
+    params.update()
+
+    return success
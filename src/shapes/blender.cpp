@@ -63,7 +63,7 @@ class BlenderMesh final : public Mesh<Float, Spectrum> {
 public:
     MTS_IMPORT_BASE(Mesh, m_name, m_bbox, m_to_world, m_vertex_count, m_face_count,
                     m_vertex_positions_buf, m_vertex_normals_buf, m_vertex_texcoords_buf,
-                    m_faces_buf, add_attribute, set_children)
+                    m_faces_buf, add_attribute, m_compress, m_lod_auto, compress, set_children)
     MTS_IMPORT_TYPES()
 
     using typename Base::MeshAttributeType;
@@ -317,6 +317,9 @@ public:
         if constexpr (is_cuda_array_v<Float>)
             cuda_sync();
 
+        if (m_compress && !m_lod_auto)
+            compress();
+
         set_children();
     }
 
@@ -91,6 +91,12 @@ public:
         return result;
     }
 
+    void parameters_changed(const std::vector<std::string> &keys = {}) override {
+        // Moving an instance only requires the scene to rebuild its top-level BVH
+        m_to_object = m_to_world.inverse();
+        Base::parameters_changed(keys);
+    }
+
     ScalarSize primitive_count() const override { return 1; }
 
     ScalarSize effective_primitive_count() const override {
@@ -0,0 +1,238 @@
+#include <mitsuba/render/mesh.h>
+#include <mitsuba/core/fresolver.h>
+#include <mitsuba/core/mmap.h>
+#include <mitsuba/core/properties.h>
+#include <mitsuba/core/timer.h>
+#include <mitsuba/core/util.h>
+
+NAMESPACE_BEGIN(mitsuba)
+
+/**!
+
+.. _shape-mmesh:
+
+Memory-mapped binary mesh loader (:monosp:`mmesh`)
+--------------------------------------------------
+
+.. pluginparameters::
+
+ * - filename
+   - |string|
+   - Filename of the mesh file that should be loaded
+ * - face_normals
+   - |bool|
+   - When set to |true|, any existing or computed vertex normals are
+     discarded and *face normals* will instead be used during rendering.
+     This gives the rendered object a faceted appearance. (Default: |false|)
+ * - compress
+   - |bool|
+   - When set to |true|, the mesh is converted to a compact read-only
+     representation after loading (see the :ref:`ply <shape-ply>` plugin).
+     (Default: |false|)
+ * - lod_face_count, lod_auto, lod_cache_dir
+   - |int|, |bool|, |string|
+   - Level of detail parameters (see the :ref:`ply <shape-ply>` plugin). The
+     LOD cache directory is not used by this plugin.
+ * - to_world
+   - |transform|
+   - Specifies an optional linear object-to-world transformation.
+     (Default: none, i.e. object space = world space)
+
+This plugin loads meshes stored in Mitsuba's native binary mesh format, which
+can be created from any other mesh using ``Mesh.write_mmesh()``:
+
+.. code-block:: python
+
+    mesh = load_string('<shape type="ply" version="2.0.0">'
+                       '<string name="filename" value="bunny.ply"/></shape>')
+    mesh.write_mmesh('bunny.mmesh')
+
+The format stores vertex positions, normals, texture coordinates, face indices
+and custom mesh attributes exactly as they are laid out in memory. Instead of
+parsing the file, the plugin maps it into memory and lets the mesh buffers
+refer to the mapped pages directly, so loading a mesh that already resides in
+the operating system's page cache is nearly instantaneous, and several
+processes rendering the same mesh share its physical memory.
+
+The mapping uses copy-on-write semantics: pages that get modified (e.g. when
+applying a :monosp:`to_world` transformation, or when editing the mesh through
+the Python API) are privately copied and the file itself is never modified.
+Transformations should therefore preferably be baked into the file when the
+mesh is shared between many jobs. The CUDA variants copy the data to the GPU.
+
+Files are written using the byte order of the current machine and can only be
+loaded on machines with the same byte order.
+ */
+
+template <typename Float, typename Spectrum>
+class MMeshMesh final : public Mesh<Float, Spectrum> {
+public:
+    MTS_IMPORT_BASE(Mesh, m_name, m_bbox, m_to_world, m_vertex_count, m_face_count,
+                    m_vertex_positions_buf, m_vertex_normals_buf, m_vertex_texcoords_buf,
+                    m_faces_buf, add_attribute, m_disable_vertex_normals,
+                    recompute_vertex_normals, m_compress, m_lod_auto, compress, apply_lod,
+                    m_lod_face_count, set_children)
+    MTS_IMPORT_TYPES()
+
+    using typename Base::ScalarSize;
+    using typename Base::ScalarIndex;
+    using typename Base::InputFloat;
+    using typename Base::InputPoint3f;
+    using typename Base::InputNormal3f;
+    using typename Base::FloatStorage;
+    using typename Base::MMeshHeader;
+    using typename Base::MMeshAttribute;
+    using Base::MMeshVersion;
+    using Base::MMeshByteOrder;
+    using Base::MMeshAlignment;
+
+    MMeshMesh(const Properties &props) : Base(props) {
+        auto fs = Thread::thread()->file_resolver();
+        fs::path file_path = fs->resolve(props.string("filename"));
+        m_name = file_path.filename().string();
+
+        auto fail = [&](const char *descr) {
+            Throw("Error while loading mesh file \"%s\": %s!", m_name, descr);
+        };
+
+        Log(Debug, "Loading mesh from \"%s\" ..", m_name);
+        if (!fs::exists(file_path))
+            fail("file not found");
+
+        Timer timer;
+        m_mmap = MemoryMappedFile::map_private(file_path);
+        uint8_t *data = (uint8_t *) m_mmap->data();
+
+        if (m_mmap->size() < sizeof(MMeshHeader))
+            fail("file is too small");
+
+        MMeshHeader header;
+        memcpy(&header, data, sizeof(MMeshHeader));
+        if (memcmp(header.magic, "MTSMESH", 8) != 0)
+            fail("invalid file header");
+        if (header.byte_order != MMeshByteOrder)
+            fail("file was written on a machine with a different byte order");
+        if (header.version != MMeshVersion)
+            fail("unsupported file format version");
+        if (header.vertex_count > std::numeric_limits<ScalarSize>::max() ||
+            header.face_count > std::numeric_limits<ScalarSize>::max())
+            fail("mesh is too large");
+        if (header.positions_offset == 0 || header.faces_offset == 0)
+            fail("vertex positions or face indices are missing");
+
+        m_vertex_count = (ScalarSize) header.vertex_count;
+        m_face_count = (ScalarSize) header.face_count;
+
+        if (m_to_world != ScalarTransform4f()) {
+            /* Transforming the vertices touches all pages of the mapping,
+               which turns them into private copies */
+            InputFloat *position_ptr = section<InputFloat>(header.positions_offset, m_vertex_count * 3),
+                       *normal_ptr   = nullptr;
+            if (header.normals_offset != 0 && !m_disable_vertex_normals)
+                normal_ptr = section<InputFloat>(header.normals_offset, m_vertex_count * 3);
+
+            m_bbox.reset();
+            for (ScalarSize i = 0; i < m_vertex_count; ++i) {
+                InputPoint3f p = m_to_world.transform_affine(
+                    load_unaligned<InputPoint3f>(position_ptr + 3 * i));
+                store_unaligned(position_ptr + 3 * i, p);
+                m_bbox.expand(p);
+
+                if (normal_ptr) {
+                    InputNormal3f n = normalize(m_to_world.transform_affine(
+                        load_unaligned<InputNormal3f>(normal_ptr + 3 * i)));
+                    store_unaligned(normal_ptr + 3 * i, n);
+                }
+            }
+        } else {
+            m_bbox = ScalarBoundingBox3f(
+                ScalarPoint3f(header.bbox_min[0], header.bbox_min[1], header.bbox_min[2]),
+                ScalarPoint3f(header.bbox_max[0], header.bbox_max[1], header.bbox_max[2]));
+        }
+
+        m_vertex_positions_buf = map_buffer<FloatStorage>(header.positions_offset, m_vertex_count * 3);
+        m_faces_buf = map_buffer<DynamicBuffer<UInt32>>(header.faces_offset, m_face_count * 3);
+
+        bool has_vertex_normals = header.normals_offset != 0;
+        if (!m_disable_vertex_normals) {
+            if (has_vertex_normals)
+                m_vertex_normals_buf = map_buffer<FloatStorage>(header.normals_offset, m_vertex_count * 3);
+            else
+                m_vertex_normals_buf = zero<FloatStorage>(m_vertex_count * 3);
+        }
+
+        if (header.texcoords_offset != 0)
+            m_vertex_texcoords_buf = map_buffer<FloatStorage>(header.texcoords_offset, m_vertex_count * 2);
+
+        if (sizeof(MMeshHeader) + header.attribute_count * sizeof(MMeshAttribute) > m_mmap->size())
+            fail("truncated attribute records");
+
+        for (uint32_t i = 0; i < header.attribute_count; ++i) {
+            MMeshAttribute record;
+            memcpy(&record, data + sizeof(MMeshHeader) + i * sizeof(MMeshAttribute),
+                   sizeof(MMeshAttribute));
+            if (record.name[sizeof(record.name) - 1] != '\0')
+                fail("invalid attribute name");
+
+            size_t count = record.type == 0 ? m_vertex_count : m_face_count;
+            add_attribute(record.name, record.size,
+                          map_buffer<FloatStorage>(record.offset, count * record.size));
+        }
+
+        if constexpr (is_cuda_array_v<Float>) {
+            // The data now resides on the GPU, release the mapping
+            m_mmap = nullptr;
+            cuda_sync();
+        }
+
+        Log(Debug, "\"%s\": mapped %i faces, %i vertices (%s in %s)",
+            m_name, m_face_count, m_vertex_count,
+            util::mem_string(m_face_count * Base::face_data_bytes() +
+                             m_vertex_count * Base::vertex_data_bytes()),
+            util::time_string(timer.value())
+        );
+
+        if (!m_disable_vertex_normals && !has_vertex_normals) {
+            Timer timer2;
+            recompute_vertex_normals();
+            Log(Debug, "\"%s\": computed vertex normals (took %s)", m_name,
+                util::time_string(timer2.value()));
+        }
+
+        apply_lod(m_lod_face_count);
+
+        if (m_compress && !m_lod_auto)
+            compress();
+
+        set_children();
+    }
+
+    MTS_DECLARE_CLASS()
+
+private:
+    /// Return a pointer to an array of \c count values within the mapped file
+    template <typename Value> Value *section(uint64_t offset, size_t count) const {
+        uint64_t size = (count * sizeof(Value) + MMeshAlignment - 1) /
+                        MMeshAlignment * MMeshAlignment;
+        if (offset % MMeshAlignment != 0 || offset + size > m_mmap->size())
+            Throw("Error while loading mesh file \"%s\": truncated or corrupt file!", m_name);
+        return (Value *) ((uint8_t *) m_mmap->data() + offset);
+    }
+
+    /// Create a buffer that refers to an array within the mapped file
+    template <typename Buffer> Buffer map_buffer(uint64_t offset, size_t count) const {
+        auto *ptr = section<scalar_t<Buffer>>(offset, count);
+        if constexpr (is_dynamic_v<Float>)
+            return Buffer::copy(ptr, count);
+        else
+            return Buffer::map(ptr, count);
+    }
+
+private:
+    /// Copy-on-write mapping of the mesh file backing the mesh buffers
+    ref<MemoryMappedFile> m_mmap;
+};
+
+MTS_IMPLEMENT_CLASS_VARIANT(MMeshMesh, Mesh)
+MTS_EXPORT_PLUGIN(MMeshMesh, "Memory-mapped binary mesh")
+NAMESPACE_END(mitsuba)
@@ -4,6 +4,9 @@
 #include <mitsuba/core/mmap.h>
 #include <mitsuba/core/util.h>
 #include <mitsuba/core/timer.h>
+#include <mitsuba/core/hash.h>
+#include <tbb/concurrent_hash_map.h>
+#include <tbb/parallel_for.h>
 
 NAMESPACE_BEGIN(mitsuba)
 
@@ -27,6 +30,29 @@ Wavefront OBJ mesh loader (:monosp:`obj`)
  * - flip_tex_coords
    - |bool|
    - Treat the vertical component of the texture as inverted? Most OBJ files use this convention. (Default: |true|)
+ * - compress
+   - |bool|
+   - When set to |true|, the mesh is converted to a compact read-only
+     representation after loading: positions are quantized relative to the
+     bounding box, normals and texture coordinates use 16 bit encodings, and
+     face indices are delta-compressed. This roughly halves the memory usage
+     at a small cost in ray tracing performance. Only supported by the scalar
+     and packet variants without Embree. (Default: |false|)
+ * - lod_face_count
+   - |int|
+   - When set to a positive value, the mesh is simplified to (at most) this
+     number of triangles after loading, using edge collapses driven by a
+     quadric error metric. (Default: 0, i.e. disabled)
+ * - lod_auto
+   - |bool|
+   - When set to |true|, the scene chooses the number of triangles based on
+     the projected size of the mesh as seen by the sensor (see the
+     :ref:`ply <shape-ply>` plugin). Not supported by meshes within a
+     :ref:`shapegroup <shape-shapegroup>`. (Default: |false|)
+ * - lod_cache_dir
+   - |string|
+   - Directory where simplified meshes are stored, so that subsequent runs
+     neither load the full mesh nor simplify it again. (Default: none)
  * - to_world
    - |transform|
    - Specifies an optional linear object-to-world transformation.
@@ -34,7 +60,8 @@ Wavefront OBJ mesh loader (:monosp:`obj`)
 
 This plugin implements a simple loader for Wavefront OBJ files. It handles
 meshes containing triangles and quadrilaterals, and it also imports vertex normals
-and texture coordinates.
+and texture coordinates. Large files are split into chunks that are parsed in
+parallel.
 
 Loading an ordinary OBJ file is as simple as writing:
 
@@ -54,30 +81,14 @@ Loading an ordinary OBJ file is as simple as writing:
 
  */
 
-template <bool Negate, size_t N>
-void advance(const char **start_, const char *end, const char (&delim)[N]) {
-    const char *start = *start_;
-
-    while (true) {
-        bool is_delim = false;
-        for (size_t i = 0; i < N; ++i)
-            if (*start == delim[i])
-                is_delim = true;
-        if ((is_delim ^ Negate) || start == end)
-            break;
-        ++start;
-    }
-
-    *start_ = start;
-}
-
 template <typename Float, typename Spectrum>
 class OBJMesh final : public Mesh<Float, Spectrum> {
 public:
     MTS_IMPORT_BASE(Mesh, m_name, m_bbox, m_to_world, m_vertex_count, m_face_count,
                     m_vertex_positions_buf, m_vertex_normals_buf, m_vertex_texcoords_buf,
                     m_faces_buf, m_disable_vertex_normals, recompute_vertex_normals,
-                    has_vertex_normals, set_children)
+                    has_vertex_normals, m_compress, m_lod_auto, compress, cache_key,
+                    load_from_cache, store_in_cache, apply_lod, m_lod_face_count, set_children)
     MTS_IMPORT_TYPES()
 
     using typename Base::ScalarSize;
@@ -89,20 +100,20 @@ public:
     using typename Base::InputNormal3f;
     using typename Base::FloatStorage;
 
-    InputFloat strtof(const char *nptr, char **endptr) {
-            return std::strtof(nptr, endptr);
-    }
+    using ScalarIndex3 = std::array<ScalarIndex, 3>;
+
+    /// Size of the line-aligned chunks of the file that are parsed in parallel
+    static constexpr size_t chunk_size = 4 * 1024 * 1024;
 
     OBJMesh(const Properties &props) : Base(props) {
         /* Causes all texture coordinates to be vertically flipped.
            Enabled by default, for consistence with the Mitsuba 1 behavior. */
-        bool flip_tex_coords = props.bool_("flip_tex_coords", true);
+        m_flip_tex_coords = props.bool_("flip_tex_coords", true);
 
         auto fs = Thread::thread()->file_resolver();
         fs::path file_path = fs->resolve(props.string("filename"));
         m_name = file_path.filename().string();
 
-
         auto fail = [&](const char *descr, auto... args) {
             Throw(("Error while loading OBJ file \"%s\": " + std::string(descr))
                       .c_str(), m_name, args...);
@@ -112,178 +123,115 @@ public:
         if (!fs::exists(file_path))
             fail("file not found");
 
+        std::string key = cache_key(file_path, tfm::format("flip_tex_coords=%i", m_flip_tex_coords));
+        if (load_from_cache(key)) {
+            apply_lod(m_lod_face_count);
+            if (m_compress && !m_lod_auto)
+                compress();
+            set_children();
+            return;
+        }
+
         ref<MemoryMappedFile> mmap = new MemoryMappedFile(file_path);
+        Timer timer, phase_timer;
 
-        using ScalarIndex3 = std::array<ScalarIndex, 3>;
+        const char *text = (const char *) mmap->data();
+        size_t size = mmap->size();
 
-        struct VertexBinding {
-            ScalarIndex3 key {{ 0, 0, 0 }};
-            ScalarIndex value { 0 };
-            VertexBinding *next { nullptr };
-        };
+        // Split the file into chunks that begin at the start of a line
+        std::vector<size_t> offsets = { 0 };
+        while (offsets.back() < size) {
+            size_t pos = std::min(offsets.back() + chunk_size, size);
+            const char *eol = (const char *) memchr(text + pos, '\n', size - pos);
+            offsets.push_back(eol ? (size_t) (eol - text) + 1 : size);
+        }
+        std::vector<Chunk> chunks(offsets.size() - 1);
+
+        tbb::parallel_for(size_t(0), chunks.size(), [&](size_t i) {
+            parse_chunk(text + offsets[i], text + offsets[i + 1], chunks[i]);
+        });
 
-        /// Temporary buffers for vertices, normals, and texture coordinates
-        std::vector<InputVector3f> vertices;
+        /* Concatenate the vertex data of all chunks, and determine the global
+           index of the first triangle corner of every chunk */
+        std::vector<InputPoint3f> vertices;
         std::vector<InputNormal3f> normals;
         std::vector<InputVector2f> texcoords;
-        std::vector<ScalarIndex3> triangles;
-        std::vector<VertexBinding> vertex_map;
-
-        size_t vertex_guess = mmap->size() / 100;
-        vertices.reserve(vertex_guess);
-        normals.reserve(vertex_guess);
-        texcoords.reserve(vertex_guess);
-        triangles.reserve(vertex_guess * 2);
-        vertex_map.resize(vertex_guess);
-
-        ScalarIndex vertex_ctr = 0;
-
-        const char *ptr = (const char *) mmap->data();
-        const char *eof = ptr + mmap->size();
-        char buf[1025];
-        Timer timer;
-
-        while (ptr < eof) {
-            // Determine the offset of the next newline
-            const char *next = ptr;
-            advance<false>(&next, eof, "\n");
-
-            // Copy buf into a 0-terminated buffer
-            size_t size = next - ptr;
-            if (size >= sizeof(buf) - 1)
-                fail("file contains an excessively long line! (%i characters)", size);
-            memcpy(buf, ptr, size);
-            buf[size] = '\0';
-
-            // Skip whitespace
-            const char *cur = buf, *eol = buf + size;
-            advance<true>(&cur, eol, " \t\r");
-
-            bool parse_error = false;
-            if (cur[0] == 'v' && (cur[1] == ' ' || cur[1] == '\t')) {
-                // Vertex position
-                InputPoint3f p;
-                cur += 2;
-                for (size_t i = 0; i < 3; ++i) {
-                    const char *orig = cur;
-                    p[i] = strtof(cur, (char **) &cur);
-                    parse_error |= cur == orig;
-                }
-                p = m_to_world.transform_affine(p);
-                if (unlikely(!all(enoki::isfinite(p))))
-                    fail("mesh contains invalid vertex position data");
-                m_bbox.expand(p);
-                vertices.push_back(p);
-            } else if (cur[0] == 'v' && cur[1] == 'n' && (cur[2] == ' ' || cur[2] == '\t')) {
-                // Vertex normal
-                InputNormal3f n;
-                cur += 3;
-                for (size_t i = 0; i < 3; ++i) {
-                    const char *orig = cur;
-                    n[i] = strtof(cur, (char **) &cur);
-                    parse_error |= cur == orig;
-                }
-                n = normalize(m_to_world.transform_affine(n));
-                if (unlikely(!all(enoki::isfinite(n))))
-                    fail("mesh contains invalid vertex normal data");
-                normals.push_back(n);
-            } else if (cur[0] == 'v' && cur[1] == 't' && (cur[2] == ' ' || cur[2] == '\t')) {
-                // Texture coordinate
-                InputVector2f uv;
-                cur += 3;
-                for (size_t i = 0; i < 2; ++i) {
-                    const char *orig = cur;
-                    uv[i] = strtof(cur, (char **) &cur);
-                    parse_error |= cur == orig;
-                }
-                if (flip_tex_coords)
-                    uv.y() = 1.f - uv.y();
-
-                texcoords.push_back(uv);
-            } else if (cur[0] == 'f' && (cur[1] == ' ' || cur[1] == '\t')) {
-                // Face specification
-                cur += 2;
-                size_t vertex_index = 0;
-                size_t type_index = 0;
-                ScalarIndex3 key {{ (ScalarIndex) 0, (ScalarIndex) 0, (ScalarIndex) 0 }};
-                ScalarIndex3 tri;
-
-                while (true) {
-                    const char *next2;
-                    ScalarIndex value = (ScalarIndex) strtoul(cur, (char **) &next2, 10);
-                    if (cur == next2)
-                        break;
-
-                    if (type_index < 3) {
-                        key[type_index] = value;
-                    } else {
-                        parse_error = true;
-                        break;
-                    }
-
-                    while (*next2 == '/') {
-                        type_index++;
-                        next2++;
-                    }
-
-                    if (*next2 == ' ' || *next2 == '\t' || *next2 == '\0' || *next2 == '\r') {
-                        type_index = 0;
-                        size_t map_index = key[0] - 1;
-
-                        if (unlikely(map_index >= vertices.size()))
-                            fail("reference to invalid vertex %i!", key[0]);
-                        if (unlikely(vertex_map.size() < vertices.size()))
-                            vertex_map.resize(vertices.size());
-
-                        // Hash table lookup
-                        VertexBinding *entry = &vertex_map[map_index];
-                        while (entry->key != key && entry->next != nullptr)
-                            entry = entry->next;
-
-                        ScalarIndex id;
-                        if (entry->key == key) {
-                            // Hit
-                            id = entry->value;
-                        } else {
-                            // Miss
-                            if (entry->key != ScalarIndex3{{0, 0, 0}}) {
-                                entry->next = new VertexBinding();
-                                entry = entry->next;
-                            }
-                            entry->key = key;
-                            id = entry->value = vertex_ctr++;
-                        }
-
-                        if (vertex_index < 3) {
-                            tri[vertex_index] = id;
-                        } else {
-                            tri[1] = tri[2];
-                            tri[2] = id;
-                        }
-                        vertex_index++;
-
-                        if (vertex_index >= 3)
-                            triangles.push_back(tri);
-                    }
+        size_t corner_count = 0;
+
+        for (Chunk &chunk : chunks) {
+            chunk.vertex_offset   = vertices.size();
+            chunk.normal_offset   = normals.size();
+            chunk.texcoord_offset = texcoords.size();
+            chunk.corner_offset   = corner_count;
+            vertices.resize(vertices.size() + chunk.vertices.size());
+            normals.resize(normals.size() + chunk.normals.size());
+            texcoords.resize(texcoords.size() + chunk.texcoords.size());
+            corner_count += chunk.corners.size();
+            m_bbox.expand(chunk.bbox);
+        }
 
-                    cur = next2;
-                }
+        if (corner_count / 3 > (size_t) std::numeric_limits<ScalarSize>::max())
+            fail("mesh is too large");
+
+        tbb::parallel_for(size_t(0), chunks.size(), [&](size_t i) {
+            Chunk &chunk = chunks[i];
+            std::copy(chunk.vertices.begin(), chunk.vertices.end(),
+                      vertices.begin() + chunk.vertex_offset);
+            std::copy(chunk.normals.begin(), chunk.normals.end(),
+                      normals.begin() + chunk.normal_offset);
+            std::copy(chunk.texcoords.begin(), chunk.texcoords.end(),
+                      texcoords.begin() + chunk.texcoord_offset);
+            std::vector<InputPoint3f>().swap(chunk.vertices);
+            std::vector<InputNormal3f>().swap(chunk.normals);
+            std::vector<InputVector2f>().swap(chunk.texcoords);
+        });
+
+        std::string phases = "parsing: " + util::time_string((float) phase_timer.reset());
+
+        /* Deduplicate the v/vt/vn triples referenced by the faces. The hash
+           table maps every triple to the first triangle corner referencing it,
+           which makes the resulting vertex order independent of the
+           scheduling of the parallel insertions: vertices are numbered in the
+           order of their first reference, like a sequential parser would. */
+        VertexMap vertex_map(vertices.size());
+        tbb::parallel_for(size_t(0), chunks.size(), [&](size_t i) {
+            const Chunk &chunk = chunks[i];
+            for (size_t j = 0; j < chunk.corners.size(); ++j) {
+                typename VertexMap::accessor acc;
+                size_t corner = chunk.corner_offset + j;
+                if (vertex_map.insert(acc, chunk.corners[j]) || corner < acc->second)
+                    acc->second = corner;
+            }
+        });
+
+        // Find the first reference of every triple, and count them per chunk
+        std::vector<size_t> first_corner(corner_count);
+        tbb::parallel_for(size_t(0), chunks.size(), [&](size_t i) {
+            Chunk &chunk = chunks[i];
+            for (size_t j = 0; j < chunk.corners.size(); ++j) {
+                typename VertexMap::const_accessor acc;
+                vertex_map.find(acc, chunk.corners[j]);
+                size_t corner = chunk.corner_offset + j;
+                first_corner[corner] = acc->second;
+                if (acc->second == corner)
+                    chunk.unique_count++;
             }
+        });
+        vertex_map.clear();
 
-            if (unlikely(parse_error))
-                fail("could not parse line \"%s\"", buf);
-            ptr = next + 1;
+        m_vertex_count = 0;
+        for (Chunk &chunk : chunks) {
+            chunk.unique_offset = m_vertex_count;
+            m_vertex_count += (ScalarSize) chunk.unique_count;
         }
+        m_face_count = (ScalarSize) (corner_count / 3);
 
-        m_vertex_count = vertex_ctr;
-        m_face_count = (ScalarSize) triangles.size();
-
-        m_faces_buf = DynamicBuffer<UInt32>::copy(triangles.data(), m_face_count * 3);
+        m_faces_buf = empty<DynamicBuffer<UInt32>>(m_face_count * 3);
         m_vertex_positions_buf = empty<FloatStorage>(m_vertex_count * 3);
         if (!m_disable_vertex_normals)
-            m_vertex_normals_buf = empty<FloatStorage>(m_vertex_count * 3);
+            m_vertex_normals_buf = zero<FloatStorage>(m_vertex_count * 3);
         if (!texcoords.empty())
-            m_vertex_texcoords_buf = empty<FloatStorage>(m_vertex_count * 2);
+            m_vertex_texcoords_buf = zero<FloatStorage>(m_vertex_count * 2);
 
         // TODO this is needed for the bbox(..) methods, but is it slower?
         m_faces_buf.managed();
@@ -294,34 +242,55 @@ public:
         if constexpr (is_cuda_array_v<Float>)
             cuda_sync();
 
-        for (const auto& v_ : vertex_map) {
-            const VertexBinding *v = &v_;
+        // Number the vertices and fetch their data
+        std::vector<ScalarIndex> vertex_id(corner_count);
+        tbb::parallel_for(size_t(0), chunks.size(), [&](size_t i) {
+            const Chunk &chunk = chunks[i];
+            ScalarIndex id = (ScalarIndex) chunk.unique_offset;
 
-            while (v && v->key != ScalarIndex3{{0, 0, 0}}) {
-                InputFloat* position_ptr   = m_vertex_positions_buf.data() + v->value * 3;
-                InputFloat* normal_ptr   = m_vertex_normals_buf.data() + v->value * 3;
-                InputFloat* texcoord_ptr = m_vertex_texcoords_buf.data() + v->value * 2;
-                auto key = v->key;
+            for (size_t j = 0; j < chunk.corners.size(); ++j) {
+                size_t corner = chunk.corner_offset + j;
+                if (first_corner[corner] != corner)
+                    continue;
 
-                store_unaligned(position_ptr, vertices[key[0] - 1]);
+                const ScalarIndex3 &key = chunk.corners[j];
+                InputFloat* position_ptr = m_vertex_positions_buf.data() + id * 3;
+                InputFloat* normal_ptr   = m_vertex_normals_buf.data() + id * 3;
+                InputFloat* texcoord_ptr = m_vertex_texcoords_buf.data() + id * 2;
+
+                size_t map_index = key[0] - 1;
+                if (unlikely(map_index >= vertices.size()))
+                    fail("reference to invalid vertex %i!", key[0]);
+                store_unaligned(position_ptr, vertices[map_index]);
 
                 if (key[1]) {
-                    size_t map_index = key[1] - 1;
+                    map_index = key[1] - 1;
                     if (unlikely(map_index >= texcoords.size()))
                         fail("reference to invalid texture coordinate %i!", key[1]);
                     store_unaligned(texcoord_ptr, texcoords[map_index]);
                 }
 
                 if (!m_disable_vertex_normals && key[2]) {
-                    size_t map_index = key[2] - 1;
+                    map_index = key[2] - 1;
                     if (unlikely(map_index >= normals.size()))
                         fail("reference to invalid normal %i!", key[2]);
-                    store_unaligned(normal_ptr, normals[key[2] - 1]);
+                    store_unaligned(normal_ptr, normals[map_index]);
                 }
 
-                v = v->next;
+                vertex_id[corner] = id++;
             }
-        }
+        });
+
+        ScalarIndex *face_ptr = m_faces_buf.data();
+        tbb::parallel_for(
+            tbb::blocked_range<size_t>(0, corner_count, 1 << 16),
+            [&](const tbb::blocked_range<size_t> &range) {
+                for (size_t i = range.begin(); i != range.end(); ++i)
+                    face_ptr[i] = vertex_id[first_corner[i]];
+            }
+        );
+
+        phases += ", deduplication: " + util::time_string((float) phase_timer.reset());
 
         size_t vertex_data_bytes = 3 * sizeof(InputFloat);
         if (has_vertex_normals())
@@ -329,11 +298,11 @@ public:
         if (!texcoords.empty())
             vertex_data_bytes += 2 * sizeof(InputFloat);
 
-        Log(Debug, "\"%s\": read %i faces, %i vertices (%s in %s)",
+        Log(Debug, "\"%s\": read %i faces, %i vertices (%s in %s; %s)",
             m_name, m_face_count, m_vertex_count,
             util::mem_string(m_face_count * 3 * sizeof(ScalarIndex) +
                              m_vertex_count * vertex_data_bytes),
-            util::time_string(timer.value())
+            util::time_string(timer.value()), phases
         );
 
         if (!m_disable_vertex_normals && normals.empty()) {
@@ -343,10 +312,256 @@ public:
                 util::time_string(timer2.value()));
         }
 
+        store_in_cache(key);
+        apply_lod(m_lod_face_count);
+
+        if (m_compress && !m_lod_auto)
+            compress();
+
         set_children();
     }
 
     MTS_DECLARE_CLASS()
+
+private:
+    /// Geometry parsed from one chunk of the file
+    struct Chunk {
+        std::vector<InputPoint3f> vertices;
+        std::vector<InputNormal3f> normals;
+        std::vector<InputVector2f> texcoords;
+        /// v/vt/vn triples of the triangle corners (three per triangle)
+        std::vector<ScalarIndex3> corners;
+        ScalarBoundingBox3f bbox;
+
+        size_t vertex_offset = 0, normal_offset = 0, texcoord_offset = 0;
+        size_t corner_offset = 0, unique_count = 0, unique_offset = 0;
+    };
+
+    struct VertexKeyHashCompare {
+        static size_t hash(const ScalarIndex3 &key) {
+            return hash_combine(hash_combine(mitsuba::hash(key[0]), mitsuba::hash(key[1])),
+                                mitsuba::hash(key[2]));
+        }
+        static bool equal(const ScalarIndex3 &k1, const ScalarIndex3 &k2) {
+            return k1 == k2;
+        }
+    };
+
+    /// Maps v/vt/vn triples to the index of the first triangle corner referencing them
+    using VertexMap = tbb::concurrent_hash_map<ScalarIndex3, size_t, VertexKeyHashCompare>;
+
+    /// Parse the lines in the range [ptr, end)
+    void parse_chunk(const char *ptr, const char *end, Chunk &chunk) const {
+        size_t reserve = (end - ptr) / 40;
+        chunk.vertices.reserve(reserve);
+        chunk.corners.reserve(reserve * 3);
+
+        while (ptr < end) {
+            const char *eol = (const char *) memchr(ptr, '\n', end - ptr);
+            if (!eol)
+                eol = end;
+
+            const char *cur = skip_whitespace(ptr, eol);
+            bool parse_error = false;
+
+            if (cur == eol) {
+                // Empty line
+            } else if (cur[0] == 'v' && cur + 1 < eol && (cur[1] == ' ' || cur[1] == '\t')) {
+                // Vertex position
+                InputPoint3f p;
+                cur += 2;
+                for (size_t i = 0; i < 3; ++i)
+                    parse_error |= !parse_float(cur, eol, p[i]);
+                p = m_to_world.transform_affine(p);
+                if (unlikely(!all(enoki::isfinite(p))))
+                    Throw("Error while loading OBJ file \"%s\": mesh contains invalid "
+                          "vertex position data", m_name);
+                chunk.bbox.expand(p);
+                chunk.vertices.push_back(p);
+            } else if (cur[0] == 'v' && cur + 2 < eol && cur[1] == 'n' &&
+                       (cur[2] == ' ' || cur[2] == '\t')) {
+                // Vertex normal
+                InputNormal3f n;
+                cur += 3;
+                for (size_t i = 0; i < 3; ++i)
+                    parse_error |= !parse_float(cur, eol, n[i]);
+                n = normalize(m_to_world.transform_affine(n));
+                if (unlikely(!all(enoki::isfinite(n))))
+                    Throw("Error while loading OBJ file \"%s\": mesh contains invalid "
+                          "vertex normal data", m_name);
+                chunk.normals.push_back(n);
+            } else if (cur[0] == 'v' && cur + 2 < eol && cur[1] == 't' &&
+                       (cur[2] == ' ' || cur[2] == '\t')) {
+                // Texture coordinate
+                InputVector2f uv;
+                cur += 3;
+                for (size_t i = 0; i < 2; ++i)
+                    parse_error |= !parse_float(cur, eol, uv[i]);
+                if (m_flip_tex_coords)
+                    uv.y() = 1.f - uv.y();
+                chunk.texcoords.push_back(uv);
+            } else if (cur[0] == 'f' && cur + 1 < eol && (cur[1] == ' ' || cur[1] == '\t')) {
+                // Face specification, triangulated as a fan
+                cur += 2;
+                ScalarIndex3 first {}, prev {};
+                size_t vertex_index = 0;
+
+                while (!parse_error) {
+                    cur = skip_whitespace(cur, eol);
+                    if (cur == eol)
+                        break;
+
+                    ScalarIndex3 key {{ 0, 0, 0 }};
+                    size_t type_index = 0;
+                    while (true) {
+                        ScalarIndex value;
+                        if (parse_index(cur, eol, value)) {
+                            if (type_index < 3)
+                                key[type_index] = value;
+                            else
+                                parse_error = true;
+                        } else if (type_index == 0) {
+                            parse_error = true;
+                        }
+
+                        if (cur == eol || *cur != '/')
+                            break;
+                        type_index++;
+                        cur++;
+                    }
+
+                    if (vertex_index == 0) {
+                        first = key;
+                    } else if (vertex_index >= 2) {
+                        chunk.corners.push_back(first);
+                        chunk.corners.push_back(prev);
+                        chunk.corners.push_back(key);
+                    }
+                    prev = key;
+                    vertex_index++;
+                }
+            }
+
+            if (unlikely(parse_error))
+                Throw("Error while loading OBJ file \"%s\": could not parse line \"%s\"",
+                      m_name, std::string(ptr, eol));
+            ptr = eol + 1;
+        }
+    }
+
+    static bool is_whitespace(char c) {
+        return c == ' ' || c == '\t' || c == '\r';
+    }
+
+    static const char *skip_whitespace(const char *ptr, const char *end) {
+        while (ptr < end && is_whitespace(*ptr))
+            ++ptr;
+        return ptr;
+    }
+
+    /// Parse an unsigned decimal integer
+    static bool parse_index(const char *&ptr, const char *end, ScalarIndex &out) {
+        const char *cur = ptr;
+        uint64_t value = 0;
+        while (cur < end && *cur >= '0' && *cur <= '9' && value <= 0xFFFFFFFFull)
+            value = value * 10 + (uint64_t) (*cur++ - '0');
+        if (cur == ptr || value > 0xFFFFFFFFull)
+            return false;
+        out = (ScalarIndex) value;
+        ptr = cur;
+        return true;
+    }
+
+    /**
+     * \brief Parse a floating point value following leading whitespace
+     *
+     * Decimal values with up to 19 significant digits and small exponents are
+     * converted using a single exactly rounded floating point multiplication
+     * or division. Everything else (e.g. \c inf, \c nan, or hexadecimal
+     * values) is handed to \c std::strtod.
+     */
+    static bool parse_float(const char *&ptr, const char *end, InputFloat &out) {
+        static const double powers_of_ten[] = {
+            1e0,  1e1,  1e2,  1e3,  1e4,  1e5,  1e6,  1e7,  1e8,  1e9,  1e10, 1e11,
+            1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22
+        };
+
+        ptr = skip_whitespace(ptr, end);
+        const char *cur = ptr;
+
+        bool negative = false;
+        if (cur < end && (*cur == '-' || *cur == '+'))
+            negative = *cur++ == '-';
+
+        uint64_t mantissa = 0;
+        int digits = 0, exponent = 0;
+        bool any_digits = false;
+
+        for (bool fraction = false; cur < end; ++cur) {
+            if (*cur >= '0' && *cur <= '9') {
+                if (mantissa != 0 || *cur != '0')
+                    digits++;
+                mantissa = mantissa * 10 + (uint64_t) (*cur - '0');
+                exponent -= fraction ? 1 : 0;
+                any_digits = true;
+            } else if (*cur == '.' && !fraction) {
+                fraction = true;
+            } else {
+                break;
+            }
+        }
+
+        if (any_digits && cur < end && (*cur == 'e' || *cur == 'E')) {
+            const char *exp_ptr = cur + 1;
+            bool exp_negative = false;
+            if (exp_ptr < end && (*exp_ptr == '-' || *exp_ptr == '+'))
+                exp_negative = *exp_ptr++ == '-';
+            int value = 0;
+            const char *exp_start = exp_ptr;
+            while (exp_ptr < end && *exp_ptr >= '0' && *exp_ptr <= '9' && value < 10000)
+                value = value * 10 + (*exp_ptr++ - '0');
+            if (exp_ptr != exp_start) {
+                exponent += exp_negative ? -value : value;
+                cur = exp_ptr;
+            }
+        }
+
+        bool fast_path = any_digits && digits <= 19 &&
+                         mantissa <= (1ull << 53) && exponent >= -22 &&
+                         exponent <= 22 && (cur == end || is_whitespace(*cur));
+
+        if (likely(fast_path)) {
+            double value = (double) mantissa;
+            if (exponent < 0)
+                value /= powers_of_ten[-exponent];
+            else
+                value *= powers_of_ten[exponent];
+            out = (InputFloat) (negative ? -value : value);
+            ptr = cur;
+            return true;
+        }
+
+        // Slow path: copy the token into a zero-terminated buffer
+        const char *token_end = ptr;
+        while (token_end < end && !is_whitespace(*token_end))
+            ++token_end;
+
+        char buf[128];
+        size_t size = std::min((size_t) (token_end - ptr), sizeof(buf) - 1);
+        memcpy(buf, ptr, size);
+        buf[size] = '\0';
+
+        char *buf_end = nullptr;
+        double value = std::strtod(buf, &buf_end);
+        if (buf_end == buf)
+            return false;
+        out = (InputFloat) value;
+        ptr += buf_end - buf;
+        return true;
+    }
+
+private:
+    bool m_flip_tex_coords;
 };
 
 MTS_IMPLEMENT_CLASS_VARIANT(OBJMesh, Mesh)
@@ -1,11 +1,15 @@
 #include <mitsuba/render/mesh.h>
 #include <mitsuba/core/fstream.h>
-#include <mitsuba/core/mstream.h>
+#include <mitsuba/core/mmap.h>
 #include <mitsuba/core/fresolver.h>
 #include <mitsuba/core/properties.h>
 #include <mitsuba/core/util.h>
 #include <mitsuba/core/timer.h>
 #include <enoki/half.h>
+#include <tbb/parallel_for.h>
+#include <tbb/spin_mutex.h>
+#include <cctype>
+#include <numeric>
 #include <unordered_map>
 #include <unordered_set>
 #include <fstream>
@@ -29,6 +33,30 @@ PLY (Stanford Triangle Format) mesh loader (:monosp:`ply`)
    - When set to |true|, any existing or computed vertex normals are
      discarded and *face normals* will instead be used during rendering.
      This gives the rendered object a faceted appearance. (Default: |false|)
+ * - compress
+   - |bool|
+   - When set to |true|, the mesh is converted to a compact read-only
+     representation after loading: positions are quantized relative to the
+     bounding box, normals and texture coordinates use 16 bit encodings, and
+     face indices are delta-compressed. This roughly halves the memory usage
+     at a small cost in ray tracing performance. Only supported by the scalar
+     and packet variants without Embree. Meshes with :monosp:`lod_auto` are
+     compressed by the scene once their level of detail has been chosen.
+     (Default: |false|)
+ * - lod_face_count
+   - |int|
+   - When set to a positive value, the mesh is simplified to (at most) this
+     number of triangles after loading, using edge collapses driven by a
+     quadric error metric. (Default: 0, i.e. disabled)
+ * - lod_auto
+   - |bool|
+   - When set to |true|, the scene chooses the number of triangles based on
+     the projected size of the mesh as seen by the sensor (see below).
+     (Default: |false|)
+ * - lod_cache_dir
+   - |string|
+   - Directory where simplified meshes are stored, so that subsequent runs
+     neither load the full mesh nor simplify it again. (Default: none)
  * - to_world
    - |transform|
    - Specifies an optional linear object-to-world transformation.
@@ -61,6 +89,31 @@ multidimentional attribute named ``{vertex|face}_color``.
 
     Values stored in a RBG color attribute will automatically be converted into spectal model
     coefficients when using a spectral variant of the renderer.
+
+**Level of detail**: large environments often contain detailed meshes that
+only cover a few pixels of the image. Such meshes can be simplified at load
+time, which reduces memory usage and the construction time of the
+acceleration data structure. The target number of triangles is either given
+explicitly using :monosp:`lod_face_count`, or chosen automatically when
+:monosp:`lod_auto` is set: the scene then estimates the number of pixels
+covered by the bounding sphere of the mesh from the ray differentials of its
+first sensor (or the sensor selected via the scene's :monosp:`lod_sensor`
+index), and allows :monosp:`lod_triangles_per_pixel` triangles per pixel
+(default: 1). Meshes behind the sensor are treated like visible ones, as they
+may still be seen in reflections. As the size of instanced geometry depends on
+each instance, :monosp:`lod_auto` cannot be used by meshes within a
+:ref:`shapegroup <shape-shapegroup>`; specify their :monosp:`lod_face_count`
+instead. Simplified meshes are stored in the
+:monosp:`lod_cache_dir` directory using the format of the
+:ref:`mmesh <shape-mmesh>` plugin.
+
+.. code-block:: xml
+
+    <shape type="ply">
+        <string name="filename" value="tree.ply"/>
+        <boolean name="lod_auto" value="true"/>
+        <string name="lod_cache_dir" value="lod_cache"/>
+    </shape>
  */
 
 template <typename Float, typename Spectrum>
@@ -69,7 +122,9 @@ public:
     MTS_IMPORT_BASE(Mesh, m_name, m_bbox, m_to_world, m_vertex_count, m_face_count,
                     m_vertex_positions_buf, m_vertex_normals_buf, m_vertex_texcoords_buf,
                     m_faces_buf, add_attribute, m_disable_vertex_normals, has_vertex_normals,
-                    has_vertex_texcoords, recompute_vertex_normals, set_children)
+                    has_vertex_texcoords, recompute_vertex_normals, m_compress, m_lod_auto,
+                    compress, cache_key, load_from_cache, store_in_cache, apply_lod,
+                    m_lod_face_count, set_children)
     MTS_IMPORT_TYPES()
 
     using typename Base::ScalarSize;
@@ -100,10 +155,10 @@ public:
         FloatStorage buf;
     };
 
-    PLYMesh(const Properties &props) : Base(props) {
-        /// Process vertex/index records in large batches
-        constexpr size_t elements_per_packet = 1024;
+    /// Process vertex/index records in large batches
+    static constexpr size_t records_per_batch = 16384;
 
+    PLYMesh(const Properties &props) : Base(props) {
         auto fs = Thread::thread()->file_resolver();
         fs::path file_path = fs->resolve(props.string("filename"));
         m_name = file_path.filename().string();
@@ -116,24 +171,58 @@ public:
         if (!fs::exists(file_path))
             fail("file not found");
 
-        ref<Stream> stream = new FileStream(file_path);
-        Timer timer;
+        std::string key = cache_key(file_path);
+        if (load_from_cache(key)) {
+            apply_lod(m_lod_face_count);
+            if (m_compress && !m_lod_auto)
+                compress();
+            set_children();
+            return;
+        }
+
+        ref<FileStream> stream = new FileStream(file_path);
+        Timer timer, phase_timer;
 
         PLYHeader header;
         try {
             header = parse_ply_header(stream);
-            if (header.ascii) {
-                if (stream->size() > 100 * 1024)
-                    Log(Warn,
-                        "\"%s\": performance warning -- this file uses the ASCII PLY format, which "
-                        "is slow to parse. Consider converting it to the binary PLY format.",
-                        m_name);
-                stream = parse_ascii((FileStream *) stream.get(), header.elements);
-            }
         } catch (const std::exception &e) {
             fail(e.what());
         }
 
+        /* The element data is decoded in parallel, directly from a memory
+           mapping of the file. The contents of ASCII files are first converted
+           into the equivalent binary representation (also in parallel). */
+        size_t data_offset = stream->tell();
+        stream->close();
+
+        ref<MemoryMappedFile> mmap = new MemoryMappedFile(file_path);
+        const uint8_t *data = (const uint8_t *) mmap->data() + data_offset;
+        size_t data_size = mmap->size() - data_offset;
+        std::string phases = "header: " + util::time_string((float) phase_timer.reset());
+
+        std::unique_ptr<uint8_t[]> ascii_data;
+        if (header.ascii) {
+            try {
+                ascii_data = parse_ascii((const char *) data, data_size,
+                                         header.elements, data_size);
+            } catch (const std::exception &e) {
+                fail(e.what());
+            }
+            data = ascii_data.get();
+            phases += ", ASCII parsing: " + util::time_string((float) phase_timer.reset());
+        }
+
+        size_t offset = 0;
+        auto element_data = [&](const PLYElement &el) {
+            size_t size = el.struct_->size() * el.count;
+            if (offset + size > data_size)
+                fail("unexpected end of file");
+            const uint8_t *result = data + offset;
+            offset += size;
+            return result;
+        };
+
         bool has_vertex_normals = false;
         bool has_vertex_texcoords = false;
 
@@ -181,7 +270,6 @@ public:
                 find_other_fields("vertex_", vertex_attributes_descriptors,
                                   vertex_struct, el.struct_, reserved_names);
 
-                size_t i_struct_size = el.struct_->size();
                 size_t o_struct_size = vertex_struct->size();
 
                 ref<StructConverter> conv;
@@ -210,42 +298,28 @@ public:
                 if constexpr (is_cuda_array_v<Float>)
                     cuda_sync();
 
-                size_t packet_count     = el.count / elements_per_packet;
-                size_t remainder_count  = el.count % elements_per_packet;
-                size_t i_packet_size    = i_struct_size * elements_per_packet;
-                size_t i_remainder_size = i_struct_size * remainder_count;
-                size_t o_packet_size    = o_struct_size * elements_per_packet;
-
-                std::unique_ptr<uint8_t[]> buf(new uint8_t[i_packet_size]);
-                std::unique_ptr<uint8_t[]> buf_o(new uint8_t[o_packet_size]);
-
                 InputFloat* position_ptr = m_vertex_positions_buf.data();
                 InputFloat* normal_ptr   = m_vertex_normals_buf.data();
                 InputFloat* texcoord_ptr = m_vertex_texcoords_buf.data();
+                tbb::spin_mutex bbox_mutex;
 
-                for (size_t i = 0; i <= packet_count; ++i) {
-                    uint8_t *target = (uint8_t *) buf_o.get();
-                    size_t psize = (i != packet_count) ? i_packet_size : i_remainder_size;
-                    size_t count = (i != packet_count) ? elements_per_packet : remainder_count;
-                    stream->read(buf.get(), psize);
-                    if (unlikely(!conv->convert(count, buf.get(), buf_o.get())))
-                        fail("incompatible contents -- is this a triangle mesh?");
+                convert_parallel(conv, element_data(el), el.count, o_struct_size,
+                                 [&](size_t start, size_t count, const uint8_t *target) {
+                    ScalarBoundingBox3f bbox;
 
-                    for (size_t j = 0; j < count; ++j) {
+                    for (size_t i = start; i < start + count; ++i) {
                         InputPoint3f p = enoki::load<InputPoint3f>(target);
                         p = m_to_world.transform_affine(p);
                         if (unlikely(!all(enoki::isfinite(p))))
                             fail("mesh contains invalid vertex positions/normal data");
-                        m_bbox.expand(p);
-                        store_unaligned(position_ptr, p);
-                        position_ptr += 3;
+                        bbox.expand(p);
+                        store_unaligned(position_ptr + 3 * i, p);
 
                         if (has_vertex_normals) {
                             InputNormal3f n = enoki::load<InputNormal3f>(
                                 target + sizeof(InputFloat) * 3);
                             n = normalize(m_to_world.transform_affine(n));
-                            store_unaligned(normal_ptr, n);
-                            normal_ptr += 3;
+                            store_unaligned(normal_ptr + 3 * i, n);
                         }
 
                         if (has_vertex_texcoords) {
@@ -253,8 +327,7 @@ public:
                                 target + (m_disable_vertex_normals
                                               ? sizeof(InputFloat) * 3
                                               : sizeof(InputFloat) * 6));
-                            store_unaligned(texcoord_ptr, uv);
-                            texcoord_ptr += 2;
+                            store_unaligned(texcoord_ptr + 2 * i, uv);
                         }
 
                         size_t target_offset =
@@ -263,9 +336,8 @@ public:
                                  ? (has_vertex_texcoords ? 8 : 6)
                                  : (has_vertex_texcoords ? 5 : 3));
 
-                        for (size_t k = 0; k < vertex_attributes_descriptors.size(); ++k) {
-                            auto& descr = vertex_attributes_descriptors[k];
-                            memcpy(descr.buf.data() + (i * elements_per_packet + j) * descr.dim,
+                        for (auto& descr: vertex_attributes_descriptors) {
+                            memcpy(descr.buf.data() + i * descr.dim,
                                    target + target_offset,
                                    descr.dim * sizeof(InputFloat));
                             target_offset += descr.dim * sizeof(InputFloat);
@@ -273,11 +345,16 @@ public:
 
                         target += o_struct_size;
                     }
-                }
+
+                    std::lock_guard<tbb::spin_mutex> lock(bbox_mutex);
+                    m_bbox.expand(bbox);
+                });
 
                 for (auto& descr: vertex_attributes_descriptors) {
                     add_attribute(descr.name, descr.dim, descr.buf);
                 }
+
+                phases += ", vertices: " + util::time_string((float) phase_timer.reset());
             } else if (el.name == "face") {
                 std::string field_name;
                 if (el.struct_->has_field("vertex_index.count"))
@@ -300,7 +377,6 @@ public:
                 find_other_fields("face_", face_attributes_descriptors,
                                   face_struct, el.struct_, reserved_names);
 
-                size_t i_struct_size = el.struct_->size();
                 size_t o_struct_size = face_struct->size();
 
                 ref<StructConverter> conv;
@@ -321,33 +397,15 @@ public:
 
                 ScalarIndex* face_ptr = m_faces_buf.data();
 
-                size_t packet_count     = el.count / elements_per_packet;
-                size_t remainder_count  = el.count % elements_per_packet;
-                size_t i_packet_size    = i_struct_size * elements_per_packet;
-                size_t i_remainder_size = i_struct_size * remainder_count;
-                size_t o_packet_size    = o_struct_size * elements_per_packet;
-
-                std::unique_ptr<uint8_t[]> buf(new uint8_t[i_packet_size]);
-                std::unique_ptr<uint8_t[]> buf_o(new uint8_t[o_packet_size]);
-
-                for (size_t i = 0; i <= packet_count; ++i) {
-                    uint8_t *target = (uint8_t *) buf_o.get();
-                    size_t psize = (i != packet_count) ? i_packet_size : i_remainder_size;
-                    size_t count = (i != packet_count) ? elements_per_packet : remainder_count;
-
-                    stream->read(buf.get(), psize);
-                    if (unlikely(!conv->convert(count, buf.get(), buf_o.get())))
-                        fail("incompatible contents -- is this a triangle mesh?");
-
-                    for (size_t j = 0; j < count; ++j) {
+                convert_parallel(conv, element_data(el), el.count, o_struct_size,
+                                 [&](size_t start, size_t count, const uint8_t *target) {
+                    for (size_t i = start; i < start + count; ++i) {
                         ScalarIndex3 fi = enoki::load<ScalarIndex3>(target);
-                        store_unaligned(face_ptr, fi);
-                        face_ptr += 3;
+                        store_unaligned(face_ptr + 3 * i, fi);
 
                         size_t target_offset = sizeof(InputFloat) * 3;
-                        for (size_t k = 0; k < face_attributes_descriptors.size(); ++k) {
-                            auto& descr = face_attributes_descriptors[k];
-                            memcpy(descr.buf.data() + (i * elements_per_packet + j) * descr.dim,
+                        for (auto& descr: face_attributes_descriptors) {
+                            memcpy(descr.buf.data() + i * descr.dim,
                                    target + target_offset,
                                    descr.dim * sizeof(InputFloat));
                             target_offset += descr.dim * sizeof(InputFloat);
@@ -355,25 +413,27 @@ public:
 
                         target += o_struct_size;
                     }
-                }
+                });
 
                 for (auto& descr: face_attributes_descriptors) {
                     add_attribute(descr.name, descr.dim, descr.buf);
                 }
+
+                phases += ", faces: " + util::time_string((float) phase_timer.reset());
             } else {
                 Log(Warn, "\"%s\": Skipping unknown element \"%s\"", m_name, el.name);
-                stream->seek(stream->tell() + el.struct_->size() * el.count);
+                element_data(el);
             }
         }
 
-        if (stream->tell() != stream->size())
+        if (offset != data_size)
             fail("invalid file -- trailing content");
 
-        Log(Debug, "\"%s\": read %i faces, %i vertices (%s in %s)",
+        Log(Debug, "\"%s\": read %i faces, %i vertices (%s in %s; %s)",
             m_name, m_face_count, m_vertex_count,
             util::mem_string(m_face_count * face_struct->size() +
                              m_vertex_count * vertex_struct->size()),
-            util::time_string(timer.value())
+            util::time_string(timer.value()), phases
         );
 
         if (!m_disable_vertex_normals && !has_vertex_normals) {
@@ -383,6 +443,12 @@ public:
                 util::time_string(timer2.value()));
         }
 
+        store_in_cache(key);
+        apply_lod(m_lod_face_count);
+
+        if (m_compress && !m_lod_auto)
+            compress();
+
         set_children();
     }
 
@@ -523,108 +589,183 @@ private:
         return header;
     }
 
-    ref<Stream> parse_ascii(FileStream *in, const std::vector<PLYElement> &elements) {
-        ref<Stream> out = new MemoryStream();
-        std::fstream &is = *in->native();
-        for (auto const &el : elements) {
-            for (size_t i = 0; i < el.count; ++i) {
-                for (auto const &field : *(el.struct_)) {
-                    switch (field.type) {
-                        case Struct::Type::Int8: {
-                                int value;
-                                if (!(is >> value)) Throw("Could not parse \"char\" value for field %s", field.name);
-                                if (value < -128 || value > 127)
-                                    Throw("Could not parse \"char\" value for field %s", field.name);
-                                out->write((int8_t) value);
-                            }
-                            break;
-
-                        case Struct::Type::UInt8: {
-                                int value;
-                                if (!(is >> value))
-                                    Throw("Could not parse \"uchar\" value for field %s (may be due to non-triangular faces)", field.name);
-                                if (value < 0 || value > 255)
-                                    Throw("Could not parse \"uchar\" value for field %s (may be due to non-triangular faces)", field.name);
-                                out->write((uint8_t) value);
-                            }
-                            break;
-
-                        case Struct::Type::Int16: {
-                                int16_t value;
-                                if (!(is >> value)) Throw("Could not parse \"short\" value for field %s", field.name);
-                                out->write(value);
-                            }
-                            break;
-
-                        case Struct::Type::UInt16: {
-                                uint16_t value;
-                                if (!(is >> value)) Throw("Could not parse \"ushort\" value for field %s", field.name);
-                                out->write(value);
-                            }
-                            break;
-
-                        case Struct::Type::Int32: {
-                                int32_t value;
-                                if (!(is >> value)) Throw("Could not parse \"int\" value for field %s", field.name);
-                                out->write(value);
-                            }
-                            break;
-
-                        case Struct::Type::UInt32: {
-                                uint32_t value;
-                                if (!(is >> value)) Throw("Could not parse \"uint\" value for field %s", field.name);
-                                out->write(value);
-                            }
-                            break;
-
-                        case Struct::Type::Int64: {
-                                int64_t value;
-                                if (!(is >> value)) Throw("Could not parse \"long\" value for field %s", field.name);
-                                out->write(value);
-                            }
-                            break;
-
-                        case Struct::Type::UInt64: {
-                                uint64_t value;
-                                if (!(is >> value)) Throw("Could not parse \"ulong\" value for field %s", field.name);
-                                out->write(value);
-                            }
-                            break;
-
-                        case Struct::Type::Float16: {
-                                float value;
-                                if (!(is >> value)) Throw("Could not parse \"half\" value for field %s", field.name);
-                                out->write(enoki::half::float32_to_float16(value));
-                            }
-                            break;
-
-                        case Struct::Type::Float32: {
-                                float value;
-                                if (!(is >> value)) Throw("Could not parse \"float\" value for field %s", field.name);
-                                out->write(value);
-                            }
-                            break;
-
-                        case Struct::Type::Float64: {
-                                double value;
-                                if (!(is >> value)) Throw("Could not parse \"double\" value for field %s", field.name);
-                                out->write(value);
-                            }
-                            break;
-
-                        default:
-                            Throw("internal error");
-                    }
+    /**
+     * \brief Convert \c count records starting at \c src in parallel
+     *
+     * The records are processed in batches, and \c func is invoked with the
+     * index of the first record of each batch, the batch size, and the
+     * converted records.
+     */
+    template <typename Func>
+    void convert_parallel(const StructConverter *conv, const uint8_t *src, size_t count,
+                          size_t o_struct_size, Func func) {
+        size_t i_struct_size = conv->source()->size(),
+               batch_count   = (count + records_per_batch - 1) / records_per_batch;
+
+        tbb::parallel_for(
+            tbb::blocked_range<size_t>(0, batch_count, 1),
+            [&](const tbb::blocked_range<size_t> &range) {
+                std::unique_ptr<uint8_t[]> buf(new uint8_t[o_struct_size * records_per_batch]);
+
+                for (size_t i = range.begin(); i != range.end(); ++i) {
+                    size_t start = i * records_per_batch,
+                           size  = std::min(records_per_batch, count - start);
+
+                    if (unlikely(!conv->convert(size, src + start * i_struct_size, buf.get())))
+                        Throw("Error while loading PLY file \"%s\": incompatible contents "
+                              "-- is this a triangle mesh?", m_name);
+
+                    func(start, size, buf.get());
                 }
             }
+        );
+    }
+
+    /// Invoke \c func with the start and end of every non-blank line in the given range
+    template <typename Func>
+    static void for_each_line(const char *ptr, const char *end, Func func) {
+        while (ptr < end) {
+            const char *eol = (const char *) memchr(ptr, '\n', end - ptr);
+            if (!eol)
+                eol = end;
+
+            const char *line_end = eol;
+            while (line_end > ptr && std::isspace((unsigned char) line_end[-1]))
+                --line_end;
+            const char *line_start = ptr;
+            while (line_start < line_end && std::isspace((unsigned char) *line_start))
+                ++line_start;
+
+            if (line_start != line_end)
+                func(line_start, line_end);
+            ptr = eol + 1;
         }
-        std::string token;
-        if (is >> token)
+    }
+
+    /**
+     * \brief Convert the contents of an ASCII PLY file into the equivalent
+     * binary representation
+     *
+     * Every record of the file is expected to occupy a separate line. The
+     * text is split into chunks at line boundaries, and the chunks are
+     * processed in parallel: a first pass counts their lines, which determines
+     * the records they contain, and a second pass parses them.
+     */
+    std::unique_ptr<uint8_t[]> parse_ascii(const char *text, size_t size,
+                                          const std::vector<PLYElement> &elements,
+                                          size_t &out_size) {
+        // Index of the first record and binary offset of every element
+        std::vector<size_t> record_start(elements.size() + 1, 0),
+                            out_offset(elements.size() + 1, 0);
+        for (size_t i = 0; i < elements.size(); ++i) {
+            record_start[i + 1] = record_start[i] + elements[i].count;
+            out_offset[i + 1] = out_offset[i] + elements[i].count * elements[i].struct_->size();
+        }
+        out_size = out_offset.back();
+        std::unique_ptr<uint8_t[]> out(new uint8_t[out_size]);
+
+        // Split the text into chunks that begin at the start of a line
+        const size_t chunk_size = 1024 * 1024;
+        std::vector<size_t> chunks = { 0 };
+        while (chunks.back() < size) {
+            size_t pos = std::min(chunks.back() + chunk_size, size);
+            const char *eol = (const char *) memchr(text + pos, '\n', size - pos);
+            chunks.push_back(eol ? (size_t) (eol - text) + 1 : size);
+        }
+        size_t chunk_count = chunks.size() - 1;
+
+        // First pass: count the lines (i.e. records) of every chunk
+        std::vector<size_t> chunk_record(chunk_count + 1, 0);
+        tbb::parallel_for(size_t(0), chunk_count, [&](size_t i) {
+            size_t lines = 0;
+            for_each_line(text + chunks[i], text + chunks[i + 1],
+                          [&](const char *, const char *) { lines++; });
+            chunk_record[i + 1] = lines;
+        });
+        std::partial_sum(chunk_record.begin(), chunk_record.end(), chunk_record.begin());
+
+        if (chunk_record.back() < record_start.back())
+            Throw("Unexpected end of PLY file (expected %i records, found %i lines)",
+                  record_start.back(), chunk_record.back());
+        else if (chunk_record.back() > record_start.back())
             Throw("Trailing tokens after end of PLY file");
-        out->seek(0);
+
+        // Second pass: parse the records
+        tbb::parallel_for(size_t(0), chunk_count, [&](size_t i) {
+            size_t record = chunk_record[i], el = 0;
+            std::string line;
+
+            for_each_line(text + chunks[i], text + chunks[i + 1],
+                          [&](const char *start, const char *end) {
+                while (record >= record_start[el + 1])
+                    ++el;
+                const Struct *struct_ = elements[el].struct_.get();
+                uint8_t *target = out.get() + out_offset[el] +
+                                  (record - record_start[el]) * struct_->size();
+
+                line.assign(start, end);
+                parse_ascii_record(line.c_str(), struct_, target);
+                record++;
+            });
+        });
+
         return out;
     }
 
+    /// Parse a single line of an ASCII PLY file into a binary record
+    static void parse_ascii_record(const char *ptr, const Struct *struct_, uint8_t *target) {
+        for (auto const &field : *struct_) {
+            uint8_t *out = target + field.offset;
+            char *end = nullptr;
+
+            if (field.is_float()) {
+                double value = std::strtod(ptr, &end);
+                if (end == ptr)
+                    Throw("Could not parse floating point value for field %s", field.name);
+
+                switch (field.type) {
+                    case Struct::Type::Float16:
+                        store_value(out, enoki::half::float32_to_float16((float) value));
+                        break;
+                    case Struct::Type::Float32: store_value(out, (float) value); break;
+                    case Struct::Type::Float64: store_value(out, value); break;
+                    default: Throw("internal error");
+                }
+            } else {
+                long long value = std::strtoll(ptr, &end, 10);
+                auto [range_min, range_max] = field.range();
+                if (end == ptr || value < range_min || value > range_max)
+                    Throw("Could not parse integer value for field %s%s", field.name,
+                          field.type == Struct::Type::UInt8
+                              ? " (may be due to non-triangular faces)" : "");
+
+                switch (field.type) {
+                    case Struct::Type::Int8:   store_value(out, (int8_t)   value); break;
+                    case Struct::Type::UInt8:  store_value(out, (uint8_t)  value); break;
+                    case Struct::Type::Int16:  store_value(out, (int16_t)  value); break;
+                    case Struct::Type::UInt16: store_value(out, (uint16_t) value); break;
+                    case Struct::Type::Int32:  store_value(out, (int32_t)  value); break;
+                    case Struct::Type::UInt32: store_value(out, (uint32_t) value); break;
+                    case Struct::Type::Int64:  store_value(out, (int64_t)  value); break;
+                    case Struct::Type::UInt64: store_value(out, (uint64_t) value); break;
+                    default: Throw("internal error");
+                }
+            }
+
+            ptr = end;
+        }
+
+        while (std::isspace((unsigned char) *ptr))
+            ++ptr;
+        if (*ptr != '\0')
+            Throw("Trailing tokens in PLY record \"%s\" (may be due to non-triangular faces)",
+                  ptr);
+    }
+
+    template <typename T> static void store_value(uint8_t *ptr, T value) {
+        memcpy(ptr, &value, sizeof(T));
+    }
+
     void find_other_fields(const std::string& type, std::vector<PLYAttributeDescriptor> &vertex_attributes_descriptors, ref<Struct> target_struct,
         ref<Struct> ref_struct, std::unordered_set<std::string> &reserved_names) {
 
@@ -1,9 +1,12 @@
 #include <mitsuba/render/mesh.h>
-#include <mitsuba/core/fstream.h>
+#include <mitsuba/core/mmap.h>
+#include <mitsuba/core/mstream.h>
 #include <mitsuba/core/zstream.h>
 #include <mitsuba/core/fresolver.h>
 #include <mitsuba/core/properties.h>
 #include <mitsuba/core/timer.h>
+#include <list>
+#include <mutex>
 
 NAMESPACE_BEGIN(mitsuba)
 
@@ -28,6 +31,29 @@ Serialized mesh loader (:monosp:`serialized`)
    - When set to |true|, any existing or computed vertex normals are
      discarded and \emph{face normals} will instead be used during rendering.
      This gives the rendered object a faceted appearance.(Default: |false|)
+ * - compress
+   - |bool|
+   - When set to |true|, the mesh is converted to a compact read-only
+     representation after loading: positions are quantized relative to the
+     bounding box, normals and texture coordinates use 16 bit encodings, and
+     face indices are delta-compressed. This roughly halves the memory usage
+     at a small cost in ray tracing performance. Only supported by the scalar
+     and packet variants without Embree. (Default: |false|)
+ * - lod_face_count
+   - |int|
+   - When set to a positive value, the mesh is simplified to (at most) this
+     number of triangles after loading, using edge collapses driven by a
+     quadric error metric. (Default: 0, i.e. disabled)
+ * - lod_auto
+   - |bool|
+   - When set to |true|, the scene chooses the number of triangles based on
+     the projected size of the mesh as seen by the sensor (see the
+     :ref:`ply <shape-ply>` plugin). Not supported by meshes within a
+     :ref:`shapegroup <shape-shapegroup>`. (Default: |false|)
+ * - lod_cache_dir
+   - |string|
+   - Directory where simplified meshes are stored, so that subsequent runs
+     neither load the full mesh nor simplify it again. (Default: none)
  * - to_world
    - |transform|
    - Specifies an optional linear object-to-world transformation.
@@ -107,6 +133,11 @@ Hence, after each mesh, the stream briefly reverts back to an
 uncompressed format, followed by an uncompressed header, and so on.
 This is neccessary for efficient read access to arbitrary sub-meshes.
 
+The plugin keeps recently used :monosp:`.serialized` files mapped into memory
+along with their end-of-file dictionary (see below), so that scenes
+referencing many meshes of the same file only open it once, and the meshes are
+decompressed in parallel.
+
 End-of-file dictionary
 **********************
 In addition to the previous table, a :monosp:`.serialized` file also concludes with a brief summary
@@ -138,13 +169,124 @@ at the end of the file, which specifies the starting position of each sub-mesh:
 #define MTS_FILEFORMAT_VERSION_V3 0x0003
 #define MTS_FILEFORMAT_VERSION_V4 0x0004
 
+/**
+ * \brief Memory-mapped serialized file along with its dictionary of mesh offsets
+ *
+ * Scenes often reference thousands of meshes stored in the same serialized
+ * file. The instances of this class are cached and shared between all meshes
+ * loaded from a file (see \ref SerializedFile::open()), so that the file is
+ * only opened and its dictionary only parsed once. Every mesh then inflates
+ * its own data stream from the mapping, which allows loading many meshes
+ * concurrently.
+ */
+struct SerializedFile {
+    fs::path path;
+    ref<MemoryMappedFile> mmap;
+    /// Last modification time of the file when it was mapped
+    uint64_t mtime = 0;
+    short version = 0;
+    /// File offsets of the meshes (empty if the file has no dictionary)
+    std::vector<uint64_t> offsets;
+
+    /// Number of recently accessed files that are kept open
+    static constexpr size_t cache_size = 16;
+
+    /// Return a (potentially cached) reader for the given file
+    static std::shared_ptr<const SerializedFile> open(const fs::path &path) {
+        static std::mutex mutex;
+        static std::list<std::shared_ptr<const SerializedFile>> cache;
+
+        std::lock_guard<std::mutex> guard(mutex);
+        size_t size = fs::file_size(path);
+        uint64_t mtime = fs::last_write_time(path);
+        for (auto it = cache.begin(); it != cache.end(); ++it) {
+            if ((*it)->path != path)
+                continue;
+            std::shared_ptr<const SerializedFile> file = *it;
+            cache.erase(it);
+            // Reopen files that were modified in the meantime
+            if (file->mmap->size() != size || file->mtime != mtime)
+                break;
+            cache.push_front(file);
+            return file;
+        }
+
+        auto file = std::make_shared<SerializedFile>();
+        file->path = path;
+        file->mtime = mtime;
+        file->mmap = new MemoryMappedFile(path);
+        file->read_dictionary();
+
+        cache.push_front(file);
+        if (cache.size() > cache_size)
+            cache.pop_back();
+        return file;
+    }
+
+    /// Return a stream that reads the file starting at the given offset
+    ref<Stream> stream(uint64_t offset) const {
+        if (offset > mmap->size())
+            Throw("Error while loading serialized file \"%s\": invalid mesh "
+                  "offset!", path.filename());
+        ref<Stream> stream = new MemoryStream((uint8_t *) mmap->data() + offset,
+                                              mmap->size() - offset);
+        stream->set_byte_order(Stream::ELittleEndian);
+        return stream;
+    }
+
+private:
+    void read_dictionary() {
+        ref<Stream> stream = this->stream(0);
+        size_t size = stream->size();
+
+        short format = 0;
+        if (size >= 2 * sizeof(short)) {
+            stream->read(format);
+            stream->read(version);
+        }
+
+        if (format != MTS_FILEFORMAT_HEADER)
+            Throw("Error while loading serialized file \"%s\": encountered an "
+                  "invalid file format!", path.filename());
+
+        if (version != MTS_FILEFORMAT_VERSION_V3 &&
+            version != MTS_FILEFORMAT_VERSION_V4)
+            Throw("Error while loading serialized file \"%s\": encountered an "
+                  "incompatible file version!", path.filename());
+
+        /* The dictionary at the end of the file stores the offsets of all
+           meshes (64 bit offsets in version 4, 32 bit in version 3), followed
+           by their count */
+        uint32_t count = 0;
+        stream->seek(size - sizeof(uint32_t));
+        stream->read(count);
+
+        size_t entry_size = version == MTS_FILEFORMAT_VERSION_V4 ? sizeof(uint64_t)
+                                                                 : sizeof(uint32_t);
+        if ((uint64_t) count * entry_size + sizeof(uint32_t) > size)
+            return;
+
+        offsets.resize(count);
+        stream->seek(size - count * entry_size - sizeof(uint32_t));
+        if (version == MTS_FILEFORMAT_VERSION_V4) {
+            stream->read_array(offsets.data(), count);
+        } else {
+            std::unique_ptr<uint32_t[]> values(new uint32_t[count]);
+            stream->read_array(values.get(), count);
+            std::copy(values.get(), values.get() + count, offsets.begin());
+        }
+    }
+};
+
 template <typename Float, typename Spectrum>
 class SerializedMesh final : public Mesh<Float, Spectrum> {
 public:
     MTS_IMPORT_BASE(Mesh,m_name, m_bbox, m_to_world, m_vertex_count, m_face_count,
                     m_vertex_positions_buf, m_vertex_normals_buf, m_vertex_texcoords_buf,
                     m_faces_buf, m_disable_vertex_normals, has_vertex_normals, has_vertex_texcoords,
-                    recompute_vertex_normals, vertex_position, vertex_normal, set_children)
+                    recompute_vertex_normals, vertex_position, vertex_normal, m_compress,
+                    m_lod_auto, compress, cache_key, load_from_cache, store_in_cache, apply_lod,
+                    m_lod_face_count, set_children)
     MTS_IMPORT_TYPES()
 
     using typename Base::ScalarSize;
@@ -191,56 +333,32 @@ public:
 
         m_name = tfm::format("%s@%i", file_path.filename(), shape_index);
 
-        ref<Stream> stream = new FileStream(file_path);
-        Timer timer;
-        stream->set_byte_order(Stream::ELittleEndian);
-
-        short format = 0, version = 0;
-        stream->read(format);
-        stream->read(version);
-
-        if (format != MTS_FILEFORMAT_HEADER)
-            fail("encountered an invalid file format!");
+        std::string key = cache_key(file_path, tfm::format("shape_index=%i", shape_index));
+        if (load_from_cache(key)) {
+            apply_lod(m_lod_face_count);
+            if (m_compress && !m_lod_auto)
+                compress();
+            set_children();
+            return;
+        }
 
-        if (version != MTS_FILEFORMAT_VERSION_V3 &&
-            version != MTS_FILEFORMAT_VERSION_V4)
-            fail("encountered an incompatible file version!");
+        Timer timer;
+        std::shared_ptr<const SerializedFile> file = SerializedFile::open(file_path);
 
+        /* Determine the position of the requested substream. This
+           is stored at the end of the file */
+        uint64_t offset = 0;
         if (shape_index != 0) {
-            size_t file_size = stream->size();
-
-            /* Determine the position of the requested substream. This
-               is stored at the end of the file */
-            stream->seek(file_size - sizeof(uint32_t));
-
-            uint32_t count = 0;
-            stream->read(count);
-
-            if (shape_index > (int) count)
+            if (shape_index >= (int) file->offsets.size())
                 fail(tfm::format("Unable to unserialize mesh, shape index is "
                                  "out of range! (requested %i out of 0..%i)",
-                                 shape_index, count - 1));
-
-            // Seek to the correct position
-            if (version == MTS_FILEFORMAT_VERSION_V4) {
-                stream->seek(file_size -
-                             sizeof(uint64_t) * (count - shape_index) -
-                             sizeof(uint32_t));
-                size_t offset = 0;
-                stream->read(offset);
-                stream->seek(offset);
-            } else {
-                Assert(version == MTS_FILEFORMAT_VERSION_V3);
-                stream->seek(file_size -
-                             sizeof(uint32_t) * (count - shape_index + 1));
-                uint32_t offset = 0;
-                stream->read(offset);
-                stream->seek(offset);
-            }
-            stream->skip(sizeof(short) * 2); // Skip the header
+                                 shape_index, (int) file->offsets.size() - 1));
+            offset = file->offsets[shape_index];
         }
+        short version = file->version;
 
-        stream = new ZStream(stream);
+        // Skip the header
+        ref<Stream> stream = new ZStream(file->stream(offset + sizeof(short) * 2));
         stream->set_byte_order(Stream::ELittleEndian);
 
         uint32_t flags = 0;
@@ -335,6 +453,12 @@ public:
                 util::time_string(timer2.value()));
         }
 
+        store_in_cache(key);
+        apply_lod(m_lod_face_count);
+
+        if (m_compress && !m_lod_auto)
+            compress();
+
         set_children();
     }
 
@@ -345,9 +469,7 @@ public:
             for (size_t i = 0; i < m_vertex_count * dim; ++i)
                 dst[i] = (float) values[i];
         } else {
-            std::unique_ptr<float[]> values(new float[m_vertex_count * dim]);
-            stream->read_array(values.get(), m_vertex_count * dim);
-            memcpy(dst, values.get(), m_vertex_count * sizeof(InputFloat) * dim);
+            stream->read_array(dst, m_vertex_count * dim);
         }
     }
 
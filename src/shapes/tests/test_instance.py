@@ -205,3 +205,60 @@ def test03_ray_intersect_instance(variants_all_rgb):
     ray = Ray3f([0.5, 0.5, -12], [0.0, 0.0, 1.0], 0.0, [])
     pi = scene.ray_intersect_preliminary(ray)
     assert 'instance = nullptr' in str(pi) or 'instance = [nullptr]' in str(pi)
+
+
+def test04_move_instances(variant_scalar_rgb):
+    """Instances are managed by a top-level BVH that is rebuilt when they move"""
+    import mitsuba
+    from mitsuba.core import xml, Ray3f, ScalarTransform4f as T
+    from mitsuba.python.util import traverse
+
+    if mitsuba.core.MTS_ENABLE_EMBREE:
+        pytest.skip("EMBREE enabled")
+
+    n = 8
+    scene_dict = {
+        'type' : 'scene',
+        'group_0' : {
+            'type' : 'shapegroup',
+            'shape' : { 'type' : 'rectangle' }
+        },
+        # Regular shape occluding the instances of the first row
+        'shape' : {
+            'type' : 'rectangle',
+            'to_world' : T.translate([0.0, 0.0, -1.0]) * T.scale([2 * n, 0.5, 1])
+        }
+    }
+    for i in range(n):
+        scene_dict['instance_%i' % i] = {
+            'type' : 'instance',
+            'group' : { 'type' : 'ref', 'id' : 'group_0' },
+            'to_world' : T.translate([2 * i, 0.0, 0.0]) * T.scale(0.5)
+        }
+    scene = xml.load_dict(scene_dict)
+
+    def trace(x, y):
+        ray = Ray3f([x, y, -12], [0.0, 0.0, 1.0], 0.0, [])
+        si = scene.ray_intersect(ray)
+        si_naive = scene.ray_intersect_naive(ray)
+        assert si.is_valid() == si_naive.is_valid() == scene.ray_test(ray)
+        if si.is_valid():
+            assert ek.allclose(si.t, si_naive.t)
+        return si
+
+    for i in range(n):
+        # The regular shape is in front of the instances
+        si = trace(2 * i, 0.0)
+        assert ek.allclose(si.t, 11.0) and si.instance is None
+        assert not trace(2 * i, 2.0).is_valid()
+
+    # Move all instances up, out of the shadow of the regular shape
+    params = traverse(scene)
+    for i in range(n):
+        params['instance_%i.to_world' % i] = T.translate([2 * i, 2.0, 0.0]) * T.scale(0.5)
+    params.update()
+
+    for i in range(n):
+        si = trace(2 * i, 2.0)
+        assert ek.allclose(si.t, 12.0) and si.instance is not None
+        assert not trace(2 * i + 1, 2.0).is_valid()
@@ -60,6 +60,13 @@ public:
             return m_value;
     }
 
+    ScalarFloat mean() const override {
+        if constexpr (is_spectral_v<Spectrum>)
+            return m_d65->mean() * scalar_cast(hmean(srgb_model_mean(m_value)));
+        else
+            return scalar_cast(hmean(hmean(m_value)));
+    }
+
     void traverse(TraversalCallback *callback) override {
         callback->put_parameter("value", m_value);
     }
@@ -1,8 +1,10 @@
+#include <mitsuba/core/asset_cache.h>
 #include <mitsuba/core/bitmap.h>
 #include <mitsuba/core/fresolver.h>
 #include <mitsuba/core/plugin.h>
 #include <mitsuba/core/properties.h>
 #include <mitsuba/core/spectrum.h>
+#include <mitsuba/core/texture_cache.h>
 #include <mitsuba/core/distr_2d.h>
 #include <mitsuba/render/interaction.h>
 #include <mitsuba/render/texture.h>
@@ -35,6 +37,20 @@ Bitmap texture (:monosp:`bitmap`)
      - ``nearest``: disable filtering and interpolation. In this mode, the plugin
        performs nearest neighbor lookups of texture values.
 
+     - ``trilinear``: bilinear interpolation within the two levels of a MIP map
+       pyramid that best match the pixel footprint, and linear interpolation
+       between them. Fast, but overly blurry at grazing angles.
+
+     - ``ewa``: elliptically weighted average of the pixels covered by the
+       anisotropic pixel footprint within the matching MIP map levels
+       :cite:`Heckbert1989Fundamentals`. Sharpest, but also most expensive.
+
+ * - max_anisotropy
+   - |float|
+   - Maximum anisotropy of the footprints used by the ``ewa`` filter. Footprints
+     that are more elongated are shortened to keep the number of pixel lookups
+     bounded. (Default: 20)
+
  * - wrap_mode
    - |string|
    - Controls the behavior of texture evaluations that fall outside of the
@@ -74,11 +90,76 @@ These conversions can alternatively be disabled with the :paramtype:`raw` flag,
 e.g. when textured data is already in linear space or does not represent colors
 at all.
 
+The ``trilinear`` and ``ewa`` filters avoid the aliasing of textures that are
+minified on screen (e.g. tiled textures seen at a distance). The MIP map pyramid
+is constructed once when the texture is loaded, and the pixel footprint is
+derived from the ray differentials of camera rays. Indirect rays don't carry
+differentials and fall back to bilinear lookups at the full resolution. The
+GPU variants don't support the ``ewa`` filter and use ``trilinear`` filtering
+instead.
+
+The :paramtype:`filename` parameter may also refer to a tiled MIP map pyramid
+written using ``TiledImage.write()``. Such textures are not loaded into memory
+as a whole: the CPU variants read the tiles that are actually accessed through
+a process-wide cache with a fixed memory budget (see
+``TextureCache.set_capacity()``), so that scenes can reference more texture
+data than fits into memory. Tiled files store linear values, and the pyramid
+stored in the file is used by the ``trilinear`` and ``ewa`` filters. Importance
+sampling a tiled texture (e.g. when it is used by an emitter) loads its full
+resolution level into memory, and the GPU variants load the entire texture.
+
+Textures can also be converted ahead of time, so that render jobs neither decode
+nor linearize them, using the :monosp:`mtstexconv` executable or
+``TiledImage.convert()``:
+
+.. code-block:: bash
+
+    mtstexconv --wrap-mode repeat textures/*.png
+
+This writes the conversion of e.g. ``wood.png`` to ``wood.png.mtt``, which the
+plugin then loads in place of ``wood.png``. Converted files store a hash of the
+contents of their source: files that are out of date, that were converted with
+a different :paramtype:`raw` setting (``mtstexconv --raw``), or whose pyramid
+was built for a different wrap mode (when using the ``trilinear`` or ``ewa``
+filters) are ignored with a warning.
+
 */
 
-enum class FilterType { Nearest, Bilinear };
+enum class FilterType { Nearest, Bilinear, Trilinear, EWA };
 enum class WrapMode { Repeat, Mirror, Clamp };
 
+/// Return the boundary condition of the MIP map filter matching a wrap mode
+static FilterBoundaryCondition boundary_condition(WrapMode wrap_mode) {
+    if (wrap_mode == WrapMode::Repeat)
+        return FilterBoundaryCondition::Repeat;
+    else if (wrap_mode == WrapMode::Mirror)
+        return FilterBoundaryCondition::Mirror;
+    else
+        return FilterBoundaryCondition::Clamp;
+}
+
+/**
+ * \brief Build the levels of a MIP map pyramid by repeatedly halving the
+ * resolution of \c bitmap using a box filter (the full resolution image
+ * is not part of the returned list)
+ */
+static std::vector<ref<Bitmap>> build_mip_pyramid(const Bitmap *bitmap,
+                                                  WrapMode wrap_mode) {
+    using ReconstructionFilter = Bitmap::ReconstructionFilter;
+    ref<ReconstructionFilter> rfilter =
+        PluginManager::instance()->create_object<ReconstructionFilter>(Properties("box"));
+    FilterBoundaryCondition bc = boundary_condition(wrap_mode);
+
+    std::vector<ref<Bitmap>> levels;
+    const Bitmap *current = bitmap;
+    while (current->width() > 1 || current->height() > 1) {
+        levels.push_back(current->resample(max(current->size() / 2u, 1u),
+                                           rfilter, { bc, bc }));
+        current = levels.back();
+    }
+    return levels;
+}
+
 // Forward declaration of specialized bitmap texture
 template <typename Float, typename Spectrum, uint32_t Channels, bool Raw>
 class BitmapTextureImpl;
@@ -102,9 +183,26 @@ public:
             m_filter_type = FilterType::Nearest;
         else if (filter_type == "bilinear")
             m_filter_type = FilterType::Bilinear;
+        else if (filter_type == "trilinear")
+            m_filter_type = FilterType::Trilinear;
+        else if (filter_type == "ewa")
+            m_filter_type = FilterType::EWA;
         else
-            Throw("Invalid filter type \"%s\", must be one of: \"nearest\", or "
-                  "\"bilinear\"!", filter_type);
+            Throw("Invalid filter type \"%s\", must be one of: \"nearest\", "
+                  "\"bilinear\", \"trilinear\", or \"ewa\"!", filter_type);
+
+        m_max_anisotropy = props.float_("max_anisotropy", 20.f);
+        if (!(m_max_anisotropy >= 1.f))
+            Throw("The maximum anisotropy must be at least 1 (got %f)!",
+                  m_max_anisotropy);
+
+        if constexpr (is_cuda_array_v<Float>) {
+            if (m_filter_type == FilterType::EWA) {
+                Log(Warn, "EWA filtering is not supported by the GPU variants, "
+                          "using trilinear filtering instead.");
+                m_filter_type = FilterType::Trilinear;
+            }
+        }
 
         std::string wrap_mode = props.string("wrap_mode", "repeat");
         if (wrap_mode == "repeat")
@@ -117,7 +215,34 @@ public:
             Throw("Invalid wrap mode \"%s\", must be one of: \"repeat\", "
                   "\"mirror\", or \"clamp\"!", wrap_mode);
 
-        m_bitmap = new Bitmap(file_path);
+        /* Should Mitsuba disable transformations to the stored color data?
+           (e.g. sRGB to linear, spectral upsampling, etc.) */
+        m_raw = props.bool_("raw", false);
+
+        // Prefer an up-to-date pre-converted version of the file (see 'mtstexconv')
+        if (!TiledImage::is_tiled_image(file_path)) {
+            fs::path converted_path =
+                fs->resolve(TiledImage::converted_path(props.string("filename")));
+            if (fs::exists(converted_path) && is_converted(file_path, converted_path))
+                file_path = converted_path;
+        }
+
+        if (TiledImage::is_tiled_image(file_path)) {
+            if constexpr (!is_dynamic_v<Float>) {
+                open_tiled(file_path);
+                return;
+            } else {
+                // Tiles are looked up on the CPU, load the full resolution level instead
+                Log(Debug, "Loading the full resolution level of tiled texture \"%s\"", m_name);
+                m_bitmap = ref<TiledImage>(new TiledImage(file_path))->read_level(0);
+            }
+        } else {
+            // The decoded bitmap may be shared with other textures via the asset cache
+            m_bitmap = AssetCache::get_or_load<Bitmap>(
+            "bitmap:" + AssetCache::file_key(file_path),
+                [&]() { return new Bitmap(file_path); },
+                [](const Bitmap *value) { return value->buffer_size(); });
+        }
 
         /* Convert to linear RGB float bitmap, will be converted
            into spectral profile coefficients below (in place) */
@@ -140,12 +265,12 @@ public:
                       "format (Y[A], RGB[A], XYZ[A] are supported).");
         }
 
-        /* Should Mitsuba disable transformations to the stored color data?
-           (e.g. sRGB to linear, spectral upsampling, etc.) */
-        m_raw = props.bool_("raw", false);
         if (m_raw) {
             /* Don't undo gamma correction in the conversion below.
-               This is needed, e.g., for normal maps. */
+               This is needed, e.g., for normal maps. Cached bitmaps
+               must not be modified, hence this changes a copy. */
+            if (AssetCache::capacity() > 0)
+                m_bitmap = new Bitmap(*m_bitmap);
             m_bitmap->set_srgb_gamma(false);
         }
 
@@ -160,6 +285,10 @@ public:
             m_bitmap = m_bitmap->resample(max(m_bitmap->size(), 2), rfilter);
         }
 
+        // The MIP map levels are built before the conversion into spectral coefficients
+        if (m_filter_type == FilterType::Trilinear || m_filter_type == FilterType::EWA)
+            m_pyramid = build_mip_pyramid(m_bitmap, m_wrap_mode);
+
         ScalarFloat *ptr = (ScalarFloat *) m_bitmap->data();
         size_t pixel_count = m_bitmap->pixel_count();
         bool bad = false;
@@ -203,6 +332,16 @@ public:
                 "exceed the [0, 1] range!", m_name);
 
         m_mean = ScalarFloat(mean / pixel_count);
+
+        if (is_spectral_v<Spectrum> && !m_raw && m_bitmap->channel_count() == 3) {
+            for (Bitmap *level : m_pyramid) {
+                ptr = (ScalarFloat *) level->data();
+                for (size_t i = 0; i < level->pixel_count(); ++i) {
+                    store_unaligned(ptr, srgb_model_fetch(load_unaligned<ScalarColor3f>(ptr)));
+                    ptr += 3;
+                }
+            }
+        }
     }
 
     /**
@@ -218,8 +357,80 @@ public:
     MTS_DECLARE_CLASS()
 
 protected:
+    /// Check whether \c converted_path is an up-to-date conversion of \c file_path
+    bool is_converted(const fs::path &file_path, const fs::path &converted_path) const {
+        if (!TiledImage::is_tiled_image(converted_path) || !fs::exists(file_path))
+            return false;
+
+        ref<TiledImage> converted;
+        try {
+            converted = new TiledImage(converted_path);
+        } catch (const std::exception &e) {
+            Log(Warn, "Ignoring converted texture \"%s\": %s", converted_path, e.what());
+            return false;
+        }
+
+        if (converted->source_hash() != TiledImage::compute_source_hash(file_path, m_raw)) {
+            Log(Warn, "Ignoring converted texture \"%s\", which is out of date "
+                      "(or was converted with a different \"raw\" setting)",
+                converted_path);
+            return false;
+        }
+
+        bool pyramid = m_filter_type == FilterType::Trilinear ||
+                       m_filter_type == FilterType::EWA;
+        if (pyramid && converted->boundary_condition() != boundary_condition(m_wrap_mode)) {
+            Log(Warn, "Ignoring converted texture \"%s\", whose MIP map pyramid "
+                      "was built for a different wrap mode", converted_path);
+            return false;
+        }
+
+        Log(Debug, "Using converted texture \"%s\"", converted_path.filename());
+        return true;
+    }
+
+    /// Open a tiled image, whose tiles are loaded on demand through the \ref TextureCache
+    void open_tiled(const fs::path &file_path) {
+        TiledImage::TileConverter converter;
+        if (is_spectral_v<Spectrum> && !m_raw) {
+            // Convert loaded tiles into spectral model coefficients
+            converter = [](float *data, size_t pixel_count, uint32_t channel_count) {
+                if (channel_count != 3)
+                    return;
+                for (size_t i = 0; i < pixel_count; ++i, data += 3)
+                    store_unaligned(data, srgb_model_fetch(load_unaligned<Color<float, 3>>(data)));
+            };
+        }
+
+        // Open files may be shared with other textures via the asset cache
+        m_tiled = AssetCache::get_or_load<TiledImage>(
+            "tiled:" + AssetCache::file_key(file_path) + ":" + std::to_string((int) (bool) converter),
+            [&]() { return new TiledImage(file_path, converter); },
+            [](const TiledImage *) { return sizeof(TiledImage); });
+
+        /* Approximate the mean using the coarsest level of the pyramid. In
+           spectral variants, this averages spectral model coefficients. */
+        ref<Bitmap> level = m_tiled->read_level(m_tiled->level_count() - 1);
+        const float *ptr = (const float *) level->data();
+        double mean = 0.0;
+        for (size_t i = 0; i < level->pixel_count(); ++i) {
+            if (m_tiled->channel_count() == 1) {
+                mean += (double) ptr[i];
+            } else {
+                ScalarColor3f value(load_unaligned<Color<float, 3>>(ptr + 3 * i));
+                if (is_spectral_v<Spectrum> && !m_raw)
+                    mean += (double) srgb_model_mean(value);
+                else
+                    mean += (double) luminance(value);
+            }
+        }
+        m_mean = ScalarFloat(mean / level->pixel_count());
+    }
+
     Object* expand_1() const {
-        return m_bitmap->channel_count() == 1 ? expand_2<1>() : expand_2<3>();
+        uint32_t channel_count = m_tiled ? m_tiled->channel_count()
+                                         : (uint32_t) m_bitmap->channel_count();
+        return channel_count == 1 ? expand_2<1>() : expand_2<3>();
     }
 
     template <uint32_t Channels> Object* expand_2() const {
@@ -229,17 +440,21 @@ protected:
     template <uint32_t Channels, bool Raw> Object* expand_3() const {
         Properties props;
         return new BitmapTextureImpl<Float, Spectrum, Channels, Raw>(
-            props, m_bitmap, m_name, m_transform, m_mean, m_filter_type, m_wrap_mode);
+            props, m_bitmap, m_pyramid, m_tiled, m_name, m_transform, m_mean,
+            m_filter_type, m_wrap_mode, m_max_anisotropy);
     }
 
 protected:
     ref<Bitmap> m_bitmap;
+    std::vector<ref<Bitmap>> m_pyramid;
+    ref<TiledImage> m_tiled;
     std::string m_name;
     ScalarTransform3f m_transform;
     bool m_raw;
     ScalarFloat m_mean;
     FilterType m_filter_type;
     WrapMode m_wrap_mode;
+    ScalarFloat m_max_anisotropy;
 };
 
 template <typename Float, typename Spectrum, uint32_t Channels, bool Raw>
@@ -247,21 +462,39 @@ class BitmapTextureImpl final : public Texture<Float, Spectrum> {
 public:
     MTS_IMPORT_TYPES(Texture)
 
+    // Storage representation underlying this texture
+    using StorageType = std::conditional_t<Channels == 1, Float, Color3f>;
+
+    // Representation of evaluated texels
+    using Result = std::conditional_t<is_spectral_v<Spectrum> && !Raw && Channels == 3,
+                                      UnpolarizedSpectrum, StorageType>;
+
     BitmapTextureImpl(const Properties &props,
                       const Bitmap *bitmap,
+                      const std::vector<ref<Bitmap>> &pyramid,
+                      TiledImage *tiled,
                       const std::string &name,
                       const ScalarTransform3f &transform,
                       ScalarFloat mean,
                       FilterType filter_type,
-                      WrapMode wrap_mode)
+                      WrapMode wrap_mode,
+                      ScalarFloat max_anisotropy)
         : Texture(props),
-          m_resolution(ScalarVector2i(bitmap->size())),
-          m_inv_resolution_x((int) bitmap->width()),
-          m_inv_resolution_y((int) bitmap->height()),
+          m_resolution(ScalarVector2i(tiled ? tiled->resolution() : bitmap->size())),
+          m_inv_resolution_x(m_resolution.x()),
+          m_inv_resolution_y(m_resolution.y()),
           m_name(name), m_transform(transform), m_mean(mean),
-          m_filter_type(filter_type), m_wrap_mode(wrap_mode){
-        m_data = DynamicBuffer<Float>::copy(bitmap->data(),
-            hprod(m_resolution) * Channels);
+          m_filter_type(filter_type), m_wrap_mode(wrap_mode),
+          m_max_anisotropy(max_anisotropy), m_tiled(tiled) {
+        if (m_tiled) {
+            // Only the resolution of the levels is needed, tiles are loaded on demand
+            for (uint32_t i = 1; i < m_tiled->level_count(); ++i)
+                m_pyramid.push_back(mip_level(ScalarVector2i(m_tiled->resolution(i))));
+        } else {
+            m_data = DynamicBuffer<Float>::copy(bitmap->data(),
+                hprod(m_resolution) * Channels);
+            set_pyramid(pyramid);
+        }
     }
 
     UnpolarizedSpectrum eval(const SurfaceInteraction3f &si, Mask active) const override {
@@ -312,9 +545,7 @@ public:
                   to_string());
         }
         else {
-            if (m_filter_type == FilterType::Bilinear) {
-                // Storage representation underlying this texture
-                using StorageType = std::conditional_t<Channels == 1, Float, Color3f>;
+            if (m_filter_type != FilterType::Nearest) {
                 using Int4 = Array<Int32, 4>;
                 using Int24 = Array<Int4, 2>;
 
@@ -332,12 +563,6 @@ public:
                 // Interpolation weights
                 Point2f w1 = uv - Point2f(uv_i), w0 = 1.f - w1;
 
-                // Apply wrap mode
-                Int24 uv_i_w = wrap(Int24(Int4(0, 1, 0, 1) + uv_i.x(),
-                                          Int4(0, 0, 1, 1) + uv_i.y()));
-
-                Int4 index = uv_i_w.x() + uv_i_w.y() * m_resolution.x();
-
                 auto convert_to_monochrome = [](const auto& a) {
                     if constexpr (Channels == 3)
                         return luminance(a);
@@ -345,10 +570,24 @@ public:
                         return a;
                 };
 
-                Float f00 = convert_to_monochrome(gather<StorageType>(m_data, index.x(), active));
-                Float f10 = convert_to_monochrome(gather<StorageType>(m_data, index.y(), active));
-                Float f01 = convert_to_monochrome(gather<StorageType>(m_data, index.z(), active));
-                Float f11 = convert_to_monochrome(gather<StorageType>(m_data, index.w(), active));
+                Float f00, f10, f01, f11;
+                if (m_tiled) {
+                    f00 = convert_to_monochrome(fetch(0, uv_i, si.wavelengths, active));
+                    f10 = convert_to_monochrome(fetch(0, uv_i + Vector2i(1, 0), si.wavelengths, active));
+                    f01 = convert_to_monochrome(fetch(0, uv_i + Vector2i(0, 1), si.wavelengths, active));
+                    f11 = convert_to_monochrome(fetch(0, uv_i + Vector2i(1, 1), si.wavelengths, active));
+                } else {
+                    // Apply wrap mode
+                    Int24 uv_i_w = wrap(Int24(Int4(0, 1, 0, 1) + uv_i.x(),
+                                              Int4(0, 0, 1, 1) + uv_i.y()));
+
+                    Int4 index = uv_i_w.x() + uv_i_w.y() * m_resolution.x();
+
+                    f00 = convert_to_monochrome(gather<StorageType>(m_data, index.x(), active));
+                    f10 = convert_to_monochrome(gather<StorageType>(m_data, index.y(), active));
+                    f01 = convert_to_monochrome(gather<StorageType>(m_data, index.z(), active));
+                    f11 = convert_to_monochrome(gather<StorageType>(m_data, index.w(), active));
+                }
 
                 // Partials w.r.t. pixel coordinate x and y
                 Vector2f df_xy{ fmadd(w0.y(), f10 - f00, w1.y() * (f11 - f01)),
@@ -384,32 +623,299 @@ public:
     }
 
     template <typename T> T wrap(const T &value) const {
+        return wrap(value, m_resolution, m_inv_resolution_x, m_inv_resolution_y);
+    }
+
+    template <typename T>
+    T wrap(const T &value, const ScalarVector2i &resolution,
+           const enoki::divisor<int32_t> &inv_resolution_x,
+           const enoki::divisor<int32_t> &inv_resolution_y) const {
         if (m_wrap_mode == WrapMode::Clamp) {
-            return clamp(value, 0, m_resolution - 1);
+            return clamp(value, 0, resolution - 1);
         } else {
-            T div = T(m_inv_resolution_x(value.x()),
-                      m_inv_resolution_y(value.y())),
-              mod = value - div * m_resolution;
+            T div = T(inv_resolution_x(value.x()),
+                      inv_resolution_y(value.y())),
+              mod = value - div * resolution;
 
-            masked(mod, mod < 0) += T(m_resolution);
+            masked(mod, mod < 0) += T(resolution);
 
             if (m_wrap_mode == WrapMode::Mirror)
-                mod = select(eq(div & 1, 0) ^ (value < 0), mod, m_resolution - 1 - mod);
+                mod = select(eq(div & 1, 0) ^ (value < 0), mod, resolution - 1 - mod);
 
             return mod;
         }
     }
 
-    MTS_INLINE auto interpolate(const SurfaceInteraction3f &si, Mask active) const {
-        // Storage representation underlying this texture
-        using StorageType = std::conditional_t<Channels == 1, Float, Color3f>;
+    /// Fetch and evaluate the texel at integer position \c p of a MIP map level
+    Result fetch(size_t level, const Vector2i &p, const Wavelength &wavelengths,
+                 Mask active) const {
+        Vector2i p_w;
+        Int32 index;
+        StorageType value;
+
+        if (level == 0) {
+            p_w = wrap(p);
+            index = p_w.x() + p_w.y() * m_resolution.x();
+            if (!m_tiled)
+                value = gather<StorageType>(m_data, index, active);
+        } else {
+            const MipLevel &l = m_pyramid[level - 1];
+            p_w = wrap(p, l.resolution, l.inv_resolution_x, l.inv_resolution_y);
+            index = p_w.x() + p_w.y() * l.resolution.x();
+            if (!m_tiled)
+                value = gather<StorageType>(l.data, index, active);
+        }
+
+        if (m_tiled)
+            value = fetch_tiled((uint32_t) level, p_w, active);
 
+        if constexpr (is_spectral_v<Spectrum> && !Raw && Channels == 3) {
+            return srgb_model_eval<UnpolarizedSpectrum>(value, wavelengths);
+        } else {
+            ENOKI_MARK_USED(wavelengths);
+            return value;
+        }
+    }
+
+    /// Look up texels of a tiled image through the texture cache (at wrapped positions)
+    StorageType fetch_tiled(uint32_t level, const Vector2i &p, Mask active) const {
+        if constexpr (is_dynamic_v<Float>) {
+            ENOKI_MARK_USED(level); ENOKI_MARK_USED(p); ENOKI_MARK_USED(active);
+            Throw("Tiled textures are only supported by the scalar and packet variants!");
+        } else if constexpr (!is_array_v<Float>) {
+            if (!active)
+                return zero<StorageType>();
+            float texel[Channels];
+            TextureCache::fetch(m_tiled, level, (uint32_t) p.x(), (uint32_t) p.y(), texel);
+            if constexpr (Channels == 1)
+                return StorageType(texel[0]);
+            else
+                return StorageType(texel[0], texel[1], texel[2]);
+        } else {
+            StorageType value = zero<StorageType>();
+            float texel[Channels];
+            for (size_t i = 0; i < array_size_v<Float>; ++i) {
+                if (!active.coeff(i))
+                    continue;
+                TextureCache::fetch(m_tiled, level, (uint32_t) p.x().coeff(i),
+                                    (uint32_t) p.y().coeff(i), texel);
+                if constexpr (Channels == 1) {
+                    value.coeff(i) = texel[0];
+                } else {
+                    for (size_t j = 0; j < Channels; ++j)
+                        value.coeff(j).coeff(i) = texel[j];
+                }
+            }
+            return value;
+        }
+    }
+
+    /// Bilinearly interpolated lookup into a MIP map level
+    Result eval_bilinear(size_t level, const Point2f &uv_, const Wavelength &wavelengths,
+                         Mask active) const {
+        // Scale to the resolution of the level and apply shift
+        Point2f uv = fmadd(uv_, level_resolution(level), -.5f);
+
+        // Integer pixel positions and interpolation weights
+        Vector2i uv_i = floor2int<Vector2i>(uv);
+        Point2f w1 = uv - Point2f(uv_i),
+                w0 = 1.f - w1;
+
+        Result v00 = fetch(level, uv_i, wavelengths, active),
+               v10 = fetch(level, uv_i + Vector2i(1, 0), wavelengths, active),
+               v01 = fetch(level, uv_i + Vector2i(0, 1), wavelengths, active),
+               v11 = fetch(level, uv_i + Vector2i(1, 1), wavelengths, active);
+
+        Result v0 = fmadd(w0.x(), v00, w1.x() * v10),
+               v1 = fmadd(w0.x(), v01, w1.x() * v11);
+
+        return fmadd(w0.y(), v0, w1.y() * v1);
+    }
+
+    /**
+     * \brief Evaluate \c lookup(level, mask) at the two MIP map levels
+     * enclosing the fractional level \c lod and interpolate linearly
+     */
+    template <typename Lookup>
+    Result eval_levels(const Float &lod, const Lookup &lookup, Mask active) const {
+        Int32 lower = floor2int<Int32>(lod);
+        Float alpha = lod - Float(lower);
+
+        // Different lanes may access different levels
+        Result result = zero<Result>();
+        for (size_t level = 0; level <= m_pyramid.size(); ++level) {
+            Mask use_lower = active && eq(lower, (int32_t) level),
+                 use_upper = active && eq(lower + 1, (int32_t) level) && alpha > 0.f;
+            Mask use_level = use_lower || use_upper;
+            if (none(use_level))
+                continue;
+
+            Float weight = select(use_lower, 1.f - alpha, 0.f) +
+                           select(use_upper, alpha, 0.f);
+            masked(result, use_level) += weight * lookup(level, use_level);
+        }
+
+        return result;
+    }
+
+    /**
+     * \brief Return the axes of the pixel footprint in texture space
+     * (measured in texels of the full resolution image)
+     */
+    std::pair<Vector2f, Vector2f> footprint(const SurfaceInteraction3f &si) const {
+        ScalarVector2f resolution(m_resolution);
+        return { m_transform.transform_affine(si.duv_dx) * resolution,
+                 m_transform.transform_affine(si.duv_dy) * resolution };
+    }
+
+    /// Trilinear filtering (isotropic box footprint)
+    Result eval_trilinear(const SurfaceInteraction3f &si, const Point2f &uv,
+                          Mask active) const {
+        auto [d0, d1] = footprint(si);
+        Float width = 2.f * hmax(max(abs(d0), abs(d1)));
+
+        /* Zero-sized footprints (e.g. rays without differentials) map
+           to bilinear lookups at the full resolution */
+        Float lod = clamp(log2(max(width, 1e-8f)), 0.f, (ScalarFloat) m_pyramid.size());
+
+        return eval_levels(lod, [&](size_t level, Mask mask) {
+            return eval_bilinear(level, uv, si.wavelengths, mask);
+        }, active);
+    }
+
+    /// Elliptically weighted average filtering (anisotropic footprint)
+    Result eval_ewa(const SurfaceInteraction3f &si, const Point2f &uv,
+                    Mask active) const {
+        auto [d0, d1] = footprint(si);
+
+        // Sort the axes of the footprint by length
+        Mask swap_axes = squared_norm(d0) < squared_norm(d1);
+        Vector2f major = select(swap_axes, d1, d0),
+                 minor = select(swap_axes, d0, d1);
+        Float major_length = norm(major),
+              minor_length = norm(minor);
+
+        // Widen overly eccentric footprints to bound the number of lookups
+        Mask clamp_anisotropy = minor_length * m_max_anisotropy < major_length &&
+                                minor_length > 0.f;
+        Float scale = select(clamp_anisotropy,
+                             major_length / (minor_length * m_max_anisotropy), 1.f);
+        minor *= scale;
+        minor_length *= scale;
+
+        // Degenerate footprints (e.g. rays without differentials)
+        Mask degenerate = active && !(minor_length > 0.f);
+        active &= !degenerate;
+
+        Result result = zero<Result>();
+        if (any(active)) {
+            Float lod = clamp(log2(max(minor_length, 1e-8f)), 0.f,
+                              (ScalarFloat) m_pyramid.size());
+
+            result = eval_levels(lod, [&](size_t level, Mask mask) {
+                return eval_ewa_level(level, uv, major, minor, si.wavelengths, mask);
+            }, active);
+        }
+
+        if (any(degenerate))
+            masked(result, degenerate) = eval_bilinear(0, uv, si.wavelengths, degenerate);
+
+        return result;
+    }
+
+    /**
+     * \brief Weighted average of the texels of a MIP map level covered by the
+     * ellipse with axes \c d0 and \c d1 (in texels of the full resolution)
+     */
+    Result eval_ewa_level(size_t level, const Point2f &uv_, const Vector2f &d0_,
+                          const Vector2f &d1_, const Wavelength &wavelengths,
+                          Mask active) const {
+        ScalarVector2i resolution = level_resolution(level);
+        ScalarVector2f scale = ScalarVector2f(resolution) / ScalarVector2f(m_resolution);
+
+        Point2f uv = fmadd(uv_, resolution, -.5f);
+        Vector2f d0 = d0_ * scale, d1 = d1_ * scale;
+
+        /* Implicit equation A*s^2 + B*s*t + C*t^2 < 1 of the ellipse, which is
+           widened by one texel to always cover some texels */
+        Float a = fmadd(d0.y(), d0.y(), fmadd(d1.y(), d1.y(), 1.f)),
+              b = -2.f * fmadd(d0.x(), d0.y(), d1.x() * d1.y()),
+              c = fmadd(d0.x(), d0.x(), fmadd(d1.x(), d1.x(), 1.f)),
+              inv_f = rcp(fmsub(a, c, .25f * b * b));
+        a *= inv_f; b *= inv_f; c *= inv_f;
+
+        // Bounding box of the ellipse
+        Float det = fmsub(4.f * a, c, b * b),
+              inv_det = rcp(det),
+              u_extent = 2.f * inv_det * safe_sqrt(det * c),
+              v_extent = 2.f * inv_det * safe_sqrt(a * det);
+
+        Vector2i p_min = ceil2int<Vector2i>(uv - Vector2f(u_extent, v_extent)),
+                 p_max = floor2int<Vector2i>(uv + Vector2f(u_extent, v_extent));
+        Vector2i size = select(active, p_max - p_min + 1, 0);
+
+        auto max_size = [](const Int32 &value) -> int32_t {
+            if constexpr (is_array_v<Int32>)
+                return hmax(value);
+            else
+                return value;
+        };
+
+        int32_t width = max_size(size.x()), height = max_size(size.y());
+
+        Result sum = zero<Result>();
+        Float weight_sum = 0.f;
+        const ScalarFloat weight_offset = std::exp(-EWAAlpha);
+
+        for (int32_t j = 0; j < height; ++j) {
+            Float t = Float(p_min.y() + j) - uv.y();
+            Mask active_row = active && j < size.y();
+
+            for (int32_t i = 0; i < width; ++i) {
+                Float s = Float(p_min.x() + i) - uv.x(),
+                      r2 = fmadd(a * s, s, fmadd(b * s, t, c * t * t));
+
+                Mask inside = active_row && i < size.x() && r2 < 1.f;
+                if (none(inside))
+                    continue;
+
+                // Truncated Gaussian filter
+                Float weight = exp(-EWAAlpha * r2) - weight_offset;
+                Result value = fetch(level, Vector2i(p_min.x() + i, p_min.y() + j),
+                                     wavelengths, inside);
+
+                masked(sum, inside) += weight * value;
+                masked(weight_sum, inside) += weight;
+            }
+        }
+
+        return select(weight_sum > 0.f, sum * rcp(weight_sum), zero<Result>());
+    }
+
+    /// Return the resolution of a MIP map level
+    ScalarVector2i level_resolution(size_t level) const {
+        return level == 0 ? m_resolution : m_pyramid[level - 1].resolution;
+    }
+
+    MTS_INLINE Result interpolate(const SurfaceInteraction3f &si, Mask active) const {
         if constexpr (!is_array_v<Mask>)
             active = true;
 
         Point2f uv = m_transform.transform_affine(si.uv);
 
-        if (m_filter_type == FilterType::Bilinear) {
+        if (m_filter_type == FilterType::Trilinear) {
+            return eval_trilinear(si, uv, active);
+        } else if (m_filter_type == FilterType::EWA) {
+            if constexpr (!is_cuda_array_v<Float>)
+                return eval_ewa(si, uv, active);
+            else
+                return eval_trilinear(si, uv, active);
+        } else if (m_tiled) {
+            if (m_filter_type == FilterType::Bilinear)
+                return eval_bilinear(0, uv, si.wavelengths, active);
+            else
+                return fetch(0, floor2int<Vector2i>(uv * m_resolution), si.wavelengths, active);
+        } else if (m_filter_type == FilterType::Bilinear) {
             using Int4  = Array<Int32, 4>;
             using Int24 = Array<Int4, 2>;
 
@@ -524,7 +1030,7 @@ public:
             }
         }
 
-        if (m_filter_type == FilterType::Bilinear) {
+        if (m_filter_type != FilterType::Nearest) {
             using Int4  = Array<Int32, 4>;
             using Int24 = Array<Int4, 2>;
 
@@ -559,7 +1065,9 @@ public:
     }
 
     void traverse(TraversalCallback *callback) override {
-        callback->put_parameter("data", m_data);
+        // The texels of tiled textures are not resident in memory
+        if (!m_tiled)
+            callback->put_parameter("data", m_data);
         callback->put_parameter("resolution", m_resolution);
         callback->put_parameter("transform", m_transform);
     }
@@ -568,6 +1076,17 @@ public:
         if (keys.empty() || string::contains(keys, "data")) {
             /// Convert m_data into a managed array (available in CPU/GPU address space)
             rebuild_internals(true, m_distr2d != nullptr);
+
+            /* Rebuild the MIP map from the updated data. In spectral variants,
+               this averages the spectral model coefficients, which only
+               approximates the average of the spectra. */
+            if (m_filter_type == FilterType::Trilinear || m_filter_type == FilterType::EWA) {
+                ref<Bitmap> bitmap = new Bitmap(
+                    Channels == 1 ? Bitmap::PixelFormat::Y : Bitmap::PixelFormat::RGB,
+                    struct_type_v<ScalarFloat>, ScalarVector2u(m_resolution), Channels,
+                    (uint8_t *) m_data.data());
+                set_pyramid(build_mip_pyramid(bitmap, m_wrap_mode));
+            }
         }
     }
 
@@ -579,12 +1098,18 @@ public:
 
     bool is_spatially_varying() const override { return true; }
 
+    bool needs_differentials() const override {
+        return m_filter_type == FilterType::Trilinear || m_filter_type == FilterType::EWA;
+    }
+
     std::string to_string() const override {
         std::ostringstream oss;
         oss << "BitmapTextureImpl[" << std::endl
             << "  name = \"" << m_name << "\"," << std::endl
             << "  resolution = \"" << m_resolution << "\"," << std::endl
             << "  raw = " << (int) Raw << "," << std::endl
+            << "  mip_levels = " << m_pyramid.size() + 1 << "," << std::endl
+            << "  tiled = " << (m_tiled ? "true" : "false") << "," << std::endl
             << "  mean = " << m_mean << "," << std::endl
             << "  transform = " << string::indent(m_transform) << std::endl
             << "]";
@@ -594,11 +1119,38 @@ public:
     MTS_DECLARE_CLASS()
 
 protected:
+    /// Create the description of a MIP map level (without data)
+    static auto mip_level(const ScalarVector2i &resolution) {
+        MipLevel level;
+        level.resolution = resolution;
+        level.inv_resolution_x = enoki::divisor<int32_t>(resolution.x());
+        level.inv_resolution_y = enoki::divisor<int32_t>(resolution.y());
+        return level;
+    }
+
+    /// Replace the coarser levels of the MIP map
+    void set_pyramid(const std::vector<ref<Bitmap>> &pyramid) {
+        m_pyramid.clear();
+        for (const Bitmap *bitmap : pyramid) {
+            MipLevel level = mip_level(ScalarVector2i(bitmap->size()));
+            level.data = DynamicBuffer<Float>::copy(bitmap->data(),
+                hprod(level.resolution) * Channels);
+            m_pyramid.push_back(std::move(level));
+        }
+    }
+
     /**
      * \brief Recompute mean and 2D sampling distribution (if requested)
      * following an update
      */
     void rebuild_internals(bool init_mean, bool init_distr) {
+        if (m_tiled && slices(m_data) == 0) {
+            Log(Debug, "Loading the full resolution level of tiled texture \"%s\" "
+                       "for importance sampling", m_name);
+            ref<Bitmap> bitmap = m_tiled->read_level(0);
+            m_data = DynamicBuffer<Float>::copy(bitmap->data(), hprod(m_resolution) * Channels);
+        }
+
         // Recompute the mean texture value following an update
         m_data = m_data.managed();
         const ScalarFloat *ptr = m_data.data();
@@ -662,6 +1214,22 @@ protected:
     ScalarFloat m_mean;
     FilterType m_filter_type;
     WrapMode m_wrap_mode;
+    ScalarFloat m_max_anisotropy;
+
+    /// Tiled image whose tiles are loaded on demand (instead of \c m_data)
+    ref<TiledImage> m_tiled;
+
+    /// Coarser levels of the MIP map (the full resolution level is \c m_data)
+    struct MipLevel {
+        DynamicBuffer<Float> data;
+        ScalarVector2i resolution;
+        enoki::divisor<int32_t> inv_resolution_x;
+        enoki::divisor<int32_t> inv_resolution_y;
+    };
+    std::vector<MipLevel> m_pyramid;
+
+    /// Falloff of the Gaussian filter used for EWA filtering
+    static constexpr ScalarFloat EWAAlpha = 2.f;
 
     // Optional: distribution for importance sampling
     mutable tbb::spin_mutex m_mutex;
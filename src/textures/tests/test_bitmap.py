@@ -59,4 +59,100 @@ def test02_eval_grad(variant_scalar_rgb):
             fv = bitmap.eval_1(si)
             gradient_finite_difference = Vector2f((fu - f)/delta, (fv - f)/delta)
             gradient_analytic = bitmap.eval_1_grad(si)
-            assert ek.allclose(0, ek.abs(gradient_finite_difference/gradient_analytic - 1.0), atol = 1e04)
\ No newline at end of file
+            assert ek.allclose(0, ek.abs(gradient_finite_difference/gradient_analytic - 1.0), atol = 1e04)
+
+@fresolver_append_path
+@pytest.mark.parametrize('filter_type', ['trilinear', 'ewa'])
+def test03_mipmap(variant_scalar_rgb, filter_type):
+    # Filtered lookups reduce to bilinear lookups without a footprint and to
+    # the texture mean when the footprint covers the whole texture
+    from mitsuba.render import SurfaceInteraction3f
+    from mitsuba.core.xml import load_string
+    from mitsuba.core import Vector2f
+    import numpy as np
+    import enoki as ek
+
+    def load(filter_type):
+        return load_string("""
+        <texture type="bitmap" version="2.0.0">
+            <string name="filename" value="resources/data/common/textures/noise_8x8.png"/>
+            <string name="filter_type" value="%s"/>
+        </texture>""" % filter_type).expand()[0]
+
+    bitmap, reference = load(filter_type), load('bilinear')
+    assert bitmap.needs_differentials()
+    assert not reference.needs_differentials()
+
+    si = SurfaceInteraction3f()
+    for uv in np.random.rand(10, 2):
+        si.uv = Vector2f(uv)
+        si.duv_dx = si.duv_dy = Vector2f(0, 0)
+        assert ek.allclose(bitmap.eval_1(si), reference.eval_1(si))
+
+        si.duv_dx, si.duv_dy = Vector2f(16, 4), Vector2f(-4, 16)
+        assert ek.allclose(bitmap.eval_1(si), bitmap.mean(), atol=1e-4)
+
+    with pytest.raises(Exception) as e:
+        load('anisotropic')
+    e.match('Invalid filter type')
+
+
+@pytest.mark.parametrize('filter_type', ['nearest', 'bilinear', 'trilinear'])
+def test04_tiled(variant_scalar_rgb, tmpdir, filter_type):
+    # Tiled textures evaluate like the image they were created from
+    from mitsuba.render import SurfaceInteraction3f
+    from mitsuba.core.xml import load_string
+    from mitsuba.core import Bitmap, TiledImage, Vector2f
+    import numpy as np
+    import enoki as ek
+
+    rng = np.random.RandomState(0)
+    bitmap = Bitmap(rng.uniform(size=(64, 48, 3)).astype(np.float32))
+    exr_filename = str(tmpdir.join('image.exr'))
+    tiled_filename = str(tmpdir.join('image.mtt'))
+    bitmap.write(exr_filename)
+    TiledImage.write(bitmap, tiled_filename, tile_size=16)
+
+    def load(filename):
+        return load_string("""
+        <texture type="bitmap" version="2.0.0">
+            <string name="filename" value="%s"/>
+            <string name="filter_type" value="%s"/>
+        </texture>""" % (filename, filter_type)).expand()[0]
+
+    tiled, reference = load(tiled_filename), load(exr_filename)
+    assert ek.allclose(tiled.mean(), reference.mean(), atol=1e-3)
+
+    si = SurfaceInteraction3f()
+    for uv in rng.uniform(-1, 2, size=(20, 2)):
+        si.uv = Vector2f(uv)
+        si.duv_dx, si.duv_dy = Vector2f(0.05, 0), Vector2f(0, 0.05)
+        assert ek.allclose(tiled.eval(si), reference.eval(si), atol=1e-5)
+
+
+def test05_converted(variant_scalar_rgb, tmpdir):
+    # Up-to-date conversions are used in place of the original file
+    from mitsuba.core.xml import load_string
+    from mitsuba.core import Bitmap, TiledImage
+    import numpy as np
+
+    filename = str(tmpdir.join('image.exr'))
+    Bitmap(np.full((16, 16, 3), 0.5, dtype=np.float32)).write(filename)
+
+    def load(raw=False):
+        return load_string("""
+        <texture type="bitmap" version="2.0.0">
+            <string name="filename" value="%s"/>
+            <boolean name="raw" value="%s"/>
+        </texture>""" % (filename, 'true' if raw else 'false')).expand()[0]
+
+    assert 'tiled = true' not in str(load())
+    TiledImage.convert(filename)
+    assert 'tiled = true' in str(load())
+    assert 'tiled = true' not in str(load(raw=True))
+
+    # Stale conversions are ignored
+    Bitmap(np.full((16, 16, 3), 0.25, dtype=np.float32)).write(filename)
+    texture = load()
+    assert 'tiled = true' not in str(texture)
+    assert np.isclose(texture.mean(), 0.25)